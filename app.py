@@ -1,10 +1,7 @@
 import gradio as gr
 import asyncio
-import pandas as pd
 import plotly.graph_objects as go
 from datetime import datetime
-import json
-import time
 import os
 from utils.logging_config import setup_logging, get_logger
 
@@ -13,8 +10,7 @@ setup_logging()
 logger = get_logger(__name__)
 
 from core.main_arbitrage_system import MainArbitrageSystem
-from core.ai_model import ArbitrageAI
-from utils.config import *
+from utils.config import DEFAULT_SYMBOLS
 
 class ArbitrageDashboard:
     def __init__(self):
@@ -34,8 +30,14 @@ class ArbitrageDashboard:
             
             # AI Model Status
             ai_loaded = status.get('ai_model_loaded', False)
+            readiness = status.get('readiness', {})
             ai_icon = "✅" if ai_loaded else "⚠️"
-            ai_status = 'Ready' if ai_loaded else 'Fallback Mode (Rule-based)'
+            if ai_loaded:
+                ai_status = 'Ready'
+            elif readiness.get('ai_model') == 'loading':
+                ai_status = 'Loading in background (Rule-based meanwhile)'
+            else:
+                ai_status = 'Fallback Mode (Rule-based)'
             status_text += f"🤖 **AI Model**: {ai_icon} {ai_status}\n\n"
             
             # Data Engine Status
@@ -46,7 +48,13 @@ class ArbitrageDashboard:
             status_text += f"📡 **Data Sources**:\n"
             status_text += f"  • CEX Exchanges: {cex_count} connected\n"
             status_text += f"  • DEX Protocols: {dex_count} configured\n"
-            status_text += f"  • Web3: {'✅ Live' if web3_connected else '⚠️ Simulated'}\n\n"
+            if web3_connected:
+                web3_text = '✅ Live'
+            elif data_status.get('web3_state') == 'probing':
+                web3_text = '⏳ Connecting (Simulated meanwhile)'
+            else:
+                web3_text = '⚠️ Simulated'
+            status_text += f"  • Web3: {web3_text}\n\n"
             
             # Last scan
             last_scan = status.get('last_scan')
@@ -671,7 +679,18 @@ class ArbitrageDashboard:
                 enabled_strategies, pairs, min_profit
             )
             
-            self.scan_progress += f"   ✅ Successfully loaded price data from exchanges!\n\n"
+            # Measured span durations of this scan (MainArbitrageSystem.get_scan_timings)
+            spans = {}
+            if hasattr(self.arbitrage_system, 'get_scan_timings'):
+                spans = self.arbitrage_system.get_scan_timings()['last_scan']
+            # Building the graph covers the build, every enabled strategy's edges and the compile
+            graph_spans = ('graph_build', *(f'strategy.{name}' for name in enabled_strategies), 'graph_compile')
+
+            def took(*names):
+                seconds = sum(spans.get(name, 0.0) for name in names)
+                return f" ({seconds:.2f}s)" if spans else ""
+
+            self.scan_progress += f"   ✅ Successfully loaded price data from exchanges!{took('fetch')}\n\n"
             
             # Display graph statistics with clear explanation
             self.scan_progress += f"📊 **Step 2/5: Building Trading Graph**\n"
@@ -684,9 +703,9 @@ class ArbitrageDashboard:
                 self.scan_progress += f"     📖 Each edge = a way to convert one token to another\n"
                 self.scan_progress += f"   • Unique tokens tracked: {stats.get('tokens', 0)}\n"
                 self.scan_progress += f"   • Exchanges monitored: {stats.get('exchanges', 0)}\n"
-                self.scan_progress += f"   ✅ Trading graph constructed!\n\n"
+                self.scan_progress += f"   ✅ Trading graph constructed!{took(*graph_spans)}\n\n"
             else:
-                self.scan_progress += f"   ✅ Trading graph constructed with enabled strategies!\n\n"
+                self.scan_progress += f"   ✅ Trading graph constructed with enabled strategies!{took(*graph_spans)}\n\n"
             
             # Display Bellman-Ford results with explanation
             self.scan_progress += f"🔍 **Step 3/5: Detecting Profitable Cycles**\n"
@@ -701,9 +720,9 @@ class ArbitrageDashboard:
                 self.scan_progress += f"     📖 Longer cycles have more steps but potentially higher profit\n"
                 self.scan_progress += f"   • Profit filter applied: ≥{-self.arbitrage_system.detector.min_profit_threshold * 100:.2f}%\n"
                 self.scan_progress += f"     📖 Ignoring cycles below this threshold\n"
-                self.scan_progress += f"   ✅ Cycle detection complete!\n\n"
+                self.scan_progress += f"   ✅ Cycle detection complete!{took('detection')}\n\n"
             else:
-                self.scan_progress += f"   ✅ Cycle detection complete!\n\n"
+                self.scan_progress += f"   ✅ Cycle detection complete!{took('detection')}\n\n"
             
             self.scan_progress += f"🤖 **Step 4/5: AI Risk Analysis**\n"
             self.scan_progress += f"   🔍 What this means: AI evaluates each opportunity's safety and reliability\n"
@@ -716,7 +735,7 @@ class ArbitrageDashboard:
             self.scan_progress += f"   🔍 What this means: Selecting the best opportunities for you\n"
             self.scan_progress += f"   • Filtering by minimum profit threshold ({min_profit}%)...\n"
             self.scan_progress += f"   • Sorting by profitability and AI confidence...\n"
-            self.scan_progress += f"   ✅ Found {len(opportunities)} profitable opportunities!\n"
+            self.scan_progress += f"   ✅ Found {len(opportunities)} profitable opportunities!{took('ranking')}\n"
 
             # Limit results
             total_found = len(opportunities)
@@ -1083,7 +1102,12 @@ class ArbitrageDashboard:
             
             # AI Model
             ai_loaded = status.get('ai_model_loaded', False)
-            diag += f"🤖 AI Model: {'✓ Loaded and Ready' if ai_loaded else '⚠️ Fallback Mode (OK)'}\n"
+            if ai_loaded:
+                diag += "🤖 AI Model: ✓ Loaded and Ready\n"
+            elif status.get('readiness', {}).get('ai_model') == 'loading':
+                diag += "🤖 AI Model: ⏳ Loading in background (rule-based meanwhile)\n"
+            else:
+                diag += "🤖 AI Model: ⚠️ Fallback Mode (OK)\n"
             
             # Strategies
             strategies = status.get('active_strategies', [])
@@ -1132,6 +1156,19 @@ class ArbitrageDashboard:
                 diag += f"⏱️ Last Scan: {time_str} ({last_scan.strftime('%H:%M:%S')})\n"
             else:
                 diag += f"⏱️ Last Scan: Never (No scans performed yet)\n"
+
+            # Where scan time goes: rolling percentiles per stage, strategy and venue
+            timings = status.get('scan_timings', {})
+            if timings.get('stages'):
+                diag += f"\n=== SCAN TIMING ===\n"
+                diag += f"(last / p50 / p95 / p99 over recent scans)\n"
+                for title, key in (("Stages", 'stages'), ("Strategy edges", 'strategies'), ("Venue fetches", 'venues')):
+                    if not timings.get(key):
+                        continue
+                    diag += f"\n{title}:\n"
+                    for name, stats in timings[key].items():
+                        diag += (f"   • {name}: {stats['last']:.3f}s / {stats['p50']:.3f}s / "
+                                 f"{stats['p95']:.3f}s / {stats['p99']:.3f}s ({stats['count']} samples)\n")
             
             return diag
             
@@ -1176,6 +1213,8 @@ class ArbitrageDashboard:
             diag += f"\n🔗 Web3 Connection: "
             if web3_connected:
                 diag += f"✓ Live (real DEX data)\n"
+            elif data_status.get('web3_state') == 'probing':
+                diag += f"⏳ Connecting in background (simulated meanwhile)\n"
             else:
                 diag += f"⚠️ Simulated (safe demo mode)\n"
             
@@ -1,22 +1,17 @@
 import asyncio
+import importlib.util
 import json
 import re
+import threading
 from typing import Dict, List, Any, Optional
 
-# Optional heavy ML deps — guarded to allow running tests/demos without transformers/torch.
-try:
-    from transformers import AutoTokenizer, AutoModelForCausalLM, pipeline  # type: ignore
-    import torch  # type: ignore
-    HAVE_TRANSFORMERS = True
-except Exception:
-    AutoTokenizer = None  # type: ignore
-    AutoModelForCausalLM = None  # type: ignore
-    pipeline = None  # type: ignore
-    torch = None  # type: ignore
-    HAVE_TRANSFORMERS = False
-
+from utils import config
 from utils.logging_config import get_logger
 
+# Optional heavy ML deps (seconds to import torch) - only looked up here and imported by the
+# background model load, so tests/demos run without transformers/torch and start quickly.
+HAVE_TRANSFORMERS = all(importlib.util.find_spec(name) is not None for name in ('transformers', 'torch'))
+
 logger = get_logger(__name__)
 
 class ArbitrageAI:
@@ -30,14 +25,43 @@ class ArbitrageAI:
         self.model = None
         self.pipeline = None
         self.loaded = False
-
-        # Try to load model
-        self.load_model()
+        # 'pending' -> 'loading' -> 'ready' | 'unavailable'
+        self.load_state = 'pending'
+        self._load_lock = threading.Lock()
+
+        # Loading can take minutes (download + weights); analysis stays rule-based until it is done
+        if config.STARTUP_CONFIG.get('background_ai_model', True):
+            self.start_background_load()
+        else:
+            self.load_model()
+
+    def start_background_load(self):
+        """Load the model in a daemon thread; is_loaded() turns True once it is ready."""
+        if self.load_state != 'pending':
+            return
+        if not HAVE_TRANSFORMERS:
+            self.load_model()
+            return
+        self.load_state = 'loading'
+        threading.Thread(target=self.load_model, name='ai-model-load', daemon=True).start()
 
     def load_model(self):
         """Load the AI model"""
+        with self._load_lock:
+            if self.loaded:
+                return
+            self.load_state = 'loading'
+            self._load_model()
+
+    def _load_model(self):
+        if not HAVE_TRANSFORMERS:
+            logger.warning("transformers/torch not installed - using rule-based analysis")
+            self.load_state = 'unavailable'
+            return
         try:
             logger.info("Loading AI model...")
+            from transformers import AutoTokenizer, AutoModelForCausalLM, pipeline  # type: ignore
+            import torch  # type: ignore
  
             # Use a lighter model for HuggingFace Spaces
             self.tokenizer = AutoTokenizer.from_pretrained(self.model_id)
@@ -61,12 +85,14 @@ class ArbitrageAI:
             )
  
             self.loaded = True
+            self.load_state = 'ready'
             logger.info("AI model loaded successfully")
  
         except Exception as e:
             logger.exception("Failed to load AI model: %s", e)
             logger.warning("Falling back to rule-based analysis")
             self.loaded = False
+            self.load_state = 'unavailable'
 
     def is_loaded(self) -> bool:
         """Check if model is loaded"""
@@ -12,13 +12,20 @@ except Exception:
         nx = None
 
 import math
+import numpy as np
 from typing import Dict, List, Any, Optional, Tuple
-from collections import defaultdict, deque
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 import time
 from utils.config import BELLMAN_FORD_CONFIG
+from core.compiled_graph import CompiledGraph
+from core.cycle_enumerator import BoundedCycleEnumerator
+from core.graph_index import GraphIndex, graph_index, parse_node
+from core.trace import get_trace_buffer
 import logging
 
 logger = logging.getLogger(__name__)
+trace = get_trace_buffer()
 
 class BellmanFordDetector:
     """
@@ -33,10 +40,38 @@ class BellmanFordDetector:
         # Configurable production-safe minimum profit threshold (log-space).
         # Default approximates requiring ~0.1% profit.
         self.min_profit_threshold = BELLMAN_FORD_CONFIG.get('min_profit_threshold', -0.001)
- 
+
+        # 'multi_source' runs a single Bellman-Ford pass from a virtual super-source
+        # (O(V*E)); 'per_source' is the legacy mode that runs once per graph node (O(V^2*E)).
+        self.detection_mode = BELLMAN_FORD_CONFIG.get('detection_mode', 'multi_source')
+
+        # Relaxation kernel: 'python' (reference implementation) or 'numpy' (vectorized)
+        self.relaxation_backend = BELLMAN_FORD_CONFIG.get('relaxation_backend', 'python')
+
+        # Stop collecting candidate cycles once this many valid ones were found
+        self.max_cycles_to_process = BELLMAN_FORD_CONFIG.get('max_cycles_to_process', 50)
+
+        # Candidate search: 'bellman_ford' (predecessor walks) or 'bounded_dfs' (enumerate
+        # every profitable simple cycle up to max_cycle_length, top-N per start node)
+        self.cycle_search = BELLMAN_FORD_CONFIG.get('cycle_search', 'bellman_ford')
+        self.cycles_per_start = BELLMAN_FORD_CONFIG.get('cycles_per_start', 5)
+        self.max_enumerated_cycles = BELLMAN_FORD_CONFIG.get('max_enumerated_cycles', 200)
+
+        # Search each strongly connected component separately; with parallel_workers > 1
+        # components are spread over a process pool
+        self.partition_components = BELLMAN_FORD_CONFIG.get('partition_components', True)
+        self.parallel_workers = BELLMAN_FORD_CONFIG.get('parallel_workers', 0)
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+        # Re-check only what changed since the previous graph (multi_source mode only)
+        self.incremental_detection = BELLMAN_FORD_CONFIG.get('incremental_detection', False)
+        # Distances/predecessors of the last multi-source run, reused by incremental detection
+        self._last_run: Optional[Dict[str, Any]] = None
+
         # Debug: log effective configuration used by detector
-        logger.debug("Bellman-Ford detector config: max_cycle_length=%s, min_profit_threshold=%s, raw_config=%s",
-                     self.max_cycle_length, self.min_profit_threshold, BELLMAN_FORD_CONFIG)
+        logger.debug("Bellman-Ford detector config: max_cycle_length=%s, min_profit_threshold=%s, mode=%s, backend=%s, raw_config=%s",
+                     self.max_cycle_length, self.min_profit_threshold, self.detection_mode,
+                     self.relaxation_backend, BELLMAN_FORD_CONFIG)
 
     def detect_all_cycles(self, graph: nx.DiGraph) -> List[Dict[str, Any]]:
         """
@@ -44,49 +79,47 @@ class BellmanFordDetector:
         """
         try:
             logger.info(f" Running Bellman-Ford on graph with {graph.number_of_nodes()} nodes")
- 
-            # Sample light-weight diagnostic: show top 10 smallest-weight edges to help spot potentially profitable edges
-            try:
-                sample_edges = sorted(graph.edges(data=True), key=lambda e: e[2].get('weight', 0))[:10]
-                formatted = [
-                    {
-                        'edge': f"{u}->{v}",
-                        'weight': round(data.get('weight', 0), 8),
-                        'rate': data.get('rate'),
-                        'fee': data.get('fee')
-                    } for u, v, data in sample_edges
-                ]
-                logger.debug("Top-10 lightest edges (possible arbitrage contributors): %s", formatted)
-            except Exception:
-                logger.exception("Failed to sample graph edges for diagnostics")
-
-            cycles = []
-            processed_nodes = set()
 
-            # Try Bellman-Ford from multiple starting points
-            for start_node in graph.nodes():
-                if start_node in processed_nodes:
-                    continue
+            # Intern nodes and pack edges into arrays once; every pass below relaxes over them
+            compiled = CompiledGraph.from_graph(graph)
 
-                node_cycles = self.bellman_ford_from_node(graph, start_node)
- 
-                # Log raw candidate cycles returned from the algorithm before any filtering
+            # Sample light-weight diagnostic: the 10 smallest-weight edges help spot profitable edges
+            if trace.enabled or logger.isEnabledFor(logging.DEBUG):
                 try:
-                    logger.debug("Raw cycles detected from %s: %s", start_node, node_cycles)
+                    names = compiled.node_names
+                    formatted = [
+                        {
+                            'edge': f"{names[int(compiled.src[i])]}->{names[int(compiled.dst[i])]}",
+                            'weight': round(float(compiled.weight[i]), 8),
+                            'rate': compiled.edge_attrs[i].get('rate'),
+                            'fee': compiled.edge_attrs[i].get('fee')
+                        } for i in compiled.weight.argsort()[:10].tolist()
+                    ]
+                    if trace.enabled:
+                        trace.emit('lightest_edges', edges=formatted)
+                    logger.debug("Top-10 lightest edges (possible arbitrage contributors): %s", formatted)
                 except Exception:
-                    logger.exception("Failed to log raw node_cycles for %s", start_node)
- 
-                for cycle in node_cycles:
-                    if self.is_valid_cycle(cycle):
-                        cycles.append(cycle)
-                        # Mark nodes in this cycle as processed to avoid duplicates
-                        for node in cycle.get('path', []):
-                            processed_nodes.add(node)
+                    logger.exception("Failed to sample graph edges for diagnostics")
+
+            # Incremental detection keeps its state for the whole graph, so it is not partitioned
+            incremental = (self.incremental_detection and self.detection_mode == 'multi_source'
+                           and self.cycle_search != 'bounded_dfs')
+            if self.partition_components and not incremental:
+                # Negative cycles live inside a single SCC: search each non-trivial component alone
+                components = [compiled.subgraph(ids) for ids in compiled.strongly_connected_components()
+                              if len(ids) > 1]
+                logger.info(f" Searching {len(components)} strongly connected components "
+                            f"(largest: {max((c.number_of_nodes() for c in components), default=0)} nodes)")
+                cycles = self._find_cycles_in_components(components)
+            else:
+                cycles = self._find_cycles(compiled)
 
-                # Limit processing time
-                if len(cycles) >= 50:  # Max 50 cycles
-                    break
+            if self.cycle_search == 'bounded_dfs':
+                cycles.sort(key=lambda cycle: cycle['weight'])
+                logger.info(f" Found {len(cycles)} potential arbitrage cycles (bounded search)")
+                return cycles[:self.max_enumerated_cycles]
 
+            cycles = cycles[:self.max_cycles_to_process]
             logger.info(f" Found {len(cycles)} potential arbitrage cycles")
             return self.deduplicate_cycles(cycles)
 
@@ -94,54 +127,457 @@ class BellmanFordDetector:
             logger.exception(f" Error in cycle detection: {str(e)}")
             return []
 
+    def _find_cycles(self, compiled: CompiledGraph) -> List[Dict[str, Any]]:
+        """Valid candidate cycles of one (sub)graph with the configured search mode."""
+        if self.cycle_search == 'bounded_dfs':
+            return [cycle for cycle in self.enumerate_bounded_cycles(compiled) if self.is_valid_cycle(cycle)]
+
+        if self.detection_mode == 'multi_source':
+            if self.incremental_detection:
+                candidates = self.bellman_ford_incremental(compiled)
+            else:
+                candidates = self.bellman_ford_multi_source(compiled)
+
+            cycles = []
+            for cycle in candidates:
+                if self.is_valid_cycle(cycle):
+                    cycles.append(cycle)
+                    if len(cycles) >= self.max_cycles_to_process:
+                        break
+            return cycles
+
+        cycles = []
+        processed_nodes = set()
+
+        # Legacy mode: try Bellman-Ford from multiple starting points
+        for start_node in compiled.node_names:
+            if start_node in processed_nodes:
+                continue
+
+            node_cycles = self.bellman_ford_from_node(compiled, start_node)
+
+            # Raw candidate cycles returned from the algorithm before any filtering
+            if trace.enabled:
+                trace.emit('raw_node_cycles', source=start_node, cycles=node_cycles)
+
+            for cycle in node_cycles:
+                if self.is_valid_cycle(cycle):
+                    cycles.append(cycle)
+                    # Mark nodes in this cycle as processed to avoid duplicates
+                    for node in cycle.get('path', []):
+                        processed_nodes.add(node)
+
+            # Limit processing time
+            if len(cycles) >= self.max_cycles_to_process:
+                break
+
+        return cycles
+
+    def _find_cycles_in_components(self, components: List[CompiledGraph]) -> List[Dict[str, Any]]:
+        """Run _find_cycles per component, spread over a process pool when configured."""
+        if self.parallel_workers and self.parallel_workers > 1 and len(components) > 1:
+            try:
+                settings = self._worker_settings()
+                executor = self._get_executor()
+                results = list(executor.map(_find_component_cycles, [settings] * len(components), components))
+                return [cycle for component_cycles in results for cycle in component_cycles]
+            except Exception as e:
+                logger.warning(f"Parallel component search failed ({e}); searching components in-process")
+
+        cycles = []
+        for component in components:
+            cycles.extend(self._find_cycles(component))
+        return cycles
+
+    def _worker_settings(self) -> Dict[str, Any]:
+        """Detector settings shipped to pool workers (everything except model and run state)."""
+        return {
+            key: value for key, value in self.__dict__.items()
+            if key not in ('ai', '_last_run', '_executor')
+        }
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.parallel_workers)
+        return self._executor
+
+    def close(self):
+        """Shut down the component worker pool, if one was started."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def bellman_ford_multi_source(self, graph: nx.DiGraph) -> List[Dict[str, Any]]:
+        """
+        Single-pass Bellman-Ford from a virtual super-source.
+
+        The super-source has a zero-weight edge to every node, so all distances start
+        at 0 and one O(V*E) run reaches every negative cycle in the graph. Cycles are
+        extracted by walking predecessors from each node still relaxable after V-1 passes.
+        """
+        try:
+            compiled = CompiledGraph.from_graph(graph)
+            num_nodes = compiled.number_of_nodes()
+
+            distances, predecessors, relaxed_nodes = self.relax_edges(compiled, [0.0] * num_nodes)
+            self._remember_run(compiled, distances, predecessors, converged=not relaxed_nodes)
+
+            logger.debug("Multi-source Bellman-Ford (%s): %d nodes, %d edges, %d relaxed nodes",
+                         self.relaxation_backend, num_nodes, compiled.number_of_edges(), len(relaxed_nodes))
+
+            cycles = []
+            seen_cycles = set()
+            for cycle_node in relaxed_nodes:
+                cycle = self._extract_cycle_ids(compiled, predecessors, cycle_node)
+                if not cycle:
+                    continue
+                key = self._cycle_key(cycle['path'])
+                if key in seen_cycles:
+                    continue
+                seen_cycles.add(key)
+                cycles.append(cycle)
+
+            return cycles
+
+        except Exception as e:
+            logger.exception(f" Error in multi-source Bellman-Ford: {str(e)}")
+            return []
+
+    def enumerate_bounded_cycles(self, graph: nx.DiGraph) -> List[Dict[str, Any]]:
+        """
+        Enumerate profitable simple cycles of up to max_cycle_length hops.
+
+        Unlike predecessor walks (one cycle per relaxed node), this returns the
+        cycles_per_start most profitable cycles for every start node, most profitable
+        first, in the same dict schema as the Bellman-Ford path.
+        """
+        try:
+            compiled = CompiledGraph.from_graph(graph)
+            enumerator = BoundedCycleEnumerator(
+                max_length=self.max_cycle_length,
+                weight_threshold=self.min_profit_threshold,
+                top_n_per_start=self.cycles_per_start,
+            )
+            names = compiled.node_names
+            cycles = []
+            for _, id_path in enumerator.enumerate(compiled):
+                cycle = self._build_cycle(compiled, [names[i] for i in id_path])
+                if cycle:
+                    cycles.append(cycle)
+            return cycles
+
+        except Exception as e:
+            logger.exception(f" Error in bounded cycle enumeration: {str(e)}")
+            return []
+
+    def _remember_run(self, compiled: CompiledGraph, distances: List[float],
+                      predecessors: List[int], converged: bool):
+        """Keep the state of a multi-source run for the next incremental detection."""
+        self._last_run = {
+            'names': compiled.node_names,
+            'src': compiled.src,
+            'dst': compiled.dst,
+            'weight': compiled.weight,
+            'dist': distances,
+            'pred': predecessors,
+            'converged': converged,
+        }
+
+    def bellman_ford_incremental(self, graph: nx.DiGraph) -> List[Dict[str, Any]]:
+        """
+        Multi-source detection that re-relaxes only from edges changed since the last run.
+
+        Valid when the previous run converged (no negative cycle), so its distances are a
+        feasible potential. Weight decreases and new edges/nodes can only break feasibility
+        at their heads, so an SPFA queue seeded from them re-checks exactly the reachable
+        region. Increases on non-tree edges keep the potential feasible and need no work.
+        Anything else (previous run had cycles, a shortest-path tree edge got heavier or
+        disappeared, nodes were removed, or the re-relaxation finds a negative cycle) falls
+        back to a full multi-source run, so results always match bellman_ford_multi_source.
+        """
+        try:
+            compiled = CompiledGraph.from_graph(graph)
+            plan = self._plan_incremental_run(compiled)
+            if plan is None:
+                return self.bellman_ford_multi_source(compiled)
+
+            distances, predecessors, seed_edges, seed_nodes = plan
+            if not self._relax_from_seeds(compiled, distances, predecessors, seed_edges, seed_nodes):
+                logger.debug("Incremental re-relaxation hit a negative cycle; running full detection")
+                return self.bellman_ford_multi_source(compiled)
+
+            self._remember_run(compiled, distances, predecessors, converged=True)
+            logger.debug("Incremental Bellman-Ford: %d seed edges, %d new nodes, no negative cycle",
+                         len(seed_edges), len(seed_nodes))
+            return []
+
+        except Exception as e:
+            logger.exception(f" Error in incremental Bellman-Ford: {str(e)}")
+            return self.bellman_ford_multi_source(graph)
+
+    def _plan_incremental_run(self, compiled: CompiledGraph):
+        """
+        Map the previous run onto ``compiled`` and collect what must be re-relaxed.
+
+        Returns (distances, predecessors, seed_edges, seed_nodes) or None when a full
+        run is required.
+        """
+        last = self._last_run
+        if last is None or not last['converged']:
+            return None
+
+        src, dst, weight = compiled.src, compiled.dst, compiled.weight
+        same_topology = (last['names'] == compiled.node_names
+                         and np.array_equal(last['src'], src) and np.array_equal(last['dst'], dst))
+
+        if same_topology:
+            # Fast path: edge positions line up, so the diff is a vector comparison
+            predecessors = list(last['pred'])
+            delta = weight - last['weight']
+            increased = np.flatnonzero(delta > 0)
+            pred_arr = np.asarray(predecessors, dtype=np.int64)
+            if increased.size and np.any(pred_arr[dst[increased]] == src[increased]):
+                return None
+            return list(last['dist']), predecessors, np.flatnonzero(delta < 0).tolist(), []
+
+        # General path: match nodes and edges by name
+        index = compiled.node_index
+        old_names = last['names']
+        if any(name not in index for name in old_names):
+            return None
+
+        old_pred = last['pred']
+        old_tree = {(old_names[p], old_names[v]) for v, p in enumerate(old_pred) if p != -1}
+        old_weights = {
+            (old_names[u], old_names[v]): w
+            for u, v, w in zip(last['src'].tolist(), last['dst'].tolist(), last['weight'].tolist())
+        }
+
+        names = compiled.node_names
+        old_dist = dict(zip(old_names, last['dist']))
+        distances = [old_dist.get(name, 0.0) for name in names]
+        predecessors = [-1] * len(names)
+        for v_name, p in zip(old_names, old_pred):
+            if p != -1:
+                predecessors[index[v_name]] = index[old_names[p]]
+
+        seed_edges = []
+        current = set()
+        for i, (u, v, w) in enumerate(zip(src.tolist(), dst.tolist(), weight.tolist())):
+            key = (names[u], names[v])
+            current.add(key)
+            previous = old_weights.get(key)
+            if previous is None or w < previous:
+                seed_edges.append(i)
+            elif w > previous and key in old_tree:
+                return None
+
+        # A removed tree edge leaves its head with an unsupported distance
+        if any(key not in current for key in old_tree):
+            return None
+
+        seed_nodes = [index[name] for name in names if name not in old_dist]
+        return distances, predecessors, seed_edges, seed_nodes
+
+    def _relax_from_seeds(self, compiled: CompiledGraph, distances: List[float], predecessors: List[int],
+                          seed_edges: List[int], seed_nodes: List[int]) -> bool:
+        """
+        SPFA re-relaxation starting from changed edges and new nodes (updates lists in place).
+
+        Returns False if a negative cycle appears: the predecessor graph is checked for a
+        cycle every V relaxations, and any such cycle is negative.
+        """
+        num_nodes = compiled.number_of_nodes()
+        src = compiled.src.tolist()
+        dst = compiled.dst.tolist()
+        weight = compiled.weight.tolist()
+        indptr = compiled.indptr.tolist()
+
+        queue = deque(seed_nodes)
+        in_queue = [False] * num_nodes
+        for node in seed_nodes:
+            in_queue[node] = True
+
+        for i in seed_edges:
+            u, v = src[i], dst[i]
+            candidate = distances[u] + weight[i]
+            if candidate < distances[v]:
+                distances[v] = candidate
+                predecessors[v] = u
+                if not in_queue[v]:
+                    in_queue[v] = True
+                    queue.append(v)
+
+        # Bellman-Ford never needs more than V*E relaxations without a negative cycle
+        max_relaxations = num_nodes * max(1, len(weight))
+        relaxations = 0
+        while queue:
+            u = queue.popleft()
+            in_queue[u] = False
+            dist_u = distances[u]
+            for i in range(indptr[u], indptr[u + 1]):
+                v = dst[i]
+                candidate = dist_u + weight[i]
+                if candidate < distances[v]:
+                    distances[v] = candidate
+                    predecessors[v] = u
+                    relaxations += 1
+                    if relaxations % num_nodes == 0 and (relaxations > max_relaxations
+                                                         or self._has_predecessor_cycle(predecessors)):
+                        return False
+                    if not in_queue[v]:
+                        in_queue[v] = True
+                        queue.append(v)
+
+        return not self._has_predecessor_cycle(predecessors)
+
+    @staticmethod
+    def _has_predecessor_cycle(predecessors: List[int]) -> bool:
+        """True if following predecessor links from some node loops (O(V))."""
+        state = [0] * len(predecessors)  # 0 = unvisited, 1 = on current walk, 2 = done
+        for start in range(len(predecessors)):
+            node = start
+            walk = []
+            while node != -1 and state[node] == 0:
+                state[node] = 1
+                walk.append(node)
+                node = predecessors[node]
+            if node != -1 and state[node] == 1:
+                return True
+            for visited in walk:
+                state[visited] = 2
+        return False
+
+    def relax_edges(self, compiled: CompiledGraph,
+                    distances: List[float]) -> Tuple[List[float], List[int], List[int]]:
+        """
+        Run V-1 Bellman-Ford passes plus one detection pass with the configured backend.
+
+        Returns (distances, predecessors, relaxed_nodes) where predecessors uses -1 for
+        "none" and relaxed_nodes lists the heads of edges still relaxable after V-1 passes.
+        """
+        if self.relaxation_backend == 'numpy':
+            return self._relax_edges_numpy(compiled, distances)
+        return self._relax_edges_python(compiled, distances)
+
+    def _relax_edges_python(self, compiled: CompiledGraph,
+                            distances: List[float]) -> Tuple[List[float], List[int], List[int]]:
+        """
+        Reference kernel: pure-Python relaxation over interned edge lists.
+
+        Each pass relaxes against the previous pass's distances (Jacobi order) and ties
+        go to the last edge, so the NumPy kernel reproduces its distances, predecessors
+        and relaxed nodes exactly.
+        """
+        num_nodes = compiled.number_of_nodes()
+        distances = list(distances)
+        predecessors = [-1] * num_nodes
+
+        # Plain Python lists iterate much faster than NumPy scalars in a Python loop
+        edges = list(zip(compiled.src.tolist(), compiled.dst.tolist(), compiled.weight.tolist()))
+
+        for _ in range(num_nodes - 1):
+            updated = list(distances)
+            changed = False
+            for u, v, weight in edges:
+                candidate = distances[u] + weight
+                if candidate < distances[v] and candidate <= updated[v]:
+                    updated[v] = candidate
+                    predecessors[v] = u
+                    changed = True
+            if not changed:
+                break
+            distances = updated
+
+        # Nodes still relaxable after V-1 passes are on, or reachable from, a negative cycle
+        relaxed_nodes = []
+        for u, v, weight in edges:
+            if distances[u] + weight < distances[v]:
+                predecessors[v] = u
+                relaxed_nodes.append(v)
+
+        return distances, predecessors, relaxed_nodes
+
+    def _relax_edges_numpy(self, compiled: CompiledGraph,
+                           distances: List[float]) -> Tuple[List[float], List[int], List[int]]:
+        """
+        Vectorized kernel: relaxes every edge at once per pass (Jacobi order).
+
+        Edges are grouped by destination once, so each pass is a gather, an add and a
+        min-reduce per destination. Stops early when a pass changes nothing.
+        """
+        num_nodes = compiled.number_of_nodes()
+        dist = np.array(distances, dtype=np.float64)
+        pred = np.full(num_nodes, -1, dtype=np.int64)
+
+        if compiled.number_of_edges() == 0:
+            return dist.tolist(), pred.tolist(), []
+
+        order = np.argsort(compiled.dst, kind='stable')
+        src = compiled.src[order]
+        dst = compiled.dst[order]
+        weight = compiled.weight[order]
+        group_starts = np.flatnonzero(np.r_[True, dst[1:] != dst[:-1]])
+        heads = dst[group_starts]
+
+        for _ in range(num_nodes - 1):
+            candidate = dist[src] + weight
+            best_in = np.minimum.reduceat(candidate, group_starts)
+            improved_heads = best_in < dist[heads]
+            if not improved_heads.any():
+                break
+
+            new_dist = dist.copy()
+            new_dist[heads[improved_heads]] = best_in[improved_heads]
+
+            # Attribute each improved node to an edge that achieves its new distance
+            improved = np.zeros(num_nodes, dtype=bool)
+            improved[heads[improved_heads]] = True
+            winners = improved[dst] & (candidate == new_dist[dst])
+            pred[dst[winners]] = src[winners]
+            dist = new_dist
+
+        candidate = dist[src] + weight
+        relaxable = np.flatnonzero(candidate < dist[dst])
+        pred[dst[relaxable]] = src[relaxable]
+        # Report relaxed heads in the compiled edge order, as the reference kernel does
+        relaxed_nodes = compiled.dst[np.sort(order[relaxable])]
+
+        return dist.tolist(), pred.tolist(), relaxed_nodes.tolist()
+
+    @staticmethod
+    def _cycle_key(path: List[str]) -> Tuple[str, ...]:
+        """Rotation-independent key for a closed cycle path ([a, b, c, a])."""
+        nodes = list(path[:-1]) if len(path) > 1 and path[0] == path[-1] else list(path)
+        if not nodes:
+            return tuple()
+        start = nodes.index(min(nodes))
+        return tuple(nodes[start:] + nodes[:start])
+
     def bellman_ford_from_node(self, graph: nx.DiGraph, source: str) -> List[Dict[str, Any]]:
         """
         Modified Bellman-Ford to find negative cycles from a specific source
         """
         try:
+            compiled = CompiledGraph.from_graph(graph)
+            num_nodes = compiled.number_of_nodes()
+            source_id = compiled.node_index[source]
+
             # Initialize distances
-            distances = {node: float('inf') for node in graph.nodes()}
-            distances[source] = 0
-            predecessors = {node: None for node in graph.nodes()}
-
-            # Relax edges repeatedly
-            num_nodes = graph.number_of_nodes()
-
-            # Standard Bellman-Ford relaxation
-            # Debugging: Log initial distances and predecessors
-            logger.debug(f" Debug: Initial distances: {distances}")
-            logger.debug(f" Debug: Initial predecessors: {predecessors}")
-
-            # Debugging: Log each relaxation step
-            for _ in range(num_nodes - 1):
-                updated = False
-                for u, v, data in graph.edges(data=True):
-                    weight = data.get('weight', 0)
-                    logger.debug(f" Debug: Relaxing edge {u}->{v} with weight {weight}")
-                    if distances[u] != float('inf') and distances[u] + weight < distances[v]:
-                        distances[v] = distances[u] + weight
-                        predecessors[v] = u
-                        updated = True
-                        logger.debug(f" Debug: Updated distance for {v}: {distances[v]}")
-                        logger.debug(f" Debug: Updated predecessor for {v}: {predecessors[v]}")
-
-                if not updated:
-                    logger.debug(" Debug: No updates in this iteration, breaking early.")
-                    break
-
-            # Debugging: Log negative cycle detection
-            negative_cycle_nodes = set()
-            for u, v, data in graph.edges(data=True):
-                weight = data.get('weight', 0)
-                if distances[u] != float('inf') and distances[u] + weight < distances[v]:
-                    negative_cycle_nodes.add(v)
+            distances = [float('inf')] * num_nodes
+            distances[source_id] = 0.0
+
+            _, predecessors, relaxed_nodes = self.relax_edges(compiled, distances)
+            negative_cycle_nodes = set(relaxed_nodes)
  
-            logger.debug(f" Debug: Negative cycle nodes: {negative_cycle_nodes}")
+            if trace.enabled:
+                trace.emit('negative_cycle_nodes', source=source,
+                           nodes=[compiled.node_names[i] for i in negative_cycle_nodes])
 
             # Extract cycles from negative cycle nodes
             cycles = []
             for cycle_node in negative_cycle_nodes:
-                cycle = self.extract_cycle(graph, predecessors, cycle_node)
+                cycle = self._extract_cycle_ids(compiled, predecessors, cycle_node)
                 if cycle:
                     cycles.append(cycle)
 
@@ -151,6 +587,28 @@ class BellmanFordDetector:
             logger.exception(f" Error in Bellman-Ford from {source}: {str(e)}")
             return []
 
+    def _extract_cycle_ids(self, compiled: CompiledGraph, predecessors: List[int],
+                           cycle_node: int) -> Optional[Dict[str, Any]]:
+        """
+        Extract a cycle from an int-indexed predecessor list (-1 = no predecessor)
+        """
+        visited = set()
+        current = cycle_node
+        path = []
+
+        while current not in visited and current != -1:
+            visited.add(current)
+            path.append(current)
+            current = predecessors[current]
+
+        if current == -1:
+            return None
+
+        traced_segment = path[path.index(current):]
+        names = compiled.node_names
+        cycle_nodes = [names[i] for i in reversed(traced_segment)]
+        return self._build_cycle(compiled, cycle_nodes + [cycle_nodes[0]])
+
     def extract_cycle(self, graph: nx.DiGraph, predecessors: Dict, cycle_node: str) -> Optional[Dict[str, Any]]:
         """
         Extract the actual cycle from predecessors
@@ -177,7 +635,17 @@ class BellmanFordDetector:
             traced_segment = path[cycle_start_idx:]
             cycle_nodes = list(reversed(traced_segment))
             cycle_path = cycle_nodes + [cycle_nodes[0]]
- 
+            return self._build_cycle(graph, cycle_path)
+
+        except Exception as e:
+            logger.exception(f" Error extracting cycle: {str(e)}")
+            return None
+
+    def _build_cycle(self, graph, cycle_path: List[str]) -> Optional[Dict[str, Any]]:
+        """
+        Build the cycle result dict for a closed path ([a, b, c, a])
+        """
+        try:
             if len(cycle_path) < 3:  # Need at least 3 nodes for meaningful arbitrage
                 return None
 
@@ -187,12 +655,11 @@ class BellmanFordDetector:
 
             for i in range(len(cycle_path) - 1):
                 u, v = cycle_path[i], cycle_path[i + 1]
-                if graph.has_edge(u, v):
-                    edge_info = graph[u][v]
-                    cycle_weight += edge_info.get('weight', 0)
-                    edge_data[f"{u}->{v}"] = edge_info
-                else:
+                edge_info = graph.get_edge_data(u, v)
+                if edge_info is None:
                     return None  # Invalid cycle
+                cycle_weight += edge_info.get('weight', 0)
+                edge_data[f"{u}->{v}"] = edge_info
 
             # Only return cycles that meet the minimum log-space profit threshold.
             # cycle_weight is negative for profitable cycles (-log(product_rates) < 0).
@@ -200,7 +667,7 @@ class BellmanFordDetector:
                 return None
 
             # Classify cycle type
-            cycle_type = self.classify_cycle_type(cycle_path)
+            cycle_type = self.classify_cycle_type(cycle_path, graph)
 
             # Convert log-space weight to actual profit percentage
             # Weight is negative log of the product of rates: W = -log(rate1 * rate2 * ... * rateN)
@@ -237,29 +704,33 @@ class BellmanFordDetector:
             }
 
         except Exception as e:
-            logger.exception(f" Error extracting cycle: {str(e)}")
+            logger.exception(f" Error building cycle: {str(e)}")
             return None
 
-    def classify_cycle_type(self, path: List[str]) -> str:
+    def classify_cycle_type(self, path: List[str], graph=None) -> str:
         """
         Classify the type of arbitrage cycle
+
+        Venue types come from the node table of a CompiledGraph or the index a graph
+        maintains, otherwise from the venue name.
         """
         try:
+            if isinstance(graph, CompiledGraph):
+                node_info = graph.node_info
+            else:
+                index = getattr(graph, 'graph_index', None)
+                node_info = index.node_info if isinstance(index, GraphIndex) else parse_node
+
             exchanges = set()
             exchange_types = set()
             tokens = set()
 
             for node in path:
-                if '@' in node:
-                    token, exchange = node.split('@', 1)
-                    tokens.add(token)
-                    exchanges.add(exchange)
-
-                    # Classify exchange type
-                    if any(dex in exchange.lower() for dex in ['uniswap', 'sushi', 'pancake']):
-                        exchange_types.add('dex')
-                    else:
-                        exchange_types.add('cex')
+                info = node_info(node)
+                if info is not None:
+                    tokens.add(info.token)
+                    exchanges.add(info.venue)
+                    exchange_types.add(info.exchange_type)
 
             # Determine cycle type
             if len(exchanges) == 1:
@@ -279,20 +750,18 @@ class BellmanFordDetector:
         """Extract unique exchanges from path"""
         exchanges = []
         for node in path:
-            if '@' in node:
-                exchange = node.split('@', 1)[1]
-                if exchange not in exchanges:
-                    exchanges.append(exchange)
+            info = parse_node(node)
+            if info is not None and info.venue not in exchanges:
+                exchanges.append(info.venue)
         return exchanges
 
     def get_tokens_from_path(self, path: List[str]) -> List[str]:
         """Extract unique tokens from path"""
         tokens = []
         for node in path:
-            if '@' in node:
-                token = node.split('@', 1)[0]
-                if token not in tokens:
-                    tokens.append(token)
+            info = parse_node(node)
+            if info is not None and info.token not in tokens:
+                tokens.append(info.token)
         return tokens
 
     def is_valid_cycle(self, cycle: Dict[str, Any]) -> bool:
@@ -357,7 +826,8 @@ class BellmanFordDetector:
             opportunities = []
 
             # Get all nodes for this token
-            token_nodes = [node for node in graph.nodes() if node.startswith(f"{token}@")]
+            index = graph_index(graph)
+            token_nodes = index.token_nodes(token)
 
             # Compare prices between all pairs
             for i, node1 in enumerate(token_nodes):
@@ -365,8 +835,8 @@ class BellmanFordDetector:
                     if i >= j:
                         continue
 
-                    exchange1 = node1.split('@')[1]
-                    exchange2 = node2.split('@')[1]
+                    exchange1 = index.info[node1].venue
+                    exchange2 = index.info[node2].venue
 
                     # Check if there are paths between these nodes
                     if graph.has_edge(node1, node2) and graph.has_edge(node2, node1):
@@ -466,3 +936,10 @@ class BellmanFordDetector:
             'wrap_unwrap': 60   # 1 minute for wrap/unwrap operation
         }
         return time_estimates.get(step_type, 30)  # Default 30 seconds
+
+
+def _find_component_cycles(settings: Dict[str, Any], component: CompiledGraph) -> List[Dict[str, Any]]:
+    """Process-pool entry point: search one component with the caller's detector settings."""
+    detector = BellmanFordDetector(ai_model=None)
+    detector.__dict__.update(settings)
+    return detector._find_cycles(component)
@@ -0,0 +1,60 @@
+import logging
+import time
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of issuing a request to a venue whose circuit breaker is open."""
+
+
+class CircuitBreaker:
+    """
+    Per-venue circuit breaker.
+
+    ``closed``: requests flow and consecutive failures are counted. After
+    ``failure_threshold`` failures in a row the breaker opens. ``open``: requests are
+    refused until ``reset_timeout`` seconds have passed, at which point ``probe_due``
+    reports that a single probe may be sent (``half_open``). While half open only the
+    probe gets through (``allow_request(probe=True)``). A successful probe closes the
+    breaker; a failed one re-opens it for another ``reset_timeout``.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.name = name
+        self.failure_threshold = max(1, int(failure_threshold))
+        self.reset_timeout = float(reset_timeout)
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+
+    def allow_request(self, probe: bool = False) -> bool:
+        if self.state == self.HALF_OPEN:
+            return probe
+        return self.state == self.CLOSED
+
+    def probe_due(self) -> bool:
+        return self.state == self.OPEN and time.monotonic() - self.opened_at >= self.reset_timeout
+
+    def start_probe(self):
+        self.state = self.HALF_OPEN
+
+    def record_success(self):
+        if self.state != self.CLOSED:
+            logger.info(f"Circuit for {self.name} closed after a successful request")
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = None
+
+    def record_failure(self):
+        self.failures += 1
+        if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+            if self.state != self.OPEN:
+                logger.warning(f"Circuit for {self.name} opened after {self.failures} consecutive failures")
+            self.state = self.OPEN
+            self.opened_at = time.monotonic()
@@ -0,0 +1,209 @@
+import logging
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from core.graph_index import NodeInfo, graph_index, parse_node
+
+logger = logging.getLogger(__name__)
+
+
+class CompiledGraph:
+    """
+    Array-backed (CSR) snapshot of an arbitrage graph for the detector hot loop.
+
+    Node names such as "BTC@binance" are interned to ints. Edge endpoints and weights
+    live in contiguous NumPy arrays sorted by source node, so the out-edges of node
+    ``i`` are ``range(indptr[i], indptr[i + 1])``. Edge attribute dicts are kept in a
+    side table (by reference, not copied) for cycle reconstruction, and each node's
+    NodeInfo (token, venue, venue type) is taken from the source graph's index when
+    compiling, so venues typed only by node attributes (curve, balancer, ...) keep their type.
+
+    The object also implements the read-only subset of the networkx API the detector
+    helpers rely on (nodes, edges, has_edge, get_edge_data, graph[u][v]).
+    """
+
+    def __init__(self, nodes: Sequence[str], src: np.ndarray, dst: np.ndarray,
+                 weight: np.ndarray, edge_attrs: Sequence[Dict[str, Any]],
+                 node_info: Optional[Sequence[Optional[NodeInfo]]] = None):
+        self.node_names: List[str] = list(nodes)
+        self.node_index: Dict[str, int] = {name: i for i, name in enumerate(self.node_names)}
+        # NodeInfo per node id; parsed from the names when the caller has no index
+        self.node_infos: List[Optional[NodeInfo]] = (
+            list(node_info) if node_info is not None else [parse_node(name) for name in self.node_names]
+        )
+
+        src = np.asarray(src, dtype=np.int64)
+        dst = np.asarray(dst, dtype=np.int64)
+        weight = np.asarray(weight, dtype=np.float64)
+
+        # Sort edges by source node to get a CSR layout (stable keeps insertion order per node)
+        order = np.argsort(src, kind='stable')
+        self.src = src[order]
+        self.dst = dst[order]
+        self.weight = weight[order]
+        self.edge_attrs: List[Dict[str, Any]] = [edge_attrs[i] for i in order.tolist()]
+
+        counts = np.bincount(self.src, minlength=len(self.node_names))
+        self.indptr = np.zeros(len(self.node_names) + 1, dtype=np.int64)
+        np.cumsum(counts, out=self.indptr[1:])
+
+        self._edge_lookup: Optional[Dict[Tuple[int, int], int]] = None
+
+    @classmethod
+    def from_graph(cls, graph) -> 'CompiledGraph':
+        """Compile any graph exposing networkx-style nodes() and edges(data=True)."""
+        if isinstance(graph, CompiledGraph):
+            return graph
+
+        nodes = list(graph.nodes())
+        index = {name: i for i, name in enumerate(nodes)}
+        info = graph_index(graph)
+
+        src, dst, weight, attrs = [], [], [], []
+        for u, v, data in graph.edges(data=True):
+            src.append(index[u])
+            dst.append(index[v])
+            weight.append(data.get('weight', 0))
+            attrs.append(data)
+
+        return cls(nodes, np.array(src, dtype=np.int64), np.array(dst, dtype=np.int64),
+                   np.array(weight, dtype=np.float64), attrs,
+                   [info.node_info(name) for name in nodes])
+
+    # ------------------------------------------------------------------
+    # Array access used by relaxation kernels
+    # ------------------------------------------------------------------
+    def out_edges(self, node_id: int) -> range:
+        """Edge positions of all out-edges of ``node_id``."""
+        return range(int(self.indptr[node_id]), int(self.indptr[node_id + 1]))
+
+    def edge_position(self, u_id: int, v_id: int) -> Optional[int]:
+        """Position of edge (u_id, v_id) in the edge arrays, or None."""
+        if self._edge_lookup is None:
+            self._edge_lookup = {
+                (s, d): i for i, (s, d) in enumerate(zip(self.src.tolist(), self.dst.tolist()))
+            }
+        return self._edge_lookup.get((u_id, v_id))
+
+    def strongly_connected_components(self) -> List[List[int]]:
+        """Strongly connected components as lists of node ids (iterative Tarjan, O(V+E))."""
+        num_nodes = len(self.node_names)
+        indptr = self.indptr.tolist()
+        dst = self.dst.tolist()
+
+        index = [-1] * num_nodes
+        low = [0] * num_nodes
+        on_stack = [False] * num_nodes
+        stack: List[int] = []
+        components: List[List[int]] = []
+        counter = 0
+
+        for root in range(num_nodes):
+            if index[root] != -1:
+                continue
+            index[root] = low[root] = counter
+            counter += 1
+            stack.append(root)
+            on_stack[root] = True
+            work = [(root, indptr[root])]
+
+            while work:
+                node, pos = work[-1]
+                end = indptr[node + 1]
+                while pos < end:
+                    nxt = dst[pos]
+                    pos += 1
+                    if index[nxt] == -1:
+                        # Descend; resume this node at ``pos`` afterwards
+                        work[-1] = (node, pos)
+                        index[nxt] = low[nxt] = counter
+                        counter += 1
+                        stack.append(nxt)
+                        on_stack[nxt] = True
+                        work.append((nxt, indptr[nxt]))
+                        break
+                    if on_stack[nxt] and index[nxt] < low[node]:
+                        low[node] = index[nxt]
+                else:
+                    work.pop()
+                    if work:
+                        parent = work[-1][0]
+                        if low[node] < low[parent]:
+                            low[parent] = low[node]
+                    if low[node] == index[node]:
+                        component = []
+                        while True:
+                            member = stack.pop()
+                            on_stack[member] = False
+                            component.append(member)
+                            if member == node:
+                                break
+                        components.append(component)
+
+        return components
+
+    def subgraph(self, node_ids: Sequence[int]) -> 'CompiledGraph':
+        """Induced subgraph on ``node_ids`` (edge attribute dicts are shared, not copied)."""
+        ids = np.array(sorted(node_ids), dtype=np.int64)
+        remap = np.full(len(self.node_names), -1, dtype=np.int64)
+        remap[ids] = np.arange(len(ids), dtype=np.int64)
+
+        positions = np.flatnonzero((remap[self.src] >= 0) & (remap[self.dst] >= 0))
+        return CompiledGraph(
+            [self.node_names[i] for i in ids.tolist()],
+            remap[self.src[positions]],
+            remap[self.dst[positions]],
+            self.weight[positions],
+            [self.edge_attrs[i] for i in positions.tolist()],
+            [self.node_infos[i] for i in ids.tolist()],
+        )
+
+    # ------------------------------------------------------------------
+    # Read-only networkx-compatible surface
+    # ------------------------------------------------------------------
+    def nodes(self) -> List[str]:
+        return list(self.node_names)
+
+    def number_of_nodes(self) -> int:
+        return len(self.node_names)
+
+    def number_of_edges(self) -> int:
+        return len(self.edge_attrs)
+
+    def has_node(self, node: str) -> bool:
+        return node in self.node_index
+
+    def node_info(self, node: str) -> Optional[NodeInfo]:
+        """NodeInfo recorded for ``node`` at compile time, falling back to parsing its name."""
+        node_id = self.node_index.get(node)
+        return self.node_infos[node_id] if node_id is not None else parse_node(node)
+
+    def edges(self, data: bool = False) -> Iterator:
+        names = self.node_names
+        pairs = zip(self.src.tolist(), self.dst.tolist())
+        if data:
+            return ((names[s], names[d], attrs) for (s, d), attrs in zip(pairs, self.edge_attrs))
+        return ((names[s], names[d]) for s, d in pairs)
+
+    def has_edge(self, u: str, v: str) -> bool:
+        return self.get_edge_data(u, v) is not None
+
+    def get_edge_data(self, u: str, v: str, default: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        u_id = self.node_index.get(u)
+        v_id = self.node_index.get(v)
+        if u_id is None or v_id is None:
+            return default
+        pos = self.edge_position(u_id, v_id)
+        return self.edge_attrs[pos] if pos is not None else default
+
+    def __getitem__(self, u: str) -> Dict[str, Dict[str, Any]]:
+        u_id = self.node_index[u]
+        names = self.node_names
+        return {names[int(self.dst[i])]: self.edge_attrs[i] for i in self.out_edges(u_id)}
+
+    def __contains__(self, node: str) -> bool:
+        return node in self.node_index
+
+    def __len__(self) -> int:
+        return len(self.node_names)
@@ -0,0 +1,138 @@
+import heapq
+import logging
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from core.compiled_graph import CompiledGraph
+
+logger = logging.getLogger(__name__)
+
+
+class BoundedCycleEnumerator:
+    """
+    Enumerate profitable simple cycles of at most ``max_length`` hops.
+
+    Bellman-Ford predecessor walks yield at most one cycle per relaxed node; this engine
+    instead searches every simple cycle up to the hop bound. Each cycle is found exactly
+    once, from its canonical start (its lowest node id), by a DFS restricted to higher ids.
+
+    Pruning uses a hop-count DP: ``back[k][v]`` is the lightest walk of at most ``k`` edges
+    from ``v`` back to the start. A partial path at ``v`` with ``h`` hops and weight ``w``
+    is abandoned when ``w + back[max_length - h][v]`` cannot beat the profit threshold
+    or the worst cycle currently kept for this start.
+    """
+
+    def __init__(self, max_length: int, weight_threshold: float, top_n_per_start: int = 5,
+                 max_expansions: Optional[int] = None):
+        self.max_length = max(2, int(max_length))
+        # Cycles must have total log-weight strictly below this (negative = profitable)
+        self.weight_threshold = weight_threshold
+        self.top_n_per_start = max(1, int(top_n_per_start))
+        # Optional safety cap on DFS steps per start node
+        self.max_expansions = max_expansions
+        self.expansions = 0
+
+    def enumerate(self, graph) -> List[Tuple[float, List[int]]]:
+        """
+        Return ``(weight, [n0, n1, ..., n0])`` for the top-N cycles of each start node,
+        lightest (most profitable) first. Node ids refer to ``CompiledGraph.node_names``.
+        """
+        compiled = CompiledGraph.from_graph(graph)
+        num_nodes = compiled.number_of_nodes()
+        self.expansions = 0
+        if num_nodes == 0 or compiled.number_of_edges() == 0:
+            return []
+
+        indptr = compiled.indptr.tolist()
+        dst_list = compiled.dst.tolist()
+        weight_list = compiled.weight.tolist()
+
+        results = []
+        for start in range(num_nodes):
+            if indptr[start] == indptr[start + 1]:
+                continue
+            back = self._backward_bounds(compiled, start)
+            if back[self.max_length][start] >= self.weight_threshold:
+                # Not even a closed walk through start is profitable
+                continue
+            kept = self._search_from(start, indptr, dst_list, weight_list, back)
+            results.extend(kept)
+
+        results.sort(key=lambda item: item[0])
+        logger.debug("Bounded cycle search: %d cycles, %d expansions (max_length=%d, top_n=%d)",
+                     len(results), self.expansions, self.max_length, self.top_n_per_start)
+        return results
+
+    def _backward_bounds(self, compiled: CompiledGraph, start: int) -> List[List[float]]:
+        """back[k][v]: min weight of a walk from v to ``start`` using 1..k edges over ids >= start."""
+        num_nodes = compiled.number_of_nodes()
+        src, dst, weight = compiled.src, compiled.dst, compiled.weight
+        usable = (src >= start) & (dst >= start)
+
+        # The CSR layout groups edges by source, so per-node minima are a reduceat
+        nonempty = np.flatnonzero(compiled.indptr[1:] > compiled.indptr[:-1])
+        group_starts = compiled.indptr[nonempty]
+
+        to_start = np.full(num_nodes, np.inf)
+        to_start[start] = 0.0
+        bounds = [np.full(num_nodes, np.inf)]
+        current = np.full(num_nodes, np.inf)
+        for _ in range(self.max_length):
+            candidate = np.where(usable, weight + to_start[dst], np.inf)
+            best = np.full(num_nodes, np.inf)
+            best[nonempty] = np.minimum.reduceat(candidate, group_starts)
+            current = np.minimum(current, best)
+            bounds.append(current.copy())
+            # Walks may pass through start again only as their final step
+            to_start = current.copy()
+            to_start[start] = 0.0
+        return [b.tolist() for b in bounds]
+
+    def _search_from(self, start: int, indptr: List[int], dst: List[int], weight: List[float],
+                     back: List[List[float]]) -> List[Tuple[float, List[int]]]:
+        """DFS over simple paths from ``start`` through higher ids, keeping the top-N cycles."""
+        heap: List[Tuple[float, int, List[int]]] = []  # (-weight, tiebreak, path) max-heap on weight
+        counter = 0
+        top_n = self.top_n_per_start
+        max_length = self.max_length
+        threshold = self.weight_threshold
+        path = [start]
+        on_path = {start}
+        budget = self.max_expansions
+
+        def cutoff() -> float:
+            if len(heap) < top_n:
+                return threshold
+            return min(threshold, -heap[0][0])
+
+        def visit(node: int, hops: int, total: float):
+            nonlocal counter
+            for i in range(indptr[node], indptr[node + 1]):
+                nxt = dst[i]
+                new_total = total + weight[i]
+                if nxt == start:
+                    if hops + 1 >= 2 and new_total < cutoff():
+                        counter += 1
+                        entry = (-new_total, counter, path + [start])
+                        if len(heap) < top_n:
+                            heapq.heappush(heap, entry)
+                        else:
+                            heapq.heapreplace(heap, entry)
+                    continue
+                if nxt < start or nxt in on_path or hops + 1 >= max_length:
+                    continue
+                # Best possible completion from nxt with the hops that remain
+                if new_total + back[max_length - hops - 1][nxt] >= cutoff():
+                    continue
+                self.expansions += 1
+                if budget is not None and self.expansions > budget:
+                    return
+                path.append(nxt)
+                on_path.add(nxt)
+                visit(nxt, hops + 1, new_total)
+                path.pop()
+                on_path.discard(nxt)
+
+        visit(start, 0, 0.0)
+        return sorted(((-neg_weight, cycle) for neg_weight, _, cycle in heap), key=lambda item: item[0])
@@ -1,50 +1,166 @@
 import asyncio
-import ccxt
-try:
-    from web3 import Web3  # web3 is optional for tests
-except Exception:
-    Web3 = None
-import requests
+import importlib
+import importlib.util
 import json
-from typing import Dict, List, Optional, Any
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Any, Tuple
 from datetime import datetime
 import time
 import logging
 import os
+import sys
+import threading
+from collections import deque
+from collections.abc import MutableMapping
 from utils import config as config
+from core.circuit_breaker import CircuitBreaker, CircuitOpenError
+from core.market_cache import MarketMetadataCache
+from core.quote_store import QuoteStore, SectionQuotes
+from core.rate_limiter import get_rate_limiter
+from core.rest_client import RestTickerClient
+from core.scan_timing import ScanTimings
+from core.trace import get_trace_buffer
+
+if TYPE_CHECKING:
+    from core.market_stream import MarketStream
 
 # Module logger
 logger = logging.getLogger(__name__)
+trace = get_trace_buffer()
+
+# ccxt (~0.6s) and web3 (~0.7s) dominate import time, so both are imported on first use:
+# ccxt when the first client is built, web3 in the background Web3 probe
+ccxt = None
+ccxt_async = None  # native asyncio clients over a shared aiohttp session
+Web3 = None
+
+
+def _ccxt_provides(name: str = None, async_support: bool = False) -> bool:
+    """
+    Whether ccxt (or ``ccxt.async_support``) offers ``name``, or exists at all when
+    ``name`` is None. An already imported module is asked directly; otherwise the
+    installed package is inspected on disk, so the check itself never imports ccxt.
+    """
+    module_name = 'ccxt.async_support' if async_support else 'ccxt'
+    loaded = sys.modules.get(module_name)
+    if loaded is not None:
+        return name is None or hasattr(loaded, name)
+    try:
+        spec = importlib.util.find_spec('ccxt')
+    except (ImportError, ValueError):
+        return False
+    if spec is None or not spec.submodule_search_locations:
+        return False
+    parts = (('async_support',) if async_support else ()) + ((f"{name}.py",) if name else ('__init__.py',))
+    return any(os.path.exists(os.path.join(location, *parts)) for location in spec.submodule_search_locations)
+
+
+def _import_ccxt(async_support: bool):
+    """Import ccxt or ccxt.async_support once; returns the module."""
+    global ccxt, ccxt_async
+    if async_support:
+        if ccxt_async is None:
+            ccxt_async = importlib.import_module('ccxt.async_support')
+        return ccxt_async
+    if ccxt is None:
+        ccxt = importlib.import_module('ccxt')
+    return ccxt
+
+
+def _web3_class():
+    """The Web3 class, imported on first use (None when web3 is not installed)."""
+    global Web3
+    if Web3 is None and importlib.util.find_spec('web3') is not None:
+        try:
+            from web3 import Web3 as web3_class
+        except Exception:
+            return None
+        Web3 = web3_class
+    return Web3
+
+class LazyClients(MutableMapping):
+    """
+    ``name -> exchange client`` mapping that builds each client on first access.
+
+    Listing names (``keys``, ``len``, ``in``) never constructs a client; reading a value
+    does, once, under a lock so a background thread and the event loop cannot race.
+    """
+
+    def __init__(self, factories: Dict[str, Callable[[], Any]]):
+        self._factories = dict(factories)
+        self._clients: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def __getitem__(self, name: str):
+        client = self._clients.get(name)
+        if client is not None:
+            return client
+        if name not in self._factories:
+            raise KeyError(name)
+        with self._lock:
+            client = self._clients.get(name)
+            if client is None:
+                client = self._clients[name] = self._factories[name]()
+        return client
+
+    def __setitem__(self, name: str, client):
+        self._clients[name] = client
+        self._factories.setdefault(name, None)
+
+    def __delitem__(self, name: str):
+        del self._factories[name]
+        self._clients.pop(name, None)
+
+    def __iter__(self):
+        return iter(list(self._factories))
+
+    def __len__(self) -> int:
+        return len(self._factories)
+
+    def __contains__(self, name) -> bool:
+        return name in self._factories
+
+    def created(self) -> Dict[str, Any]:
+        """Clients constructed so far."""
+        return dict(self._clients)
+
 
 class DataEngine:
     """
     Unified data fetching from CEX exchanges and DEX protocols
     """
 
-    def __init__(self):
+    def __init__(self, timings: Optional[ScanTimings] = None):
+        # Fetch spans ('fetch.cex', 'fetch.dex', 'fetch.venue.<name>') go to the scan's timings
+        self.timings = timings if timings is not None else ScanTimings(
+            config.SCAN_TIMING_CONFIG.get('window', 200))
+
         # CEX exchanges (ccxt clients)
         # Instantiate common CEX clients used for real-time fetches where available.
         # Some CI / test environments may not have all exchange classes available in ccxt;
         # create clients defensively and skip ones that are missing to keep tests deterministic.
-        self.cex_exchanges = {}
-        _preferred_clients = {
-            'binance': getattr(ccxt, 'binance', None),
-            'kraken': getattr(ccxt, 'kraken', None),
-            'coinbase': getattr(ccxt, 'coinbase', None),
-            'kucoin': getattr(ccxt, 'kucoin', None),
-            'bybit': getattr(ccxt, 'bybit', None),
-            'okx': getattr(ccxt, 'okx', None),
-            'bitfinex': getattr(ccxt, 'bitfinex', None),
-            'gateio': getattr(ccxt, 'gateio', None),
-        }
-        for name, ctor in _preferred_clients.items():
-            if ctor is None:
+        # With FETCH_CONFIG['async_ccxt'], native async clients (ccxt.async_support) keep one
+        # keep-alive aiohttp session each, so requests are awaited directly instead of going
+        # through threads; the owner must then close the engine to release the sessions.
+        self.async_clients = bool(config.FETCH_CONFIG.get('async_ccxt', False)
+                                  and _ccxt_provides(async_support=True))
+        factories = {}
+        for name in ('binance', 'kraken', 'coinbase', 'kucoin', 'bybit', 'okx', 'bitfinex', 'gateio'):
+            if not _ccxt_provides(name, async_support=self.async_clients):
                 logger.warning("CCXT client for %s not available in this environment; skipping ccxt client.", name)
                 continue
-            try:
-                self.cex_exchanges[name] = ctor({'enableRateLimit': True})
-            except Exception as e:
-                logger.warning("Failed to initialize ccxt client for %s: %s -- falling back to REST parsing.", name, e)
+            factories[name] = self._client_factory(name)
+
+        # Market metadata persisted across restarts (MARKET_CACHE_CONFIG); clients whose cached
+        # markets are applied when they are created skip load_markets on the first scan
+        self.market_cache = MarketMetadataCache() if config.MARKET_CACHE_CONFIG.get('enabled', True) else None
+        self._markets_fetched_at: Dict[str, float] = {}
+        self._market_refresh_tasks: Dict[str, asyncio.Task] = {}
+
+        # With STARTUP_CONFIG['lazy_ccxt_clients'] each client is only built when first used
+        self.cex_exchanges = LazyClients(factories)
+        if not config.STARTUP_CONFIG.get('lazy_ccxt_clients', True):
+            for name in list(self.cex_exchanges):
+                self.cex_exchanges.get(name)
 
         # REST endpoints configured in utils.config.EXCHANGE_ENDPOINTS (defined in utils/config.py)
         # Keep a mapping of base URLs for REST fallback and verification tools
@@ -128,62 +244,461 @@ class DataEngine:
             }
         }
 
-        # Web3 setup (using public RPC for demo) - optional for tests
-        if Web3 is not None:
-            try:
-                self.w3 = Web3(Web3.HTTPProvider('https://eth-mainnet.public.blastapi.io'))
-                self.web3_connected = self.w3.is_connected()
-            except Exception:
-                self.w3 = None
-                self.web3_connected = False
-                logger.warning("Web3 connection failed - DEX data will be simulated")
-        else:
-            self.w3 = None
-            self.web3_connected = False
+        # Web3 setup (using public RPC for demo) - optional for tests. The connectivity probe
+        # can hang until its timeout on an offline machine, so by default it runs in a
+        # background thread and DEX data stays simulated until it reports a connection
+        self.w3 = None
+        self.web3_connected = False
+        web3_installed = Web3 is not None or importlib.util.find_spec('web3') is not None
+        self.web3_state = 'probing' if web3_installed else 'unavailable'
+        if not web3_installed:
             logger.warning("Web3 not installed - DEX data will be simulated (tests)")
+        elif config.STARTUP_CONFIG.get('background_web3_probe', True):
+            threading.Thread(target=self._probe_web3, name='web3-probe', daemon=True).start()
+        else:
+            self._probe_web3()
 
         self.last_fetch_time = None
         self.cached_data = {}
+        # Last good quote per (section, venue, pair) with its receive time, reused while
+        # younger than the caller's max_age (see fetch_all_market_data)
+        self._quote_cache: Dict[Tuple[str, str, str], Tuple[float, Dict]] = {}
+        # Per-venue token buckets shared with every other network caller in the process
+        self.rate_limiter = get_rate_limiter()
+        # Pooled async REST client used when a ccxt request fails
+        self.rest_client = RestTickerClient()
+        # Per-venue circuit breakers and recent successful call latencies (used to pick hedge delays)
+        self.breakers: Dict[str, CircuitBreaker] = {}
+        self._latencies: Dict[str, deque] = {}
+        self._probe_tasks: Dict[str, asyncio.Task] = {}
+        # Live WebSocket top-of-book store (see start_streaming)
+        self.market_stream: Optional['MarketStream'] = None
+
+    async def start_streaming(self, trading_pairs: List[str], venues: Optional[List[str]] = None,
+                              urls: Optional[Dict[str, str]] = None) -> 'MarketStream':
+        """
+        Start (or widen) WebSocket ingestion for the given pairs.
+
+        While the stream runs, fetch_all_market_data reads quotes from the live store;
+        every (venue, pair) without a fresh quote from a connected socket is still polled over REST.
+        """
+        stream = self.market_stream
+        if stream is not None and stream.is_running:
+            if set(trading_pairs) <= set(stream.trading_pairs) and (venues is None or set(venues) <= set(stream.venues)):
+                return stream
+            trading_pairs = list(dict.fromkeys(list(stream.trading_pairs) + list(trading_pairs)))
+            venues = list(dict.fromkeys(list(stream.venues) + list(venues or [])))
+            await self.stop_streaming()
+
+        from core.market_stream import MarketStream
+        self.market_stream = MarketStream(trading_pairs, venues=venues, urls=urls)
+        await self.market_stream.start()
+        return self.market_stream
+
+    async def stop_streaming(self):
+        """Stop WebSocket ingestion; subsequent fetches poll REST again."""
+        if self.market_stream is not None:
+            await self.market_stream.stop()
+            self.market_stream = None
+
+    def _streamed_market_data(self, trading_pairs: List[str]) -> Dict[str, Dict[str, Dict]]:
+        """
+        Normalized CEX/DEX entries from the live stream: ``{section: {venue: {pair: quote}}}``.
+
+        Only venues whose socket is connected count, and only quotes younger than
+        STREAMING_CONFIG['max_quote_age'] seconds; everything else is left to REST polling.
+        """
+        sections = {'cex': {}, 'dex': {}}
+        if self.market_stream is None:
+            return sections
+        max_age = config.STREAMING_CONFIG.get('max_quote_age')
+        now = time.time()
+        for section, venues in self.market_stream.snapshot().items():
+            for venue, book in venues.items():
+                if not self.market_stream.connected.get(venue):
+                    continue
+                venue_data = {}
+                for pair in trading_pairs:
+                    quote = book.get(pair)
+                    if quote is None:
+                        continue
+                    age = max(0.0, now - quote['received_at']) if quote.get('received_at') else None
+                    if max_age and age is not None and age > max_age:
+                        continue
+                    normalized = self._normalize_price_dict(quote)
+                    if not normalized:
+                        continue
+                    normalized['pair'] = pair
+                    normalized['source'] = quote.get('source', f"{section}:{venue}")
+                    if age is not None:
+                        normalized['age'] = age
+                    venue_data[pair] = normalized
+                if venue_data:
+                    sections[section][venue] = venue_data
+        return sections
+
+    def _client_factory(self, name: str) -> Callable[[], Any]:
+        def create():
+            ctor = getattr(_import_ccxt(self.async_clients), name)
+            client = ctor({'enableRateLimit': True})
+            self._apply_cached_markets(name, client)
+            return client
+        return create
+
+    def _apply_cached_markets(self, name: str, exchange):
+        """Populate a new ccxt client from the on-disk market cache."""
+        if self.market_cache is None:
+            return
+        if not hasattr(exchange, 'set_markets') or getattr(exchange, 'markets', None):
+            return
+        entry = self.market_cache.load(name)
+        if entry is None:
+            return
+        try:
+            exchange.set_markets(entry['markets'], entry['currencies'] or None)
+        except Exception as e:
+            logger.warning(f"Cached markets for {name} could not be applied: {e} - will load from the exchange")
+            return
+        self._markets_fetched_at[name] = entry['fetched_at']
+        logger.debug("Applied %d cached markets to %s", len(entry['markets']), name)
+
+    def _probe_web3(self):
+        """Connect to the public RPC and record whether it answered (runs off the event loop)."""
+        timeout = config.STARTUP_CONFIG.get('web3_timeout', 5.0)
+        try:
+            web3_class = _web3_class()
+            w3 = web3_class(web3_class.HTTPProvider('https://eth-mainnet.public.blastapi.io',
+                                        request_kwargs={'timeout': timeout}))
+            connected = bool(w3.is_connected())
+        except Exception:
+            w3, connected = None, False
+        self.w3 = w3 if connected else None
+        self.web3_connected = connected
+        self.web3_state = 'connected' if connected else 'unavailable'
+        if not connected:
+            logger.warning("Web3 connection failed - DEX data will be simulated")
+
+    def _remember_markets(self, exchange_name: str, exchange):
+        """Record when an exchange's markets were loaded and persist them to the cache."""
+        markets = getattr(exchange, 'markets', None)
+        if not isinstance(markets, dict) or not markets:
+            return
+        fetched_at = time.time()
+        self._markets_fetched_at[exchange_name] = fetched_at
+        if self.market_cache is not None:
+            self.market_cache.store(exchange_name, markets, getattr(exchange, 'currencies', None), fetched_at)
+
+    async def _ensure_markets(self, exchange_name: str, exchange):
+        """
+        Make sure an exchange has its symbols loaded.
+
+        A cold client awaits load_markets; a client populated from the cache is used as is,
+        and if its markets are older than the cache TTL they are reloaded in the background.
+        """
+        if getattr(exchange, 'symbols', None):
+            fetched_at = self._markets_fetched_at.get(exchange_name)
+            if fetched_at is not None and self.market_cache is not None and self.market_cache.is_stale(fetched_at):
+                self._schedule_market_refresh(exchange_name, exchange)
+            return
+        try:
+            logger.debug("Loading markets for %s...", exchange_name)
+            await self._call_exchange(exchange_name, exchange, 'load_markets')
+            if trace.enabled:
+                trace.emit('markets_loaded', venue=exchange_name, symbols=len(exchange.symbols or ()))
+        except Exception as load_err:
+            logger.warning(f"Failed to load markets for {exchange_name}: {load_err} - will use fallbacks")
+            return
+        self._remember_markets(exchange_name, exchange)
+
+    def _schedule_market_refresh(self, exchange_name: str, exchange):
+        task = self._market_refresh_tasks.get(exchange_name)
+        if task is not None and not task.done():
+            return
+        self._market_refresh_tasks[exchange_name] = asyncio.create_task(self._refresh_markets(exchange_name, exchange))
+
+    async def _refresh_markets(self, exchange_name: str, exchange):
+        try:
+            await self._call_exchange(exchange_name, exchange, 'load_markets', True)
+        except Exception as e:
+            logger.warning(f"Background market refresh for {exchange_name} failed: {e} - keeping cached markets")
+            return
+        self._remember_markets(exchange_name, exchange)
+        logger.info(f"Refreshed markets for {exchange_name} ({len(exchange.markets)} markets)")
+
+    async def __aenter__(self) -> 'DataEngine':
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def close(self):
+        """Stop streaming and release every exchange client's HTTP session."""
+        await self.stop_streaming()
+        background = [task for task in (*self._market_refresh_tasks.values(), *self._probe_tasks.values())
+                      if not task.done()]
+        for task in background:
+            task.cancel()
+        await asyncio.gather(*background, return_exceptions=True)
+        self._market_refresh_tasks.clear()
+        self._probe_tasks.clear()
+        closers = []
+        # Only clients that were actually created hold a session
+        created = self.cex_exchanges.created() if isinstance(self.cex_exchanges, LazyClients) else self.cex_exchanges
+        for exchange in created.values():
+            close = getattr(exchange, 'close', None)
+            if close is not None and asyncio.iscoroutinefunction(close):
+                closers.append(close())
+        closers.append(self.rest_client.close())
+        results = await asyncio.gather(*closers, return_exceptions=True)
+        for result in results:
+            if isinstance(result, Exception):
+                logger.warning(f"Closing exchange client failed: {result}")
+
+    # Idempotent reads that may be duplicated by a hedged request
+    _HEDGEABLE_METHODS = ('fetch_ticker', 'fetch_tickers')
+
+    async def _call_exchange(self, exchange_name: str, exchange, method_name: str, *args,
+                             probe: bool = False, **kwargs):
+        """
+        Call a client method through the venue's circuit breaker, with a deadline.
+
+        Open breakers refuse the call with CircuitOpenError; half-open ones admit only the
+        ``probe`` call. The call first waits for a token from the venue's rate limiter, then
+        an async client's method is awaited directly, a synchronous client's method runs in
+        a thread. Calls are abandoned after FETCH_CONFIG request_timeout (markets_timeout
+        for load_markets), counted from when the token is granted, and slow venues' ticker
+        reads may be hedged (see _hedge_delay). Failures and timeouts count against the
+        breaker; waiting on the local rate limiter does not.
+        """
+        breaker = self.breaker(exchange_name)
+        if not breaker.allow_request(probe):
+            raise CircuitOpenError(f"circuit open for {exchange_name}")
+        timeout_key = 'markets_timeout' if method_name == 'load_markets' else 'request_timeout'
+        timeout = config.FETCH_CONFIG.get(timeout_key)
+        hedge_delay = self._hedge_delay(exchange_name) if method_name in self._HEDGEABLE_METHODS else None
+
+        await self.rate_limiter.acquire(exchange_name)
+        # The circuit may have opened while this call queued behind the limiter
+        if not breaker.allow_request(probe):
+            raise CircuitOpenError(f"circuit open for {exchange_name}")
+
+        async def attempt():
+            method = getattr(exchange, method_name)
+            if asyncio.iscoroutinefunction(method):
+                return await method(*args, **kwargs)
+            return await asyncio.to_thread(method, *args, **kwargs)
+
+        started = time.monotonic()
+        try:
+            if hedge_delay is None:
+                result = await asyncio.wait_for(attempt(), timeout)
+            else:
+                result = await self._hedged(exchange_name, attempt, hedge_delay, timeout)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            breaker.record_failure()
+            raise
+        breaker.record_success()
+        self._latencies.setdefault(exchange_name, deque(maxlen=128)).append(time.monotonic() - started)
+        return result
+
+    async def _hedged(self, exchange_name: str, attempt, hedge_delay: float, timeout: Optional[float]):
+        """Run ``attempt``, starting a duplicate after ``hedge_delay`` seconds; the first success wins."""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout if timeout else None
+        tasks = {asyncio.ensure_future(attempt())}
+        hedged = False
+        error: Optional[BaseException] = None
+        try:
+            while tasks:
+                wait = None if deadline is None else max(0.0, deadline - loop.time())
+                if not hedged:
+                    wait = hedge_delay if wait is None else min(wait, hedge_delay)
+                done, tasks = await asyncio.wait(tasks, timeout=wait, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    error = task.exception()
+                if deadline is not None and loop.time() >= deadline:
+                    break
+                if not hedged and not done:
+                    hedged = True
+                    # A hedge is optional: send it only if the venue has a token to spare right now
+                    if self.rate_limiter.try_acquire(exchange_name):
+                        logger.debug("Hedging request to %s after %.3fs", exchange_name, hedge_delay)
+                        tasks.add(asyncio.ensure_future(attempt()))
+                    else:
+                        logger.debug("Not hedging request to %s: rate limit has no spare token", exchange_name)
+            if error is not None and not tasks:
+                raise error
+            raise asyncio.TimeoutError(f"{exchange_name} did not answer within {timeout}s")
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    def _hedge_delay(self, exchange_name: str) -> Optional[float]:
+        """
+        How long to wait before hedging a ticker read on this venue, or None for no hedge.
+
+        Only venues whose recent p95 latency exceeds FETCH_CONFIG hedge_min_delay are
+        hedged, and the duplicate is sent once a call has been outstanding for that p95,
+        so roughly one request in twenty is duplicated on those venues.
+        """
+        if not config.FETCH_CONFIG.get('hedge_requests', False):
+            return None
+        samples = self._latencies.get(exchange_name)
+        if not samples or len(samples) < int(config.FETCH_CONFIG.get('hedge_min_samples', 20)):
+            return None
+        ordered = sorted(samples)
+        p95 = ordered[int(0.95 * (len(ordered) - 1))]
+        return p95 if p95 > float(config.FETCH_CONFIG.get('hedge_min_delay', 0.5)) else None
+
+    def breaker(self, exchange_name: str) -> CircuitBreaker:
+        """The venue's circuit breaker, created from FETCH_CONFIG on first use."""
+        breaker = self.breakers.get(exchange_name)
+        if breaker is None:
+            breaker = self.breakers[exchange_name] = CircuitBreaker(
+                exchange_name,
+                failure_threshold=config.FETCH_CONFIG.get('breaker_failure_threshold', 5),
+                reset_timeout=config.FETCH_CONFIG.get('breaker_reset_timeout', 30.0),
+            )
+        return breaker
+
+    def _schedule_probe(self, exchange_name: str, exchange, pair: str):
+        """Probe an open venue in the background once its reset timeout has passed."""
+        task = self._probe_tasks.get(exchange_name)
+        if task is not None and not task.done():
+            return
+        breaker = self.breaker(exchange_name)
+        if not breaker.probe_due():
+            return
+        breaker.start_probe()
+        self._probe_tasks[exchange_name] = asyncio.create_task(self._probe_venue(exchange_name, exchange, pair))
+
+    async def _probe_venue(self, exchange_name: str, exchange, pair: str):
+        try:
+            if getattr(exchange, 'symbols', None):
+                await self._call_exchange(exchange_name, exchange, 'fetch_ticker', pair, probe=True)
+            else:
+                await self._call_exchange(exchange_name, exchange, 'load_markets', probe=True)
+                self._remember_markets(exchange_name, exchange)
+        except Exception as e:
+            logger.info(f"Probe of {exchange_name} failed: {e} - circuit stays open")
+            return
+        logger.info(f"Probe of {exchange_name} succeeded - venue back in scans")
 
-    async def fetch_all_market_data(self, trading_pairs: List[str]) -> Dict[str, Any]:
+    async def _bind_clients_to_loop(self, exchanges: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Replace async ccxt clients whose session belongs to another event loop.
+
+        An aiohttp session is tied to the loop that opened it; when the engine is driven
+        from a new loop (e.g. successive asyncio.run calls), a fresh client is created
+        with the already-loaded markets so the next request opens a session on this loop.
+        The replaced client is closed so its session does not leak.
+        """
+        if ccxt_async is None:
+            return exchanges
+        loop = asyncio.get_running_loop()
+        bound = dict(exchanges)
+        for name, exchange in exchanges.items():
+            if not isinstance(exchange, ccxt_async.Exchange):
+                continue
+            if exchange.asyncio_loop is None or exchange.asyncio_loop is loop:
+                continue
+            logger.debug("Recreating async client for %s on the current event loop", name)
+            fresh = type(exchange)({'enableRateLimit': True})
+            if exchange.markets:
+                fresh.set_markets(exchange.markets, exchange.currencies)
+            bound[name] = fresh
+            if self.cex_exchanges.get(name) is exchange:
+                self.cex_exchanges[name] = fresh
+            try:
+                await exchange.close()
+            except Exception as e:
+                # Connections opened on a loop that has since closed cannot be shut down cleanly
+                logger.debug("Closing the replaced %s client failed: %s", name, e)
+        return bound
+
+    def _quote_max_age(self, max_age: Optional[float]) -> float:
+        if max_age is None:
+            max_age = config.FETCH_CONFIG.get('max_quote_age', 0.0)
+        return float(max_age or 0.0)
+
+    def _remember_quote(self, section: str, venue: str, pair: str, entry: Dict):
+        self._quote_cache[(section, venue, pair)] = (time.time(), entry)
+
+    def _cached_quote(self, section: str, venue: str, pair: str, max_age: float, now: float) -> Optional[Dict]:
+        """A copy of the cached quote with its current 'age', or None if absent or older than max_age."""
+        if max_age <= 0:
+            return None
+        cached = self._quote_cache.get((section, venue, pair))
+        if cached is None:
+            return None
+        received_at, entry = cached
+        age = now - received_at
+        if age > max_age:
+            return None
+        entry = dict(entry)
+        entry['age'] = age
+        return entry
+
+    async def fetch_all_market_data(self, trading_pairs: List[str], max_age: Optional[float] = None) -> Dict[str, Any]:
         """
         Fetch market data from all sources
+
+        ``max_age`` is how stale (in seconds) a quote may be: cached quotes younger than
+        that are reused and only the expired (venue, pair) entries are fetched again
+        (default: FETCH_CONFIG['max_quote_age']). Every quote carries its 'age' in seconds.
         """
         try:
             logger.info("Fetching market data...")
 
+            # All quotes of this snapshot live in one columnar store; 'cex'/'dex' are views over it
+            store = QuoteStore(capacity=len(trading_pairs) * (len(self.cex_exchanges) + len(self.dex_protocols)))
             market_data = {
-                'cex': {},
-                'dex': {},
+                'cex': store.section('cex'),
+                'dex': store.section('dex'),
+                'quotes': store,
                 'tokens': self.extract_tokens_from_pairs(trading_pairs),
                 'timestamp': datetime.now(),
                 'pairs': trading_pairs
             }
 
-            # Fetch CEX data
-            cex_data = await self.fetch_cex_data(trading_pairs)
-            market_data['cex'] = cex_data
+            if config.STREAMING_CONFIG.get('enabled') and self.market_stream is None:
+                await self.start_streaming(trading_pairs)
 
-            # Fetch DEX data
-            dex_data = await self.fetch_dex_data(trading_pairs)
-            market_data['dex'] = dex_data
+            streamed = {'cex': {}, 'dex': {}}
+            if self.market_stream is not None and self.market_stream.is_running:
+                streamed = self._streamed_market_data(trading_pairs)
+
+            # Fetch CEX data: streamed (venue, pair) quotes are a snapshot read, the rest are polled over REST
+            for venue, venue_data in streamed['cex'].items():
+                if venue in self.cex_exchanges:
+                    continue
+                for pair, quote in venue_data.items():
+                    store.put('cex', venue, pair, quote)
+            with self.timings.span('fetch.cex'):
+                await self.fetch_cex_data(trading_pairs, store=store, max_age=max_age, streamed=streamed['cex'])
+            cex_data = market_data['cex']
+
+            # Fetch DEX data (streamed quotes replace the polled/simulated quote of their pair)
+            with self.timings.span('fetch.dex'):
+                await self.fetch_dex_data(trading_pairs, store=store, max_age=max_age)
+            for venue, venue_data in streamed['dex'].items():
+                for pair, quote in venue_data.items():
+                    store.put('dex', venue, pair, quote)
+            dex_data = market_data['dex']
 
             # Cache the data
             self.cached_data = market_data
             self.last_fetch_time = datetime.now()
 
             logger.info(f"Market data fetched: {len(cex_data)} CEX, {len(dex_data)} DEX")
-
-            # Debugging: Log the size of the market data being returned
-            logger.debug(f"Debug: Returning market data of size: {len(str(market_data))} characters")
-    
-            # Debugging: Log the fetched CEX and DEX data
-            logger.debug(f"Debug: CEX data: {cex_data}")
-            logger.debug(f"Debug: DEX data: {dex_data}")
-    
-            # Debugging: Log raw CEX and DEX data responses
-            logger.debug(f"Debug: Raw CEX data: {cex_data}")
-            logger.debug(f"Debug: Raw DEX data: {dex_data}")
+            if trace.enabled:
+                trace.emit('market_data', pairs=len(trading_pairs),
+                           cex={venue: len(quotes) for venue, quotes in cex_data.items()},
+                           dex={venue: len(quotes) for venue, quotes in dex_data.items()})
 
             # Validate fetched data
             if not cex_data:
@@ -197,377 +712,285 @@ class DataEngine:
             logger.exception(f" Error fetching market data: {str(e)}")
             return self.get_fallback_data(trading_pairs)
 
-    async def fetch_cex_data(self, trading_pairs: List[str]) -> Dict[str, Dict]:
-        """Fetch data from centralized exchanges"""
-        cex_data = {}
-
-        for exchange_name, exchange in self.cex_exchanges.items():
-            cex_data[exchange_name] = {}
-            
-            # Load markets if not already loaded (required for symbols to be populated)
-            try:
-                if not getattr(exchange, 'symbols', None):
-                    logger.debug(f"Loading markets for {exchange_name}...")
-                    await asyncio.to_thread(exchange.load_markets)
-                    logger.debug(f"Markets loaded for {exchange_name}, symbols count: {len(exchange.symbols) if exchange.symbols else 0}")
-            except Exception as load_err:
-                logger.warning(f"Failed to load markets for {exchange_name}: {load_err} - will use fallbacks")
-
+    async def fetch_cex_data(self, trading_pairs: List[str], exchanges: Optional[Dict[str, Any]] = None,
+                             store: Optional[QuoteStore] = None, max_age: Optional[float] = None,
+                             streamed: Optional[Dict[str, Dict[str, Dict]]] = None) -> SectionQuotes:
+        """Fetch data from centralized exchanges.
+
+        All exchanges are fetched in parallel; within an exchange, requests run
+        concurrently up to a cap derived from its configured rate limit, so scan
+        latency tracks the slowest venue instead of the sum over all venues.
+        ``exchanges`` restricts the fetch to a subset of clients (default: all).
+        Quotes are written to ``store`` (a new QuoteStore by default) and the
+        returned value is its read-only ``venue -> pair -> quote`` CEX view.
+        Cached quotes younger than ``max_age`` seconds are reused instead of fetched, as
+        are the ``streamed`` ``venue -> pair -> quote`` entries from the live market stream.
+        The scan waits at most FETCH_CONFIG scan_deadline seconds; venues still
+        running then contribute only the quotes that have arrived, and venues with
+        an open circuit breaker are skipped.
+        """
+        if exchanges is None:
+            exchanges = self.cex_exchanges
+        exchanges = await self._bind_clients_to_loop(exchanges)
+        exchange_names = list(exchanges.keys())
+
+        max_age = self._quote_max_age(max_age)
+        now = time.time()
+        cached = {}
+        for name in exchange_names:
+            hits = dict((streamed or {}).get(name, {}))
             for pair in trading_pairs:
-                try:
-                    # Prepare base token for mapping
-                    base_token = pair.split('/')[0]
-
-                    # Validate exchange.symbols
-                    if not getattr(exchange, 'symbols', None):
-                        logger.debug(f"{exchange_name} symbols not available after load attempt - using fallback for {pair}")
-                        fb = self.generate_fallback_ticker(pair)
-                        # attach origin info so downstream code can show source pair
-                        fb = dict(fb)
-                        fb['pair'] = pair
-                        fb['source'] = f"cex:{exchange_name}"
-                        cex_data[exchange_name][pair] = fb
-                        # also map base token to a copy so token lookups work consistently
-                        cex_data[exchange_name][base_token] = dict(fb)
-                        cex_data[exchange_name][base_token]['mapped_from_pair'] = pair
-                        continue
+                if pair in hits:
+                    continue
+                entry = self._cached_quote('cex', name, pair, max_age, now)
+                if entry is not None:
+                    hits[pair] = entry
+            cached[name] = hits
+
+        # Venues whose circuit is open sit this scan out (keeping any cached quotes); a
+        # background probe decides when they rejoin
+        skipped = set()
+        for name in exchange_names:
+            if not self.breaker(name).allow_request():
+                skipped.add(name)
+                if trading_pairs:
+                    self._schedule_probe(name, exchanges[name], trading_pairs[0])
+        if skipped:
+            logger.info(f"Skipping CEX venues with open circuits: {sorted(skipped)}")
+
+        # Quotes land here as they arrive, so a venue cut off by the scan deadline still
+        # contributes the pairs it answered
+        arrived: Dict[str, Dict[str, Dict]] = {name: {} for name in exchange_names}
+
+        async def fetch_expired(name: str) -> Dict[str, Dict]:
+            expired = [pair for pair in trading_pairs if pair not in cached[name]]
+            if not expired or name in skipped:
+                return {}
+            with self.timings.span(f'fetch.venue.{name}'):
+                return await self._fetch_exchange_tickers(name, exchanges[name], expired, sink=arrived[name])
+
+        tasks = [asyncio.ensure_future(fetch_expired(name)) for name in exchange_names]
+        results: List[Any] = []
+        if tasks:
+            deadline = config.FETCH_CONFIG.get('scan_deadline')
+            _, pending = await asyncio.wait(tasks, timeout=deadline)
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+            for name, task in zip(exchange_names, tasks):
+                if task in pending:
+                    logger.warning(f"{name} missed the {deadline}s scan deadline - "
+                                   f"using {len(arrived[name])}/{len(trading_pairs)} quotes that arrived")
+                    results.append(arrived[name])
+                elif task.exception() is not None:
+                    results.append(task.exception())
+                else:
+                    results.append(task.result())
+
+        if store is None:
+            store = QuoteStore(capacity=len(trading_pairs) * max(1, len(exchange_names)))
+        for exchange_name, result in zip(exchange_names, results):
+            hits = cached[exchange_name]
+            if isinstance(result, Exception):
+                logger.warning(f"Fetching {exchange_name} failed: {result} - using fallback for all pairs")
+                result = {pair: self._fallback_cex_ticker(exchange_name, pair)
+                          for pair in trading_pairs if pair not in hits}
+            if hits:
+                logger.debug("Reused %d/%d cached or streamed quotes for %s", len(hits), len(trading_pairs), exchange_name)
+            store.add_venue('cex', exchange_name)
+            # Request order, so base-token lookups resolve to the same pair as a full fetch
+            for pair in trading_pairs:
+                entry = hits.get(pair) or result.get(pair)
+                if entry is not None:
+                    store.put('cex', exchange_name, pair, entry)
 
-                    # Check if the pair is unsupported for the exchange
-                    if pair not in exchange.symbols:
-                        logger.warning(f"{exchange_name} does not have market symbol {pair} - using fallback")
-                        fb = self.generate_fallback_ticker(pair)
-                        fb = dict(fb)
-                        fb['pair'] = pair
-                        fb['source'] = f"cex:{exchange_name}"
-                        cex_data[exchange_name][pair] = fb
-                        cex_data[exchange_name][base_token] = dict(fb)
-                        cex_data[exchange_name][base_token]['mapped_from_pair'] = pair
-                        continue
+        return store.section('cex')
 
-                    # Debugging: Log exchange symbols and pair
-                    logger.debug(f"Debug: {exchange_name} symbols: {exchange.symbols}")
-                    logger.debug(f"Debug: Checking pair {pair}")
-
-                    # Additional error handling for fetch_ticker
-                    try:
-                        logger.debug(f"Debug: Attempting fetch_ticker for {pair} on {exchange_name}")
-                        ticker = await asyncio.to_thread(exchange.fetch_ticker, pair)
-                    except Exception as fetch_error:
-                        logger.warning(f"Error fetching ticker for {pair} on {exchange_name}: {fetch_error}")
-                        # Try REST fallback using configured endpoints before giving up
-                        try:
-                            rest_ticker = await asyncio.to_thread(self.rest_fetch_ticker, exchange_name, pair)
-                            if rest_ticker:
-                                logger.info(f"Using REST fallback for {pair} on {exchange_name}")
-                                ticker = rest_ticker
-                            else:
-                                fb = self.generate_fallback_ticker(pair)
-                                fb = dict(fb)
-                                fb['pair'] = pair
-                                fb['source'] = f"cex:{exchange_name}"
-                                cex_data[exchange_name][pair] = fb
-                                cex_data[exchange_name][base_token] = dict(fb)
-                                cex_data[exchange_name][base_token]['mapped_from_pair'] = pair
-                                continue
-                        except Exception as rest_exc:
-                            logger.warning(f"REST fallback failed for {exchange_name}: {rest_exc}")
-                            fb = self.generate_fallback_ticker(pair)
-                            fb = dict(fb)
-                            fb['pair'] = pair
-                            fb['source'] = f"cex:{exchange_name}"
-                            cex_data[exchange_name][pair] = fb
-                            cex_data[exchange_name][base_token] = dict(fb)
-                            cex_data[exchange_name][base_token]['mapped_from_pair'] = pair
-                            continue
+    def _exchange_rate_per_second(self, exchange_name: str) -> float:
+        """Configured request allowance for an exchange, in requests per second."""
+        return self.rate_limiter.rate_per_second(exchange_name)
 
-                    # Informational: log a concise summary of the fetched ticker
-                    try:
-                        logger.info(
-                            "Fetched ticker for %s %s -> bid=%s ask=%s last=%s",
-                            exchange_name,
-                            pair,
-                            ticker.get('bid') if isinstance(ticker, dict) else None,
-                            ticker.get('ask') if isinstance(ticker, dict) else None,
-                            ticker.get('last') if isinstance(ticker, dict) else None,
-                        )
-                    except Exception:
-                        logger.debug("Debug: Fetched ticker (unable to format summary)")
-
-                    # Debugging: Log raw ticker response (extra raw logging for ADA to help diagnostics)
-                    logger.debug(f"Debug: Raw ticker response for {pair} on {exchange_name}: {ticker}")
-                    if 'ADA' in pair:
-                        logger.debug(f"RAW ADA ticker @ {exchange_name} {pair}: {ticker}")
-
-                    # Debugging: Log the type and structure of ticker data
-                    logger.debug(f"Debug: Ticker type: {type(ticker)}")
-                    logger.debug(f"Debug: Ticker content: {ticker}")
-
-                    # Validate ticker data
-                    if ticker is None:
-                        logger.warning(f"{exchange_name} returned None for {pair}")
-                        fb = self.generate_fallback_ticker(pair)
-                        fb = dict(fb)
-                        fb['pair'] = pair
-                        fb['source'] = f"cex:{exchange_name}"
-                        cex_data[exchange_name][pair] = fb
-                        cex_data[exchange_name][base_token] = dict(fb)
-                        cex_data[exchange_name][base_token]['mapped_from_pair'] = pair
-                        continue
+    def _exchange_concurrency(self, exchange_name: str) -> int:
+        """Max in-flight requests for an exchange: its per-second allowance, capped by FETCH_CONFIG."""
+        cap = int(config.FETCH_CONFIG.get('max_concurrency_per_exchange', 8))
+        return max(1, min(cap, int(self._exchange_rate_per_second(exchange_name))))
 
-                    # Normalize and validate numeric fields (ensure bid <= ask, numeric types)
-                    normalized = self._normalize_price_dict(ticker)
-                    if not normalized:
-                        logger.warning(f"{exchange_name} returned invalid numeric ticker for {pair}; using fallback")
-                        fb = self.generate_fallback_ticker(pair)
-                        fb = dict(fb)
-                        fb['pair'] = pair
-                        fb['source'] = f"cex:{exchange_name}"
-                        cex_data[exchange_name][pair] = fb
-                        cex_data[exchange_name][base_token] = dict(fb)
-                        cex_data[exchange_name][base_token]['mapped_from_pair'] = pair
-                    else:
-                        # attach provenance so downstream strategies can identify originating pair
-                        normalized = dict(normalized)
-                        normalized['pair'] = pair
-                        normalized['source'] = f"cex:{exchange_name}"
-                        cex_data[exchange_name][pair] = normalized
-                        # map base token to a separate copy with the mapped_from_pair marker
-                        cex_data[exchange_name][base_token] = dict(normalized)
-                        cex_data[exchange_name][base_token]['mapped_from_pair'] = pair
+    async def _fetch_exchange_tickers(self, exchange_name: str, exchange, trading_pairs: List[str],
+                                      sink: Optional[Dict[str, Dict]] = None) -> Dict[str, Dict]:
+        """Fetch every pair from one exchange with bounded concurrency, paced by the venue's token bucket.
 
-                except Exception as e:
-                    logger.exception(f"Failed to fetch {pair} from {exchange_name}: {str(e)}")
-                    # Use fallback data
-                    fb = self.generate_fallback_ticker(pair)
-                    fb = dict(fb)
-                    fb['pair'] = pair
-                    fb['source'] = f"cex:{exchange_name}"
-                    cex_data[exchange_name][pair] = fb
-                    base_token = pair.split('/')[0]
-                    cex_data[exchange_name][base_token] = dict(fb)
-                    cex_data[exchange_name][base_token]['mapped_from_pair'] = pair
-
-                # Small delay to respect rate limits
-                await asyncio.sleep(0.1)
-
-        return cex_data
-
-    def rest_fetch_ticker(self, exchange_name: str, pair: str) -> Optional[Dict]:
-        """Attempt to fetch a public ticker via REST using configured EXCHANGE_ENDPOINTS.
-        This is a best-effort parser for common public endpoints and returns a dict
-        compatible with ccxt.fetch_ticker minimal fields: {'bid','ask','last','volume','timestamp'}
-        Returns None if it cannot fetch/parse the response.
+        Entries are also written to ``sink`` as they arrive, so a caller that stops waiting
+        keeps the pairs already fetched.
         """
-        endpoints = getattr(config, 'EXCHANGE_ENDPOINTS', {})
-        entry = endpoints.get(exchange_name)
-        if not entry:
-            return None
+        if sink is None:
+            sink = {}
+        # Load markets if not already loaded (required for symbols to be populated)
+        await self._ensure_markets(exchange_name, exchange)
+
+        # One bulk request covers every listed pair on venues that support it
+        bulk_entries = await self._fetch_bulk_tickers(exchange_name, exchange, trading_pairs)
+        sink.update(bulk_entries)
+        remaining_pairs = [pair for pair in trading_pairs if pair not in bulk_entries]
+
+        # The token bucket (in _call_exchange) paces requests; the semaphore caps those in flight
+        semaphore = asyncio.Semaphore(self._exchange_concurrency(exchange_name))
+
+        async def fetch_paced(pair: str) -> Dict:
+            async with semaphore:
+                entry = await self._fetch_pair_ticker(exchange_name, exchange, pair)
+            if entry is not None:
+                sink[pair] = entry
+            return entry
+
+        entries = await asyncio.gather(*(fetch_paced(pair) for pair in remaining_pairs))
+        per_pair_entries = dict(zip(remaining_pairs, entries))
+
+        # Pairs whose ccxt request failed share one REST request where the venue allows it;
+        # whatever REST cannot answer falls back to simulated data
+        failed = [pair for pair, entry in per_pair_entries.items() if entry is None]
+        if failed:
+            rest_tickers = await self.rest_fetch_tickers(exchange_name, failed)
+            if rest_tickers:
+                logger.info(f"Using REST fallback for {len(rest_tickers)}/{len(failed)} pairs on {exchange_name}")
+            for pair in failed:
+                ticker = rest_tickers.get(pair)
+                entry = (self._normalize_cex_ticker(exchange_name, pair, ticker) if ticker is not None
+                         else self._fallback_cex_ticker(exchange_name, pair))
+                per_pair_entries[pair] = sink[pair] = entry
+
+        # Assemble in request order so base-token lookups resolve to the same pair as before
+        venue_data = {}
+        for pair in trading_pairs:
+            entry = bulk_entries.get(pair)
+            venue_data[pair] = entry if entry is not None else per_pair_entries[pair]
+        return venue_data
 
-        base = entry.get('base_url', '').rstrip('/')
-        path = entry.get('public_ticker_path', '')
-        if not base or not path:
-            return None
+    async def _fetch_bulk_tickers(self, exchange_name: str, exchange, trading_pairs: List[str]) -> Dict[str, Dict]:
+        """Fetch all listed pairs with a single fetch_tickers call when the venue supports it.
 
-        # Prepare symbol variants
-        symbol_noslash = pair.replace('/', '')
-        symbol_dash = pair.replace('/', '-')
-        base_token = pair.split('/')[0]
-        # Format path with named placeholders if possible (supports {base},{noslash},{dash},{pair})
-        try:
-            formatted_path = path.format(base=base_token, noslash=symbol_noslash, dash=symbol_dash, pair=pair)
-        except Exception:
-            try:
-                formatted_path = path.format(symbol_noslash) if '{}' in path else path
-            except Exception:
-                formatted_path = path
+        Returns normalized entries keyed by pair; pairs missing from the result (or every
+        pair, if the venue lacks bulk support or the call fails) are left to per-pair fetching.
+        """
+        if not config.FETCH_CONFIG.get('use_bulk_tickers', True):
+            return {}
+        has = getattr(exchange, 'has', None) or {}
+        symbols = getattr(exchange, 'symbols', None)
+        if not has.get('fetchTickers') or not symbols:
+            return {}
 
-        # Build URL
-        if formatted_path.startswith('/'):
-            url = base + formatted_path
-        else:
-            url = base + '/' + formatted_path
-
-        params = {}
-        headers = {}
-        # If endpoint requires API key, check env and set header
-        if entry.get('requires_api_key'):
-            api_key = os.getenv('COINMARKETCAP_API_KEY') or os.getenv('CMC_API_KEY')
-            if not api_key:
-                # Cannot call API without key
-                return None
-            headers['X-CMC_PRO_API_KEY'] = api_key
-
-        # Exchange-specific common params
-        if exchange_name == 'binance':
-            params = {'symbol': symbol_noslash}
-        elif exchange_name == 'coinbase':
-            # coinbase path uses {base}-USD in path; no params needed
-            params = {}
-        elif exchange_name == 'kraken':
-            params = {'pair': symbol_noslash}
-        elif exchange_name == 'kucoin':
-            params = {'symbol': symbol_dash}
-        elif exchange_name == 'bybit':
-            # spot quote endpoint accepts symbol=BTCUSDT
-            params = {'symbol': symbol_noslash}
-        elif exchange_name == 'okx':
-            # okx uses instId like BTC-USDT
-            params = {'instId': symbol_dash}
-        elif exchange_name == 'bitfinex':
-            # prefer ccxt for bitfinex if configured
-            if entry.get('prefer_ccxt'):
-                return None
-            params = {}
-        elif exchange_name == 'gateio':
-            # gateio expects currency_pair like BTC_USDT
-            params = {'currency_pair': pair.replace('/', '_')}
-        elif exchange_name == 'coingecko':
-            ids_map = {'BTC': 'bitcoin', 'ETH': 'ethereum', 'BNB': 'binancecoin',
-                       'ADA': 'cardano', 'SOL': 'solana', 'MATIC': 'matic-network', 'DOT': 'polkadot'}
-            ids = ids_map.get(base_token, base_token.lower())
-            params = {'ids': ids, 'vs_currencies': 'usd'}
-        elif exchange_name == 'coinmarketcap':
-            # CMC requires symbol param and convert
-            params = {'symbol': base_token, 'convert': 'USD'}
-        else:
-            params = {}
+        listed = [pair for pair in trading_pairs if pair in symbols]
+        if not listed:
+            return {}
 
         try:
-            # Try primary configured path first with logging
+            tickers = await self._call_exchange(exchange_name, exchange, 'fetch_tickers', listed)
+        except Exception as bulk_error:
+            logger.warning(f"Bulk fetch_tickers failed on {exchange_name}: {bulk_error} - fetching pairs individually")
+            return {}
+
+        entries = {}
+        for pair in listed:
+            ticker = (tickers or {}).get(pair)
+            if ticker is not None:
+                entries[pair] = self._normalize_cex_ticker(exchange_name, pair, ticker)
+        logger.debug("Bulk fetch_tickers on %s returned %d/%d pairs", exchange_name, len(entries), len(listed))
+        return entries
+
+    def _fallback_cex_ticker(self, exchange_name: str, pair: str) -> Dict:
+        """Fallback ticker tagged with its originating pair and exchange."""
+        fb = dict(self.generate_fallback_ticker(pair))
+        fb['pair'] = pair
+        fb['source'] = f"cex:{exchange_name}"
+        return fb
+
+    async def _fetch_pair_ticker(self, exchange_name: str, exchange, pair: str) -> Optional[Dict]:
+        """Fetch and normalize one ticker; None when the request failed and REST should be tried."""
+        try:
+            # Validate exchange.symbols
+            if not getattr(exchange, 'symbols', None):
+                if trace.enabled:
+                    trace.emit('ticker_fallback', venue=exchange_name, pair=pair, reason='no symbols')
+                return self._fallback_cex_ticker(exchange_name, pair)
+
+            # Check if the pair is unsupported for the exchange
+            if pair not in exchange.symbols:
+                logger.warning(f"{exchange_name} does not have market symbol {pair} - using fallback")
+                return self._fallback_cex_ticker(exchange_name, pair)
+
+            # Additional error handling for fetch_ticker
             try:
-                logger.debug("REST GET %s params=%s headers=%s", url, params, bool(headers))
-                resp = requests.get(url, params=params, headers=headers or None, timeout=5)
-                logger.info("REST ticker request %s %s -> status=%s url=%s", exchange_name, pair, resp.status_code, getattr(resp, 'url', url))
-            except Exception as req_exc:
-                logger.warning("REST request failed for %s %s: %s", exchange_name, pair, req_exc)
+                ticker = await self._call_exchange(exchange_name, exchange, 'fetch_ticker', pair)
+            except CircuitOpenError:
+                # The venue failed repeatedly during this scan; do not hammer it over REST either
+                return self._fallback_cex_ticker(exchange_name, pair)
+            except Exception as fetch_error:
+                logger.warning(f"Error fetching ticker for {pair} on {exchange_name}: {fetch_error!r}")
+                # Left for the venue's batched REST fallback (see _fetch_exchange_tickers)
                 return None
 
-            if resp.status_code == 200:
-                try:
-                    data = resp.json()
-                    # Log a short snippet to avoid huge logs
-                    try:
-                        snippet = str(data)[:200]
-                        logger.debug("REST response snippet for %s %s: %s", exchange_name, pair, snippet)
-                    except Exception:
-                        logger.debug("REST response received (unable to serialize snippet)")
-                except Exception:
-                    logger.debug("REST response non-json for %s %s: %.200s", exchange_name, pair, resp.text)
-                    data = None
-            else:
-                # If non-200 and alternates are provided, try them
-                data = None
-                alternates = entry.get('alternate_paths') or []
-                for alt in alternates:
-                    try:
-                        # format alternate path similar to primary formatting
-                        try:
-                            alt_path = alt.format(base=base_token, noslash=symbol_noslash, dash=symbol_dash, pair=pair)
-                        except Exception:
-                            try:
-                                alt_path = alt.format(symbol_noslash) if '{}' in alt else alt
-                            except Exception:
-                                alt_path = alt
-                        if alt_path.startswith('/'):
-                            alt_url = base + alt_path
-                        else:
-                            alt_url = base + '/' + alt_path
-                        logger.debug("REST ALT GET %s params=%s", alt_url, params)
-                        try:
-                            alt_resp = requests.get(alt_url, params=params, headers=headers or None, timeout=5)
-                            logger.info("REST alt request %s %s -> status=%s", exchange_name, pair, alt_resp.status_code)
-                            if alt_resp.status_code == 200:
-                                try:
-                                    data = alt_resp.json()
-                                    snippet = str(data)[:200]
-                                    logger.debug("REST alt response snippet for %s %s: %s", exchange_name, pair, snippet)
-                                except Exception:
-                                    logger.debug("REST alt response non-json for %s %s: %.200s", exchange_name, pair, alt_resp.text)
-                                break
-                        except Exception as alt_req_exc:
-                            logger.warning("REST alt request failed for %s alt=%s: %s", exchange_name, alt_url, alt_req_exc)
-                            continue
-                    except Exception:
-                        continue
-                if data is None:
-                    logger.warning("REST endpoints returned no usable data for %s %s", exchange_name, pair)
-                    return None
-        except Exception as e:
-            logger.exception(" Unexpected error in rest_fetch_ticker for %s %s: %s", exchange_name, pair, str(e))
-            return None
+            return self._normalize_cex_ticker(exchange_name, pair, ticker)
 
-        # Parse common response shapes (extended to handle list responses like Gate.io)
+        except Exception as e:
+            logger.exception(f"Failed to fetch {pair} from {exchange_name}: {str(e)}")
+            # Use fallback data
+            return self._fallback_cex_ticker(exchange_name, pair)
+
+    def _normalize_cex_ticker(self, exchange_name: str, pair: str, ticker: Optional[Dict]) -> Dict:
+        """Normalize a raw ccxt/REST ticker into a CEX entry, or a fallback if it is unusable."""
+        # Raw response as returned by ccxt/REST, formatted only when the trace is dumped
+        if trace.enabled:
+            trace.emit('raw_ticker', venue=exchange_name, pair=pair, ticker=ticker)
+
+        # Validate ticker data
+        if ticker is None:
+            logger.warning(f"{exchange_name} returned None for {pair}")
+            return self._fallback_cex_ticker(exchange_name, pair)
+
+        # Normalize and validate numeric fields (ensure bid <= ask, numeric types)
+        normalized = self._normalize_price_dict(ticker)
+        if not normalized:
+            logger.warning(f"{exchange_name} returned invalid numeric ticker for {pair}; using fallback")
+            return self._fallback_cex_ticker(exchange_name, pair)
+
+        # attach provenance so downstream strategies can identify originating pair
+        normalized['pair'] = pair
+        normalized['source'] = f"cex:{exchange_name}"
+        normalized['age'] = 0.0
+        self._remember_quote('cex', exchange_name, pair, normalized)
+        return normalized
+
+    async def rest_fetch_tickers(self, exchange_name: str, pairs: List[str]) -> Dict[str, Dict]:
+        """Fetch raw tickers for ``pairs`` over the venue's public REST API (see core/rest_client.py).
+
+        Venues with an all-symbols endpoint are quoted with one request; pairs the venue
+        did not answer are absent from the result.
+        """
         try:
-            # If API returns a list of tickers (e.g., gate.io), find matching pair
-            if isinstance(data, list):
-                target_cp = pair.replace('/', '_').upper()
-                for item in data:
-                    if not isinstance(item, dict):
-                        continue
-                    cp = (item.get('currency_pair') or item.get('symbol') or item.get('s') or item.get('pair') or '').upper()
-                    if not cp:
-                        # Try to infer from fields that contain pair-like strings
-                        continue
-                    if cp == target_cp or cp == symbol_noslash.upper() or cp.replace('_', '-') == symbol_dash.upper():
-                        # try common price fields
-                        for key in ('last', 'price', 'last_price', 'last_trade_price'):
-                            if key in item:
-                                try:
-                                    price = float(item.get(key))
-                                    volume = float(item.get('baseVolume', 0) or item.get('volume', 0) or 0)
-                                    return {'bid': price, 'ask': price, 'last': price, 'volume': volume, 'timestamp': int(time.time() * 1000)}
-                                except Exception:
-                                    continue
-
-            # Simple price field (e.g., Binance / some endpoints)
-            if isinstance(data, dict) and 'price' in data:
-                price = float(data.get('price'))
-                return {'bid': price, 'ask': price, 'last': price, 'volume': 0, 'timestamp': int(time.time() * 1000)}
-
-            # Coinbase returns {'data': {'base': 'BTC', 'currency': 'USD', 'amount': '50000.00'}}
-            if isinstance(data, dict) and 'data' in data and isinstance(data['data'], dict) and 'amount' in data['data']:
-                price = float(data['data']['amount'])
-                return {'bid': price, 'ask': price, 'last': price, 'volume': 0, 'timestamp': int(time.time() * 1000)}
-
-            # Coingecko: {'bitcoin': {'usd': 50000}}
-            if isinstance(data, dict):
-                for v in data.values():
-                    if isinstance(v, dict):
-                        for sub in v.values():
-                            try:
-                                price = float(sub)
-                                return {'bid': price, 'ask': price, 'last': price, 'volume': 0, 'timestamp': int(time.time() * 1000)}
-                            except Exception:
-                                continue
-
-            # Kraken returns nested 'result' object
-            if isinstance(data, dict) and 'result' in data and isinstance(data['result'], dict):
-                first = next(iter(data['result'].values()))
-                if isinstance(first, dict):
-                    # Try common fields
-                    if 'c' in first and isinstance(first['c'], list):
-                        last = float(first['c'][0])
-                        return {'bid': last, 'ask': last, 'last': last, 'volume': 0, 'timestamp': int(time.time() * 1000)}
-                    if 'last' in first:
-                        last = float(first['last'])
-                        return {'bid': last, 'ask': last, 'last': last, 'volume': 0, 'timestamp': int(time.time() * 1000)}
-        except Exception:
-            return None
-
-        # Fallback: unable to parse
-        return None
+            return await self.rest_client.fetch_tickers(exchange_name, pairs)
+        except Exception as e:
+            logger.warning(f"REST fallback failed for {exchange_name}: {e!r}")
+            return {}
 
-    async def fetch_dex_data(self, trading_pairs: List[str]) -> Dict[str, Dict]:
-        """Fetch data from decentralized exchanges"""
-        dex_data = {}
+    async def fetch_dex_data(self, trading_pairs: List[str], store: Optional[QuoteStore] = None,
+                             max_age: Optional[float] = None) -> SectionQuotes:
+        """Fetch data from decentralized exchanges into ``store`` and return its DEX view"""
+        if store is None:
+            store = QuoteStore(capacity=len(trading_pairs) * max(1, len(self.dex_protocols)))
+        max_age = self._quote_max_age(max_age)
+        now = time.time()
 
         for protocol_name, protocol_info in self.dex_protocols.items():
-            dex_data[protocol_name] = {}
+            store.add_venue('dex', protocol_name)
 
             for pair in trading_pairs:
+                cached = self._cached_quote('dex', protocol_name, pair, max_age, now)
+                if cached is not None:
+                    store.put('dex', protocol_name, pair, cached)
+                    continue
                 try:
                     if self.web3_connected:
                         # Try to fetch real DEX data
+                        await self.rate_limiter.acquire(protocol_name)
                         price_data = await self.fetch_dex_price_real(protocol_info, pair)
                     else:
                         # Use simulated data
@@ -577,12 +1000,7 @@ class DataEngine:
                     normalized = self._normalize_price_dict(price_data)
                     if not normalized:
                         logger.warning(f"Invalid DEX price for {pair} on {protocol_name}; using simulated fallback")
-                        dex_data[protocol_name][pair] = self.generate_simulated_dex_price(pair)
-                        # Add individual token data (same as success path)
-                        base_token = pair.split('/')[0]
-                        token_data = dict(dex_data[protocol_name][pair])
-                        token_data['mapped_from_pair'] = pair
-                        dex_data[protocol_name][base_token] = token_data
+                        store.put('dex', protocol_name, pair, self.generate_simulated_dex_price(pair))
                         continue
                     else:
                         # Preserve extra fields commonly present in DEX entries (fee, liquidity)
@@ -596,26 +1014,17 @@ class DataEngine:
                             normalized['pair'] = pair
                         if 'source' not in normalized or not normalized['source']:
                             normalized['source'] = f"dex:{protocol_name}"
-                        dex_data[protocol_name][pair] = normalized
-                        
-                        # Add individual token data
-                        base_token = pair.split('/')[0]
-                        token_data = dict(dex_data[protocol_name][pair])
-                        token_data['mapped_from_pair'] = pair
-                        dex_data[protocol_name][base_token] = token_data
+                        if self.web3_connected:
+                            # Simulated quotes are regenerated each scan; only fetched ones are cached
+                            normalized['age'] = 0.0
+                            self._remember_quote('dex', protocol_name, pair, normalized)
+                        store.put('dex', protocol_name, pair, normalized)
 
                 except Exception as e:
                     logger.exception(f"Failed to fetch {pair} from {protocol_name}: {str(e)}")
-                    dex_data[protocol_name][pair] = self.generate_simulated_dex_price(pair)
-                    # Add individual token data (same as success path)
-                    base_token = pair.split('/')[0]
-                    token_data = dict(dex_data[protocol_name][pair])
-                    token_data['mapped_from_pair'] = pair
-                    dex_data[protocol_name][base_token] = token_data
-
-                await asyncio.sleep(0.1)
+                    store.put('dex', protocol_name, pair, self.generate_simulated_dex_price(pair))
 
-        return dex_data
+        return store.section('dex')
 
     async def fetch_dex_price_real(self, protocol_info: Dict, pair: str) -> Dict:
         """Fetch real DEX prices using Web3"""
@@ -872,9 +1281,9 @@ class DataEngine:
                     warnings.append(warning)
                     logger.warning(warning)
                     
-                    # Log details for debugging
-                    for price, pair, exchange in prices:
-                        logger.debug(f"  {token} price from {pair}@{exchange}: ${price:.4f}")
+                    if trace.enabled:
+                        trace.emit('price_inconsistency', token=token,
+                                   prices=[(pair, exchange, price) for price, pair, exchange in prices])
         
         except Exception as e:
             logger.exception(f"Error validating price consistency: {e}")
@@ -949,20 +1358,25 @@ class DataEngine:
             'cached_data_available': bool(self.cached_data),
             'cex_exchanges': len(self.cex_exchanges),
             'dex_protocols': len(self.dex_protocols),
-            'web3_connected': self.web3_connected
+            'web3_connected': self.web3_connected,
+            'web3_state': self.web3_state,
+            'cached_quotes': len(self._quote_cache),
+            'circuits': {name: breaker.state for name, breaker in self.breakers.items()},
+            'async_clients': self.async_clients,
+            'streaming': bool(self.market_stream and self.market_stream.is_running),
+            'stream_connections': dict(self.market_stream.connected) if self.market_stream else {}
         }
 
     async def get_historical_data(self, pair: str, timeframe: str = '1h', limit: int = 100) -> List[Dict]:
         """Get historical OHLCV data (simplified implementation)"""
         try:
             # Use Binance as primary source for historical data
-            exchange = self.cex_exchanges['binance']
-            ohlcv = await asyncio.to_thread(exchange.fetch_ohlcv, pair, timeframe, limit=limit)
+            exchange = (await self._bind_clients_to_loop({'binance': self.cex_exchanges['binance']}))['binance']
+            ohlcv = await self._call_exchange('binance', exchange, 'fetch_ohlcv', pair, timeframe, limit=limit)
+
+            if trace.enabled:
+                trace.emit('ohlcv', venue='binance', pair=pair, timeframe=timeframe, candles=ohlcv)
 
-            # Debugging: Log the type and content of ohlcv before processing
-            logger.debug(f"Debug: OHLCV type: {type(ohlcv)}")
-            logger.debug(f"Debug: OHLCV content: {ohlcv}")
-    
             # Filter out invalid candles
             ohlcv = [candle for candle in ohlcv if all(candle)]
     
@@ -1,102 +1,214 @@
 import math
-from typing import Dict, List, Any, Optional
+import numpy as np
+from typing import Dict, List, Any, Optional, Set, Tuple
 from datetime import datetime
 import logging
+from itertools import islice
+
+from core.compiled_graph import CompiledGraph
+from core.graph_index import GraphIndex, graph_index
+from core.graph_overlay import OverlayGraph
+from core.quote_store import SectionQuotes
+from core.trace import get_trace_buffer
+from utils import config
+from utils.config import get_dex_fee, get_exchange_fee
+# Import centralized validation thresholds
+from utils.constants import MAX_RATE_THRESHOLD, MIN_RATE_THRESHOLD, MAX_WEIGHT_THRESHOLD
+
+# networkx is optional: without it the built-in LeanDiGraph backend (core/lean_graph.py)
+# provides the subset of the networkx API used by this project.
+from core import lean_graph
+from core.lean_graph import LeanDiGraph
 
-# networkx is optional for running lightweight tests without installing dependencies.
-# Provide a minimal in-process fallback implementation that implements the subset of
-# networkx API used by this project. When real networkx is available it will be used.
 try:
     import networkx as nx
+    _HAVE_NETWORKX = True
 except Exception:
-    logger = logging.getLogger(__name__)
-
-    class _AdjView:
-        def __init__(self, graph, u):
-            self._graph = graph
-            self._u = u
-
-        def __getitem__(self, v):
-            return self._graph._edges.get((self._u, v), {})
-
-    class _SimpleDiGraph:
-        def __init__(self):
-            self._nodes = {}      # node -> attr dict
-            self._edges = {}      # (u,v) -> attr dict
-
-        def add_node(self, node, **attrs):
-            if node not in self._nodes:
-                self._nodes[node] = {}
-            self._nodes[node].update(attrs)
-
-        def add_edge(self, u, v, **data):
-            # ensure nodes exist
-            if u not in self._nodes:
-                self._nodes[u] = {}
-            if v not in self._nodes:
-                self._nodes[v] = {}
-            self._edges[(u, v)] = dict(data)
-
-        def nodes(self):
-            return list(self._nodes.keys())
-
-        def edges(self, data=False):
-            if data:
-                return [(u, v, dict(d)) for (u, v), d in self._edges.items()]
-            return list(self._edges.keys())
-
-        def number_of_nodes(self):
-            return len(self._nodes)
-
-        def number_of_edges(self):
-            return len(self._edges)
-
-        def has_edge(self, u, v):
-            return (u, v) in self._edges
-
-        def has_node(self, node):
-            """Compatibility helper used by strategy code (networkx has has_node)."""
-            return node in self._nodes
-
-        def subgraph(self, nodes_list):
-            sub = _SimpleDiGraph()
-            for n in nodes_list:
-                if n in self._nodes:
-                    sub.add_node(n, **self._nodes[n])
-            for (u, v), d in self._edges.items():
-                if u in sub._nodes and v in sub._nodes:
-                    sub.add_edge(u, v, **d)
-            return sub
-
-        def __getitem__(self, u):
-            return _AdjView(self, u)
-
-    def density(graph):
-        n = graph.number_of_nodes()
-        m = graph.number_of_edges()
-        if n <= 1:
-            return 0.0
-        return m / (n * (n - 1))
-
-    def number_strongly_connected_components(graph):
-        # conservative fallback: treat whole graph as one component
-        return 1 if graph.number_of_nodes() > 0 else 0
-
-    def number_weakly_connected_components(graph):
-        return number_strongly_connected_components(graph)
+    _HAVE_NETWORKX = False
 
     class _NXModule:
-        DiGraph = _SimpleDiGraph
-        density = staticmethod(density)
-        number_strongly_connected_components = staticmethod(number_strongly_connected_components)
-        number_weakly_connected_components = staticmethod(number_weakly_connected_components)
+        DiGraph = LeanDiGraph
+        density = staticmethod(lean_graph.density)
+        number_strongly_connected_components = staticmethod(lean_graph.number_strongly_connected_components)
+        number_weakly_connected_components = staticmethod(lean_graph.number_weakly_connected_components)
 
     nx = _NXModule()
 
 logger = logging.getLogger(__name__)
+trace = get_trace_buffer()
+
+if _HAVE_NETWORKX:
+    class ArbitrageGraph(nx.DiGraph):
+        """
+        networkx DiGraph that keeps a GraphIndex (token/venue/type lookups) in step with its nodes.
+
+        Every networkx path that creates or deletes nodes goes through the methods
+        overridden here; edges add their missing endpoints in insertion order, so the new
+        nodes are the tail of ``_node``.
+        """
+
+        def __init__(self, incoming_graph_data=None, **attr):
+            self.graph_index = GraphIndex()
+            super().__init__(incoming_graph_data, **attr)
+
+        def _index_new_nodes(self, before: int):
+            for node in islice(self._node, before, None):
+                self.graph_index.add(node, self._node[node])
+
+        def add_node(self, node_for_adding, **attr):
+            super().add_node(node_for_adding, **attr)
+            self.graph_index.add(node_for_adding, self._node[node_for_adding])
+
+        def add_nodes_from(self, nodes_for_adding, **attr):
+            nodes = list(nodes_for_adding)
+            super().add_nodes_from(nodes, **attr)
+            for n in nodes:
+                try:
+                    node = n if n in self._node else n[0]
+                except TypeError:
+                    node = n[0]  # (node, attr dict)
+                self.graph_index.add(node, self._node[node])
+
+        def add_edge(self, u_of_edge, v_of_edge, **attr):
+            before = len(self._node)
+            super().add_edge(u_of_edge, v_of_edge, **attr)
+            if len(self._node) != before:
+                self._index_new_nodes(before)
+
+        def add_edges_from(self, ebunch_to_add, **attr):
+            before = len(self._node)
+            super().add_edges_from(ebunch_to_add, **attr)
+            if len(self._node) != before:
+                self._index_new_nodes(before)
+
+        def remove_node(self, n):
+            super().remove_node(n)
+            self.graph_index.discard(n)
+
+        def remove_nodes_from(self, nodes):
+            nodes = list(nodes)
+            super().remove_nodes_from(nodes)
+            for n in nodes:
+                self.graph_index.discard(n)
+
+        def clear(self):
+            super().clear()
+            self.graph_index.clear()
+else:
+    ArbitrageGraph = LeanDiGraph
+
+
+def create_graph(backend: Optional[str] = None):
+    """
+    Empty arbitrage graph of the configured backend (GRAPH_CONFIG['backend']).
+
+    'networkx' gives an ArbitrageGraph (networkx DiGraph with a GraphIndex); 'lean' gives
+    the built-in LeanDiGraph, which is also used whenever networkx is not installed.
+    """
+    backend = backend or config.GRAPH_CONFIG.get('backend', 'networkx')
+    if backend == 'lean' or not _HAVE_NETWORKX:
+        return LeanDiGraph()
+    if backend != 'networkx':
+        logger.warning(f"Unknown graph backend {backend!r}; using networkx")
+    return ArbitrageGraph()
+
+
+def _graph_algorithms(graph):
+    """Module providing density / component counts for ``graph``'s backend."""
+    return lean_graph if isinstance(graph, (LeanDiGraph, OverlayGraph)) else nx
+
+
+def _optional_float(value) -> float:
+    return np.nan if value is None else float(value)
+
+
+class QuoteMatrix:
+    """
+    One section's quotes as parallel arrays, for computing price edges in batch.
+
+    ``venues``/``pairs``/``bases``/``quote_tokens`` are lists aligned with the float64
+    arrays ``bid``, ``ask``, ``fee``, ``liquidity`` and ``age`` (NaN where the source gave
+    no value; a missing bid/ask is 0, as ``float(x or 0)`` treated it). ``fee`` is the
+    effective fee: a CEX venue's taker fee from EXCHANGES_CONFIG, or a DEX quote's own
+    ``fee`` falling back to the protocol fee in DEX_CONFIG. Only quotes carrying both a
+    bid and an ask are included.
+    """
+
+    def __init__(self, exchange_type: str, venues: List[str], pairs: List[str], bases: List[str],
+                 quote_tokens: List[str], bid: np.ndarray, ask: np.ndarray, quoted_fee: np.ndarray,
+                 liquidity: np.ndarray, age: np.ndarray):
+        self.exchange_type = exchange_type
+        self.venues, self.pairs, self.bases, self.quote_tokens = venues, pairs, bases, quote_tokens
+        self.bid, self.ask, self.liquidity, self.age = bid, ask, liquidity, age
+        # Fee as given by the quote (part of the signature) and the fee actually applied
+        self.quoted_fee = quoted_fee
+        self.fee = self._venue_fees(exchange_type, venues, quoted_fee)
+        max_age = config.GRAPH_CONFIG.get('max_quote_age')
+        self.stale = (np.nan_to_num(age) > max_age) if max_age is not None else np.zeros(len(venues), dtype=bool)
+
+    @staticmethod
+    def _venue_fees(exchange_type: str, venues: List[str], quoted_fee: np.ndarray) -> np.ndarray:
+        lookup = get_exchange_fee if exchange_type == 'cex' else get_dex_fee
+        fee_by_venue = {venue: lookup(venue) for venue in set(venues)}
+        venue_fee = np.array([fee_by_venue[venue] for venue in venues], dtype=float)
+        if exchange_type == 'cex':
+            return venue_fee
+        return np.where(np.isnan(quoted_fee), venue_fee, quoted_fee)
+
+    @classmethod
+    def from_quotes(cls, exchange_type: str, quotes) -> 'QuoteMatrix':
+        """Build from ``(venue, pair, quote dict)`` tuples; quotes without both bid and ask are skipped."""
+        venues, pairs, bases, quote_tokens, values = [], [], [], [], []
+        for venue, pair, pair_data in quotes:
+            if 'bid' not in pair_data or 'ask' not in pair_data:
+                continue
+            base, quote = pair.split('/')
+            venues.append(venue)
+            pairs.append(pair)
+            bases.append(base)
+            quote_tokens.append(quote)
+            values.append((float(pair_data.get('bid') or 0), float(pair_data.get('ask') or 0),
+                           _optional_float(pair_data.get('fee')), _optional_float(pair_data.get('liquidity')),
+                           _optional_float(pair_data.get('age'))))
+        columns = np.array(values, dtype=float).reshape(len(values), 5).T
+        return cls(exchange_type, venues, pairs, bases, quote_tokens, *columns)
+
+    @classmethod
+    def from_section(cls, exchange_type: str, section) -> 'QuoteMatrix':
+        """Build from a price_data section: QuoteStore columns are gathered directly, nested dicts are read per quote."""
+        if not isinstance(section, SectionQuotes):
+            return cls.from_quotes(exchange_type, ((venue, pair, pair_data)
+                                                   for venue, venue_data in section.items()
+                                                   for pair, pair_data in venue_data.items() if '/' in pair))
+        store = section.store
+        venues, pairs, bases, quote_tokens, rows = [], [], [], [], []
+        for venue, pair, base, quote, row in store.iter_rows(exchange_type):
+            venues.append(venue)
+            pairs.append(pair)
+            bases.append(base)
+            quote_tokens.append(quote)
+            rows.append(row)
+        rows = np.array(rows, dtype=np.intp)
+        bid, ask = store.column('bid')[rows], store.column('ask')[rows]
+        present = ~(np.isnan(bid) | np.isnan(ask))
+        if not present.all():
+            keep = np.flatnonzero(present).tolist()
+            venues, pairs = [venues[i] for i in keep], [pairs[i] for i in keep]
+            bases, quote_tokens = [bases[i] for i in keep], [quote_tokens[i] for i in keep]
+            rows = rows[present]
+        return cls(exchange_type, venues, pairs, bases, quote_tokens, store.column('bid')[rows],
+                   store.column('ask')[rows], store.column('fee')[rows], store.column('liquidity')[rows],
+                   store.column('age')[rows])
+
+    def __len__(self) -> int:
+        return len(self.venues)
+
+    def signature(self, i: int) -> Tuple:
+        """Same tuple as ``GraphBuilder._quote_signature`` for the quote in row ``i``."""
+        fee, liquidity = self.quoted_fee[i], self.liquidity[i]
+        return (float(self.bid[i]), float(self.ask[i]), None if np.isnan(fee) else float(fee),
+                None if np.isnan(liquidity) else float(liquidity), bool(self.stale[i]))
 
-# Import centralized validation thresholds
-from utils.constants import MAX_RATE_THRESHOLD, MIN_RATE_THRESHOLD, MAX_WEIGHT_THRESHOLD
 
 class GraphBuilder:
     """
@@ -106,6 +218,11 @@ class GraphBuilder:
     def __init__(self, ai_model):
         self.ai = ai_model
         self.graph = None
+        self.compiled_graph = None
+        # Last applied quote per (exchange_type, venue, pair) and the price edges it produced,
+        # so apply_price_updates can diff and touch only changed pairs
+        self._price_quotes: Dict[Tuple[str, str, str], Tuple] = {}
+        self._price_edge_keys: Dict[Tuple[str, str, str], List[Tuple[str, str]]] = {}
 
     def build_unified_graph(self, price_data: Dict[str, Any]) -> nx.DiGraph:
         """
@@ -117,12 +234,16 @@ class GraphBuilder:
             if not price_data:
                 raise ValueError(" Price data is empty or None")
 
-            # Validate price data
-            if not all(pair_data for exchange_data in price_data.get('cex', {}).values() for pair_data in exchange_data.values()):
+            # Validate price data (QuoteStore sections only ever hold quote rows)
+            cex_section = price_data.get('cex', {})
+            if not isinstance(cex_section, SectionQuotes) and \
+                    not all(pair_data for exchange_data in cex_section.values() for pair_data in exchange_data.values()):
                 raise ValueError(" Price data contains NoneType values")
 
             # Create directed graph
-            G = nx.DiGraph()
+            G = create_graph()
+            self._price_quotes = {}
+            self._price_edge_keys = {}
 
             # Add nodes for all tokens on all exchanges/protocols
             self.add_all_nodes(G, price_data)
@@ -137,11 +258,35 @@ class GraphBuilder:
 
         except Exception as e:
             logger.exception(f" Error building graph: {str(e)}")
-            return nx.DiGraph()
+            return create_graph()
+
+    def compile_graph(self, graph: Optional[nx.DiGraph] = None) -> CompiledGraph:
+        """
+        Emit an array-backed CompiledGraph for the detector.
+
+        Call this after strategies have added their edges: the compiled form is an
+        immutable snapshot of the graph at compile time.
+        """
+        source = graph if graph is not None else self.graph
+        if source is None:
+            source = create_graph()
+        compiled = CompiledGraph.from_graph(source)
+        logger.debug("Compiled graph: %d nodes, %d edges", compiled.number_of_nodes(), compiled.number_of_edges())
+        self.compiled_graph = compiled
+        return compiled
 
     def add_all_nodes(self, graph: nx.DiGraph, price_data: Dict[str, Any]):
         """Add all nodes (token@exchange) to the graph"""
 
+        if isinstance(price_data.get('cex'), SectionQuotes) and isinstance(price_data.get('dex'), SectionQuotes):
+            # Columnar snapshot: interned token names, no pair parsing or quote dicts
+            store = price_data['cex'].store
+            for exchange_type in ('cex', 'dex'):
+                for venue, _, base_token, quote_token, _ in store.iter_rows(exchange_type):
+                    graph.add_node(f"{base_token}@{venue}", exchange=venue, token=base_token, exchange_type=exchange_type)
+                    graph.add_node(f"{quote_token}@{venue}", exchange=venue, token=quote_token, exchange_type=exchange_type)
+            return
+
         # Add CEX nodes
         for exchange_name, exchange_data in price_data.get('cex', {}).items():
             for pair, pair_data in exchange_data.items():
@@ -180,214 +325,200 @@ class GraphBuilder:
                                  exchange_type='dex')
 
     def add_price_edges(self, graph: nx.DiGraph, price_data: Dict[str, Any]):
-        """Add edges based on trading pairs"""
-
-        # Add CEX trading pair edges
-        for exchange_name, exchange_data in price_data.get('cex', {}).items():
-            for pair, pair_data in exchange_data.items():
-                if '/' in pair and 'bid' in pair_data and 'ask' in pair_data:
-                    base_token, quote_token = pair.split('/')
-
-                    base_node = f"{base_token}@{exchange_name}"
-                    quote_node = f"{quote_token}@{exchange_name}"
-
-                    # Diagnostic: log the pair data structure and numeric types
-                    try:
-                        logger.debug(
-                            "CEX pair data %s@%s -> pair=%s bid=%s(%s) ask=%s(%s) volume=%s",
-                            base_token, exchange_name, pair,
-                            pair_data.get('bid'), type(pair_data.get('bid')).__name__,
-                            pair_data.get('ask'), type(pair_data.get('ask')).__name__,
-                            pair_data.get('volume')
-                        )
-                    except Exception:
-                        logger.debug("CEX pair data available for %s@%s pair=%s", base_token, exchange_name, pair)
-
-                    # Normalize bid/ask and apply explicit CEX fee
-                    bid = float(pair_data.get('bid', 0) or 0)
-                    ask = float(pair_data.get('ask', 0) or 0)
-                    cex_fee = 0.001  # 0.1% CEX fee
-
-                    # Base -> Quote (selling base for quote)
-                    if bid > 0:
-                        # Validate bid is reasonable (not extreme)
-                        if bid > MAX_RATE_THRESHOLD or bid < MIN_RATE_THRESHOLD:
-                            logger.warning(f"Extreme bid price {bid} for pair {pair} on {exchange_name}. Skipping edge.")
-                            continue
-                        
-                        rate = bid
-                        try:
-                            weight = -math.log(rate * (1 - cex_fee))
-                            
-                            # Validate weight is not extreme
-                            if abs(weight) > MAX_WEIGHT_THRESHOLD:
-                                logger.warning(f"Extreme weight {weight:.2f} for pair {pair} on {exchange_name}. "
-                                             f"bid={bid}, fee={cex_fee}. Skipping edge.")
-                                continue
-                            
-                            logger.debug(
-                                "Adding CEX sell edge %s->%s bid=%s computed_weight=%s rate=%s",
-                                base_node, quote_node, bid, weight, rate
-                            )
-                            graph.add_edge(base_node, quote_node,
-                                         weight=weight,
-                                         rate=rate,
-                                         fee=cex_fee,
-                                         pair=pair,
-                                         exchange=exchange_name,
-                                         action='sell')
-                        except (ValueError, OverflowError) as e:
-                            logger.error(f"Error calculating weight for {pair}: {e}")
-                            continue
+        """Add the sell/buy price edges of every quote in the snapshot, computed in one batch per section"""
+        for exchange_type in ('cex', 'dex'):
+            quotes = QuoteMatrix.from_section(exchange_type, price_data.get(exchange_type, {}))
+            if not len(quotes):
+                continue
+            per_quote = self.price_edges_batch(quotes)
+            graph.add_edges_from(edge for edges in per_quote for edge in edges)
+            for i, edges in enumerate(per_quote):
+                key = (exchange_type, quotes.venues[i], quotes.pairs[i])
+                self._price_quotes[key] = quotes.signature(i)
+                self._price_edge_keys[key] = [(u, v) for u, v, _ in edges]
+
+    def price_edges_for_quote(self, exchange_type: str, venue: str, pair: str,
+                              pair_data: Dict[str, Any]) -> List[Tuple[str, str, Dict[str, Any]]]:
+        """
+        Compute the sell (base->quote) and buy (quote->base) edges for one ticker.
 
-                    # Quote -> Base (buying base with quote)
-                    if ask > 0:
-                        # Validate ask is reasonable
-                        if ask > MAX_RATE_THRESHOLD or ask < MIN_RATE_THRESHOLD:
-                            logger.warning(f"Extreme ask price {ask} for pair {pair} on {exchange_name}. Skipping edge.")
-                            continue
-                        
-                        # Protect against division by zero; invert ask to get base per quote
-                        inv_rate = 1.0 / ask
-                        
-                        # Validate inverted rate
-                        if inv_rate > MAX_RATE_THRESHOLD or inv_rate < MIN_RATE_THRESHOLD:
-                            logger.warning(f"Extreme inverted rate {inv_rate} (1/{ask}) for pair {pair} on {exchange_name}. Skipping edge.")
-                            continue
-                        
-                        try:
-                            weight = -math.log(inv_rate * (1 - cex_fee))
-                            
-                            # Validate weight is not extreme
-                            if abs(weight) > MAX_WEIGHT_THRESHOLD:
-                                logger.warning(f"Extreme weight {weight:.2f} for pair {pair} on {exchange_name}. "
-                                             f"ask={ask}, inv_rate={inv_rate}, fee={cex_fee}. Skipping edge.")
-                                continue
-                            
-                            logger.debug(
-                                "Adding CEX buy edge %s->%s ask=%s inv_rate=%s computed_weight=%s",
-                                quote_node, base_node, ask, inv_rate, weight
-                            )
-                            graph.add_edge(quote_node, base_node,
-                                         weight=weight,
-                                         rate=inv_rate,
-                                         fee=cex_fee,
-                                         pair=pair,
-                                         exchange=exchange_name,
-                                         action='buy')
-                        except (ValueError, OverflowError) as e:
-                            logger.error(f"Error calculating weight for {pair}: {e}")
-                            continue
+        Returns ``(u, v, attrs)`` tuples for the edges that pass validation. An
+        extreme bid (or a rejected sell weight) drops the whole pair, matching the
+        original per-pair ``continue`` semantics of ``add_price_edges``.
+        """
+        return self.price_edges_batch(QuoteMatrix.from_quotes(exchange_type, [(venue, pair, pair_data)]))[0]
 
-        # Add DEX trading pair edges
-        for protocol_name, protocol_data in price_data.get('dex', {}).items():
-            for pair, pair_data in protocol_data.items():
-                if '/' in pair and 'bid' in pair_data and 'ask' in pair_data:
-                    base_token, quote_token = pair.split('/')
+    def price_edges_batch(self, quotes: 'QuoteMatrix') -> List[List[Tuple[str, str, Dict[str, Any]]]]:
+        """
+        Price edges of every quote in ``quotes``, as one ``(u, v, attrs)`` list per quote.
 
-                    base_node = f"{base_token}@{protocol_name}"
-                    quote_node = f"{quote_token}@{protocol_name}"
+        Weights, rate thresholds and MAX_WEIGHT_THRESHOLD rejections are evaluated on
+        whole arrays. Per quote: a bid outside the rate thresholds, or a sell weight that
+        is extreme or undefined, drops the pair; an unusable ask drops only the buy edge.
+        Stale quotes (GRAPH_CONFIG['max_quote_age']) produce no edges.
+        """
+        bid, ask, fee, stale = quotes.bid, quotes.ask, quotes.fee, quotes.stale
+
+        with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+            has_bid = bid > 0
+            bid_extreme = has_bid & ((bid > MAX_RATE_THRESHOLD) | (bid < MIN_RATE_THRESHOLD))
+            sell_weight = -np.log(bid * (1 - fee))
+            # NaN/inf weights (rate * (1 - fee) <= 0) fail the comparison and are rejected too
+            sell_rejected = has_bid & ~bid_extreme & ~(np.abs(sell_weight) <= MAX_WEIGHT_THRESHOLD)
+            keep = ~(stale | bid_extreme | sell_rejected)
+            sell = keep & has_bid
+
+            has_ask = ask > 0
+            inv_rate = np.where(has_ask, 1.0 / np.where(has_ask, ask, 1.0), 0.0)
+            ask_extreme = has_ask & ((ask > MAX_RATE_THRESHOLD) | (ask < MIN_RATE_THRESHOLD) |
+                                     (inv_rate > MAX_RATE_THRESHOLD) | (inv_rate < MIN_RATE_THRESHOLD))
+            buy_weight = -np.log(inv_rate * (1 - fee))
+            buy_rejected = has_ask & ~ask_extreme & ~(np.abs(buy_weight) <= MAX_WEIGHT_THRESHOLD)
+            buy = keep & has_ask & ~ask_extreme & ~buy_rejected
+
+        self._log_rejected_quotes(quotes, stale, bid_extreme, sell_rejected, keep & (ask_extreme | buy_rejected),
+                                  sell_weight, buy_weight)
+
+        is_dex = quotes.exchange_type == 'dex'
+        liquidity = np.nan_to_num(quotes.liquidity).tolist() if is_dex else None
+        rows = zip(quotes.venues, quotes.pairs, quotes.bases, quotes.quote_tokens, sell.tolist(), buy.tolist(),
+                   bid.tolist(), inv_rate.tolist(), fee.tolist(), sell_weight.tolist(), buy_weight.tolist())
+        per_quote = []
+        for i, (venue, pair, base, quote, has_sell, has_buy, rate, inv, f, w_sell, w_buy) in enumerate(rows):
+            edges = []
+            if has_sell or has_buy:
+                base_node, quote_node = f"{base}@{venue}", f"{quote}@{venue}"
+                if has_sell:
+                    attrs = {'weight': w_sell, 'rate': rate, 'fee': f, 'pair': pair, 'exchange': venue,
+                             'action': 'sell'}
+                    if is_dex:
+                        attrs['liquidity'] = liquidity[i]
+                    edges.append((base_node, quote_node, attrs))
+                if has_buy:
+                    attrs = {'weight': w_buy, 'rate': inv, 'fee': f, 'pair': pair, 'exchange': venue,
+                             'action': 'buy'}
+                    if is_dex:
+                        attrs['liquidity'] = liquidity[i]
+                    edges.append((quote_node, base_node, attrs))
+            per_quote.append(edges)
+
+        if trace.enabled:
+            for i, edges in enumerate(per_quote):
+                trace.emit('quote', kind=quotes.exchange_type, venue=quotes.venues[i], pair=quotes.pairs[i],
+                           bid=float(bid[i]), ask=float(ask[i]), fee=float(fee[i]))
+                for u, v, attrs in edges:
+                    trace.emit('edge', src=u, dst=v, action=attrs['action'], rate=attrs['rate'], weight=attrs['weight'])
+        return per_quote
+
+    @staticmethod
+    def _log_rejected_quotes(quotes: 'QuoteMatrix', stale, bid_extreme, sell_rejected, buy_dropped,
+                             sell_weight, buy_weight):
+        """Warn about rejected quotes; only rejected rows are visited."""
+        for i in np.flatnonzero(stale).tolist():
+            logger.debug("Skipping stale quote %s on %s (age %.1fs)", quotes.pairs[i], quotes.venues[i], quotes.age[i])
+        for i in np.flatnonzero(bid_extreme).tolist():
+            logger.warning(f"Extreme bid price {quotes.bid[i]} for pair {quotes.pairs[i]} on {quotes.venues[i]}. "
+                           f"Skipping edge.")
+        for i in np.flatnonzero(sell_rejected).tolist():
+            logger.warning(f"Extreme weight {sell_weight[i]:.2f} for pair {quotes.pairs[i]} on {quotes.venues[i]}. "
+                           f"bid={quotes.bid[i]}, fee={quotes.fee[i]}. Skipping edge.")
+        for i in np.flatnonzero(buy_dropped).tolist():
+            logger.warning(f"Extreme ask {quotes.ask[i]} (weight {buy_weight[i]:.2f}) for pair {quotes.pairs[i]} "
+                           f"on {quotes.venues[i]}. Skipping buy edge.")
+
+    @staticmethod
+    def _quote_signature(pair_data: Dict[str, Any]) -> Tuple:
+        """Fields that determine a pair's price edges; equal signatures mean no edge change."""
+        fee, liquidity = pair_data.get('fee'), pair_data.get('liquidity')
+        return (float(pair_data.get('bid') or 0), float(pair_data.get('ask') or 0),
+                None if fee is None else float(fee), None if liquidity is None else float(liquidity),
+                GraphBuilder._is_stale_quote(pair_data))
+
+    @staticmethod
+    def _is_stale_quote(pair_data: Dict[str, Any]) -> bool:
+        """True when the quote's age exceeds GRAPH_CONFIG['max_quote_age']."""
+        max_age = config.GRAPH_CONFIG.get('max_quote_age')
+        return max_age is not None and (pair_data.get('age') or 0.0) > max_age
+
+    def apply_price_updates(self, changed_quotes: Dict[str, Any], graph: Optional[nx.DiGraph] = None) -> Set[str]:
+        """
+        Update the persistent graph in place from changed tickers.
 
-                    dex_fee = pair_data.get('fee', 0.003)  # Default 0.3%
-
-                    # Diagnostic: log DEX pair data and fee/liquidity fields
-                    try:
-                        logger.debug(
-                            "DEX pair data %s@%s -> pair=%s bid=%s ask=%s fee=%s liquidity=%s",
-                            base_token, protocol_name, pair,
-                            pair_data.get('bid'), pair_data.get('ask'),
-                            dex_fee, pair_data.get('liquidity')
-                        )
-                    except Exception:
-                        logger.debug("DEX pair data available for %s@%s pair=%s", base_token, protocol_name, pair)
-
-                    # Base -> Quote
-                    bid = pair_data.get('bid', 0)
-                    if bid > 0:
-                        # Validate bid is reasonable
-                        if bid > MAX_RATE_THRESHOLD or bid < MIN_RATE_THRESHOLD:
-                            logger.warning(f"Extreme DEX bid {bid} for {pair} on {protocol_name}. Skipping.")
-                            continue
-                        
-                        try:
-                            weight = -math.log(bid * (1 - dex_fee))
-                            
-                            # Validate weight
-                            if abs(weight) > MAX_WEIGHT_THRESHOLD:
-                                logger.warning(f"Extreme DEX weight {weight:.2f} for {pair}. Skipping.")
-                                continue
-                            
-                            logger.debug(
-                                "Adding DEX sell edge %s->%s bid=%s fee=%s computed_weight=%s rate=%s",
-                                base_node, quote_node, bid, dex_fee, weight, bid
-                            )
-                            graph.add_edge(base_node, quote_node,
-                                         weight=weight,
-                                         rate=bid,
-                                         fee=dex_fee,
-                                         pair=pair,
-                                         exchange=protocol_name,
-                                         action='sell',
-                                         liquidity=pair_data.get('liquidity', 0))
-                        except (ValueError, OverflowError) as e:
-                            logger.error(f"Error calculating DEX weight for {pair}: {e}")
-                            continue
+        ``changed_quotes`` uses the price_data layout (``{'cex': {venue: {pair: quote}},
+        'dex': {...}}``); it may be a full snapshot, since quotes identical to the last
+        applied ones are skipped. A quote of ``None`` removes that pair's edges. Only the
+        edges of changed pairs are recomputed, so the cost tracks the size of the change.
 
-                    # Quote -> Base
-                    ask = pair_data.get('ask', 0)
-                    if ask > 0:
-                        # Validate ask is reasonable
-                        if ask > MAX_RATE_THRESHOLD or ask < MIN_RATE_THRESHOLD:
-                            logger.warning(f"Extreme DEX ask {ask} for {pair} on {protocol_name}. Skipping.")
-                            continue
-                        
-                        inv_rate = 1 / ask
-                        
-                        # Validate inverted rate
-                        if inv_rate > MAX_RATE_THRESHOLD or inv_rate < MIN_RATE_THRESHOLD:
-                            logger.warning(f"Extreme DEX inv_rate {inv_rate} for {pair}. Skipping.")
-                            continue
-                        
-                        try:
-                            weight = -math.log(inv_rate * (1 - dex_fee))
-                            
-                            # Validate weight
-                            if abs(weight) > MAX_WEIGHT_THRESHOLD:
-                                logger.warning(f"Extreme DEX weight {weight:.2f} for {pair}. Skipping.")
-                                continue
-                            
-                            logger.debug(
-                                "Adding DEX buy edge %s->%s ask=%s inv_rate=%s fee=%s computed_weight=%s",
-                                quote_node, base_node, ask, inv_rate, dex_fee, weight
-                            )
-                            graph.add_edge(quote_node, base_node,
-                                         weight=weight,
-                                         rate=inv_rate,
-                                         fee=dex_fee,
-                                         pair=pair,
-                                         exchange=protocol_name,
-                                         action='buy',
-                                         liquidity=pair_data.get('liquidity', 0))
-                        except (ValueError, OverflowError) as e:
-                            logger.error(f"Error calculating DEX weight for {pair}: {e}")
+        Returns the set of dirty nodes (endpoints of every edge added, re-weighted or removed).
+        """
+        if graph is None:
+            graph = self.graph
+        if graph is None:
+            # Nothing to update yet: the first snapshot is a full build
+            graph = self.build_unified_graph(changed_quotes)
+            return set(graph.nodes())
+
+        dirty: Set[str] = set()
+        for exchange_type in ('cex', 'dex'):
+            for venue, venue_data in changed_quotes.get(exchange_type, {}).items():
+                for pair, pair_data in venue_data.items():
+                    if '/' not in pair:
+                        continue
+                    key = (exchange_type, venue, pair)
+
+                    if pair_data is None:
+                        edges = []
+                        self._price_quotes.pop(key, None)
+                    elif 'bid' in pair_data and 'ask' in pair_data:
+                        signature = self._quote_signature(pair_data)
+                        if self._price_quotes.get(key) == signature:
                             continue
+                        edges = self.price_edges_for_quote(exchange_type, venue, pair, pair_data)
+                        self._price_quotes[key] = signature
+                    else:
+                        continue
+
+                    new_keys = [(u, v) for u, v, _ in edges]
+                    for u, v in self._price_edge_keys.get(key, []):
+                        if (u, v) not in new_keys and graph.has_edge(u, v):
+                            graph.remove_edge(u, v)
+                            dirty.update((u, v))
+
+                    for u, v, attrs in edges:
+                        for node in (u, v):
+                            if not graph.has_node(node):
+                                token = node.split('@')[0]
+                                graph.add_node(node, exchange=venue, token=token, exchange_type=exchange_type)
+                        data = graph.get_edge_data(u, v)
+                        if data is None:
+                            graph.add_edge(u, v, **attrs)
+                        else:
+                            data.update(attrs)
+                        dirty.update((u, v))
+
+                    if new_keys:
+                        self._price_edge_keys[key] = new_keys
+                    else:
+                        self._price_edge_keys.pop(key, None)
+
+        if dirty:
+            logger.info(f" Applied price updates: {len(dirty)} dirty nodes")
+        return dirty
 
     def add_cross_exchange_edges(self, graph: nx.DiGraph, price_data: Dict[str, Any]):
         """Add edges between same tokens on different exchanges"""
         try:
             tokens = price_data.get('tokens', [])
+            index = graph_index(graph)
 
             for token in tokens:
                 # Get all nodes for this token
-                token_nodes = [node for node in graph.nodes() 
-                              if node.startswith(f"{token}@")]
+                token_nodes = [(node, index.info[node].venue) for node in index.token_nodes(token)]
 
                 # Add edges between all pairs of nodes for this token
-                for i, node1 in enumerate(token_nodes):
-                    for j, node2 in enumerate(token_nodes):
+                for i, (node1, exchange1) in enumerate(token_nodes):
+                    for j, (node2, exchange2) in enumerate(token_nodes):
                         if i != j:
-                            exchange1 = node1.split('@')[1]
-                            exchange2 = node2.split('@')[1]
 
                             # Calculate transfer cost and time
                             transfer_cost = self.calculate_transfer_cost(token, exchange1, exchange2)
@@ -441,58 +572,58 @@ class GraphBuilder:
                 'ETH': 'wETH'
             }
 
-            for native, wrapped in wrapped_pairs.items():
-                # Find all DEX nodes with these tokens
-                native_nodes = [node for node in graph.nodes() 
-                              if node.startswith(f"{native}@") and 
-                              any(dex in node for dex in ['uniswap', 'sushi'])]
+            index = graph_index(graph)
 
-                wrapped_nodes = [node for node in graph.nodes()
-                               if node.startswith(f"{wrapped}@") and
-                               any(dex in node for dex in ['uniswap', 'sushi'])]
+            for native, wrapped in wrapped_pairs.items():
+                # DEX nodes of the wrapped token, by protocol
+                wrapped_nodes = {index.info[node].venue: node for node in index.token_nodes(wrapped)
+                                 if any(dex in node for dex in ['uniswap', 'sushi'])}
 
                 # Add wrap/unwrap edges
-                for native_node in native_nodes:
-                    for wrapped_node in wrapped_nodes:
-                        if native_node.split('@')[1] == wrapped_node.split('@')[1]:
-                            # Same protocol - can wrap/unwrap
-
-                            wrap_fee = 0.001  # Gas fee for wrapping
-
-                            # Native -> Wrapped (wrap)
-                            wrap_weight = -math.log(1 - wrap_fee)
-                            graph.add_edge(native_node, wrapped_node,
-                                         weight=wrap_weight,
-                                         rate=1.0,
-                                         fee=wrap_fee,
-                                         operation='wrap')
-
-                            # Wrapped -> Native (unwrap)
-                            unwrap_weight = -math.log(1 - wrap_fee)
-                            graph.add_edge(wrapped_node, native_node,
-                                         weight=unwrap_weight,
-                                         rate=1.0,
-                                         fee=wrap_fee,
-                                         operation='unwrap')
+                for native_node in index.token_nodes(native):
+                    wrapped_node = wrapped_nodes.get(index.info[native_node].venue)
+                    if wrapped_node is not None:
+                        # Same protocol - can wrap/unwrap
+
+                        wrap_fee = 0.001  # Gas fee for wrapping
+
+                        # Native -> Wrapped (wrap)
+                        wrap_weight = -math.log(1 - wrap_fee)
+                        graph.add_edge(native_node, wrapped_node,
+                                     weight=wrap_weight,
+                                     rate=1.0,
+                                     fee=wrap_fee,
+                                     operation='wrap')
+
+                        # Wrapped -> Native (unwrap)
+                        unwrap_weight = -math.log(1 - wrap_fee)
+                        graph.add_edge(wrapped_node, native_node,
+                                     weight=unwrap_weight,
+                                     rate=1.0,
+                                     fee=wrap_fee,
+                                     operation='unwrap')
 
             logger.info(f" Added wrapped token edges")
 
         except Exception as e:
             logger.exception(f" Error adding wrapped token edges: {str(e)}")
 
-    def get_graph_statistics(self) -> Dict[str, Any]:
-        """Get graph statistics"""
-        if not self.graph:
+    def get_graph_statistics(self, graph: Optional[nx.DiGraph] = None) -> Dict[str, Any]:
+        """Get graph statistics (defaults to the last built graph)"""
+        graph = graph if graph is not None else self.graph
+        if not graph:
             return {}
 
+        index = graph_index(graph)
+        algorithms = _graph_algorithms(graph)
         return {
-            'nodes': self.graph.number_of_nodes(),
-            'edges': self.graph.number_of_edges(),
-            'density': nx.density(self.graph),
-            'tokens': len(set(node.split('@')[0] for node in self.graph.nodes())),
-            'exchanges': len(set(node.split('@')[1] for node in self.graph.nodes())),
-            'strongly_connected_components': nx.number_strongly_connected_components(self.graph),
-            'weakly_connected_components': nx.number_weakly_connected_components(self.graph)
+            'nodes': graph.number_of_nodes(),
+            'edges': graph.number_of_edges(),
+            'density': algorithms.density(graph),
+            'tokens': len(index.tokens),
+            'exchanges': len(index.venues),
+            'strongly_connected_components': algorithms.number_strongly_connected_components(graph),
+            'weakly_connected_components': algorithms.number_weakly_connected_components(graph)
         }
 
     def visualize_subgraph(self, token: str) -> Dict[str, Any]:
@@ -501,8 +632,8 @@ class GraphBuilder:
             return {}
 
         # Get all nodes for this token
-        token_nodes = [node for node in self.graph.nodes() 
-                      if node.startswith(f"{token}@")]
+        index = graph_index(self.graph)
+        token_nodes = index.token_nodes(token)
 
         if not token_nodes:
             return {}
@@ -515,7 +646,7 @@ class GraphBuilder:
         edges_data = []
 
         for node in subgraph.nodes():
-            exchange = node.split('@')[1]
+            exchange = index.info[node].venue
             nodes_data.append({
                 'id': node,
                 'label': exchange,
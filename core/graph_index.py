@@ -0,0 +1,140 @@
+import logging
+from collections import namedtuple
+from functools import lru_cache
+from typing import Any, Dict, List, Mapping, Optional
+
+logger = logging.getLogger(__name__)
+
+# token, venue and venue type ('cex' / 'dex') of a "TOKEN@venue" node
+NodeInfo = namedtuple('NodeInfo', ['token', 'venue', 'exchange_type'])
+
+# Venue-name markers used to guess the type of nodes built without an exchange_type attribute
+DEX_VENUE_MARKERS = ('uniswap', 'sushi', 'pancake')
+
+
+@lru_cache(maxsize=65536)
+def parse_node(node: str) -> Optional[NodeInfo]:
+    """Split a "TOKEN@venue" node name once (cached); None for names without a venue."""
+    if not isinstance(node, str):
+        return None
+    token, sep, venue = node.partition('@')
+    if not sep:
+        return None
+    lowered = venue.lower()
+    exchange_type = 'dex' if any(marker in lowered for marker in DEX_VENUE_MARKERS) else 'cex'
+    return NodeInfo(token, venue, exchange_type)
+
+
+class GraphIndex:
+    """
+    Secondary indexes over the nodes of an arbitrage graph.
+
+    Keeps node -> NodeInfo(token, venue, exchange_type), token -> nodes and venue -> nodes.
+    Node attributes (``token``, ``exchange``, ``exchange_type`` as set by
+    ``GraphBuilder.add_all_nodes``) take precedence over what the node name implies.
+    Token and venue node lists keep the order the nodes were added in, i.e. graph order.
+    Names without '@' are tracked (so ``len`` matches the graph) but not indexed.
+    """
+
+    def __init__(self):
+        self.info: Dict[Any, Optional[NodeInfo]] = {}
+        # dicts used as insertion-ordered sets
+        self._by_token: Dict[str, Dict[Any, None]] = {}
+        self._by_venue: Dict[str, Dict[Any, None]] = {}
+
+    @classmethod
+    def from_graph(cls, graph) -> 'GraphIndex':
+        index = cls()
+        try:
+            nodes = graph.nodes(data=True)
+        except TypeError:
+            nodes = ((node, None) for node in graph.nodes())
+        for node, attrs in nodes:
+            index.add(node, attrs)
+        return index
+
+    def add(self, node, attrs: Optional[Mapping[str, Any]] = None):
+        """Index ``node`` (again, if its attributes changed)."""
+        current = self.info.get(node)
+        if current is not None and attrs and current == (attrs.get('token', current.token),
+                                                         attrs.get('exchange', current.venue),
+                                                         attrs.get('exchange_type', current.exchange_type)):
+            # Re-adding a node with unchanged attributes (every pair re-adds its quote token)
+            return
+        info = parse_node(node)
+        if info is not None and attrs:
+            token = attrs.get('token') or info.token
+            venue = attrs.get('exchange') or info.venue
+            exchange_type = attrs.get('exchange_type') or info.exchange_type
+            if (token, venue, exchange_type) != info:
+                info = NodeInfo(token, venue, exchange_type)
+
+        if node in self.info:
+            if self.info[node] == info:
+                return
+            self.discard(node)
+        self.info[node] = info
+        if info is not None:
+            self._by_token.setdefault(info.token, {})[node] = None
+            self._by_venue.setdefault(info.venue, {})[node] = None
+
+    def discard(self, node):
+        info = self.info.pop(node, None)
+        if info is None:
+            return
+        for bucket, key in ((self._by_token, info.token), (self._by_venue, info.venue)):
+            nodes = bucket.get(key)
+            if nodes is not None:
+                nodes.pop(node, None)
+                if not nodes:
+                    del bucket[key]
+
+    def copy(self) -> 'GraphIndex':
+        dup = GraphIndex()
+        dup.info = dict(self.info)
+        dup._by_token = {token: dict(nodes) for token, nodes in self._by_token.items()}
+        dup._by_venue = {venue: dict(nodes) for venue, nodes in self._by_venue.items()}
+        return dup
+
+    def clear(self):
+        self.info.clear()
+        self._by_token.clear()
+        self._by_venue.clear()
+
+    def token_nodes(self, token: str) -> List[str]:
+        return list(self._by_token.get(token, ()))
+
+    def venue_nodes(self, venue: str) -> List[str]:
+        return list(self._by_venue.get(venue, ()))
+
+    @property
+    def tokens(self) -> List[str]:
+        return list(self._by_token)
+
+    @property
+    def venues(self) -> List[str]:
+        return list(self._by_venue)
+
+    def node_info(self, node) -> Optional[NodeInfo]:
+        """Indexed info for ``node``, falling back to parsing its name."""
+        info = self.info.get(node)
+        return info if info is not None else parse_node(node)
+
+    def __len__(self) -> int:
+        return len(self.info)
+
+    def __contains__(self, node) -> bool:
+        return node in self.info
+
+
+def graph_index(graph) -> GraphIndex:
+    """
+    The index ``graph`` maintains (graphs built by GraphBuilder), or a fresh one.
+
+    A maintained index is only trusted while it covers exactly the graph's nodes; for
+    plain networkx graphs and subgraph views the index is built in one O(V) pass.
+    """
+    index = getattr(graph, 'graph_index', None)
+    if isinstance(index, GraphIndex) and len(index) == graph.number_of_nodes():
+        return index
+    return GraphIndex.from_graph(graph)
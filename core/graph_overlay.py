@@ -0,0 +1,178 @@
+import logging
+from typing import Any, Dict, Iterator, List, Optional
+
+from core.graph_index import GraphIndex, graph_index as index_of_graph
+from core.lean_graph import _NodeView
+
+logger = logging.getLogger(__name__)
+
+
+class _OverlayAdjacency:
+    """``overlay[u]``: the out-edges of ``u``; looking up an edge hands out the overlay's own copy."""
+
+    __slots__ = ('_overlay', '_node')
+
+    def __init__(self, overlay: 'OverlayGraph', node):
+        self._overlay = overlay
+        self._node = node
+
+    def __getitem__(self, v) -> Dict[str, Any]:
+        data = self._overlay._edge_for_write(self._node, v)
+        if data is None:
+            raise KeyError(v)
+        return data
+
+    def __contains__(self, v) -> bool:
+        return self._overlay.has_edge(self._node, v)
+
+    def __iter__(self) -> Iterator:
+        return self._overlay.successors(self._node)
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self._overlay.successors(self._node))
+
+    def get(self, v, default=None):
+        return self[v] if v in self else default
+
+
+class OverlayGraph:
+    """
+    Copy-on-write layer over a graph: reads fall through to ``base``, writes stay in the overlay.
+
+    Strategies add their edges to an overlay of the persistent price graph, so a scan
+    neither copies nor mutates it. Writing to a base edge (``add_edge`` on an existing
+    edge, or ``overlay[u][v]``, which callers may mutate) first copies its attribute dict
+    into the overlay. Nodes and edges iterate in the order a modified copy of ``base``
+    would have, so compiling an overlay gives the same CompiledGraph. ``base`` is any
+    graph keeping networkx-style ``_node`` / ``_succ`` dicts (ArbitrageGraph, LeanDiGraph).
+    """
+
+    def __init__(self, base):
+        self.base = base
+        self._base_node: Dict[Any, Dict[str, Any]] = base._node
+        self._base_succ: Dict[Any, Dict[Any, Dict[str, Any]]] = base._succ
+        # Nodes missing from base, and per-source edges (copied base edges and new ones)
+        self._node: Dict[Any, Dict[str, Any]] = {}
+        self._succ: Dict[Any, Dict[Any, Dict[str, Any]]] = {}
+        self._new_edge_count = 0
+        self._index: Optional[GraphIndex] = None
+        self.graph: Dict[str, Any] = dict(getattr(base, 'graph', {}) or {})
+
+    # ------------------------------------------------------------------
+    # Nodes
+    # ------------------------------------------------------------------
+    def has_node(self, node) -> bool:
+        return node in self._base_node or node in self._node
+
+    def add_node(self, node, **attrs):
+        if node in self._base_node:
+            if attrs:
+                raise ValueError(f"{node} belongs to the base graph; overlays do not edit base node attributes")
+            return
+        existing = self._node.get(node)
+        if existing is None:
+            self._node[node] = attrs
+            self._index = None
+        else:
+            existing.update(attrs)
+
+    @property
+    def nodes(self) -> _NodeView:
+        if not self._node:
+            return _NodeView(self._base_node)
+        return _NodeView({**self._base_node, **self._node})
+
+    def number_of_nodes(self) -> int:
+        return len(self._base_node) + len(self._node)
+
+    @property
+    def graph_index(self) -> GraphIndex:
+        """The base graph's index while no node was added, otherwise one built over the overlay."""
+        if not self._node:
+            return index_of_graph(self.base)
+        if self._index is None:
+            self._index = GraphIndex.from_graph(self)
+        return self._index
+
+    # ------------------------------------------------------------------
+    # Edges
+    # ------------------------------------------------------------------
+    def has_edge(self, u, v) -> bool:
+        targets = self._succ.get(u)
+        if targets is not None and v in targets:
+            return True
+        targets = self._base_succ.get(u)
+        return targets is not None and v in targets
+
+    def get_edge_data(self, u, v, default=None):
+        targets = self._succ.get(u)
+        if targets is not None and v in targets:
+            return targets[v]
+        targets = self._base_succ.get(u)
+        if targets is not None and v in targets:
+            return targets[v]
+        return default
+
+    def _edge_for_write(self, u, v) -> Optional[Dict[str, Any]]:
+        targets = self._succ.get(u)
+        if targets is not None and v in targets:
+            return targets[v]
+        base_targets = self._base_succ.get(u)
+        if base_targets is None or v not in base_targets:
+            return None
+        data = dict(base_targets[v])
+        self._succ.setdefault(u, {})[v] = data
+        return data
+
+    def add_edge(self, u, v, **attrs):
+        for node in (u, v):
+            if not self.has_node(node):
+                self.add_node(node)
+        data = self._edge_for_write(u, v)
+        if data is None:
+            self._succ.setdefault(u, {})[v] = attrs
+            self._new_edge_count += 1
+        else:
+            data.update(attrs)
+
+    def successors(self, node) -> Iterator:
+        base_targets = self._base_succ.get(node, {})
+        yield from base_targets
+        for v in self._succ.get(node, ()):
+            if v not in base_targets:
+                yield v
+
+    def edges(self, data: bool = False) -> List:
+        edges = []
+        for u in self.nodes:
+            base_targets = self._base_succ.get(u, {})
+            targets = self._succ.get(u, {})
+            for v, attrs in base_targets.items():
+                edges.append((u, v, targets.get(v, attrs)) if data else (u, v))
+            for v, attrs in targets.items():
+                if v not in base_targets:
+                    edges.append((u, v, attrs) if data else (u, v))
+        return edges
+
+    def number_of_edges(self) -> int:
+        return self.base.number_of_edges() + self._new_edge_count
+
+    def __getitem__(self, u) -> _OverlayAdjacency:
+        if not self.has_node(u):
+            raise KeyError(u)
+        return _OverlayAdjacency(self, u)
+
+    def is_directed(self) -> bool:
+        return True
+
+    def is_multigraph(self) -> bool:
+        return False
+
+    def __len__(self) -> int:
+        return self.number_of_nodes()
+
+    def __iter__(self) -> Iterator:
+        return iter(self.nodes)
+
+    def __contains__(self, node) -> bool:
+        return self.has_node(node)
@@ -0,0 +1,242 @@
+import logging
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from core.compiled_graph import CompiledGraph
+from core.graph_index import GraphIndex
+
+logger = logging.getLogger(__name__)
+
+
+class _NodeView:
+    """``graph.nodes``: callable like networkx (``nodes()``, ``nodes(data=True)``) and subscriptable for attributes."""
+
+    __slots__ = ('_nodes',)
+
+    def __init__(self, nodes: Dict[Any, Dict[str, Any]]):
+        self._nodes = nodes
+
+    def __call__(self, data: bool = False) -> List:
+        return list(self._nodes.items()) if data else list(self._nodes)
+
+    def __getitem__(self, node) -> Dict[str, Any]:
+        return self._nodes[node]
+
+    def __iter__(self) -> Iterator:
+        return iter(self._nodes)
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+    def __contains__(self, node) -> bool:
+        return node in self._nodes
+
+    def items(self):
+        return self._nodes.items()
+
+
+class LeanDiGraph:
+    """
+    Minimal directed graph covering the networkx DiGraph API this project uses.
+
+    Adjacency is a dict of dicts (``_succ[u][v]`` is the edge attribute dict), so
+    ``graph[u][v]``, ``has_edge`` and ``get_edge_data`` are single lookups and edge
+    attribute dicts are shared, not wrapped in views. The graph is rebuilt every scan
+    and mostly appended to, so it keeps no predecessor map: ``remove_node`` scans the
+    adjacency instead. A GraphIndex (token/venue lookups) is maintained as nodes are added.
+    """
+
+    __slots__ = ('_node', '_succ', '_edge_count', 'graph_index', 'graph')
+
+    def __init__(self):
+        self._node: Dict[Any, Dict[str, Any]] = {}
+        self._succ: Dict[Any, Dict[Any, Dict[str, Any]]] = {}
+        self._edge_count = 0
+        self.graph_index = GraphIndex()
+        # Graph-level attributes, as networkx's ``G.graph``
+        self.graph: Dict[str, Any] = {}
+
+    # ------------------------------------------------------------------
+    # Nodes
+    # ------------------------------------------------------------------
+    def _new_node(self, node, attrs: Optional[Dict[str, Any]] = None):
+        self._node[node] = attrs if attrs is not None else {}
+        self._succ[node] = {}
+        self.graph_index.add(node, attrs)
+
+    def add_node(self, node, **attrs):
+        existing = self._node.get(node)
+        if existing is None:
+            self._new_node(node, attrs)
+        elif attrs:
+            existing.update(attrs)
+            self.graph_index.add(node, existing)
+
+    def add_nodes_from(self, nodes: Iterable, **attrs):
+        for item in nodes:
+            if isinstance(item, tuple) and len(item) == 2 and isinstance(item[1], dict):
+                self.add_node(item[0], **{**attrs, **item[1]})
+            else:
+                self.add_node(item, **attrs)
+
+    def remove_node(self, node):
+        if node not in self._node:
+            raise KeyError(f"The node {node} is not in the graph.")
+        self._edge_count -= len(self._succ.pop(node))
+        del self._node[node]
+        for targets in self._succ.values():
+            if targets.pop(node, None) is not None:
+                self._edge_count -= 1
+        self.graph_index.discard(node)
+
+    def has_node(self, node) -> bool:
+        return node in self._node
+
+    @property
+    def nodes(self) -> _NodeView:
+        return _NodeView(self._node)
+
+    def number_of_nodes(self) -> int:
+        return len(self._node)
+
+    # ------------------------------------------------------------------
+    # Edges
+    # ------------------------------------------------------------------
+    def add_edge(self, u, v, **attrs):
+        targets = self._succ.get(u)
+        if targets is None:
+            self._new_node(u)
+            targets = self._succ[u]
+        if v not in self._node:
+            self._new_node(v)
+        data = targets.get(v)
+        if data is None:
+            # The keyword dict is already a fresh dict: store it as the edge's attributes
+            targets[v] = attrs
+            self._edge_count += 1
+        else:
+            data.update(attrs)
+
+    def add_edges_from(self, edges: Iterable, **attrs):
+        """Add ``(u, v)`` or ``(u, v, attr_dict)`` edges; attribute dicts are copied."""
+        succ, nodes = self._succ, self._node
+        for edge in edges:
+            if len(edge) == 3:
+                u, v, data = edge
+                data = {**attrs, **data} if attrs else dict(data)
+            else:
+                u, v = edge
+                data = dict(attrs)
+            targets = succ.get(u)
+            if targets is None:
+                self._new_node(u)
+                targets = succ[u]
+            if v not in nodes:
+                self._new_node(v)
+            existing = targets.get(v)
+            if existing is None:
+                targets[v] = data
+                self._edge_count += 1
+            else:
+                existing.update(data)
+
+    def remove_edge(self, u, v):
+        try:
+            del self._succ[u][v]
+        except KeyError:
+            raise KeyError(f"The edge {u}-{v} is not in the graph.") from None
+        self._edge_count -= 1
+
+    def has_edge(self, u, v) -> bool:
+        targets = self._succ.get(u)
+        return targets is not None and v in targets
+
+    def get_edge_data(self, u, v, default=None):
+        targets = self._succ.get(u)
+        if targets is None:
+            return default
+        return targets.get(v, default)
+
+    def edges(self, data: bool = False) -> List:
+        if data:
+            return [(u, v, attrs) for u, targets in self._succ.items() for v, attrs in targets.items()]
+        return [(u, v) for u, targets in self._succ.items() for v in targets]
+
+    def successors(self, node) -> Iterator:
+        return iter(self._succ[node])
+
+    def number_of_edges(self) -> int:
+        return self._edge_count
+
+    def __getitem__(self, u) -> Dict[Any, Dict[str, Any]]:
+        return self._succ[u]
+
+    @property
+    def adj(self) -> Dict[Any, Dict[Any, Dict[str, Any]]]:
+        """Adjacency dict of dicts (read it, do not mutate it); also lets ``networkx.DiGraph(graph)`` convert."""
+        return self._succ
+
+    # ------------------------------------------------------------------
+    # Whole-graph operations
+    # ------------------------------------------------------------------
+    def copy(self) -> 'LeanDiGraph':
+        """Independent copy: node and edge attribute dicts are copied one level deep (as networkx does)."""
+        dup = LeanDiGraph()
+        dup._node = {node: dict(attrs) for node, attrs in self._node.items()}
+        dup._succ = {u: {v: dict(attrs) for v, attrs in targets.items()} for u, targets in self._succ.items()}
+        dup._edge_count = self._edge_count
+        dup.graph_index = self.graph_index.copy()
+        dup.graph = dict(self.graph)
+        return dup
+
+    def subgraph(self, nodes: Iterable) -> 'LeanDiGraph':
+        """Induced subgraph on ``nodes``; attribute dicts are shared with this graph, like a networkx view."""
+        sub = LeanDiGraph()
+        for node in nodes:
+            if node in self._node and node not in sub._node:
+                sub._new_node(node, self._node[node])
+        for u in sub._node:
+            targets = {v: attrs for v, attrs in self._succ[u].items() if v in sub._node}
+            sub._succ[u] = targets
+            sub._edge_count += len(targets)
+        return sub
+
+    def is_directed(self) -> bool:
+        return True
+
+    def is_multigraph(self) -> bool:
+        return False
+
+    def __len__(self) -> int:
+        return len(self._node)
+
+    def __iter__(self) -> Iterator:
+        return iter(self._node)
+
+    def __contains__(self, node) -> bool:
+        return node in self._node
+
+
+def density(graph) -> float:
+    n = graph.number_of_nodes()
+    m = graph.number_of_edges()
+    if n <= 1:
+        return 0.0
+    return m / (n * (n - 1))
+
+
+def number_strongly_connected_components(graph) -> int:
+    return len(CompiledGraph.from_graph(graph).strongly_connected_components())
+
+
+def number_weakly_connected_components(graph) -> int:
+    parent = {node: node for node in graph.nodes()}
+
+    def find(node):
+        while parent[node] != node:
+            parent[node] = parent[parent[node]]
+            node = parent[node]
+        return node
+
+    for u, v in graph.edges():
+        parent[find(u)] = find(v)
+    return len({find(node) for node in parent})
@@ -19,16 +19,21 @@ import logging
 from .ai_model import ArbitrageAI
 from .data_engine import DataEngine
 from .graph_builder import GraphBuilder
+from .graph_overlay import OverlayGraph
 from .bellman_ford_detector import BellmanFordDetector
+from .scan_timing import ScanTimings
+from .trace import get_trace_buffer
 from strategies.dex_cex_arbitrage import DEXCEXArbitrage
 from strategies.cross_exchange_arbitrage import CrossExchangeArbitrage
 from strategies.triangular_arbitrage import TriangularArbitrage
 from strategies.wrapped_tokens_arbitrage import WrappedTokensArbitrage
 from strategies.statistical_arbitrage import StatisticalArbitrage
 from utils.config import get_start_capital_usd
+from utils import config
 
 # Module logger
 logger = logging.getLogger(__name__)
+trace = get_trace_buffer()
 
 class MainArbitrageSystem:
     def __init__(self, start_capital_usd: float = None):
@@ -43,8 +48,11 @@ class MainArbitrageSystem:
         # Configure start capital (exposed parameter)
         self.start_capital_usd = float(start_capital_usd) if start_capital_usd is not None else float(get_start_capital_usd())
 
+        # Per-stage timing spans of every scan (SCAN_TIMING_CONFIG), shared with the data engine
+        self.timings = ScanTimings(config.SCAN_TIMING_CONFIG.get('window', 200))
+
         # Initialize core components
-        self.data_engine = DataEngine()
+        self.data_engine = DataEngine(timings=self.timings)
         self.graph_builder = GraphBuilder(self.ai)
         self.detector = BellmanFordDetector(self.ai)
 
@@ -59,6 +67,12 @@ class MainArbitrageSystem:
 
         self.last_scan_time = None
         self.cached_opportunities = []
+        # Incremental graph state (GRAPH_CONFIG['incremental_updates'])
+        self.last_dirty_nodes = set()
+        # (strategy name, state version) pairs the last compiled graph was built with
+        self._compiled_strategies = None
+        # Trace buffer scan id of the latest scan (see get_scan_trace)
+        self.last_trace_scan = None
 
     async def run_full_arbitrage_scan(self, enabled_strategies: List[str], 
                                      trading_pairs: List[str], 
@@ -66,66 +80,127 @@ class MainArbitrageSystem:
         """
         Main function to run complete arbitrage scan with all enabled strategies
         """
+        self.timings.begin_scan()
+        self.last_trace_scan = trace.begin_scan()
         try:
-            logger.info(f" Starting arbitrage scan with strategies: {enabled_strategies}")
-
-            # 1. Fetch market data
-            logger.info(" Fetching market data...")
+            with self.timings.span('scan'):
+                return await self._run_scan(enabled_strategies, trading_pairs, min_profit_threshold)
+        except Exception as e:
+            logger.exception(f" Error in arbitrage scan: {str(e)}")
+            return []
+        finally:
+            stages = ', '.join(f"{name}={seconds:.3f}s" for name, seconds in self.timings.last_scan.items()
+                               if not name.startswith('fetch.venue.'))
+            logger.info(f" Scan timings: {stages}")
+
+    async def _run_scan(self, enabled_strategies: List[str], trading_pairs: List[str],
+                        min_profit_threshold: float) -> List[Dict]:
+        """The scan stages, each timed as a span of self.timings."""
+        logger.info(f" Starting arbitrage scan with strategies: {enabled_strategies}")
+
+        # 1. Fetch market data
+        logger.info(" Fetching market data...")
+        with self.timings.span('fetch'):
             price_data = await self.data_engine.fetch_all_market_data(trading_pairs)
 
-            if not price_data:
-                logger.warning(" No market data available")
-                return []
+        if not price_data:
+            logger.warning(" No market data available")
+            return []
 
-            # 2. Update statistical data if needed
-            if 'statistical' in enabled_strategies:
+        # 2. Update statistical data if needed
+        if 'statistical' in enabled_strategies:
+            with self.timings.span('statistical_update'):
                 self.strategies['statistical'].update_historical_data(price_data)
 
-            # 3. Build multi-strategy graph
-            logger.info(" Building arbitrage graph...")
-            graph = self.graph_builder.build_unified_graph(price_data)
+        # 3-4. Build multi-strategy graph and add strategy-specific edges
+        compiled_graph = await self.prepare_scan_graph(enabled_strategies, price_data)
 
-            # 4. Add strategy-specific edges
-            for strategy_name in enabled_strategies:
-                if strategy_name in self.strategies:
-                    logger.info(f" Adding {strategy_name} edges...")
-                    await self.strategies[strategy_name].add_strategy_edges(graph, price_data)
+        # 5. Run Bellman-Ford detection
+        logger.info(" Running Bellman-Ford cycle detection...")
+        with self.timings.span('detection'):
+            raw_cycles = self.detector.detect_all_cycles(compiled_graph)
 
-            # 5. Run Bellman-Ford detection
-            logger.info(" Running Bellman-Ford cycle detection...")
-            
-            # Store graph stats for UI display
-            graph_stats = self.graph_builder.get_graph_statistics()
-            self.last_graph_stats = graph_stats
-            logger.info(f" Graph: {graph_stats.get('nodes', 0)} nodes, {graph_stats.get('edges', 0)} edges")
-            
-            raw_cycles = self.detector.detect_all_cycles(graph)
+        if trace.enabled:
+            trace.emit('raw_cycles', count=len(raw_cycles), sample=raw_cycles[:5])
 
-            # Debugging: Log raw cycles before processing
-            logger.debug(f" Debug: Raw cycles detected: {len(raw_cycles)}")
-            for cycle in raw_cycles[:5]:  # Log first 5 cycles for brevity
-                logger.debug(f" Debug: Cycle: {cycle}")
-            
-            # Store for UI display
-            self.last_raw_cycles_count = len(raw_cycles)
-            logger.info(f" Bellman-Ford found {len(raw_cycles)} raw cycles")
+        # Store for UI display
+        self.last_raw_cycles_count = len(raw_cycles)
+        logger.info(f" Bellman-Ford found {len(raw_cycles)} raw cycles")
 
-            # 6. Process and filter opportunities
-            logger.info(" Processing opportunities with AI...")
+        # 6. Process and filter opportunities
+        logger.info(" Processing opportunities with AI...")
+        with self.timings.span('ranking'):
             opportunities = await self.process_and_rank_opportunities(
                 raw_cycles, price_data, min_profit_threshold
             )
 
-            # 7. Cache results
-            self.cached_opportunities = opportunities
-            self.last_scan_time = datetime.now()
- 
-            logger.info(f" Scan complete. Found {len(opportunities)} opportunities")
-            return opportunities
+        # 7. Cache results
+        self.cached_opportunities = opportunities
+        self.last_scan_time = datetime.now()
 
-        except Exception as e:
-            logger.exception(f" Error in arbitrage scan: {str(e)}")
-            return []
+        logger.info(f" Scan complete. Found {len(opportunities)} opportunities")
+        return opportunities
+
+    async def prepare_scan_graph(self, enabled_strategies: List[str], price_data: Dict):
+        """
+        Build (or incrementally update) the price graph, add strategy edges and compile it.
+
+        With GRAPH_CONFIG['incremental_updates'] the price graph persists between scans and
+        only edges of changed tickers are re-weighted. Strategy edges go to an OverlayGraph
+        over it, so the persistent graph holds price edges only and is never copied. When no
+        ticker changed and every enabled strategy reports the same ``state_version()`` as
+        last time, the previous compiled graph is reused as-is.
+        """
+        incremental = config.GRAPH_CONFIG.get('incremental_updates', False)
+
+        if incremental and self.graph_builder.graph is not None:
+            logger.info(" Updating arbitrage graph incrementally...")
+            with self.timings.span('graph_build'):
+                dirty_nodes = self.graph_builder.apply_price_updates(price_data)
+            self.last_dirty_nodes = dirty_nodes
+            if (not dirty_nodes and self.graph_builder.compiled_graph is not None
+                    and self._compiled_strategies == self._strategy_state(enabled_strategies)):
+                logger.info(" No price or strategy changes since last scan; reusing compiled graph")
+                return self.graph_builder.compiled_graph
+        else:
+            # 3. Build multi-strategy graph
+            logger.info(" Building arbitrage graph...")
+            with self.timings.span('graph_build'):
+                graph = self.graph_builder.build_unified_graph(price_data)
+            self.last_dirty_nodes = set(graph.nodes())
+
+        if incremental:
+            graph = OverlayGraph(self.graph_builder.graph)
+
+        # 4. Add strategy-specific edges
+        for strategy_name in enabled_strategies:
+            if strategy_name in self.strategies:
+                logger.info(f" Adding {strategy_name} edges...")
+                with self.timings.span(f'strategy.{strategy_name}'):
+                    await self.strategies[strategy_name].add_strategy_edges(graph, price_data)
+
+        # Store graph stats for UI display
+        graph_stats = self.graph_builder.get_graph_statistics(graph)
+        self.last_graph_stats = graph_stats
+        logger.info(f" Graph: {graph_stats.get('nodes', 0)} nodes, {graph_stats.get('edges', 0)} edges")
+
+        # Taken after the strategies ran: adding edges may itself advance their state
+        self._compiled_strategies = self._strategy_state(enabled_strategies)
+        with self.timings.span('graph_compile'):
+            return self.graph_builder.compile_graph(graph)
+
+    def _strategy_state(self, enabled_strategies: List[str]) -> tuple:
+        """
+        Enabled strategies with their ``state_version()``.
+
+        Strategies whose edges depend on more than the current prices (e.g. price history)
+        implement ``state_version``; the others are keyed by name only.
+        """
+        state = []
+        for name in enabled_strategies:
+            version = getattr(self.strategies.get(name), 'state_version', None)
+            state.append((name, version() if version is not None else None))
+        return tuple(state)
 
     async def process_and_rank_opportunities(self, raw_cycles: List[Dict], 
                                            price_data: Dict, 
@@ -249,7 +324,9 @@ class MainArbitrageSystem:
             current_token_amount = float(self.start_capital_usd) / start_token_usd_price
             total_fees_usd = 0
             
-            logger.debug(f"Starting with {current_token_amount:.8f} {start_token} (worth ${self.start_capital_usd})")
+            start_token_amount = current_token_amount
+            # Per-step conversion detail, only collected while tracing
+            steps = [] if trace.enabled else None
 
             # Track the current token through the cycle
             for i in range(len(path) - 1):
@@ -310,10 +387,7 @@ class MainArbitrageSystem:
                                f"This suggests incorrect data. Flooring at 1e-6.")
                     conversion_rate = 1e-6
                 
-                logger.debug(f"Step {i+1}: {current_token} -> {next_token}")
-                logger.debug(f"  Amount before: {current_token_amount:.8f} {current_token}")
-                logger.debug(f"  Rate: {conversion_rate:.8f} {next_token}/{current_token}")
-                logger.debug(f"  Fee: {fee_pct:.4%}, Slippage: {slippage:.4%}")
+                amount_before = current_token_amount
 
                 # Calculate fees in current token amount
                 fee_token_amount = current_token_amount * fee_pct
@@ -326,8 +400,11 @@ class MainArbitrageSystem:
                 # Apply conversion: current_token_amount * rate gives next_token_amount
                 # Then subtract fees
                 current_token_amount = current_token_amount * conversion_rate * (1 - fee_pct - slippage)
-                
-                logger.debug(f"  Amount after: {current_token_amount:.8f} {next_token}")
+
+                if steps is not None:
+                    steps.append({'from': current_node, 'to': next_node, 'amount_before': amount_before,
+                                  'rate': conversion_rate, 'fee': fee_pct, 'slippage': slippage,
+                                  'amount_after': current_token_amount})
 
             # Get final token value in USD
             final_node = path[-1]
@@ -335,7 +412,10 @@ class MainArbitrageSystem:
             final_token_usd_price = self.get_token_usd_price(final_token, final_exchange, price_data)
             final_usd_value = current_token_amount * final_token_usd_price
             
-            logger.debug(f"Final: {current_token_amount:.8f} {final_token} = ${final_usd_value:.2f}")
+            if steps is not None:
+                trace.emit('cycle_profit', path=list(path), start_capital_usd=self.start_capital_usd,
+                           start_amount=start_token_amount, steps=steps,
+                           final_amount=current_token_amount, final_usd=final_usd_value)
 
             # Calculate profit
             profit_usd = final_usd_value - self.start_capital_usd
@@ -396,6 +476,11 @@ class MainArbitrageSystem:
             return self.cached_opportunities
         return []
 
+    async def close(self):
+        """Release network sessions and worker processes held by the core components."""
+        await self.data_engine.close()
+        self.detector.close()
+
     def get_system_status(self) -> Dict:
         """Get current system status"""
         return {
@@ -403,7 +488,33 @@ class MainArbitrageSystem:
             'cached_opportunities': len(self.cached_opportunities),
             'active_strategies': list(self.strategies.keys()),
             'data_engine_status': self.data_engine.get_status(),
-            'ai_model_loaded': self.ai.is_loaded()
+            'ai_model_loaded': self.ai.is_loaded(),
+            # Background start-up progress (STARTUP_CONFIG): scans run before these are ready
+            'readiness': {
+                'ai_model': self.ai.load_state,
+                'web3': self.data_engine.web3_state,
+            },
+            'scan_timings': self.get_scan_timings(),
+        }
+
+    def get_scan_trace(self, scan: int = None) -> List[Dict]:
+        """Trace events of one scan (default: the latest); empty unless tracing is enabled."""
+        return trace.dump(scan if scan is not None else self.last_trace_scan)
+
+    def get_scan_timings(self) -> Dict:
+        """
+        Where scan time goes: ``last_scan`` maps each span of the latest scan to seconds,
+        ``stages``/``strategies``/``venues`` give rolling p50/p95/p99 per span (seconds).
+        """
+        summary = self.timings.summary()
+        return {
+            'last_scan': dict(self.timings.last_scan),
+            'stages': {name: stats for name, stats in summary.items()
+                       if not name.startswith(('strategy.', 'fetch.venue.'))},
+            'strategies': {name.split('.', 1)[1]: stats for name, stats in summary.items()
+                           if name.startswith('strategy.')},
+            'venues': {name.split('.', 2)[2]: stats for name, stats in summary.items()
+                       if name.startswith('fetch.venue.')},
         }
     
     def get_all_strategies_info(self) -> List[Dict]:
@@ -0,0 +1,83 @@
+import json
+import logging
+import os
+import time
+from typing import Any, Dict, Optional
+
+from utils import config
+
+logger = logging.getLogger(__name__)
+
+
+class MarketMetadataCache:
+    """
+    On-disk cache of exchange market metadata (symbols, precision, limits).
+
+    One JSON file per exchange holds the ccxt ``markets`` and ``currencies`` structures
+    (without the raw ``info`` payloads) plus the time they were fetched, so a restarted
+    process can populate its clients without paying for ``load_markets``. Entries older
+    than ``ttl_seconds`` are still usable; they are only reported as stale so the caller
+    can refresh them in the background.
+    """
+
+    def __init__(self, directory: Optional[str] = None, ttl_seconds: Optional[float] = None):
+        cache_config = config.MARKET_CACHE_CONFIG
+        self.directory = directory or cache_config.get('directory')
+        self.ttl_seconds = float(ttl_seconds if ttl_seconds is not None else cache_config.get('ttl_seconds', 21600))
+
+    def path_for(self, exchange_name: str) -> str:
+        return os.path.join(self.directory, f"{exchange_name}.json")
+
+    def load(self, exchange_name: str) -> Optional[Dict[str, Any]]:
+        """Return ``{'fetched_at', 'markets', 'currencies'}`` for an exchange, or None if absent or unreadable."""
+        path = self.path_for(exchange_name)
+        try:
+            with open(path, 'r', encoding='utf-8') as handle:
+                entry = json.load(handle)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable market cache {path}: {e}")
+            return None
+        if not isinstance(entry, dict) or not isinstance(entry.get('markets'), dict) or not entry['markets']:
+            return None
+        entry.setdefault('currencies', {})
+        entry['fetched_at'] = float(entry.get('fetched_at') or 0.0)
+        return entry
+
+    def is_stale(self, fetched_at: Optional[float]) -> bool:
+        return fetched_at is None or time.time() - fetched_at > self.ttl_seconds
+
+    def store(self, exchange_name: str, markets: Dict[str, Any], currencies: Optional[Dict[str, Any]] = None,
+              fetched_at: Optional[float] = None) -> bool:
+        """Persist an exchange's markets atomically; returns False if the write failed."""
+        entry = {
+            'exchange': exchange_name,
+            'fetched_at': fetched_at if fetched_at is not None else time.time(),
+            'markets': self._strip_info(markets),
+            'currencies': self._strip_info(currencies or {}),
+        }
+        path = self.path_for(exchange_name)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(tmp_path, 'w', encoding='utf-8') as handle:
+                json.dump(entry, handle, default=str)
+            os.replace(tmp_path, path)
+        except (OSError, TypeError, ValueError) as e:
+            logger.warning(f"Could not write market cache {path}: {e}")
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            return False
+        logger.debug("Cached %d markets for %s at %s", len(entry['markets']), exchange_name, path)
+        return True
+
+    @staticmethod
+    def _strip_info(structures: Dict[str, Any]) -> Dict[str, Any]:
+        """Drop the raw exchange payloads, which dominate the size and are not needed to trade."""
+        return {
+            key: {field: value for field, value in item.items() if field != 'info'} if isinstance(item, dict) else item
+            for key, item in structures.items()
+        }
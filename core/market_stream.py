@@ -0,0 +1,402 @@
+import asyncio
+import json
+import logging
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import aiohttp
+
+from utils import config as config
+from core.rest_client import bitfinex_symbol
+
+logger = logging.getLogger(__name__)
+
+# (pair, raw top-of-book dict with bid/ask/last/volume/timestamp)
+QuoteUpdate = Tuple[str, Dict[str, Any]]
+
+
+def _split_pair(pair: str) -> Tuple[str, str]:
+    base, _, quote = pair.partition('/')
+    return base, quote
+
+
+def _to_float(value) -> Optional[float]:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class StreamAdapter(ABC):
+    """
+    Venue-specific WebSocket protocol: subscription frames and ticker parsing.
+
+    One adapter instance is created per connection, so adapters may keep per-connection
+    state (e.g. Bitfinex channel ids). ``parse`` receives a decoded JSON frame and returns
+    the quotes it carries as ``(pair, {'bid', 'ask', 'last', 'volume', 'timestamp'})``.
+    """
+
+    def __init__(self, trading_pairs: Iterable[str]):
+        self.trading_pairs = list(trading_pairs)
+        self.symbol_to_pair: Dict[str, str] = {
+            self.venue_symbol(pair): pair for pair in self.trading_pairs
+        }
+
+    def venue_symbol(self, pair: str) -> str:
+        return pair.replace('/', '')
+
+    @abstractmethod
+    def subscribe_messages(self) -> List[Any]:
+        """Frames sent right after connecting to subscribe to ``trading_pairs``."""
+
+    @abstractmethod
+    def parse(self, message: Any) -> List[QuoteUpdate]:
+        """Quotes carried by one decoded frame (empty for acks, heartbeats and other events)."""
+
+    def _quote(self, symbol: str, bid=None, ask=None, last=None, volume=None, timestamp=None) -> List[QuoteUpdate]:
+        pair = self.symbol_to_pair.get(symbol)
+        if pair is None:
+            return []
+        return [(pair, {
+            'bid': _to_float(bid),
+            'ask': _to_float(ask),
+            'last': _to_float(last),
+            'volume': _to_float(volume) or 0.0,
+            'timestamp': int(timestamp) if timestamp else int(time.time() * 1000),
+        })]
+
+
+class BinanceStreamAdapter(StreamAdapter):
+    """Binance spot ``<symbol>@bookTicker`` stream."""
+
+    def venue_symbol(self, pair: str) -> str:
+        return pair.replace('/', '').upper()
+
+    def subscribe_messages(self) -> List[Any]:
+        params = [f"{self.venue_symbol(pair).lower()}@bookTicker" for pair in self.trading_pairs]
+        return [{'method': 'SUBSCRIBE', 'params': params, 'id': 1}]
+
+    def parse(self, message: Any) -> List[QuoteUpdate]:
+        # Combined-stream frames wrap the payload in {"stream": ..., "data": {...}}
+        if isinstance(message, dict) and 'data' in message and 'stream' in message:
+            message = message['data']
+        if not isinstance(message, dict) or 's' not in message or 'b' not in message:
+            return []
+        return self._quote(message['s'], bid=message.get('b'), ask=message.get('a'))
+
+
+class OkxStreamAdapter(StreamAdapter):
+    """OKX v5 public ``tickers`` channel."""
+
+    def venue_symbol(self, pair: str) -> str:
+        return pair.replace('/', '-')
+
+    def subscribe_messages(self) -> List[Any]:
+        args = [{'channel': 'tickers', 'instId': self.venue_symbol(pair)} for pair in self.trading_pairs]
+        return [{'op': 'subscribe', 'args': args}]
+
+    def parse(self, message: Any) -> List[QuoteUpdate]:
+        if not isinstance(message, dict) or message.get('arg', {}).get('channel') != 'tickers':
+            return []
+        updates = []
+        for row in message.get('data') or []:
+            updates.extend(self._quote(row.get('instId'), bid=row.get('bidPx'), ask=row.get('askPx'),
+                                       last=row.get('last'), volume=row.get('vol24h'), timestamp=row.get('ts')))
+        return updates
+
+
+class BybitStreamAdapter(StreamAdapter):
+    """Bybit v5 spot ``orderbook.1`` (top-of-book) topic."""
+
+    def subscribe_messages(self) -> List[Any]:
+        return [{'op': 'subscribe', 'args': [f"orderbook.1.{self.venue_symbol(pair)}" for pair in self.trading_pairs]}]
+
+    def parse(self, message: Any) -> List[QuoteUpdate]:
+        if not isinstance(message, dict) or not str(message.get('topic', '')).startswith('orderbook.1.'):
+            return []
+        data = message.get('data') or {}
+        bids = data.get('b') or []
+        asks = data.get('a') or []
+        if not bids or not asks:
+            return []
+        return self._quote(data.get('s'), bid=bids[0][0], ask=asks[0][0], timestamp=message.get('ts'))
+
+
+class GateioStreamAdapter(StreamAdapter):
+    """Gate.io v4 ``spot.book_ticker`` channel."""
+
+    def venue_symbol(self, pair: str) -> str:
+        return pair.replace('/', '_')
+
+    def subscribe_messages(self) -> List[Any]:
+        return [{
+            'time': int(time.time()),
+            'channel': 'spot.book_ticker',
+            'event': 'subscribe',
+            'payload': [self.venue_symbol(pair) for pair in self.trading_pairs],
+        }]
+
+    def parse(self, message: Any) -> List[QuoteUpdate]:
+        if not isinstance(message, dict) or message.get('channel') != 'spot.book_ticker' \
+                or message.get('event') != 'update':
+            return []
+        result = message.get('result') or {}
+        return self._quote(result.get('s'), bid=result.get('b'), ask=result.get('a'), timestamp=result.get('t'))
+
+
+class KrakenStreamAdapter(StreamAdapter):
+    """Kraken v2 ``ticker`` channel (symbols already use BASE/QUOTE)."""
+
+    def venue_symbol(self, pair: str) -> str:
+        return pair
+
+    def subscribe_messages(self) -> List[Any]:
+        return [{'method': 'subscribe', 'params': {'channel': 'ticker', 'symbol': list(self.trading_pairs)}}]
+
+    def parse(self, message: Any) -> List[QuoteUpdate]:
+        if not isinstance(message, dict) or message.get('channel') != 'ticker':
+            return []
+        updates = []
+        for row in message.get('data') or []:
+            updates.extend(self._quote(row.get('symbol'), bid=row.get('bid'), ask=row.get('ask'),
+                                       last=row.get('last'), volume=row.get('volume')))
+        return updates
+
+
+class CoinbaseStreamAdapter(StreamAdapter):
+    """Coinbase Exchange ``ticker`` channel."""
+
+    def venue_symbol(self, pair: str) -> str:
+        return pair.replace('/', '-')
+
+    def subscribe_messages(self) -> List[Any]:
+        return [{
+            'type': 'subscribe',
+            'product_ids': [self.venue_symbol(pair) for pair in self.trading_pairs],
+            'channels': ['ticker'],
+        }]
+
+    def parse(self, message: Any) -> List[QuoteUpdate]:
+        if not isinstance(message, dict) or message.get('type') != 'ticker':
+            return []
+        return self._quote(message.get('product_id'), bid=message.get('best_bid'), ask=message.get('best_ask'),
+                           last=message.get('price'), volume=message.get('volume_24h'))
+
+
+class BitfinexStreamAdapter(StreamAdapter):
+    """Bitfinex v2 ``ticker`` channel; data frames are keyed by a per-connection channel id."""
+
+    def __init__(self, trading_pairs: Iterable[str]):
+        super().__init__(trading_pairs)
+        self.channels: Dict[int, str] = {}
+
+    def venue_symbol(self, pair: str) -> str:
+        return bitfinex_symbol(pair)
+
+    def subscribe_messages(self) -> List[Any]:
+        return [{'event': 'subscribe', 'channel': 'ticker', 'symbol': self.venue_symbol(pair)}
+                for pair in self.trading_pairs]
+
+    def parse(self, message: Any) -> List[QuoteUpdate]:
+        if isinstance(message, dict):
+            if message.get('event') == 'subscribed' and message.get('channel') == 'ticker':
+                self.channels[message.get('chanId')] = message.get('symbol')
+            return []
+        # [chanId, [BID, BID_SIZE, ASK, ASK_SIZE, DAILY_CHANGE, DAILY_CHANGE_REL, LAST, VOLUME, HIGH, LOW]]
+        if not isinstance(message, list) or len(message) < 2 or not isinstance(message[1], list):
+            return []
+        symbol = self.channels.get(message[0])
+        fields = message[1]
+        if symbol is None or len(fields) < 8:
+            return []
+        return self._quote(symbol, bid=fields[0], ask=fields[2], last=fields[6], volume=fields[7])
+
+
+class DydxStreamAdapter(StreamAdapter):
+    """dYdX v3 ``v3_markets`` channel; quotes use the oracle price for both sides."""
+
+    def venue_symbol(self, pair: str) -> str:
+        base, _ = _split_pair(pair)
+        return f"{base}-USD"
+
+    def subscribe_messages(self) -> List[Any]:
+        return [{'type': 'subscribe', 'channel': 'v3_markets'}]
+
+    def parse(self, message: Any) -> List[QuoteUpdate]:
+        if not isinstance(message, dict) or message.get('channel') != 'v3_markets':
+            return []
+        contents = message.get('contents') or {}
+        markets = contents.get('markets', contents)
+        updates = []
+        for market, fields in markets.items():
+            if not isinstance(fields, dict) or fields.get('oraclePrice') is None:
+                continue
+            price = fields['oraclePrice']
+            updates.extend(self._quote(market, bid=price, ask=price, last=price, volume=fields.get('volume24H')))
+        return updates
+
+
+# venue -> (adapter class, market section the quotes belong to)
+STREAM_ADAPTERS: Dict[str, Tuple[Callable[[Iterable[str]], StreamAdapter], str]] = {
+    'binance': (BinanceStreamAdapter, 'cex'),
+    'okx': (OkxStreamAdapter, 'cex'),
+    'bybit': (BybitStreamAdapter, 'cex'),
+    'gateio': (GateioStreamAdapter, 'cex'),
+    'kraken': (KrakenStreamAdapter, 'cex'),
+    'coinbase': (CoinbaseStreamAdapter, 'cex'),
+    'bitfinex': (BitfinexStreamAdapter, 'cex'),
+    'dydx': (DydxStreamAdapter, 'dex'),
+}
+
+
+def stream_url(venue: str) -> Optional[str]:
+    """WebSocket URL for a venue from EXCHANGE_ENDPOINTS / DEX_ENDPOINTS."""
+    section = STREAM_ADAPTERS.get(venue, (None, 'cex'))[1]
+    endpoints = config.EXCHANGE_ENDPOINTS if section == 'cex' else config.DEX_ENDPOINTS
+    return (endpoints.get(venue) or {}).get('websocket_url')
+
+
+class MarketStream:
+    """
+    Live top-of-book store fed by exchange WebSocket ticker channels.
+
+    Each venue runs one reconnecting connection task that subscribes to the requested
+    pairs and overwrites ``quotes[section][venue][pair]`` on every update. A venue's book
+    is dropped when its socket disconnects, and ``connected`` tells whether it is live.
+    Readers take cheap snapshots via ``snapshot()`` instead of polling REST endpoints.
+    """
+
+    def __init__(self, trading_pairs: Iterable[str], venues: Optional[Iterable[str]] = None,
+                 urls: Optional[Dict[str, str]] = None):
+        self.trading_pairs = list(trading_pairs)
+        stream_cfg = config.STREAMING_CONFIG
+        requested = list(venues) if venues is not None else list(stream_cfg.get('venues', STREAM_ADAPTERS.keys()))
+        overrides = urls or {}
+
+        self.urls: Dict[str, str] = {}
+        for venue in requested:
+            if venue not in STREAM_ADAPTERS:
+                logger.warning("No WebSocket adapter for %s; it will keep using REST polling", venue)
+                continue
+            url = overrides.get(venue) or stream_url(venue)
+            if not url:
+                logger.warning("No websocket_url configured for %s; it will keep using REST polling", venue)
+                continue
+            self.urls[venue] = url
+
+        self.reconnect_delay = float(stream_cfg.get('reconnect_delay', 1.0))
+        self.max_reconnect_delay = float(stream_cfg.get('max_reconnect_delay', 30.0))
+        self.heartbeat = stream_cfg.get('heartbeat', 20.0)
+
+        self.quotes: Dict[str, Dict[str, Dict[str, Dict[str, Any]]]] = {'cex': {}, 'dex': {}}
+        self.connected: Dict[str, bool] = {venue: False for venue in self.urls}
+        self.message_counts: Dict[str, int] = {venue: 0 for venue in self.urls}
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._updated = asyncio.Event()
+
+    @property
+    def venues(self) -> List[str]:
+        return list(self.urls)
+
+    @property
+    def is_running(self) -> bool:
+        return any(not task.done() for task in self._tasks.values())
+
+    def section_of(self, venue: str) -> str:
+        return STREAM_ADAPTERS[venue][1]
+
+    async def start(self):
+        """Open one connection task per venue (no-op if already running)."""
+        if self.is_running:
+            return
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession()
+        for venue in self.urls:
+            self._tasks[venue] = asyncio.create_task(self._run_venue(venue), name=f"market-stream-{venue}")
+        logger.info("Market stream started for %s (%d pairs)", ', '.join(self.urls) or 'no venues',
+                    len(self.trading_pairs))
+
+    async def stop(self):
+        """Cancel all connection tasks and close the HTTP session."""
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+        self._tasks.clear()
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        for venue in self.connected:
+            self.connected[venue] = False
+        logger.info("Market stream stopped")
+
+    async def wait_for_update(self, timeout: Optional[float] = None) -> bool:
+        """Block until any quote changes; returns False on timeout."""
+        self._updated.clear()
+        try:
+            await asyncio.wait_for(self._updated.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    def snapshot(self) -> Dict[str, Dict[str, Dict[str, Dict[str, Any]]]]:
+        """Copy of the current book: {'cex': {venue: {pair: quote}}, 'dex': {...}}."""
+        return {
+            section: {venue: {pair: dict(quote) for pair, quote in book.items()} for venue, book in venues.items()}
+            for section, venues in self.quotes.items()
+        }
+
+    def apply_message(self, venue: str, adapter: StreamAdapter, message: Any) -> int:
+        """Parse one decoded frame into the store; returns the number of quotes updated."""
+        updates = adapter.parse(message)
+        if not updates:
+            return 0
+        book = self.quotes[self.section_of(venue)].setdefault(venue, {})
+        for pair, quote in updates:
+            quote['pair'] = pair
+            quote['source'] = f"{self.section_of(venue)}:{venue}:ws"
+            quote['received_at'] = time.time()
+            book[pair] = quote
+        self._updated.set()
+        return len(updates)
+
+    async def _run_venue(self, venue: str):
+        """Connection loop for one venue with exponential reconnect backoff."""
+        adapter_cls = STREAM_ADAPTERS[venue][0]
+        url = self.urls[venue]
+        delay = self.reconnect_delay
+        while True:
+            adapter = adapter_cls(self.trading_pairs)
+            try:
+                async with self._session.ws_connect(url, heartbeat=self.heartbeat) as ws:
+                    for frame in adapter.subscribe_messages():
+                        await ws.send_json(frame)
+                    self.connected[venue] = True
+                    delay = self.reconnect_delay
+                    logger.info("WebSocket connected: %s (%s)", venue, url)
+                    async for msg in ws:
+                        if msg.type == aiohttp.WSMsgType.TEXT:
+                            try:
+                                message = json.loads(msg.data)
+                            except ValueError:
+                                logger.debug("Non-JSON frame from %s: %.200s", venue, msg.data)
+                                continue
+                            self.message_counts[venue] += 1
+                            self.apply_message(venue, adapter, message)
+                        elif msg.type == aiohttp.WSMsgType.ERROR:
+                            break
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("WebSocket %s error: %s", venue, e)
+            finally:
+                self.connected[venue] = False
+
+            # The book froze when the socket dropped: forget it until the next subscription refills it
+            self.quotes[self.section_of(venue)].pop(venue, None)
+            logger.info("WebSocket %s disconnected; reconnecting in %.1fs", venue, delay)
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.max_reconnect_delay)
@@ -0,0 +1,283 @@
+import logging
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Numeric quote fields held in float64 columns; NaN marks a field the source did not provide
+QUOTE_FIELDS = ('bid', 'ask', 'last', 'volume', 'fee', 'liquidity', 'timestamp', 'age')
+SECTIONS = ('cex', 'dex')
+
+
+class QuoteStore:
+    """
+    Columnar store for one market snapshot.
+
+    Every quote is a row: the numeric fields live in float64 arrays and the venue,
+    base/quote token, pair and source strings are interned to integer ids. Pair keys
+    are indexed per venue, and each venue also indexes base tokens to their row, so a
+    token lookup (``venue_data['BTC']``) no longer needs a duplicated alias entry.
+
+    ``section('cex')`` returns a read-only Mapping of venue -> pair -> quote dict shaped
+    like the nested dicts DataEngine used to emit (including ``mapped_from_pair`` on
+    token lookups); quote dicts are built on access. Hot paths can use ``iter_rows``,
+    ``iter_quotes`` and ``column`` to read interned names and columns directly.
+    """
+
+    def __init__(self, capacity: int = 64):
+        capacity = max(1, int(capacity))
+        self._size = 0
+        self._columns = {field: np.full(capacity, np.nan) for field in QUOTE_FIELDS}
+        self._ids = {name: np.full(capacity, -1, dtype=np.int32)
+                     for name in ('section', 'venue', 'base', 'quote', 'pair', 'source', 'pair_field')}
+        self._strings: List[str] = []
+        self._string_ids: Dict[str, int] = {}
+        # Non-standard keys, kept per row only when a source provides them
+        self._extras: Dict[int, Dict[str, Any]] = {}
+        # (section, venue) -> {pair: row} / {base token: row}, in insertion order
+        self._pair_rows: Dict[Tuple[str, str], Dict[str, int]] = {}
+        self._token_rows: Dict[Tuple[str, str], Dict[str, int]] = {}
+
+    @classmethod
+    def from_price_data(cls, price_data: Dict[str, Any]) -> 'QuoteStore':
+        """Build a store from nested ``{'cex': {venue: {pair: quote}}, 'dex': ...}`` dicts (alias keys are skipped)."""
+        store = cls()
+        for section in SECTIONS:
+            for venue, venue_data in (price_data.get(section) or {}).items():
+                store.add_venue(section, venue)
+                for pair, quote in venue_data.items():
+                    if '/' in pair and isinstance(quote, Mapping):
+                        store.put(section, venue, pair, quote)
+        return store
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the column arrays (excluding the string table and indexes)."""
+        return sum(array.nbytes for array in self._columns.values()) + sum(array.nbytes for array in self._ids.values())
+
+    def _intern(self, value: Optional[str]) -> int:
+        if value is None:
+            return -1
+        string_id = self._string_ids.get(value)
+        if string_id is None:
+            string_id = len(self._strings)
+            self._strings.append(value)
+            self._string_ids[value] = string_id
+        return string_id
+
+    def _grow(self):
+        capacity = len(self._columns['bid']) * 2
+        for field, array in self._columns.items():
+            grown = np.full(capacity, np.nan)
+            grown[:self._size] = array[:self._size]
+            self._columns[field] = grown
+        for name, array in self._ids.items():
+            grown = np.full(capacity, -1, dtype=np.int32)
+            grown[:self._size] = array[:self._size]
+            self._ids[name] = grown
+
+    def add_venue(self, section: str, venue: str):
+        """Register a venue so it is listed even before (or without) any quotes."""
+        key = (section, venue)
+        if key not in self._pair_rows:
+            self._pair_rows[key] = {}
+            self._token_rows[key] = {}
+
+    def discard_venue(self, section: str, venue: str):
+        """Drop a venue from the indexes; its rows stay allocated but unreachable."""
+        self._pair_rows.pop((section, venue), None)
+        self._token_rows.pop((section, venue), None)
+
+    def put(self, section: str, venue: str, pair: str, quote: Mapping) -> int:
+        """Insert or replace the quote for ``pair`` on ``venue`` and return its row."""
+        self.add_venue(section, venue)
+        key = (section, venue)
+        row = self._pair_rows[key].get(pair)
+        if row is None:
+            if self._size == len(self._columns['bid']):
+                self._grow()
+            row = self._size
+            self._size += 1
+            base, _, quote_token = pair.partition('/')
+            ids = self._ids
+            ids['section'][row] = self._intern(section)
+            ids['venue'][row] = self._intern(venue)
+            ids['base'][row] = self._intern(base)
+            ids['quote'][row] = self._intern(quote_token)
+            ids['pair'][row] = self._intern(pair)
+            self._pair_rows[key][pair] = row
+            # Last pair written for a base token answers token lookups, as the alias keys did
+            self._token_rows[key][base] = row
+        else:
+            # A replacement quote starts clean so fields it omits do not leak from the old one
+            for array in self._columns.values():
+                array[row] = np.nan
+            self._ids['source'][row] = -1
+            self._ids['pair_field'][row] = -1
+
+        extras = None
+        for field, value in quote.items():
+            if field in self._columns:
+                try:
+                    self._columns[field][row] = np.nan if value is None else float(value)
+                except (TypeError, ValueError):
+                    extras = extras or {}
+                    extras[field] = value
+            elif field == 'source':
+                self._ids['source'][row] = self._intern(value)
+            elif field == 'pair':
+                self._ids['pair_field'][row] = self._intern(value)
+            elif field != 'mapped_from_pair':
+                extras = extras or {}
+                extras[field] = value
+        if extras:
+            self._extras[row] = extras
+        else:
+            self._extras.pop(row, None)
+        return row
+
+    def quote(self, row: int) -> Dict[str, Any]:
+        """Materialize one row as a quote dict (fields the source omitted stay absent)."""
+        entry = {}
+        for field in QUOTE_FIELDS:
+            value = self._columns[field][row]
+            if value == value:  # not NaN
+                entry[field] = int(value) if field == 'timestamp' else float(value)
+        pair_field = self._ids['pair_field'][row]
+        if pair_field >= 0:
+            entry['pair'] = self._strings[pair_field]
+        source = self._ids['source'][row]
+        if source >= 0:
+            entry['source'] = self._strings[source]
+        extras = self._extras.get(row)
+        if extras:
+            entry.update(extras)
+        return entry
+
+    def column(self, field: str) -> np.ndarray:
+        """Read-only view of a numeric column over the stored rows."""
+        view = self._columns[field][:self._size]
+        view.flags.writeable = False
+        return view
+
+    def iter_rows(self, section: str) -> Iterator[Tuple[str, str, str, str, int]]:
+        """Yield ``(venue, pair, base, quote, row)`` for every live quote in a section."""
+        strings = self._strings
+        base_ids, quote_ids = self._ids['base'], self._ids['quote']
+        for (row_section, venue), pairs in self._pair_rows.items():
+            if row_section != section:
+                continue
+            for pair, row in pairs.items():
+                yield venue, pair, strings[base_ids[row]], strings[quote_ids[row]], row
+
+    def iter_quotes(self, section: str) -> Iterator[Tuple[str, str, Dict[str, Any]]]:
+        """Yield ``(venue, pair, quote dict)`` for a section, reading each column once."""
+        size = self._size
+        columns = [(field, self._columns[field][:size].tolist()) for field in QUOTE_FIELDS]
+        pair_fields = self._ids['pair_field'][:size].tolist()
+        sources = self._ids['source'][:size].tolist()
+        strings = self._strings
+        for (row_section, venue), pairs in self._pair_rows.items():
+            if row_section != section:
+                continue
+            for pair, row in pairs.items():
+                entry = {}
+                for field, values in columns:
+                    value = values[row]
+                    if value == value:  # not NaN
+                        entry[field] = int(value) if field == 'timestamp' else value
+                if pair_fields[row] >= 0:
+                    entry['pair'] = strings[pair_fields[row]]
+                if sources[row] >= 0:
+                    entry['source'] = strings[sources[row]]
+                extras = self._extras.get(row)
+                if extras:
+                    entry.update(extras)
+                yield venue, pair, entry
+
+    def venues(self, section: str) -> List[str]:
+        return [venue for row_section, venue in self._pair_rows if row_section == section]
+
+    def section(self, section: str) -> 'SectionQuotes':
+        return SectionQuotes(self, section)
+
+    def venue(self, section: str, venue: str) -> 'VenueQuotes':
+        key = (section, venue)
+        if key not in self._pair_rows:
+            raise KeyError(venue)
+        return VenueQuotes(self, venue, self._pair_rows[key], self._token_rows[key])
+
+
+class SectionQuotes(Mapping):
+    """Read-only ``venue -> VenueQuotes`` view over one section of a QuoteStore."""
+
+    __slots__ = ('store', 'name')
+
+    def __init__(self, store: QuoteStore, name: str):
+        self.store = store
+        self.name = name
+
+    def __getitem__(self, venue: str) -> 'VenueQuotes':
+        return self.store.venue(self.name, venue)
+
+    def __iter__(self):
+        return iter(self.store.venues(self.name))
+
+    def __len__(self) -> int:
+        return len(self.store.venues(self.name))
+
+    def __contains__(self, venue) -> bool:
+        return (self.name, venue) in self.store._pair_rows
+
+    def __repr__(self) -> str:
+        return f"<SectionQuotes {self.name}: {len(self)} venues>"
+
+
+class VenueQuotes(Mapping):
+    """
+    Read-only ``pair -> quote`` view over one venue.
+
+    Iteration covers pair keys only; base tokens are resolved through the token index,
+    returning the pair's quote with ``mapped_from_pair`` set.
+    """
+
+    __slots__ = ('store', 'name', '_pairs', '_tokens')
+
+    def __init__(self, store: QuoteStore, name: str, pairs: Dict[str, int], tokens: Dict[str, int]):
+        self.store = store
+        self.name = name
+        self._pairs = pairs
+        self._tokens = tokens
+
+    def __getitem__(self, key: str) -> Dict[str, Any]:
+        row = self._pairs.get(key)
+        if row is not None:
+            return self.store.quote(row)
+        row = self._tokens.get(key)
+        if row is None:
+            raise KeyError(key)
+        entry = self.store.quote(row)
+        entry['mapped_from_pair'] = self.store._strings[self.store._ids['pair'][row]]
+        return entry
+
+    def __iter__(self):
+        return iter(self._pairs)
+
+    def __len__(self) -> int:
+        return len(self._pairs)
+
+    def __contains__(self, key) -> bool:
+        return key in self._pairs or key in self._tokens
+
+    def row(self, key: str) -> Optional[int]:
+        """Row id for a pair or base token, without materializing the quote."""
+        row = self._pairs.get(key)
+        return row if row is not None else self._tokens.get(key)
+
+    def __repr__(self) -> str:
+        return f"<VenueQuotes {self.name}: {len(self)} pairs>"
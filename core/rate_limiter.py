@@ -0,0 +1,129 @@
+import asyncio
+import logging
+import threading
+import time
+from typing import Dict, Optional
+
+from utils import config
+
+logger = logging.getLogger(__name__)
+
+_PERIOD_SECONDS = {'second': 1.0, 'minute': 60.0, 'hour': 3600.0, 'day': 86400.0}
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket refilled at ``rate`` tokens per second up to ``capacity``.
+
+    ``reserve`` books tokens immediately and returns how long the caller must wait
+    before using them; the balance may go negative, so concurrent callers are spaced
+    out in arrival order. That keeps the bucket independent of any event loop: async
+    callers sleep with asyncio, blocking callers with time.sleep.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = max(float(rate), 1e-9)
+        self.capacity = max(float(capacity), 1.0)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def configure(self, rate: float, capacity: float):
+        with self._lock:
+            self._refill(time.monotonic())
+            self.rate = max(float(rate), 1e-9)
+            self.capacity = max(float(capacity), 1.0)
+            self._tokens = min(self._tokens, self.capacity)
+
+    def _refill(self, now: float):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self, tokens: float = 1.0) -> float:
+        """Take ``tokens`` and return the delay in seconds before they may be spent."""
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens -= tokens
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    def try_reserve(self, tokens: float = 1.0) -> bool:
+        """Take ``tokens`` only if they may be spent right away."""
+        with self._lock:
+            self._refill(time.monotonic())
+            if self._tokens < tokens:
+                return False
+            self._tokens -= tokens
+            return True
+
+
+class RateLimiter:
+    """
+    Per-venue token buckets built from the configured rate limits.
+
+    A venue's allowance comes from EXCHANGES_CONFIG['rate_limit'] (per minute), then
+    EXCHANGE_ENDPOINTS['rate_limit_per_min'], then the DEX_ENDPOINTS rate_limit_per_*
+    fields (see ``get_dex_rate_limit``), and finally RATE_LIMIT_CONFIG['default_per_minute'].
+    Buckets hold ``burst_seconds`` worth of requests, so a venue can be driven right up
+    to its allowance without exceeding it over any window of that length.
+    """
+
+    def __init__(self):
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def rate_per_second(venue: str) -> float:
+        """Configured request allowance for a venue, in requests per second."""
+        per_minute = config.EXCHANGES_CONFIG.get(venue, {}).get('rate_limit')
+        if not per_minute:
+            per_minute = config.EXCHANGE_ENDPOINTS.get(venue, {}).get('rate_limit_per_min')
+        if per_minute:
+            return max(float(per_minute) / 60.0, 1e-3)
+        limit, period = config.get_dex_rate_limit(venue)
+        if limit and period in _PERIOD_SECONDS:
+            return max(float(limit) / _PERIOD_SECONDS[period], 1e-6)
+        return max(float(config.RATE_LIMIT_CONFIG.get('default_per_minute', 60)) / 60.0, 1e-3)
+
+    def bucket(self, venue: str) -> TokenBucket:
+        rate = self.rate_per_second(venue)
+        capacity = max(1.0, rate * float(config.RATE_LIMIT_CONFIG.get('burst_seconds', 1.0)))
+        with self._lock:
+            bucket = self._buckets.get(venue)
+            if bucket is None:
+                bucket = self._buckets[venue] = TokenBucket(rate, capacity)
+                return bucket
+        if bucket.rate != rate or bucket.capacity != capacity:
+            # Config changed at runtime (e.g. a tuned rate limit): keep the balance, adopt the new rate
+            bucket.configure(rate, capacity)
+        return bucket
+
+    async def acquire(self, venue: str, tokens: float = 1.0):
+        """Wait (asynchronously) until ``venue`` allows another request."""
+        delay = self.bucket(venue).reserve(tokens)
+        if delay > 0:
+            logger.debug("Rate limit for %s: waiting %.3fs", venue, delay)
+            await asyncio.sleep(delay)
+
+    def try_acquire(self, venue: str, tokens: float = 1.0) -> bool:
+        """Take a token for an optional request (e.g. a hedge) only if ``venue`` allows one now."""
+        return self.bucket(venue).try_reserve(tokens)
+
+    def wait(self, venue: str, tokens: float = 1.0):
+        """Blocking variant of ``acquire`` for synchronous callers (threads, CLI tools)."""
+        delay = self.bucket(venue).reserve(tokens)
+        if delay > 0:
+            logger.debug("Rate limit for %s: waiting %.3fs", venue, delay)
+            time.sleep(delay)
+
+
+_default_limiter: Optional[RateLimiter] = None
+_default_lock = threading.Lock()
+
+
+def get_rate_limiter() -> RateLimiter:
+    """Process-wide limiter shared by every network caller."""
+    global _default_limiter
+    with _default_lock:
+        if _default_limiter is None:
+            _default_limiter = RateLimiter()
+        return _default_limiter
@@ -0,0 +1,469 @@
+import asyncio
+import json
+import logging
+import os
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlsplit
+
+from utils import config as config
+from core.rate_limiter import get_rate_limiter
+
+logger = logging.getLogger(__name__)
+
+# (symbol as the venue spells it, or None when the response does not say; raw quote dict)
+TickerRow = Tuple[Optional[str], Dict[str, Any]]
+
+
+def _to_float(value) -> Optional[float]:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class RestTickerAdapter:
+    """
+    Venue-specific REST ticker protocol: request shape and response parsing.
+
+    When the venue's EXCHANGE_ENDPOINTS entry declares ``bulk_ticker_path`` (an
+    all-symbols ticker endpoint), one request covers every pair; otherwise one request
+    per pair is made against ``public_ticker_path``. ``rows`` yields the ticker records of
+    a decoded response as ``(venue symbol, {'bid', 'ask', 'last', 'volume', 'timestamp'})``;
+    single-pair endpoints that do not echo the symbol yield ``None`` as the symbol.
+    """
+
+    # Field names tried in order when a record is a dict
+    symbol_fields: Tuple[str, ...] = ('symbol',)
+    bid_fields: Tuple[str, ...] = ('bid',)
+    ask_fields: Tuple[str, ...] = ('ask',)
+    last_fields: Tuple[str, ...] = ('last', 'price')
+    volume_fields: Tuple[str, ...] = ('volume',)
+    timestamp_fields: Tuple[str, ...] = ()
+
+    def __init__(self, venue: str, entry: Dict[str, Any]):
+        self.venue = venue
+        self.entry = entry
+
+    def venue_symbol(self, pair: str) -> str:
+        return pair.replace('/', '')
+
+    def bulk_params(self, pairs: List[str]) -> Dict[str, str]:
+        return {}
+
+    def pair_params(self, pair: str) -> Dict[str, str]:
+        return {}
+
+    def headers(self) -> Dict[str, str]:
+        return {}
+
+    @staticmethod
+    def format_path(path: str, pair: str) -> str:
+        base, _, quote = pair.partition('/')
+        return path.format(base=base, quote=quote, noslash=pair.replace('/', ''),
+                           dash=pair.replace('/', '-'), pair=pair)
+
+    def requests_for(self, pairs: List[str]) -> List[Tuple[str, Dict[str, str], List[str]]]:
+        """``(path, params, pairs covered)`` for each GET needed to quote ``pairs``."""
+        bulk_path = self.entry.get('bulk_ticker_path')
+        if bulk_path:
+            return [(bulk_path, self.bulk_params(pairs), list(pairs))]
+        path = self.entry.get('public_ticker_path', '')
+        return [(self.format_path(path, pair), self.pair_params(pair), [pair]) for pair in pairs]
+
+    def records(self, data: Any) -> Iterable[Any]:
+        """The ticker records inside a decoded response."""
+        if isinstance(data, list):
+            return data
+        return [data] if isinstance(data, dict) else []
+
+    @staticmethod
+    def _first(record: Dict[str, Any], fields: Tuple[str, ...]):
+        for field in fields:
+            value = record.get(field)
+            if value is not None:
+                return value
+        return None
+
+    def record_quote(self, record: Any) -> Optional[TickerRow]:
+        if not isinstance(record, dict):
+            return None
+        timestamp = self._first(record, self.timestamp_fields)
+        return self._first(record, self.symbol_fields), {
+            'bid': _to_float(self._first(record, self.bid_fields)),
+            'ask': _to_float(self._first(record, self.ask_fields)),
+            'last': _to_float(self._first(record, self.last_fields)),
+            'volume': _to_float(self._first(record, self.volume_fields)) or 0.0,
+            'timestamp': int(float(timestamp)) if timestamp else int(time.time() * 1000),
+        }
+
+    def rows(self, data: Any) -> List[TickerRow]:
+        rows = []
+        for record in self.records(data):
+            row = self.record_quote(record)
+            if row is not None:
+                rows.append(row)
+        return rows
+
+    def parse(self, data: Any, pairs: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Map a decoded response to ``pair -> quote`` for the requested pairs."""
+        symbol_to_pair = {self.venue_symbol(pair): pair for pair in pairs}
+        quotes = {}
+        for symbol, quote in self.rows(data):
+            pair = symbol_to_pair.get(symbol) if symbol is not None else (pairs[0] if len(pairs) == 1 else None)
+            if pair is None:
+                continue
+            if quote.get('last') is None and quote.get('bid') and quote.get('ask'):
+                quote['last'] = (quote['bid'] + quote['ask']) / 2.0
+            if quote.get('last') is None:
+                continue
+            # Price-only endpoints: quote the last trade on both sides
+            if quote.get('bid') is None:
+                quote['bid'] = quote['last']
+            if quote.get('ask') is None:
+                quote['ask'] = quote['last']
+            quotes[pair] = quote
+        return quotes
+
+
+class BinanceRestAdapter(RestTickerAdapter):
+    """``/api/v3/ticker/24hr?symbols=[...]`` (bulk) or ``/api/v3/ticker/price?symbol=`` records."""
+
+    bid_fields = ('bidPrice',)
+    ask_fields = ('askPrice',)
+    last_fields = ('lastPrice', 'price')
+    timestamp_fields = ('closeTime',)
+
+    def venue_symbol(self, pair: str) -> str:
+        return pair.replace('/', '').upper()
+
+    def bulk_params(self, pairs: List[str]) -> Dict[str, str]:
+        return {'symbols': json.dumps([self.venue_symbol(pair) for pair in pairs], separators=(',', ':'))}
+
+    def pair_params(self, pair: str) -> Dict[str, str]:
+        return {'symbol': self.venue_symbol(pair)}
+
+
+class KrakenRestAdapter(RestTickerAdapter):
+    """``/0/public/Ticker?pair=XBTUSDT,ETHUSDT``: ``result`` keyed by Kraken pair names."""
+
+    _ASSETS = {'BTC': 'XBT', 'DOGE': 'XDG'}
+
+    def venue_symbol(self, pair: str) -> str:
+        base, _, quote = pair.partition('/')
+        return self._ASSETS.get(base, base) + self._ASSETS.get(quote, quote)
+
+    def bulk_params(self, pairs: List[str]) -> Dict[str, str]:
+        return {'pair': ','.join(self.venue_symbol(pair) for pair in pairs)}
+
+    def pair_params(self, pair: str) -> Dict[str, str]:
+        return {'pair': self.venue_symbol(pair)}
+
+    @staticmethod
+    def _plain_name(name: str) -> str:
+        # Legacy names prefix assets with X (crypto) / Z (fiat): XXBTZUSD -> XBTUSD
+        if len(name) == 8 and name[0] == 'X' and name[4] in 'XZ':
+            return name[1:4] + name[5:]
+        return name
+
+    def rows(self, data: Any) -> List[TickerRow]:
+        result = data.get('result') if isinstance(data, dict) else None
+        if not isinstance(result, dict):
+            return []
+        rows = []
+        now = int(time.time() * 1000)
+        for name, record in result.items():
+            if not isinstance(record, dict):
+                continue
+            rows.append((self._plain_name(name), {
+                'bid': _to_float((record.get('b') or [None])[0]),
+                'ask': _to_float((record.get('a') or [None])[0]),
+                'last': _to_float((record.get('c') or [None])[0]),
+                'volume': _to_float((record.get('v') or [None, None])[-1]) or 0.0,
+                'timestamp': now,
+            }))
+        return rows
+
+
+class KucoinRestAdapter(RestTickerAdapter):
+    """``/api/v1/market/allTickers`` (``buy``/``sell`` are best bid/ask) or ``orderbook/level1``."""
+
+    bid_fields = ('buy', 'bestBid')
+    ask_fields = ('sell', 'bestAsk')
+    volume_fields = ('vol',)
+    timestamp_fields = ('time',)
+
+    def venue_symbol(self, pair: str) -> str:
+        return pair.replace('/', '-')
+
+    def pair_params(self, pair: str) -> Dict[str, str]:
+        return {'symbol': self.venue_symbol(pair)}
+
+    def records(self, data: Any) -> Iterable[Any]:
+        payload = data.get('data') if isinstance(data, dict) else None
+        if isinstance(payload, dict) and isinstance(payload.get('ticker'), list):
+            return payload['ticker']
+        return [payload] if isinstance(payload, dict) else []
+
+
+class BybitRestAdapter(RestTickerAdapter):
+    """``/v5/market/tickers?category=spot``: ``result.list`` records."""
+
+    bid_fields = ('bid1Price',)
+    ask_fields = ('ask1Price',)
+    last_fields = ('lastPrice',)
+    volume_fields = ('volume24h',)
+
+    def records(self, data: Any) -> Iterable[Any]:
+        result = data.get('result') if isinstance(data, dict) else None
+        records = result.get('list') if isinstance(result, dict) else None
+        return records if isinstance(records, list) else []
+
+
+class OkxRestAdapter(RestTickerAdapter):
+    """``/api/v5/market/tickers?instType=SPOT``: ``data`` records keyed by ``instId``."""
+
+    symbol_fields = ('instId',)
+    bid_fields = ('bidPx',)
+    ask_fields = ('askPx',)
+    volume_fields = ('vol24h',)
+    timestamp_fields = ('ts',)
+
+    def venue_symbol(self, pair: str) -> str:
+        return pair.replace('/', '-')
+
+    def records(self, data: Any) -> Iterable[Any]:
+        payload = data.get('data') if isinstance(data, dict) else None
+        return payload if isinstance(payload, list) else []
+
+
+class CoinbaseRestAdapter(RestTickerAdapter):
+    """``/v2/prices/{base}-USD/spot`` (one request per pair): ``{'data': {'amount': ...}}``."""
+
+    symbol_fields = ()
+    last_fields = ('amount',)
+
+    def records(self, data: Any) -> Iterable[Any]:
+        payload = data.get('data') if isinstance(data, dict) else None
+        return [payload] if isinstance(payload, dict) else []
+
+
+def bitfinex_symbol(pair: str) -> str:
+    """Bitfinex trading symbol for a pair: 't' prefix, and USDT is listed as 'UST' (BTC/USDT -> tBTCUST)."""
+    base, _, quote = pair.partition('/')
+    return f"t{base}{'UST' if quote == 'USDT' else quote}"
+
+
+class BitfinexRestAdapter(RestTickerAdapter):
+    """``/v2/tickers?symbols=tBTCUST,...`` rows ``[SYMBOL, BID, BID_SIZE, ASK, ASK_SIZE, ..., LAST, VOLUME, ...]``."""
+
+    def venue_symbol(self, pair: str) -> str:
+        return bitfinex_symbol(pair)
+
+    def bulk_params(self, pairs: List[str]) -> Dict[str, str]:
+        return {'symbols': ','.join(self.venue_symbol(pair) for pair in pairs)}
+
+    def records(self, data: Any) -> Iterable[Any]:
+        if isinstance(data, list) and data and not isinstance(data[0], list):
+            return [data]  # single-symbol endpoint returns one unlabelled row
+        return data if isinstance(data, list) else []
+
+    def record_quote(self, record: Any) -> Optional[TickerRow]:
+        if not isinstance(record, list):
+            return None
+        symbol = record[0] if record and isinstance(record[0], str) else None
+        values = record[1:] if symbol is not None else record
+        if len(values) < 8:
+            return None
+        return symbol, {'bid': _to_float(values[0]), 'ask': _to_float(values[2]), 'last': _to_float(values[6]),
+                        'volume': _to_float(values[7]) or 0.0, 'timestamp': int(time.time() * 1000)}
+
+
+class GateioRestAdapter(RestTickerAdapter):
+    """``/api/v4/spot/tickers``: list of records keyed by ``currency_pair`` (``BTC_USDT``)."""
+
+    symbol_fields = ('currency_pair',)
+    bid_fields = ('highest_bid',)
+    ask_fields = ('lowest_ask',)
+    volume_fields = ('base_volume',)
+
+    def venue_symbol(self, pair: str) -> str:
+        return pair.replace('/', '_')
+
+    def pair_params(self, pair: str) -> Dict[str, str]:
+        return {'currency_pair': self.venue_symbol(pair)}
+
+
+class CoingeckoRestAdapter(RestTickerAdapter):
+    """``simple/price?ids=bitcoin,ethereum&vs_currencies=usd``: ``{id: {'usd': price}}``."""
+
+    IDS = {'BTC': 'bitcoin', 'ETH': 'ethereum', 'BNB': 'binancecoin', 'ADA': 'cardano',
+           'SOL': 'solana', 'MATIC': 'matic-network', 'DOT': 'polkadot'}
+
+    def venue_symbol(self, pair: str) -> str:
+        base = pair.split('/')[0]
+        return self.IDS.get(base, base.lower())
+
+    def bulk_params(self, pairs: List[str]) -> Dict[str, str]:
+        return {'ids': ','.join(dict.fromkeys(self.venue_symbol(pair) for pair in pairs)), 'vs_currencies': 'usd'}
+
+    def pair_params(self, pair: str) -> Dict[str, str]:
+        return self.bulk_params([pair])
+
+    def rows(self, data: Any) -> List[TickerRow]:
+        if not isinstance(data, dict):
+            return []
+        now = int(time.time() * 1000)
+        return [(coin_id, {'last': _to_float(prices.get('usd')), 'bid': None, 'ask': None,
+                           'volume': 0.0, 'timestamp': now})
+                for coin_id, prices in data.items() if isinstance(prices, dict)]
+
+    def parse(self, data: Any, pairs: List[str]) -> Dict[str, Dict[str, Any]]:
+        # Several pairs may share a coin id (BTC/USDT, BTC/USDC): quote each of them
+        rows = {symbol: quote for symbol, quote in self.rows(data)}
+        quotes = {}
+        for pair in pairs:
+            quote = rows.get(self.venue_symbol(pair))
+            if quote and quote['last'] is not None:
+                quotes[pair] = dict(quote, bid=quote['last'], ask=quote['last'])
+        return quotes
+
+
+class CoinmarketcapRestAdapter(CoingeckoRestAdapter):
+    """``cryptocurrency/quotes/latest?symbol=BTC,ETH&convert=USD`` (needs an API key)."""
+
+    def venue_symbol(self, pair: str) -> str:
+        return pair.split('/')[0]
+
+    def bulk_params(self, pairs: List[str]) -> Dict[str, str]:
+        return {'symbol': ','.join(dict.fromkeys(self.venue_symbol(pair) for pair in pairs)), 'convert': 'USD'}
+
+    def headers(self) -> Dict[str, str]:
+        api_key = os.getenv('COINMARKETCAP_API_KEY') or os.getenv('CMC_API_KEY')
+        return {'X-CMC_PRO_API_KEY': api_key} if api_key else {}
+
+    def rows(self, data: Any) -> List[TickerRow]:
+        payload = data.get('data') if isinstance(data, dict) else None
+        if not isinstance(payload, dict):
+            return []
+        now = int(time.time() * 1000)
+        rows = []
+        for symbol, record in payload.items():
+            if isinstance(record, list):  # v2 returns a list of matches per symbol
+                record = record[0] if record else None
+            usd = ((record or {}).get('quote') or {}).get('USD') or {}
+            rows.append((symbol, {'last': _to_float(usd.get('price')), 'bid': None, 'ask': None,
+                                  'volume': _to_float(usd.get('volume_24h')) or 0.0, 'timestamp': now}))
+        return rows
+
+
+# venue name -> adapter class
+REST_ADAPTERS = {
+    'binance': BinanceRestAdapter,
+    'kraken': KrakenRestAdapter,
+    'kucoin': KucoinRestAdapter,
+    'bybit': BybitRestAdapter,
+    'okx': OkxRestAdapter,
+    'coinbase': CoinbaseRestAdapter,
+    'bitfinex': BitfinexRestAdapter,
+    'gateio': GateioRestAdapter,
+    'coingecko': CoingeckoRestAdapter,
+    'coinmarketcap': CoinmarketcapRestAdapter,
+}
+
+
+class RestTickerClient:
+    """
+    Async REST ticker client over one pooled aiohttp session.
+
+    Base URLs and paths come from EXCHANGE_ENDPOINTS (``EXCHANGE_ENDPOINT_<NAME>_BASE_URL``
+    overrides the host). Every GET waits for the venue's token bucket and is bounded by
+    FETCH_CONFIG request_timeout; the session keeps connections alive across requests and
+    venues (REST_CLIENT_CONFIG sizes the pool). The session is bound to the event loop
+    that opened it and is reopened if the client is used from another loop.
+    """
+
+    def __init__(self):
+        self.rate_limiter = get_rate_limiter()
+        self._session = None  # aiohttp.ClientSession, opened on the first request
+        self._session_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def adapter(self, venue: str) -> Optional[RestTickerAdapter]:
+        entry = config.EXCHANGE_ENDPOINTS.get(venue)
+        adapter_cls = REST_ADAPTERS.get(venue)
+        if not entry or adapter_cls is None or not entry.get('base_url') or entry.get('prefer_ccxt'):
+            return None
+        if entry.get('requires_api_key') and not adapter_cls(venue, entry).headers():
+            return None
+        return adapter_cls(venue, entry)
+
+    def _url(self, venue: str, path: str) -> Tuple[str, Dict[str, str]]:
+        """Join the venue base URL and a path, splitting off any query string into params."""
+        base = config.EXCHANGE_ENDPOINTS[venue]['base_url'].rstrip('/')
+        parts = urlsplit(path)
+        url = base + (parts.path if parts.path.startswith('/') else '/' + parts.path)
+        return url, dict(parse_qsl(parts.query))
+
+    def _get_session(self):
+        import aiohttp  # deferred: only needed once a REST fallback actually runs
+
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._session_loop is not loop:
+            rest_cfg = config.REST_CLIENT_CONFIG
+            connector = aiohttp.TCPConnector(
+                limit=int(rest_cfg.get('pool_size', 64)),
+                limit_per_host=int(rest_cfg.get('pool_size_per_host', 8)),
+                ttl_dns_cache=rest_cfg.get('dns_cache_seconds', 300),
+                keepalive_timeout=rest_cfg.get('keepalive_seconds', 30),
+            )
+            self._session = aiohttp.ClientSession(connector=connector)
+            self._session_loop = loop
+        return self._session
+
+    async def get_json(self, venue: str, path: str, params: Optional[Dict[str, str]] = None,
+                       headers: Optional[Dict[str, str]] = None) -> Any:
+        """One rate-limited GET; returns the decoded JSON body or raises on HTTP/transport errors."""
+        import aiohttp
+
+        url, query = self._url(venue, path)
+        query.update(params or {})
+        await self.rate_limiter.acquire(venue)
+        timeout = config.FETCH_CONFIG.get('request_timeout')
+        session = self._get_session()
+        logger.debug("REST GET %s params=%s", url, query)
+        async with session.get(url, params=query, headers=headers or None,
+                               timeout=aiohttp.ClientTimeout(total=timeout)) as response:
+            response.raise_for_status()
+            return await response.json(content_type=None)
+
+    async def fetch_tickers(self, venue: str, pairs: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Quote ``pairs`` on ``venue``; returns raw ``pair -> {'bid', 'ask', 'last', 'volume', 'timestamp'}``.
+
+        Venues with an all-symbols endpoint answer with a single GET. Pairs missing from
+        the response, and requests that fail, are simply absent from the result.
+        """
+        adapter = self.adapter(venue)
+        if adapter is None or not pairs:
+            return {}
+
+        async def fetch(path: str, params: Dict[str, str], covered: List[str]) -> Dict[str, Dict[str, Any]]:
+            try:
+                data = await self.get_json(venue, path, params, adapter.headers())
+            except Exception as e:
+                logger.warning("REST ticker request to %s failed: %r", venue, e)
+                return {}
+            return adapter.parse(data, covered)
+
+        quotes = {}
+        for result in await asyncio.gather(*(fetch(*request) for request in adapter.requests_for(pairs))):
+            quotes.update(result)
+        logger.debug("REST tickers from %s: %d/%d pairs", venue, len(quotes), len(pairs))
+        return quotes
+
+    async def close(self):
+        if self._session is not None and not self._session.closed:
+            if self._session_loop is asyncio.get_running_loop():
+                await self._session.close()
+        self._session = None
+        self._session_loop = None
@@ -0,0 +1,65 @@
+import logging
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Deque, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class ScanTimings:
+    """
+    Rolling per-span duration samples for the scan pipeline.
+
+    Span names are dotted (``scan``, ``fetch``, ``fetch.venue.binance``,
+    ``strategy.triangular``, ...). Each name keeps its last ``window`` durations so
+    ``summary()`` can report p50/p95/p99 over recent scans; ``last_scan`` holds the
+    spans recorded since the most recent ``begin_scan()``.
+    """
+
+    def __init__(self, window: int = 200):
+        self.window = max(1, int(window))
+        self._samples: Dict[str, Deque[float]] = {}
+        self.last_scan: Dict[str, float] = {}
+
+    def begin_scan(self):
+        self.last_scan = {}
+
+    def record(self, name: str, seconds: float):
+        samples = self._samples.get(name)
+        if samples is None:
+            samples = self._samples[name] = deque(maxlen=self.window)
+        samples.append(seconds)
+        # A span may run more than once per scan (e.g. a venue's retry); report the total
+        self.last_scan[name] = self.last_scan.get(name, 0.0) + seconds
+
+    @contextmanager
+    def span(self, name: str):
+        """Time the enclosed block as ``name``; recorded even if it raises or is cancelled."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - started)
+
+    def percentiles(self, name: str) -> Optional[Dict[str, float]]:
+        samples = self._samples.get(name)
+        if not samples:
+            return None
+        ordered = sorted(samples)
+        last = len(ordered) - 1
+        return {
+            'count': len(ordered),
+            'last': samples[-1],
+            'p50': ordered[int(0.50 * last)],
+            'p95': ordered[int(0.95 * last)],
+            'p99': ordered[int(0.99 * last)],
+        }
+
+    def summary(self, prefix: str = '') -> Dict[str, Dict[str, float]]:
+        """``name -> percentiles`` for every span whose name starts with ``prefix``."""
+        return {name: self.percentiles(name) for name in sorted(self._samples) if name.startswith(prefix)}
+
+    def reset(self):
+        self._samples.clear()
+        self.last_scan = {}
@@ -0,0 +1,87 @@
+import json
+import logging
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, List, Optional
+
+from utils import config
+
+logger = logging.getLogger(__name__)
+
+
+class TraceBuffer:
+    """
+    Fixed-size in-memory ring buffer of structured diagnostic events.
+
+    Trace points in hot paths are written as ``if trace.enabled: trace.emit(...)``, so
+    when tracing is off they cost one attribute check and build nothing. Events carry
+    the id of the scan they happened in (``begin_scan``); ``dump`` returns one scan's
+    events and the oldest events are dropped once ``capacity`` is reached.
+    """
+
+    def __init__(self, capacity: int = 20000, enabled: bool = False):
+        self.enabled = bool(enabled)
+        self.scan_id = 0
+        self._events: deque = deque(maxlen=max(1, int(capacity)))
+        self._lock = threading.Lock()
+
+    @property
+    def capacity(self) -> int:
+        return self._events.maxlen
+
+    def enable(self, enabled: bool = True):
+        self.enabled = bool(enabled)
+
+    def begin_scan(self) -> int:
+        with self._lock:
+            self.scan_id += 1
+            return self.scan_id
+
+    def emit(self, event: str, **fields: Any):
+        """Record ``event``; field values are stored as given and only formatted on dump."""
+        with self._lock:
+            self._events.append((time.time(), self.scan_id, event, fields))
+
+    def dump(self, scan: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Events of ``scan`` (default: the current one), oldest first."""
+        scan = self.scan_id if scan is None else scan
+        with self._lock:
+            events = [entry for entry in self._events if entry[1] == scan]
+        return [{'time': ts, 'scan': scan_id, 'event': event, **fields} for ts, scan_id, event, fields in events]
+
+    def write_jsonl(self, path: str, scan: Optional[int] = None) -> int:
+        """Append one scan's events to ``path`` as JSON lines; returns the number written."""
+        events = self.dump(scan)
+        with open(path, 'a', encoding='utf-8') as handle:
+            for event in events:
+                handle.write(json.dumps(event, default=str) + '\n')
+        return len(events)
+
+    def clear(self):
+        with self._lock:
+            self._events.clear()
+
+    def __len__(self) -> int:
+        return len(self._events)
+
+
+_default_buffer: Optional[TraceBuffer] = None
+_default_lock = threading.Lock()
+
+
+def get_trace_buffer() -> TraceBuffer:
+    """
+    Process-wide trace buffer configured from DIAGNOSTICS_CONFIG.
+
+    Modules bind it once at import (``trace = get_trace_buffer()``) and guard every
+    trace point with ``if trace.enabled:``, so disabled tracing costs one attribute check.
+    """
+    global _default_buffer
+    with _default_lock:
+        if _default_buffer is None:
+            _default_buffer = TraceBuffer(
+                capacity=config.DIAGNOSTICS_CONFIG.get('trace_capacity', 20000),
+                enabled=config.DIAGNOSTICS_CONFIG.get('trace_enabled', False),
+            )
+        return _default_buffer
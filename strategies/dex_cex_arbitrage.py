@@ -3,9 +3,12 @@ import asyncio
 from typing import Dict, List, Any, Optional
 from datetime import datetime
 import logging
+from collections.abc import Mapping
 from utils.constants import EPS
+from core.trace import get_trace_buffer
 
 logger = logging.getLogger(__name__)
+trace = get_trace_buffer()
 
 class DEXCEXArbitrage:
     """
@@ -91,9 +94,10 @@ class DEXCEXArbitrage:
                 if not (cex_price_info and dex_price_info):
                     continue
 
-                # Helpful raw logging when provenance is missing (common source of malformed candidates)
-                if token == 'ADA':
-                    logger.debug("RAW ADA cex_price_info=%s dex_price_info=%s exchange=%s dex=%s", cex_price_info, dex_price_info, cex_exchange, dex_protocol)
+                # Raw price infos with their provenance (missing provenance is a common source of malformed candidates)
+                if trace.enabled:
+                    trace.emit('dex_cex_prices', token=token, exchange=cex_exchange, dex=dex_protocol,
+                               cex_price_info=cex_price_info, dex_price_info=dex_price_info)
 
                 # Calculate arbitrage potential: Buy on CEX, Sell on DEX
                 if cex_price_info['ask'] > 0 and dex_price_info['bid'] > 0:
@@ -160,25 +164,13 @@ class DEXCEXArbitrage:
                             )
 
                             # Diagnostic: detailed arithmetic and units before adding edge (include pair origin info)
-                            try:
-                                logger.debug(
-                                    "DIAG cex->dex token=%s buy_price=%.8f sell_price=%.8f buy_cost=%.8f sell_proceeds=%.8f rate=%.8f profit_pct=%.6f fees_cex=%.6f fees_dex=%.6f gas_cost=%.4f ai_conf=%s src_cex_pair=%s src_dex_pair=%s",
-                                    token,
-                                    cex_buy_price,
-                                    dex_sell_price,
-                                    buy_cost,
-                                    sell_proceeds,
-                                    rate,
-                                    profit_pct,
-                                    cex_fee,
-                                    dex_fee,
-                                    gas_cost,
-                                    timing_analysis,
-                                    self._get_price_origin(cex_price_info),
-                                    self._get_price_origin(dex_price_info)
-                                )
-                            except Exception:
-                                logger.debug("DIAG cex->dex (unable to format detailed values)")
+                            if trace.enabled:
+                                trace.emit('dex_cex_edge', direction='cex_to_dex', token=token, buy_price=cex_buy_price,
+                                           sell_price=dex_sell_price, buy_cost=buy_cost, sell_proceeds=sell_proceeds,
+                                           rate=rate, profit_pct=profit_pct, fees_cex=cex_fee, fees_dex=dex_fee,
+                                           gas_cost=gas_cost, ai=timing_analysis,
+                                           buy_origin=self._get_price_origin(cex_price_info),
+                                           sell_origin=self._get_price_origin(dex_price_info))
 
                             graph.add_edge(cex_node, dex_node,
                                          weight=weight,
@@ -216,9 +208,10 @@ class DEXCEXArbitrage:
                 if not (dex_price_info and cex_price_info):
                     continue
 
-                # Helpful raw logging when provenance is missing (common source of malformed candidates)
-                if token == 'ADA':
-                    logger.debug("RAW ADA dex_price_info=%s cex_price_info=%s dex=%s exchange=%s", dex_price_info, cex_price_info, dex_protocol, cex_exchange)
+                # Raw price infos with their provenance (missing provenance is a common source of malformed candidates)
+                if trace.enabled:
+                    trace.emit('dex_cex_prices', token=token, exchange=cex_exchange, dex=dex_protocol,
+                               cex_price_info=cex_price_info, dex_price_info=dex_price_info)
 
                 # Calculate arbitrage: Buy on DEX, Sell on CEX
                 if dex_price_info['ask'] > 0 and cex_price_info['bid'] > 0:
@@ -285,25 +278,13 @@ class DEXCEXArbitrage:
                             )
 
                             # Diagnostic: detailed arithmetic and units before adding edge (include pair origin info)
-                            try:
-                                logger.debug(
-                                    "DIAG dex->cex token=%s buy_price=%.8f sell_price=%.8f buy_cost=%.8f sell_proceeds=%.8f rate=%.8f profit_pct=%.6f fees_dex=%.6f fees_cex=%.6f gas_cost=%.4f ai_conf=%s src_dex_pair=%s src_cex_pair=%s",
-                                    token,
-                                    dex_buy_price,
-                                    cex_sell_price,
-                                    buy_cost,
-                                    sell_proceeds,
-                                    rate,
-                                    profit_pct,
-                                    dex_fee,
-                                    cex_fee,
-                                    gas_cost,
-                                    timing_analysis,
-                                    self._get_price_origin(dex_price_info),
-                                    self._get_price_origin(cex_price_info)
-                                )
-                            except Exception:
-                                logger.debug("DIAG dex->cex (unable to format detailed values)")
+                            if trace.enabled:
+                                trace.emit('dex_cex_edge', direction='dex_to_cex', token=token, buy_price=dex_buy_price,
+                                           sell_price=cex_sell_price, buy_cost=buy_cost, sell_proceeds=sell_proceeds,
+                                           rate=rate, profit_pct=profit_pct, fees_cex=cex_fee, fees_dex=dex_fee,
+                                           gas_cost=gas_cost, ai=timing_analysis,
+                                           buy_origin=self._get_price_origin(dex_price_info),
+                                           sell_origin=self._get_price_origin(cex_price_info))
 
                             graph.add_edge(dex_node, cex_node,
                                          weight=weight,
@@ -328,15 +309,14 @@ class DEXCEXArbitrage:
         This method also preserves provenance fields emitted by core.data_engine
         (pair, mapped_from_pair, source) and adds a safe inverted 'pair' when inversion occurs.
         """
-        if not isinstance(exchange_data, dict):
+        if not isinstance(exchange_data, Mapping):
             return None
 
         # Direct token lookup (core.data_engine maps base token -> pair data)
         if token in exchange_data:
             info = exchange_data[token]
-            # Raw debug for ADA issues
-            if token == 'ADA':
-                logger.debug("RAW ADA direct lookup price_info=%s", info)
+            if trace.enabled:
+                trace.emit('price_info', token=token, lookup='direct', price_info=info)
             # Ensure provenance fields exist
             copy = dict(info) if isinstance(info, dict) else {}
             if 'pair' not in copy:
@@ -359,8 +339,8 @@ class DEXCEXArbitrage:
                     copy = dict(price_info)
                     copy['pair'] = pair
                     copy['source'] = copy.get('source')
-                    if token == 'ADA':
-                        logger.debug("RAW ADA base-pair price_info from pair=%s -> %s", pair, copy)
+                    if trace.enabled:
+                        trace.emit('price_info', token=token, lookup='base', pair=pair, price_info=copy)
                     return self._normalize_price_info(copy)
 
                 # If token is quote, invert the pair
@@ -381,8 +361,8 @@ class DEXCEXArbitrage:
                     # Construct a sensible inverted pair string (e.g., if pair is BASE/QUOTE and token==QUOTE -> QUOTE/BASE)
                     inverted['pair'] = f"{token}/{base_token}"
                     inverted['source'] = inverted.get('source')
-                    if token == 'ADA':
-                        logger.debug("RAW ADA inverted price_info from pair=%s -> %s", pair, inverted)
+                    if trace.enabled:
+                        trace.emit('price_info', token=token, lookup='inverted', pair=pair, price_info=inverted)
                     return self._normalize_price_info(inverted)
 
         return None
@@ -566,17 +546,14 @@ class DEXCEXArbitrage:
                                 'ai_confidence': cex_to_dex_profit.get('confidence')
                             })
                         else:
-                            # Diagnostic logging: why candidate rejected
-                            logger.debug(
-                                "Direct-detect rejected cex->dex candidate: token=%s buy=%s sell=%s profit_pct=%s profit_usd=%s confidence=%s details=%s",
-                                token,
-                                cex_exchange,
-                                dex_protocol,
-                                cex_to_dex_profit.get('profit_pct'),
-                                cex_to_dex_profit.get('profit_usd'),
-                                cex_to_dex_profit.get('confidence'),
-                                {k: v for k, v in cex_to_dex_profit.items() if k not in ('profitable',)}
-                            )
+                            # Diagnostic: why the candidate was rejected
+                            if trace.enabled or logger.isEnabledFor(logging.DEBUG):
+                                details = {k: v for k, v in cex_to_dex_profit.items() if k != 'profitable'}
+                                if trace.enabled:
+                                    trace.emit('direct_rejected', direction='cex_to_dex', token=token,
+                                               buy=cex_exchange, sell=dex_protocol, details=details)
+                                logger.debug("Direct-detect rejected cex->dex candidate: token=%s buy=%s sell=%s details=%s",
+                                             token, cex_exchange, dex_protocol, details)
 
                         # DEX -> CEX opportunity
                         dex_to_cex_profit = await self.calculate_arbitrage_profit(
@@ -596,17 +573,14 @@ class DEXCEXArbitrage:
                                 'ai_confidence': dex_to_cex_profit.get('confidence')
                             })
                         else:
-                            # Diagnostic logging: why candidate rejected
-                            logger.debug(
-                                "Direct-detect rejected dex->cex candidate: token=%s buy=%s sell=%s profit_pct=%s profit_usd=%s confidence=%s details=%s",
-                                token,
-                                dex_protocol,
-                                cex_exchange,
-                                dex_to_cex_profit.get('profit_pct'),
-                                dex_to_cex_profit.get('profit_usd'),
-                                dex_to_cex_profit.get('confidence'),
-                                {k: v for k, v in dex_to_cex_profit.items() if k not in ('profitable',)}
-                            )
+                            # Diagnostic: why the candidate was rejected
+                            if trace.enabled or logger.isEnabledFor(logging.DEBUG):
+                                details = {k: v for k, v in dex_to_cex_profit.items() if k != 'profitable'}
+                                if trace.enabled:
+                                    trace.emit('direct_rejected', direction='dex_to_cex', token=token,
+                                               buy=dex_protocol, sell=cex_exchange, details=details)
+                                logger.debug("Direct-detect rejected dex->cex candidate: token=%s buy=%s sell=%s details=%s",
+                                             token, dex_protocol, cex_exchange, details)
 
             # Sort by profit percentage
             opportunities.sort(key=lambda x: x.get('profit_pct', 0), reverse=True)
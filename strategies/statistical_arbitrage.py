@@ -4,9 +4,12 @@ import numpy as np
 from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime, timedelta
 from collections import deque
+from collections.abc import Mapping
 import logging
+from core.trace import get_trace_buffer
 
 logger = logging.getLogger(__name__)
+trace = get_trace_buffer()
 
 class StatisticalArbitrage:
     """
@@ -21,6 +24,8 @@ class StatisticalArbitrage:
         # Historical data storage
         self.price_history = {}  # {token@exchange: deque of prices}
         self.correlation_cache = {}
+        # Bumped whenever price_history changes (see state_version)
+        self._history_version = 0
 
         # Parameters
         self.lookback_periods = 100  # Number of data points to analyze
@@ -49,6 +54,10 @@ class StatisticalArbitrage:
             'status': 'Active ✅ (AI-Enhanced)'
         }
 
+    def state_version(self) -> int:
+        """Changes whenever the price history (and so the z-scores behind the signals) changes."""
+        return self._history_version
+
     async def add_strategy_edges(self, graph, price_data: Dict[str, Any]):
         """Add statistical arbitrage signals as edge weight modifications"""
 
@@ -79,36 +88,31 @@ class StatisticalArbitrage:
             if not isinstance(price_data, dict):
                 raise TypeError(" Expected price_data to be a dictionary, but got a different type")
     
-            # Debugging: Log the type of price_data
-            logger.debug(f" Debug: price_data type: {type(price_data)}")
-     
-            # Debugging: Log the structure of price_data
-            logger.debug(f" Debug: price_data content: {price_data}")
-    
             # Validate price data sections (only 'cex' and 'dex' expected to contain pair dicts)
             cex_section = price_data.get('cex', {})
             dex_section = price_data.get('dex', {})
     
-            if not isinstance(cex_section, dict) or not isinstance(dex_section, dict):
+            if not isinstance(cex_section, Mapping) or not isinstance(dex_section, Mapping):
                 raise ValueError(" Price data missing 'cex' or 'dex' dictionary sections")
     
             # Helper to check if a market section contains at least one exchange with pair dicts
             def _has_valid_market(section):
                 for exchange_data in section.values():
-                    if isinstance(exchange_data, dict) and any(isinstance(v, dict) for v in exchange_data.values()):
+                    if isinstance(exchange_data, Mapping) and any(isinstance(v, dict) for v in exchange_data.values()):
                         return True
                 return False
     
             if not (_has_valid_market(cex_section) or _has_valid_market(dex_section)):
                 raise ValueError(" Price data contains no valid market pair data")
 
+            if trace.enabled:
+                trace.emit('statistical_update', cex={venue: len(data) for venue, data in cex_section.items()},
+                           dex={venue: len(data) for venue, data in dex_section.items()})
+
             # Update CEX data
             for exchange, exchange_data in price_data.get('cex', {}).items():
-                # Debugging: Log the type of exchange_data
-                logger.debug(f" Debug: {exchange} data type: {type(exchange_data)}")
- 
                 # Ensure exchange_data is a dictionary
-                if not isinstance(exchange_data, dict):
+                if not isinstance(exchange_data, Mapping):
                     logger.warning(f" Error: Expected dictionary for {exchange}, but got {type(exchange_data)}")
                     continue
 
@@ -128,14 +132,12 @@ class StatisticalArbitrage:
                                 'timestamp': timestamp,
                                 'volume': price_info.get('volume', 0)
                             })
+                            self._history_version += 1
 
             # Update DEX data
             for protocol, protocol_data in price_data.get('dex', {}).items():
-                # Debugging: Log the type of protocol_data
-                logger.debug(f" Debug: {protocol} data type: {type(protocol_data)}")
- 
                 # Ensure protocol_data is a dictionary
-                if not isinstance(protocol_data, dict):
+                if not isinstance(protocol_data, Mapping):
                     logger.warning(f" Error: Expected dictionary for {protocol}, but got {type(protocol_data)}")
                     continue
 
@@ -155,6 +157,7 @@ class StatisticalArbitrage:
                                 'timestamp': timestamp,
                                 'volume': price_info.get('volume', 0)
                             })
+                            self._history_version += 1
 
         except Exception as e:
             logger.exception(f" Error updating historical data: {str(e)}")
@@ -492,6 +495,7 @@ class StatisticalArbitrage:
                     maxlen=self.lookback_periods
                 )
                 self.price_history[key] = filtered_data
+            self._history_version += 1
 
             logger.info(f" Cleaned historical data older than {days_to_keep} days")
 
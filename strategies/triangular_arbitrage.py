@@ -3,8 +3,10 @@ import asyncio
 import logging
 from typing import Dict, List, Any, Optional, Tuple
 from itertools import permutations
+from core.trace import get_trace_buffer
 
 logger = logging.getLogger(__name__)
+trace = get_trace_buffer()
 
 # Import centralized validation thresholds
 from utils.constants import MAX_RATE_THRESHOLD, MIN_RATE_THRESHOLD, MAX_WEIGHT_THRESHOLD
@@ -182,9 +184,9 @@ class TriangularArbitrage:
                     p2_base, p2_quote = p2.split('/')
                     p3_base, p3_quote = p3.split('/')
                     
-                    # Log the configuration for debugging
-                    logger.debug(f"Found valid triangle: {p1} ({config['action1']}), "
-                               f"{p2} ({config['action2']}), {p3} ({config['action3']})")
+                    if trace.enabled:
+                        trace.emit('triangle', pairs=(p1, p2, p3),
+                                   actions=(config['action1'], config['action2'], config['action3']))
                 
                 return {
                     'pair1': p1,
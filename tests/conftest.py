@@ -4,4 +4,12 @@ import sys
 # Ensure project root is on sys.path for tests that import local packages
 ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
 if ROOT not in sys.path:
-    sys.path.insert(0, ROOT)
\ No newline at end of file
+    sys.path.insert(0, ROOT)
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def _isolated_market_cache(tmp_path, monkeypatch):
+    """Keep the on-disk market metadata cache out of the user's home directory."""
+    import utils.config as config
+    monkeypatch.setitem(config.MARKET_CACHE_CONFIG, 'directory', str(tmp_path / 'market_cache'))
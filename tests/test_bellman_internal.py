@@ -100,4 +100,235 @@ def test_is_valid_cycle_filters_too_long():
 
     # Ensure max_cycle_length is less than our cycle_length for the detector
     detector.max_cycle_length = 6
-    assert detector.is_valid_cycle(cycle) is False
\ No newline at end of file
+    assert detector.is_valid_cycle(cycle) is False
+
+def test_multi_source_matches_per_source(simple_profitable_cycle_graph):
+    multi = BellmanFordDetector(ai_model=None)
+    multi.detection_mode = 'multi_source'
+    legacy = BellmanFordDetector(ai_model=None)
+    legacy.detection_mode = 'per_source'
+
+    multi_cycles = multi.detect_all_cycles(simple_profitable_cycle_graph)
+    legacy_cycles = legacy.detect_all_cycles(simple_profitable_cycle_graph)
+
+    assert len(multi_cycles) == len(legacy_cycles) == 1
+    assert (BellmanFordDetector._cycle_key(multi_cycles[0]['path'])
+            == BellmanFordDetector._cycle_key(legacy_cycles[0]['path']))
+
+    # Result schema consumed by MainArbitrageSystem must be unchanged
+    for key in ('path', 'weight', 'edge_data', 'profit_estimate', 'strategy_type', 'cycle_length'):
+        assert key in multi_cycles[0]
+    assert multi_cycles[0]['weight'] == pytest.approx(-math.log(1.05))
+
+
+def test_multi_source_finds_disjoint_cycles():
+    gb = GraphBuilder(ai_model=None)
+    G = gb.build_unified_graph({
+        'tokens': ['A', 'B', 'C', 'D'],
+        'cex': {'binance': {'A/B': {'bid': 0.0, 'ask': 0.0}}},
+        'dex': {'uniswap_v3': {'C/D': {'bid': 0.0, 'ask': 0.0}}}
+    })
+
+    # Two unconnected profitable loops; a single source could only reach one of them
+    r = 1.03 ** 0.5
+    G.add_edge("A@binance", "B@binance", weight=-math.log(r), rate=r)
+    G.add_edge("B@binance", "A@binance", weight=-math.log(r), rate=r)
+    G.add_edge("C@uniswap_v3", "D@uniswap_v3", weight=-math.log(r), rate=r)
+    G.add_edge("D@uniswap_v3", "C@uniswap_v3", weight=-math.log(r), rate=r)
+
+    detector = BellmanFordDetector(ai_model=None)
+    detector.detection_mode = 'multi_source'
+    cycles = detector.bellman_ford_multi_source(G)
+
+    keys = {BellmanFordDetector._cycle_key(c['path']) for c in cycles}
+    assert keys == {("A@binance", "B@binance"), ("C@uniswap_v3", "D@uniswap_v3")}
+
+
+def _cycle_keys(cycles):
+    return {BellmanFordDetector._cycle_key(c['path']) for c in cycles}
+
+
+@pytest.mark.parametrize("mode", ["multi_source", "per_source"])
+def test_numpy_backend_matches_python_backend(simple_profitable_cycle_graph, mode):
+    python_detector = BellmanFordDetector(ai_model=None)
+    python_detector.detection_mode = mode
+    python_detector.relaxation_backend = 'python'
+    numpy_detector = BellmanFordDetector(ai_model=None)
+    numpy_detector.detection_mode = mode
+    numpy_detector.relaxation_backend = 'numpy'
+
+    python_cycles = python_detector.detect_all_cycles(simple_profitable_cycle_graph)
+    numpy_cycles = numpy_detector.detect_all_cycles(simple_profitable_cycle_graph)
+
+    assert _cycle_keys(python_cycles) == _cycle_keys(numpy_cycles)
+    assert len(numpy_cycles) == 1
+    assert numpy_cycles[0]['weight'] == pytest.approx(python_cycles[0]['weight'])
+    assert numpy_cycles[0]['profit_estimate'] == pytest.approx(python_cycles[0]['profit_estimate'])
+
+
+def _several_cycles_graph():
+    """Three profitable loops in one component, joined by losing edges."""
+    import networkx as nx
+
+    G = nx.DiGraph()
+    loops = [
+        (["A@binance", "B@binance", "C@kraken"], 1.04),
+        (["D@binance", "E@uniswap_v3"], 1.02),
+        (["F@kraken", "G@kraken", "H@uniswap_v3", "I@binance"], 1.06),
+    ]
+    for nodes, factor in loops:
+        r = factor ** (1 / len(nodes))
+        for u, v in zip(nodes, nodes[1:] + nodes[:1]):
+            G.add_edge(u, v, weight=-math.log(r), rate=r, pair="X/Y", exchange="mixed")
+    # Losing bridges in both directions put every loop in one strongly connected component
+    for u, v in [("A@binance", "D@binance"), ("D@binance", "A@binance"),
+                 ("E@uniswap_v3", "F@kraken"), ("F@kraken", "E@uniswap_v3")]:
+        G.add_edge(u, v, weight=0.05, rate=math.exp(-0.05), pair="X/Y", exchange="mixed")
+    return G
+
+
+def _disconnected_graph():
+    """Two profitable components, one acyclic component and an isolated node."""
+    import networkx as nx
+
+    G = nx.DiGraph()
+    for nodes, factor in [(["A@binance", "B@binance", "C@binance"], 1.03),
+                          (["P@kraken", "Q@uniswap_v3", "R@kraken", "S@kraken"], 1.05)]:
+        r = factor ** (1 / len(nodes))
+        for u, v in zip(nodes, nodes[1:] + nodes[:1]):
+            G.add_edge(u, v, weight=-math.log(r), rate=r, pair="X/Y", exchange="mixed")
+    G.add_edge("X@okx", "Y@okx", weight=-0.01, rate=math.exp(0.01), pair="X/Y", exchange="okx")
+    G.add_edge("Y@okx", "Z@okx", weight=-0.01, rate=math.exp(0.01), pair="X/Y", exchange="okx")
+    G.add_node("LONE@okx")
+    return G
+
+
+@pytest.mark.parametrize("partition", [True, False])
+@pytest.mark.parametrize("mode", ["multi_source", "per_source"])
+@pytest.mark.parametrize("build_graph, min_cycles", [(_several_cycles_graph, 2), (_disconnected_graph, 2)])
+def test_numpy_backend_matches_python_backend_on_harder_graphs(build_graph, min_cycles, mode, partition):
+    graph = build_graph()
+    results = {}
+    for backend in ('python', 'numpy'):
+        detector = BellmanFordDetector(ai_model=None)
+        detector.detection_mode = mode
+        detector.relaxation_backend = backend
+        detector.partition_components = partition
+        detector.min_profit_threshold = 0.0
+        results[backend] = {BellmanFordDetector._cycle_key(c['path']): c['weight']
+                            for c in detector.detect_all_cycles(graph)}
+
+    assert len(results['python']) >= min_cycles
+    assert set(results['numpy']) == set(results['python'])
+    for key, weight in results['python'].items():
+        assert results['numpy'][key] == pytest.approx(weight)
+
+
+@pytest.mark.parametrize("build_graph", [_several_cycles_graph, _disconnected_graph])
+def test_numpy_kernel_reproduces_python_kernel_with_negative_cycles(build_graph):
+    from core.compiled_graph import CompiledGraph
+
+    compiled = CompiledGraph.from_graph(build_graph())
+    detector = BellmanFordDetector(ai_model=None)
+    inf = float('inf')
+    starts = [[0.0] * compiled.number_of_nodes(),
+              [0.0] + [inf] * (compiled.number_of_nodes() - 1)]
+    for start in starts:
+        py_dist, py_pred, py_relaxed = detector._relax_edges_python(compiled, start)
+        np_dist, np_pred, np_relaxed = detector._relax_edges_numpy(compiled, start)
+
+        # Same relaxation order, so the kernels agree exactly, not just on the cycles found
+        assert py_relaxed and np_relaxed == py_relaxed
+        assert np_pred == py_pred
+        assert np_dist == py_dist
+
+
+def test_numpy_backend_shortest_distances_match_python():
+    from core.compiled_graph import CompiledGraph
+
+    gb = GraphBuilder(ai_model=None)
+    G = gb.build_unified_graph({
+        'tokens': ['BTC', 'ETH', 'USDT'],
+        'cex': {
+            'binance': {'BTC/USDT': {'bid': 50000.0, 'ask': 50010.0},
+                        'ETH/USDT': {'bid': 3000.0, 'ask': 3001.0}},
+            'kraken': {'ETH/USDT': {'bid': 2999.0, 'ask': 3002.0}},
+        },
+        'dex': {}
+    })
+    compiled = CompiledGraph.from_graph(G)
+    start = [0.0] * compiled.number_of_nodes()
+
+    detector = BellmanFordDetector(ai_model=None)
+    py_dist, _, py_relaxed = detector._relax_edges_python(compiled, start)
+    np_dist, _, np_relaxed = detector._relax_edges_numpy(compiled, start)
+
+    # No negative cycles in a plain bid/ask book: both kernels converge to the same distances
+    assert py_relaxed == [] and np_relaxed == []
+    assert np_dist == pytest.approx(py_dist)
+
+
+def _random_graph(rng, num_nodes, density):
+    import networkx as nx
+
+    G = nx.DiGraph()
+    names = [f"T{i}@venue{i % 3}" for i in range(num_nodes)]
+    for u in names:
+        for v in names:
+            if u != v and rng.random() < density:
+                G.add_edge(u, v, weight=rng.uniform(-0.05, 0.2), rate=1.0, pair="T/T", exchange="x")
+    return G, names
+
+
+def test_incremental_detection_matches_full_runs():
+    import random
+
+    rng = random.Random(7)
+    for _ in range(20):
+        G, names = _random_graph(rng, rng.randint(4, 10), 0.35)
+        incremental = BellmanFordDetector(ai_model=None)
+        full = BellmanFordDetector(ai_model=None)
+
+        for step in range(10):
+            for u, v, data in list(G.edges(data=True)):
+                roll = rng.random()
+                if roll < 0.1:
+                    data['weight'] += rng.uniform(-0.05, 0.05)
+                elif roll < 0.12:
+                    G.remove_edge(u, v)
+            if rng.random() < 0.3:
+                u, v = rng.sample(names, 2)
+                G.add_edge(u, v, weight=rng.uniform(-0.02, 0.2), rate=1.0, pair="T/T", exchange="x")
+            if rng.random() < 0.1:
+                new_node = f"N{step}@venue9"
+                G.add_edge(new_node, rng.choice(names), weight=0.1, rate=1.0, pair="N/T", exchange="x")
+                G.add_edge(rng.choice(names), new_node, weight=0.05, rate=1.0, pair="T/N", exchange="x")
+
+            assert _cycle_keys(incremental.bellman_ford_incremental(G)) == \
+                _cycle_keys(full.bellman_ford_multi_source(G))
+
+
+def test_incremental_detection_relaxes_only_from_changed_edges(monkeypatch):
+    import networkx as nx
+
+    G = nx.DiGraph()
+    for u, v, w in [("A@x", "B@x", -0.01), ("B@x", "C@x", 0.02), ("C@x", "A@x", 0.03), ("C@x", "D@x", 0.01)]:
+        G.add_edge(u, v, weight=w, rate=math.exp(-w), pair="P/Q", exchange="x")
+
+    detector = BellmanFordDetector(ai_model=None)
+    assert detector.bellman_ford_incremental(G) == []
+
+    full_runs = []
+    original = detector.bellman_ford_multi_source
+    monkeypatch.setattr(detector, 'bellman_ford_multi_source', lambda g: full_runs.append(g) or original(g))
+
+    # A cheaper edge that keeps the graph cycle-free is handled without a full run
+    G["C@x"]["D@x"]["weight"] = -0.005
+    assert detector.bellman_ford_incremental(G) == []
+    assert full_runs == []
+
+    # Closing a negative cycle switches to a full run and reports the cycle
+    G["C@x"]["A@x"]["weight"] = -0.02
+    cycles = detector.bellman_ford_incremental(G)
+    assert len(full_runs) == 1
+    assert _cycle_keys(cycles) == {("A@x", "B@x", "C@x")}
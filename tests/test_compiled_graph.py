@@ -0,0 +1,147 @@
+import math
+
+from core.graph_builder import GraphBuilder
+from core.compiled_graph import CompiledGraph
+from core.bellman_ford_detector import BellmanFordDetector
+
+
+def _price_data():
+    return {
+        'tokens': ['BTC', 'ETH', 'USDT'],
+        'cex': {
+            'binance': {
+                'BTC/USDT': {'bid': 50000.0, 'ask': 50010.0},
+                'ETH/USDT': {'bid': 3000.0, 'ask': 3001.0},
+            },
+        },
+        'dex': {
+            'uniswap_v3': {
+                'ETH/USDT': {'bid': 2990.0, 'ask': 3005.0, 'fee': 0.003},
+            },
+        },
+    }
+
+
+def test_compile_interns_nodes_and_builds_csr():
+    gb = GraphBuilder(ai_model=None)
+    G = gb.build_unified_graph(_price_data())
+    compiled = gb.compile_graph(G)
+
+    assert gb.compiled_graph is compiled
+    assert compiled.number_of_nodes() == G.number_of_nodes()
+    assert compiled.number_of_edges() == G.number_of_edges()
+
+    # CSR invariants: edges sorted by source and indptr spans every edge
+    assert list(compiled.src) == sorted(compiled.src)
+    assert compiled.indptr[-1] == compiled.number_of_edges()
+
+    for name, node_id in compiled.node_index.items():
+        expected = {v for u, v in G.edges() if u == name}
+        got = {compiled.node_names[int(compiled.dst[i])] for i in compiled.out_edges(node_id)}
+        assert got == expected
+
+    # Edge attributes are shared with the source graph, not copied
+    for u, v, data in G.edges(data=True):
+        assert compiled.get_edge_data(u, v) is data
+        assert compiled[u][v]['weight'] == data['weight']
+
+
+def test_detector_accepts_compiled_graph():
+    gb = GraphBuilder(ai_model=None)
+    G = gb.build_unified_graph({
+        'tokens': ['A', 'B', 'C'],
+        'cex': {'binance': {'A/B': {'bid': 0.0, 'ask': 0.0}}},
+        'dex': {'uniswap_v3': {'B/C': {'bid': 0.0, 'ask': 0.0}}},
+    })
+    r = 1.05 ** (1 / 3)
+    G.add_edge("A@binance", "B@uniswap_v3", weight=-math.log(r), rate=r)
+    G.add_edge("B@uniswap_v3", "C@uniswap_v3", weight=-math.log(r), rate=r)
+    G.add_edge("C@uniswap_v3", "A@binance", weight=-math.log(r), rate=r)
+
+    detector = BellmanFordDetector(ai_model=None)
+    from_graph = detector.detect_all_cycles(G)
+    from_compiled = detector.detect_all_cycles(CompiledGraph.from_graph(G))
+
+    assert [c['path'] for c in from_graph] == [c['path'] for c in from_compiled]
+    assert len(from_compiled) == 1
+    assert set(from_compiled[0]['edge_data']) == {
+        "A@binance->B@uniswap_v3", "B@uniswap_v3->C@uniswap_v3", "C@uniswap_v3->A@binance"
+    }
+
+
+def _random_digraph(seed, num_nodes=12, density=0.15):
+    import random
+    import networkx as nx
+
+    rng = random.Random(seed)
+    G = nx.DiGraph()
+    G.add_nodes_from(f"T{i}@venue{i % 3}" for i in range(num_nodes))
+    for u in list(G.nodes()):
+        for v in list(G.nodes()):
+            if u != v and rng.random() < density:
+                G.add_edge(u, v, weight=rng.uniform(-0.1, 0.1), rate=1.0)
+    return G
+
+
+def test_strongly_connected_components_match_networkx():
+    import networkx as nx
+
+    for seed in range(25):
+        G = _random_digraph(seed)
+        compiled = CompiledGraph.from_graph(G)
+        got = {frozenset(compiled.node_names[i] for i in comp) for comp in compiled.strongly_connected_components()}
+        expected = {frozenset(comp) for comp in nx.strongly_connected_components(G)}
+        assert got == expected
+
+
+def test_subgraph_keeps_only_internal_edges_and_shares_attrs():
+    G = _random_digraph(3, density=0.3)
+    compiled = CompiledGraph.from_graph(G)
+    ids = [0, 2, 5, 7]
+    sub = compiled.subgraph(ids)
+
+    names = {compiled.node_names[i] for i in ids}
+    assert set(sub.nodes()) == names
+    assert {(u, v) for u, v in sub.edges()} == {(u, v) for u, v in G.edges() if u in names and v in names}
+    for u, v, data in sub.edges(data=True):
+        assert data is G[u][v]
+
+
+def _cycle_keys(cycles):
+    return sorted(BellmanFordDetector._cycle_key(c['path']) for c in cycles)
+
+
+def test_partitioned_detection_matches_whole_graph_search():
+    detector = BellmanFordDetector(ai_model=None)
+    detector.cycle_search = 'bounded_dfs'
+    detector.max_enumerated_cycles = 10 ** 6
+    whole = BellmanFordDetector(ai_model=None)
+    whole.cycle_search = 'bounded_dfs'
+    whole.max_enumerated_cycles = 10 ** 6
+    whole.partition_components = False
+
+    for seed in range(10):
+        G = _random_digraph(seed, density=0.25)
+        assert _cycle_keys(detector.detect_all_cycles(G)) == _cycle_keys(whole.detect_all_cycles(G))
+
+
+def test_parallel_component_search_matches_in_process():
+    import networkx as nx
+
+    # Two independent markets: a profitable triangle on each chain
+    G = nx.DiGraph()
+    r = 1.03 ** (1 / 3)
+    for chain in ('ethereum', 'algorand'):
+        nodes = [f"A@{chain}_dex", f"B@{chain}_cex", f"C@{chain}_dex"]
+        for u, v in zip(nodes, nodes[1:] + nodes[:1]):
+            G.add_edge(u, v, weight=-math.log(r), rate=r)
+    G.add_edge("A@ethereum_dex", "A@algorand_dex", weight=0.01, rate=0.99)
+
+    in_process = BellmanFordDetector(ai_model=None)
+    parallel = BellmanFordDetector(ai_model=None)
+    parallel.parallel_workers = 2
+    try:
+        assert _cycle_keys(parallel.detect_all_cycles(G)) == _cycle_keys(in_process.detect_all_cycles(G))
+        assert len(in_process.detect_all_cycles(G)) == 2
+    finally:
+        parallel.close()
@@ -0,0 +1,91 @@
+import math
+import random
+
+import networkx as nx
+import pytest
+
+from core.bellman_ford_detector import BellmanFordDetector
+from core.compiled_graph import CompiledGraph
+from core.cycle_enumerator import BoundedCycleEnumerator
+
+
+def _random_graph(rng, num_nodes, density=0.4):
+    G = nx.DiGraph()
+    for i in range(num_nodes):
+        for j in range(num_nodes):
+            if i != j and rng.random() < density:
+                G.add_edge(f"T{i}@venue{i % 3}", f"T{j}@venue{j % 3}", weight=rng.uniform(-0.1, 0.12))
+    return G
+
+
+def _brute_force(G, max_length, threshold):
+    cycles = {}
+    for nodes in nx.simple_cycles(G, length_bound=max_length):
+        if len(nodes) < 2:
+            continue
+        weight = sum(G[nodes[k]][nodes[(k + 1) % len(nodes)]]['weight'] for k in range(len(nodes)))
+        if weight < threshold:
+            cycles[BellmanFordDetector._cycle_key(nodes + [nodes[0]])] = weight
+    return cycles
+
+
+def _keys(compiled, results):
+    return {BellmanFordDetector._cycle_key([compiled.node_names[i] for i in path]) for _, path in results}
+
+
+def test_enumerates_every_profitable_cycle_within_bound():
+    rng = random.Random(3)
+    for _ in range(40):
+        G = _random_graph(rng, rng.randint(3, 8))
+        max_length = rng.randint(2, 5)
+        compiled = CompiledGraph.from_graph(G)
+
+        results = BoundedCycleEnumerator(max_length, -0.01, top_n_per_start=10 ** 6).enumerate(compiled)
+
+        expected = _brute_force(G, max_length, -0.01)
+        assert _keys(compiled, results) == set(expected)
+        assert [w for w, _ in results] == sorted(w for w, _ in results)
+        for weight, path in results:
+            assert path[0] == path[-1] == min(path[:-1])
+            assert len(path) - 1 <= max_length
+            assert weight == pytest.approx(expected[_keys(compiled, [(weight, path)]).pop()])
+
+
+def test_keeps_top_n_per_start_node():
+    rng = random.Random(11)
+    G = _random_graph(rng, 8, density=0.6)
+    compiled = CompiledGraph.from_graph(G)
+
+    results = BoundedCycleEnumerator(4, 0.0, top_n_per_start=2).enumerate(compiled)
+    everything = BoundedCycleEnumerator(4, 0.0, top_n_per_start=10 ** 6).enumerate(compiled)
+
+    by_start = {}
+    for weight, path in everything:
+        by_start.setdefault(path[0], []).append(weight)
+    expected = sorted(w for weights in by_start.values() for w in sorted(weights)[:2])
+    assert [w for w, _ in results] == pytest.approx(expected)
+
+
+def test_bounded_search_recovers_cycles_bellman_ford_misses():
+    # Two profitable triangles sharing the A@binance -> B@kraken edge: predecessor walks
+    # report one of them, the bounded search reports both
+    G = nx.DiGraph()
+    rate = 1.02 ** (1 / 3)
+    for u, v in [("A@binance", "B@kraken"), ("B@kraken", "C@okx"), ("C@okx", "A@binance"),
+                 ("B@kraken", "D@bybit"), ("D@bybit", "A@binance")]:
+        G.add_edge(u, v, weight=-math.log(rate), rate=rate, pair="X/Y", exchange=u.split('@')[1])
+
+    bellman_ford = BellmanFordDetector(ai_model=None)
+    bounded = BellmanFordDetector(ai_model=None)
+    bounded.cycle_search = 'bounded_dfs'
+
+    bf_keys = {BellmanFordDetector._cycle_key(c['path']) for c in bellman_ford.detect_all_cycles(G)}
+    bounded_cycles = bounded.detect_all_cycles(G)
+    bounded_keys = {BellmanFordDetector._cycle_key(c['path']) for c in bounded_cycles}
+
+    assert len(bf_keys) == 1
+    assert bounded_keys == {("A@binance", "B@kraken", "C@okx"), ("A@binance", "B@kraken", "D@bybit")}
+    assert bf_keys <= bounded_keys
+    # Same result schema as the Bellman-Ford path
+    assert set(bounded_cycles[0]) == {'path', 'weight', 'profit_estimate', 'edge_data', 'strategy_type',
+                                      'cycle_length', 'exchanges_involved', 'tokens_involved'}
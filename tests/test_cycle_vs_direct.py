@@ -15,8 +15,10 @@ _ccxt.binance = lambda conf=None: _DummyExchange(conf)
 _ccxt.kraken = lambda conf=None: _DummyExchange(conf)
 _ccxt.coinbase = lambda conf=None: _DummyExchange(conf)
 _ccxt.kucoin = lambda conf=None: _DummyExchange(conf)
+import importlib.util as _importlib_util
 import sys as _sys
-_sys.modules['ccxt'] = _ccxt
+if _importlib_util.find_spec('ccxt') is None:
+    _sys.modules['ccxt'] = _ccxt
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
@@ -0,0 +1,374 @@
+import asyncio
+import collections
+import threading
+import time
+
+import pytest
+
+import utils.config as config
+from core.circuit_breaker import CircuitBreaker
+from core.data_engine import DataEngine
+
+
+class _FakeExchange:
+    """Minimal synchronous ccxt stand-in that records request concurrency."""
+
+    def __init__(self, symbols, delay=0.05, price=100.0):
+        self.symbols = list(symbols)
+        self.delay = delay
+        self.price = price
+        self.calls = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def load_markets(self):
+        return {}
+
+    def fetch_ticker(self, pair):
+        with self._lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(self.delay)
+        with self._lock:
+            self.in_flight -= 1
+            self.calls.append(pair)
+        return {'bid': self.price * 0.999, 'ask': self.price * 1.001, 'last': self.price, 'baseVolume': 10}
+
+
+PAIRS = ['BTC/USDT', 'ETH/USDT', 'SOL/USDT', 'ADA/USDT']
+
+
+async def _no_rest(name, pairs):
+    return {}
+
+
+@pytest.fixture
+def engine(monkeypatch):
+    monkeypatch.setitem(config.EXCHANGES_CONFIG, 'fast_venue', {'rate_limit': 6000})
+    monkeypatch.setitem(config.EXCHANGES_CONFIG, 'slow_venue', {'rate_limit': 6000})
+    monkeypatch.setitem(config.EXCHANGES_CONFIG, 'strict_venue', {'rate_limit': 60})
+    de = DataEngine()
+    de.cex_exchanges = {}
+    return de
+
+
+@pytest.mark.asyncio
+async def test_fetch_cex_data_runs_exchanges_in_parallel(engine):
+    engine.cex_exchanges = {
+        'fast_venue': _FakeExchange(PAIRS, delay=0.1),
+        'slow_venue': _FakeExchange(PAIRS, delay=0.1),
+    }
+
+    started = time.monotonic()
+    cex_data = await engine.fetch_cex_data(PAIRS)
+    elapsed = time.monotonic() - started
+
+    # Serial fetching would take 2 venues x 4 pairs x 0.1s = 0.8s
+    assert elapsed < 0.6
+    for venue in ('fast_venue', 'slow_venue'):
+        assert list(k for k in cex_data[venue] if '/' in k) == PAIRS
+        assert cex_data[venue]['BTC/USDT']['source'] == f"cex:{venue}"
+        assert cex_data[venue]['BTC']['mapped_from_pair'] == 'BTC/USDT'
+        assert engine.cex_exchanges[venue].max_in_flight > 1
+
+
+@pytest.mark.asyncio
+async def test_concurrency_is_capped_by_rate_limit(engine):
+    # 60 requests/minute -> one request in flight at a time
+    strict = _FakeExchange(PAIRS[:2], delay=0.01)
+    engine.cex_exchanges = {'strict_venue': strict}
+
+    assert engine._exchange_concurrency('strict_venue') == 1
+    started = time.monotonic()
+    await engine.fetch_cex_data(PAIRS[:2])
+
+    assert strict.max_in_flight == 1
+    # The slot is held for 1s per request to stay within 1 req/s
+    assert time.monotonic() - started >= 1.0
+
+
+@pytest.mark.asyncio
+async def test_failing_exchange_falls_back_without_blocking_others(engine, monkeypatch):
+    class _Broken(_FakeExchange):
+        def fetch_ticker(self, pair):
+            raise RuntimeError("exchange down")
+
+    engine.cex_exchanges = {
+        'fast_venue': _FakeExchange(PAIRS[:2], delay=0.01),
+        'slow_venue': _Broken(PAIRS[:2]),
+    }
+    monkeypatch.setattr(engine, 'rest_fetch_tickers', _no_rest)
+
+    cex_data = await engine.fetch_cex_data(PAIRS[:2])
+
+    assert cex_data['fast_venue']['BTC/USDT']['last'] == pytest.approx(100.0)
+    assert cex_data['slow_venue']['BTC/USDT']['source'] == 'cex:slow_venue'
+    assert cex_data['slow_venue']['BTC/USDT']['last'] != pytest.approx(100.0)
+
+
+class _BulkExchange(_FakeExchange):
+    has = {'fetchTickers': True}
+
+    def __init__(self, symbols, missing=()):
+        super().__init__(symbols, delay=0.0)
+        self.missing = set(missing)
+        self.bulk_calls = []
+
+    def fetch_tickers(self, symbols):
+        self.bulk_calls.append(list(symbols))
+        return {
+            pair: {'bid': 199.0, 'ask': 201.0, 'last': 200.0, 'baseVolume': 5}
+            for pair in symbols if pair not in self.missing
+        }
+
+
+@pytest.mark.asyncio
+async def test_bulk_tickers_replace_per_pair_requests(engine):
+    bulk = _BulkExchange(PAIRS)
+    engine.cex_exchanges = {'fast_venue': bulk}
+
+    cex_data = await engine.fetch_cex_data(PAIRS)
+
+    assert bulk.bulk_calls == [PAIRS]
+    assert bulk.calls == []
+    assert cex_data['fast_venue']['ETH/USDT']['last'] == pytest.approx(200.0)
+    assert cex_data['fast_venue']['ETH']['mapped_from_pair'] == 'ETH/USDT'
+
+
+@pytest.mark.asyncio
+async def test_bulk_tickers_fall_back_per_pair_for_missing_symbols(engine):
+    bulk = _BulkExchange(PAIRS, missing={'SOL/USDT'})
+    plain = _FakeExchange(PAIRS, delay=0.0)
+    engine.cex_exchanges = {'fast_venue': bulk, 'slow_venue': plain}
+
+    cex_data = await engine.fetch_cex_data(PAIRS)
+
+    # Only the pair absent from the bulk response is fetched individually
+    assert bulk.calls == ['SOL/USDT']
+    assert cex_data['fast_venue']['SOL/USDT']['last'] == pytest.approx(100.0)
+    # Venues without fetchTickers keep using per-pair requests
+    assert sorted(plain.calls) == sorted(PAIRS)
+
+
+class _AsyncExchange:
+    """Async ccxt stand-in: records the thread each request runs on and whether it was closed."""
+
+    has = {}
+
+    def __init__(self, symbols, delay=0.05):
+        self.symbols = list(symbols)
+        self.delay = delay
+        self.threads = set()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.closed = False
+
+    async def load_markets(self):
+        return {}
+
+    async def fetch_ticker(self, pair):
+        self.threads.add(threading.get_ident())
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(self.delay)
+        self.in_flight -= 1
+        return {'bid': 99.9, 'ask': 100.1, 'last': 100.0, 'baseVolume': 10}
+
+    async def close(self):
+        self.closed = True
+
+
+@pytest.mark.asyncio
+async def test_async_clients_are_awaited_on_the_event_loop(engine):
+    client = _AsyncExchange(PAIRS)
+    engine.cex_exchanges = {'fast_venue': client}
+
+    cex_data = await engine.fetch_cex_data(PAIRS)
+
+    # No worker-thread hand-off: every request ran on the loop's own thread
+    assert client.threads == {threading.get_ident()}
+    assert client.max_in_flight > 1
+    assert cex_data['fast_venue']['BTC/USDT']['last'] == pytest.approx(100.0)
+
+    await engine.close()
+    assert client.closed
+
+
+class _StallingExchange(_AsyncExchange):
+    """Answers BTC/USDT at once and stalls on every other pair."""
+
+    async def fetch_ticker(self, pair):
+        self.in_flight += 1
+        await asyncio.sleep(0 if pair == 'BTC/USDT' else 30)
+        return {'bid': 99.9, 'ask': 100.1, 'last': 100.0, 'baseVolume': 10}
+
+
+@pytest.mark.asyncio
+async def test_scan_deadline_keeps_quotes_that_arrived(engine, monkeypatch):
+    monkeypatch.setitem(config.FETCH_CONFIG, 'request_timeout', None)
+    monkeypatch.setitem(config.FETCH_CONFIG, 'scan_deadline', 0.3)
+    engine.cex_exchanges = {'fast_venue': _AsyncExchange(PAIRS, delay=0.01), 'slow_venue': _StallingExchange(PAIRS)}
+
+    started = time.monotonic()
+    cex_data = await engine.fetch_cex_data(PAIRS)
+
+    assert time.monotonic() - started < 1.0
+    assert list(cex_data['fast_venue']) == PAIRS
+    assert list(cex_data['slow_venue']) == ['BTC/USDT']
+
+
+@pytest.mark.asyncio
+async def test_request_timeout_counts_against_the_circuit_breaker(engine, monkeypatch):
+    monkeypatch.setitem(config.FETCH_CONFIG, 'request_timeout', 0.05)
+    monkeypatch.setitem(config.FETCH_CONFIG, 'breaker_failure_threshold', 2)
+    monkeypatch.setitem(config.FETCH_CONFIG, 'breaker_reset_timeout', 0.0)
+    monkeypatch.setitem(config.FETCH_CONFIG, 'max_concurrency_per_exchange', 1)
+    monkeypatch.setattr(engine, 'rest_fetch_tickers', _no_rest)
+    stalling = _StallingExchange(PAIRS)
+    engine.cex_exchanges = {'slow_venue': stalling}
+
+    # Two timeouts open the circuit; the remaining pairs are not requested at all
+    await engine.fetch_cex_data(PAIRS[1:])
+    assert engine.breaker('slow_venue').state == 'open'
+    assert stalling.in_flight == 2
+
+    # While open the venue sits the scan out and a background probe is sent instead
+    cex_data = await engine.fetch_cex_data(['BTC/USDT'])
+    assert len(cex_data['slow_venue']) == 0
+    await engine._probe_tasks['slow_venue']
+    assert engine.breaker('slow_venue').state == 'closed'
+    assert engine.get_status()['circuits'] == {'slow_venue': 'closed'}
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_queueing_does_not_count_against_the_breaker(engine, monkeypatch):
+    # 10 requests/s with no burst: the four pairs queue 0.1s apart, longer than the request timeout
+    monkeypatch.setitem(config.EXCHANGES_CONFIG, 'queued_venue', {'rate_limit': 600})
+    monkeypatch.setitem(config.RATE_LIMIT_CONFIG, 'burst_seconds', 0.1)
+    monkeypatch.setitem(config.FETCH_CONFIG, 'request_timeout', 0.05)
+    monkeypatch.setitem(config.FETCH_CONFIG, 'breaker_failure_threshold', 2)
+    monkeypatch.setattr(engine, 'rest_fetch_tickers', _no_rest)
+    engine.cex_exchanges = {'queued_venue': _AsyncExchange(PAIRS, delay=0.0)}
+
+    cex_data = await engine.fetch_cex_data(PAIRS)
+
+    assert engine.breaker('queued_venue').state == 'closed'
+    assert all(cex_data['queued_venue'][pair]['source'] == 'cex:queued_venue' for pair in PAIRS)
+
+
+def test_half_open_breaker_admits_only_the_probe():
+    breaker = CircuitBreaker('venue', failure_threshold=1, reset_timeout=0.0)
+    breaker.record_failure()
+    assert not breaker.allow_request() and breaker.probe_due()
+
+    breaker.start_probe()
+    assert not breaker.allow_request()
+    assert breaker.allow_request(probe=True)
+
+    breaker.record_success()
+    assert breaker.allow_request()
+
+
+@pytest.mark.asyncio
+async def test_slow_venues_get_hedged_requests(engine, monkeypatch):
+    class _FirstCallStalls(_AsyncExchange):
+        async def fetch_ticker(self, pair):
+            self.in_flight += 1
+            await asyncio.sleep(30 if self.in_flight == 1 else 0)
+            return {'bid': 99.9, 'ask': 100.1, 'last': 100.0, 'baseVolume': 10}
+
+    monkeypatch.setitem(config.FETCH_CONFIG, 'hedge_requests', True)
+    monkeypatch.setitem(config.FETCH_CONFIG, 'hedge_min_delay', 0.01)
+    monkeypatch.setitem(config.FETCH_CONFIG, 'hedge_min_samples', 5)
+    client = _FirstCallStalls(PAIRS)
+    engine._latencies['slow_venue'] = collections.deque([0.05] * 10)
+    # A fast venue is never hedged
+    engine._latencies['fast_venue'] = collections.deque([0.001] * 10)
+    assert engine._hedge_delay('fast_venue') is None
+
+    started = time.monotonic()
+    ticker = await engine._call_exchange('slow_venue', client, 'fetch_ticker', 'BTC/USDT')
+
+    assert ticker['last'] == 100.0
+    assert client.in_flight == 2
+    assert time.monotonic() - started < 1.0
+
+
+def test_async_ccxt_clients_follow_the_running_event_loop(monkeypatch):
+    ccxt_async = pytest.importorskip('ccxt.async_support')
+    monkeypatch.setitem(config.FETCH_CONFIG, 'async_ccxt', True)
+    engine = DataEngine()
+    assert engine.async_clients
+    original = engine.cex_exchanges['binance']
+    assert isinstance(original, ccxt_async.Exchange)
+
+    async def open_session():
+        original.open()
+        return original.session
+
+    async def rebind():
+        async with engine:
+            bound = await engine._bind_clients_to_loop(engine.cex_exchanges)
+        return bound['binance']
+
+    session = asyncio.run(open_session())
+    rebound = asyncio.run(rebind())
+
+    # The session opened on the first loop is not reused from the second one, and is closed
+    assert rebound is not original
+    assert engine.cex_exchanges['binance'] is rebound
+    assert rebound.session is None
+    assert session.closed
+
+
+def test_async_ccxt_clients_are_opt_in():
+    assert DataEngine().async_clients is False
+
+
+@pytest.mark.asyncio
+async def test_fetch_reuses_quotes_younger_than_max_age(engine):
+    client = _FakeExchange(PAIRS, delay=0.0)
+    engine.cex_exchanges = {'fast_venue': client}
+    engine.dex_protocols = {}
+
+    await engine.fetch_all_market_data(PAIRS)
+    assert sorted(client.calls) == sorted(PAIRS)
+
+    # Back-to-back scan within the tolerance is served from the quote cache
+    client.calls.clear()
+    snapshot = await engine.fetch_all_market_data(PAIRS, max_age=30)
+    assert client.calls == []
+    assert snapshot['cex']['fast_venue']['BTC/USDT']['age'] >= 0.0
+    assert snapshot['cex']['fast_venue']['BTC']['mapped_from_pair'] == 'BTC/USDT'
+
+    # Only the expired entry goes back to the exchange
+    received_at, entry = engine._quote_cache[('cex', 'fast_venue', 'ETH/USDT')]
+    engine._quote_cache[('cex', 'fast_venue', 'ETH/USDT')] = (received_at - 60, entry)
+    snapshot = await engine.fetch_all_market_data(PAIRS, max_age=30)
+    assert client.calls == ['ETH/USDT']
+    assert snapshot['cex']['fast_venue']['ETH/USDT']['age'] == pytest.approx(0.0)
+
+    # Without a tolerance (the default) every quote is fetched again
+    client.calls.clear()
+    await engine.fetch_all_market_data(PAIRS)
+    assert sorted(client.calls) == sorted(PAIRS)
+
+
+def test_graph_drops_legs_older_than_max_quote_age(monkeypatch):
+    from core.graph_builder import GraphBuilder
+
+    monkeypatch.setitem(config.GRAPH_CONFIG, 'max_quote_age', 5.0)
+    price_data = {'cex': {'binance': {
+        'BTC/USDT': {'bid': 5000.0, 'ask': 5001.0, 'age': 1.0},
+        'ETH/USDT': {'bid': 3000.0, 'ask': 3001.0, 'age': 12.0},
+    }}, 'dex': {}}
+
+    gb = GraphBuilder(ai_model=None)
+    graph = gb.build_unified_graph(price_data)
+    assert graph.has_edge('BTC@binance', 'USDT@binance')
+    assert not graph.has_edge('ETH@binance', 'USDT@binance')
+
+    # A fresh quote for the stale pair brings its edges back on an incremental update
+    gb.apply_price_updates({'cex': {'binance': {'ETH/USDT': {'bid': 3000.0, 'ask': 3001.0, 'age': 0.0}}}})
+    assert gb.graph.has_edge('ETH@binance', 'USDT@binance')
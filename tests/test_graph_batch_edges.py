@@ -0,0 +1,69 @@
+import math
+
+import pytest
+
+from core.graph_builder import GraphBuilder, QuoteMatrix
+from core.quote_store import QuoteStore
+from utils.config import get_dex_fee, get_exchange_fee
+
+
+def _price_data():
+    return {
+        'tokens': ['BTC', 'ETH', 'USDT'],
+        'cex': {
+            'binance': {'BTC/USDT': {'bid': 5000.0, 'ask': 5001.0}},
+            'kraken': {'BTC/USDT': {'bid': 5100.0, 'ask': 5102.0}},
+        },
+        'dex': {
+            'uniswap_v3': {'ETH/USDT': {'bid': 2990.0, 'ask': 3005.0, 'fee': 0.0005, 'liquidity': 1e6}},
+            'sushiswap': {'ETH/USDT': {'bid': 2980.0, 'ask': 3010.0}},
+        },
+    }
+
+
+def test_batch_weights_use_per_venue_fees():
+    graph = GraphBuilder(ai_model=None).build_unified_graph(_price_data())
+
+    for venue, bid, ask in (('binance', 5000.0, 5001.0), ('kraken', 5100.0, 5102.0)):
+        fee = get_exchange_fee(venue)
+        sell = graph['BTC@' + venue]['USDT@' + venue]
+        buy = graph['USDT@' + venue]['BTC@' + venue]
+        assert sell['fee'] == fee and buy['fee'] == fee
+        assert sell['weight'] == pytest.approx(-math.log(bid * (1 - fee)))
+        assert buy['weight'] == pytest.approx(-math.log((1 / ask) * (1 - fee)))
+    assert get_exchange_fee('kraken') != get_exchange_fee('binance')
+
+    # A DEX quote's own fee wins; without one the protocol fee from DEX_CONFIG applies
+    uniswap = graph['ETH@uniswap_v3']['USDT@uniswap_v3']
+    assert uniswap['fee'] == 0.0005 and uniswap['liquidity'] == 1e6
+    sushiswap = graph['ETH@sushiswap']['USDT@sushiswap']
+    assert sushiswap['fee'] == get_dex_fee('sushiswap')
+    assert sushiswap['weight'] == pytest.approx(-math.log(2980.0 * (1 - get_dex_fee('sushiswap'))))
+
+
+def test_store_and_dict_matrices_give_identical_edges():
+    data = _price_data()
+    gb = GraphBuilder(ai_model=None)
+    for section in ('cex', 'dex'):
+        from_dicts = gb.price_edges_batch(QuoteMatrix.from_section(section, data[section]))
+        from_store = gb.price_edges_batch(QuoteMatrix.from_section(section, QuoteStore.from_price_data(data).section(section)))
+        assert from_dicts == from_store
+
+
+def test_rejections_drop_the_pair_or_only_the_buy_edge():
+    gb = GraphBuilder(ai_model=None)
+    quotes = QuoteMatrix.from_quotes('cex', [
+        ('binance', 'AAA/USDT', {'bid': 1e12, 'ask': 1.0}),   # extreme bid: whole pair dropped
+        ('binance', 'BBB/USDT', {'bid': 2.0, 'ask': 1e12}),   # extreme ask: sell edge kept
+        ('binance', 'CCC/USDT', {'bid': None, 'ask': 4.0}),   # missing bid: buy edge only
+        ('binance', 'DDD/USDT', {'bid': 1.0}),                # no ask: not a quote
+    ])
+
+    edges = gb.price_edges_batch(quotes)
+
+    assert quotes.pairs == ['AAA/USDT', 'BBB/USDT', 'CCC/USDT']
+    assert edges[0] == []
+    assert [attrs['action'] for _, _, attrs in edges[1]] == ['sell']
+    assert [attrs['action'] for _, _, attrs in edges[2]] == ['buy']
+    # The single-quote path used by incremental updates runs the same batch code
+    assert gb.price_edges_for_quote('cex', 'binance', 'BBB/USDT', {'bid': 2.0, 'ask': 1e12}) == edges[1]
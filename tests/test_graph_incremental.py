@@ -0,0 +1,145 @@
+import copy
+
+import pytest
+
+import utils.config as config
+from core.compiled_graph import CompiledGraph
+from core.graph_builder import GraphBuilder
+from core.graph_overlay import OverlayGraph
+from core.main_arbitrage_system import MainArbitrageSystem
+
+
+def _price_data():
+    return {
+        'tokens': ['BTC', 'ETH', 'USDT'],
+        'cex': {
+            'binance': {
+                'BTC/USDT': {'bid': 5000.0, 'ask': 5001.0},
+                'ETH/USDT': {'bid': 3000.0, 'ask': 3001.0},
+            },
+            'kraken': {
+                'BTC/USDT': {'bid': 5100.0, 'ask': 5102.0},
+            },
+        },
+        'dex': {
+            'uniswap_v3': {
+                'ETH/USDT': {'bid': 2990.0, 'ask': 3005.0, 'fee': 0.003},
+            },
+        },
+    }
+
+
+def _edge_weights(graph):
+    return {(u, v): d['weight'] for u, v, d in graph.edges(data=True)}
+
+
+def test_apply_price_updates_matches_full_rebuild():
+    gb = GraphBuilder(ai_model=None)
+    gb.build_unified_graph(_price_data())
+
+    updated = _price_data()
+    updated['cex']['binance']['ETH/USDT'] = {'bid': 3010.0, 'ask': 3011.0}
+    updated['dex']['uniswap_v3']['ETH/USDT']['fee'] = 0.0005
+
+    dirty = gb.apply_price_updates(updated)
+
+    assert dirty == {'ETH@binance', 'USDT@binance', 'ETH@uniswap_v3', 'USDT@uniswap_v3'}
+    rebuilt = GraphBuilder(ai_model=None).build_unified_graph(updated)
+    assert _edge_weights(gb.graph) == pytest.approx(_edge_weights(rebuilt))
+
+
+def test_apply_price_updates_skips_unchanged_quotes_and_keeps_edge_objects():
+    gb = GraphBuilder(ai_model=None)
+    gb.build_unified_graph(_price_data())
+    eth_edge = gb.graph.get_edge_data('ETH@binance', 'USDT@binance')
+
+    assert gb.apply_price_updates(_price_data()) == set()
+
+    gb.apply_price_updates({'cex': {'binance': {'ETH/USDT': {'bid': 3100.0, 'ask': 3101.0}}}})
+    # Weights are updated in place rather than by recreating the edge
+    assert gb.graph.get_edge_data('ETH@binance', 'USDT@binance') is eth_edge
+    assert eth_edge['rate'] == pytest.approx(3100.0)
+
+
+def test_apply_price_updates_adds_and_removes_edges():
+    gb = GraphBuilder(ai_model=None)
+    gb.build_unified_graph(_price_data())
+
+    dirty = gb.apply_price_updates({'cex': {'okx': {'SOL/USDT': {'bid': 100.0, 'ask': 100.1}}}})
+    assert dirty == {'SOL@okx', 'USDT@okx'}
+    assert gb.graph.has_edge('SOL@okx', 'USDT@okx')
+    assert gb.graph.nodes['SOL@okx']['token'] == 'SOL'
+
+    dirty = gb.apply_price_updates({'cex': {'kraken': {'BTC/USDT': None}}})
+    assert dirty == {'BTC@kraken', 'USDT@kraken'}
+    assert not gb.graph.has_edge('BTC@kraken', 'USDT@kraken')
+    assert not gb.graph.has_edge('USDT@kraken', 'BTC@kraken')
+
+
+@pytest.mark.asyncio
+async def test_incremental_scan_reuses_graph_when_nothing_changed(monkeypatch):
+    monkeypatch.setitem(config.GRAPH_CONFIG, 'incremental_updates', True)
+    system = MainArbitrageSystem()
+    price_data = _price_data()
+
+    first = await system.prepare_scan_graph(['cross_exchange'], copy.deepcopy(price_data))
+    persistent_edges = system.graph_builder.graph.number_of_edges()
+    # Strategy edges go to a copy; the persistent graph keeps price edges only
+    assert first.number_of_edges() > persistent_edges
+
+    assert await system.prepare_scan_graph(['cross_exchange'], copy.deepcopy(price_data)) is first
+    assert system.last_dirty_nodes == set()
+
+    price_data['cex']['kraken']['BTC/USDT'] = {'bid': 5110.0, 'ask': 5112.0}
+    third = await system.prepare_scan_graph(['cross_exchange'], price_data)
+    assert third is not first
+    assert system.last_dirty_nodes == {'BTC@kraken', 'USDT@kraken'}
+    assert system.graph_builder.graph.number_of_edges() == persistent_edges
+
+
+def _compiled_edges(compiled):
+    names = compiled.node_names
+    return [(names[u], names[v], w) for u, v, w in zip(compiled.src.tolist(), compiled.dst.tolist(),
+                                                       compiled.weight.tolist())]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('backend', ['networkx', 'lean'])
+async def test_overlay_compiles_like_a_modified_copy_and_leaves_the_base_alone(monkeypatch, backend):
+    monkeypatch.setitem(config.GRAPH_CONFIG, 'backend', backend)
+    system = MainArbitrageSystem()
+    base = system.graph_builder.build_unified_graph(_price_data())
+    base_edges = {(u, v): dict(d) for u, v, d in base.edges(data=True)}
+
+    copied, overlay = base.copy(), OverlayGraph(base)
+    for graph in (copied, overlay):
+        for name in ('dex_cex', 'cross_exchange', 'triangular'):
+            await system.strategies[name].add_strategy_edges(graph, _price_data())
+        # Statistical signals edit existing edges in place
+        graph['ETH@binance']['USDT@binance']['weight'] = -0.5
+
+    assert overlay.number_of_edges() == copied.number_of_edges() > len(base_edges)
+    assert _compiled_edges(CompiledGraph.from_graph(overlay)) == _compiled_edges(CompiledGraph.from_graph(copied))
+    assert {(u, v): d for u, v, d in base.edges(data=True)} == base_edges
+    assert system.graph_builder.get_graph_statistics(overlay)['edges'] == overlay.number_of_edges()
+
+
+@pytest.mark.asyncio
+async def test_incremental_scan_recompiles_when_strategy_state_changes(monkeypatch):
+    monkeypatch.setitem(config.GRAPH_CONFIG, 'incremental_updates', True)
+    system = MainArbitrageSystem()
+    statistical = system.strategies['statistical']
+
+    first = await system.prepare_scan_graph(['cross_exchange', 'statistical'], copy.deepcopy(_price_data()))
+    # The persistent price graph is never copied per scan
+    monkeypatch.setattr(system.graph_builder.graph, 'copy', None)
+
+    # Same prices, but the statistical history moved (as run_full_arbitrage_scan does every scan)
+    statistical.update_historical_data(copy.deepcopy(_price_data()))
+    second = await system.prepare_scan_graph(['cross_exchange', 'statistical'], copy.deepcopy(_price_data()))
+    assert system.last_dirty_nodes == set()
+    assert second is not first
+
+    # Without the stateful strategy an unchanged tick reuses the compiled graph
+    third = await system.prepare_scan_graph(['cross_exchange'], copy.deepcopy(_price_data()))
+    assert await system.prepare_scan_graph(['cross_exchange'], copy.deepcopy(_price_data())) is third
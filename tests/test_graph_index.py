@@ -0,0 +1,69 @@
+import networkx as nx
+
+from core.bellman_ford_detector import BellmanFordDetector
+from core.compiled_graph import CompiledGraph
+from core.graph_builder import ArbitrageGraph, GraphBuilder
+from core.graph_index import graph_index
+
+
+def _price_data():
+    return {
+        'tokens': ['BTC', 'ETH', 'USDT'],
+        'cex': {
+            'binance': {'BTC/USDT': {'bid': 5000.0, 'ask': 5001.0}, 'ETH/USDT': {'bid': 3000.0, 'ask': 3001.0}},
+            'kraken': {'BTC/USDT': {'bid': 5100.0, 'ask': 5102.0}},
+        },
+        'dex': {
+            'curve': {'ETH/USDT': {'bid': 2990.0, 'ask': 3005.0, 'fee': 0.0004}},
+        },
+    }
+
+
+def test_index_follows_node_changes():
+    graph = GraphBuilder(ai_model=None).build_unified_graph(_price_data())
+    index = graph.graph_index
+
+    for token in ('BTC', 'ETH', 'USDT'):
+        assert index.token_nodes(token) == [n for n in graph.nodes() if n.startswith(f"{token}@")]
+    assert index.venue_nodes('curve') == ['ETH@curve', 'USDT@curve']
+    assert index.info['ETH@curve'].exchange_type == 'dex'
+
+    # Endpoints created by edges are indexed too; removed nodes leave every index
+    graph.add_edges_from([('SOL@kraken', 'USDT@kraken', {'weight': 0.1})])
+    graph.add_edge('USDT@kraken', 'SOL@okx', weight=0.1)
+    assert index.token_nodes('SOL') == ['SOL@kraken', 'SOL@okx']
+    graph.remove_node('SOL@okx')
+    assert index.token_nodes('SOL') == ['SOL@kraken'] and 'okx' not in index.venues
+    assert graph_index(graph) is index
+
+    # copies keep an index; plain networkx graphs get one built on demand
+    assert graph.copy().graph_index.token_nodes('SOL') == ['SOL@kraken']
+    plain = nx.DiGraph(graph)
+    assert isinstance(plain, nx.DiGraph) and not isinstance(plain, ArbitrageGraph)
+    assert graph_index(plain).token_nodes('BTC') == index.token_nodes('BTC')
+
+
+def test_cycle_classification_uses_indexed_venue_types():
+    graph = GraphBuilder(ai_model=None).build_unified_graph(_price_data())
+    detector = BellmanFordDetector(ai_model=None)
+    path = ['USDT@binance', 'ETH@binance', 'ETH@curve', 'USDT@curve', 'USDT@binance']
+
+    # 'curve' is not recognisable by name, but its nodes are typed 'dex' by the builder
+    assert detector.classify_cycle_type(path) == 'cross_exchange'
+    assert detector.classify_cycle_type(path, graph) == 'dex_cex'
+    assert detector.get_exchanges_from_path(path) == ['binance', 'curve']
+    assert detector.get_tokens_from_path(path) == ['USDT', 'ETH']
+
+
+def test_compiled_graph_keeps_indexed_venue_types():
+    graph = GraphBuilder(ai_model=None).build_unified_graph(_price_data())
+    detector = BellmanFordDetector(ai_model=None)
+    path = ['USDT@binance', 'ETH@binance', 'ETH@curve', 'USDT@curve', 'USDT@binance']
+
+    # The detector runs on the compiled snapshot, which has no graph_index of its own
+    compiled = CompiledGraph.from_graph(graph)
+    assert compiled.node_info('ETH@curve').exchange_type == 'dex'
+    assert detector.classify_cycle_type(path, compiled) == 'dex_cex'
+
+    component = compiled.subgraph([compiled.node_index[node] for node in path[:-1]])
+    assert detector.classify_cycle_type(path, component) == 'dex_cex'
@@ -0,0 +1,107 @@
+import pickle
+
+import networkx as nx
+import pytest
+
+import utils.config as config
+from core.graph_builder import GraphBuilder
+from core.lean_graph import LeanDiGraph
+from core.main_arbitrage_system import MainArbitrageSystem
+
+
+def _price_data():
+    return {
+        'tokens': ['BTC', 'ETH', 'USDT'],
+        'cex': {
+            'binance': {'BTC/USDT': {'bid': 5000.0, 'ask': 5001.0}, 'ETH/USDT': {'bid': 3000.0, 'ask': 3001.0}},
+            'kraken': {'BTC/USDT': {'bid': 5100.0, 'ask': 5102.0}, 'ETH/USDT': {'bid': 2950.0, 'ask': 2952.0}},
+        },
+        'dex': {
+            'uniswap_v3': {'ETH/USDT': {'bid': 2990.0, 'ask': 3005.0, 'fee': 0.003}},
+        },
+    }
+
+
+# Crossed books: the detector finds opportunities here
+SCAN_DATA = {
+    'tokens': ['BTC', 'ETH'],
+    'cex': {
+        'binance': {'BTC/USDT': {'bid': 100.0, 'ask': 99.0}, 'ETH/USDT': {'bid': 10.0, 'ask': 10.1}},
+        'kraken': {'BTC/USDT': {'bid': 101.0, 'ask': 100.0}, 'ETH/USDT': {'bid': 10.2, 'ask': 10.3}},
+    },
+    'dex': {
+        'uniswap_v3': {'BTC/USDT': {'bid': 103.0, 'ask': 102.0, 'fee': 0.003}},
+    },
+}
+
+
+def _build(monkeypatch, backend):
+    monkeypatch.setitem(config.GRAPH_CONFIG, 'backend', backend)
+    builder = GraphBuilder(ai_model=None)
+    graph = builder.build_unified_graph(_price_data())
+    builder.add_cross_exchange_edges(graph, _price_data())
+    return builder, graph
+
+
+def test_lean_backend_builds_the_same_graph_as_networkx(monkeypatch):
+    nx_builder, reference = _build(monkeypatch, 'networkx')
+    lean_builder, lean = _build(monkeypatch, 'lean')
+
+    assert isinstance(lean, LeanDiGraph) and not isinstance(reference, LeanDiGraph)
+    assert list(lean.nodes()) == list(reference.nodes())
+    assert dict(lean.nodes(data=True)) == dict(reference.nodes(data=True))
+    assert {(u, v): d for u, v, d in lean.edges(data=True)} == {(u, v): d for u, v, d in reference.edges(data=True)}
+    assert lean_builder.get_graph_statistics(lean) == nx_builder.get_graph_statistics(reference)
+
+    # networkx can still consume a lean graph
+    assert nx.DiGraph(lean).number_of_edges() == reference.number_of_edges()
+
+
+def test_lean_graph_mutation_copy_and_subgraph():
+    graph = LeanDiGraph()
+    graph.add_node('BTC@binance', token='BTC', exchange='binance', exchange_type='cex')
+    graph.add_edge('BTC@binance', 'USDT@binance', weight=0.5)
+    graph.add_edges_from([('USDT@binance', 'BTC@binance', {'weight': 0.7}), ('BTC@binance', 'BTC@kraken')])
+
+    edge = graph.get_edge_data('BTC@binance', 'USDT@binance')
+    graph.add_edge('BTC@binance', 'USDT@binance', rate=2.0)
+    assert graph['BTC@binance']['USDT@binance'] is edge and edge == {'weight': 0.5, 'rate': 2.0}
+    assert graph.number_of_edges() == 3 and graph.nodes['BTC@binance']['token'] == 'BTC'
+
+    dup = graph.copy()
+    dup['BTC@binance']['USDT@binance']['weight'] = 9.0
+    assert edge['weight'] == 0.5
+
+    sub = graph.subgraph(['BTC@binance', 'USDT@binance'])
+    assert sub.number_of_edges() == 2 and sub.get_edge_data('BTC@binance', 'USDT@binance') is edge
+
+    graph.remove_node('USDT@binance')
+    assert graph.number_of_edges() == 1 and not graph.has_edge('BTC@binance', 'USDT@binance')
+    assert graph.graph_index.token_nodes('USDT') == []
+    with pytest.raises(KeyError):
+        graph.remove_edge('BTC@binance', 'USDT@binance')
+
+    restored = pickle.loads(pickle.dumps(dup))
+    assert restored.number_of_edges() == 3 and restored.graph_index.token_nodes('BTC') == ['BTC@binance', 'BTC@kraken']
+
+
+async def _scan():
+    main = MainArbitrageSystem(start_capital_usd=1000)
+
+    async def _fetch_all_market_data(_trading_pairs):
+        return SCAN_DATA
+    main.data_engine.fetch_all_market_data = _fetch_all_market_data
+    opportunities = await main.run_full_arbitrage_scan(['dex_cex', 'cross_exchange', 'triangular'],
+                                                       ['BTC/USDT', 'ETH/USDT'], min_profit_threshold=0.0)
+    return main, opportunities
+
+
+@pytest.mark.asyncio
+async def test_scan_results_do_not_depend_on_the_backend(monkeypatch):
+    results = {}
+    for backend in ('networkx', 'lean'):
+        monkeypatch.setitem(config.GRAPH_CONFIG, 'backend', backend)
+        main, opportunities = await _scan()
+        results[backend] = sorted((tuple(o.get('path', [])), round(o.get('profit_pct', 0), 9)) for o in opportunities)
+    assert isinstance(main.graph_builder.graph, LeanDiGraph)
+    assert results['networkx'] and results['lean'] == results['networkx']
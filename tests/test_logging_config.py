@@ -0,0 +1,102 @@
+import logging
+import queue
+import threading
+import time
+
+import utils.logging_config as logging_config
+from utils.logging_config import RepeatFilter, _sanitize, setup_logging
+
+
+def _record(msg, *args, name='strategies.test', level=logging.WARNING):
+    return logging.LogRecord(name, level, __file__, 1, msg, args, None)
+
+
+def test_sanitize_strips_non_ascii_with_a_translation_table():
+    assert _sanitize("plain ascii") == "plain ascii"
+    assert _sanitize("📡 Step 1/5 ✓ done → ok") == " Step 1/5  done  ok"
+
+
+def test_repeat_filter_collapses_repeats_per_logger():
+    repeat_filter = RepeatFilter(burst=2, interval=0.2)
+    passed = [repeat_filter.filter(_record("Rejected %s", 'BTC')) for _ in range(5)]
+    assert passed == [True, True, False, False, False]
+    # Other arguments and other loggers are separate keys
+    assert repeat_filter.filter(_record("Rejected %s", 'ETH'))
+    assert repeat_filter.filter(_record("Rejected %s", 'BTC', name='core.other'))
+
+    time.sleep(0.25)
+    record = _record("Rejected %s", 'BTC')
+    assert repeat_filter.filter(record)
+    assert record.suppressed == 3
+
+
+def test_queue_mode_formats_and_writes_on_the_listener_thread(capsys):
+    root = logging.getLogger()
+    saved_handlers, saved_level = list(root.handlers), root.level
+    formatted_on = []
+
+    class _Arg:
+        def __str__(self):
+            formatted_on.append(threading.current_thread())
+            return "✓ value"
+
+    try:
+        setup_logging(level=logging.INFO, use_queue=True)
+        logging.getLogger('strategies.test').info("Adding edge %s", _Arg())
+        logging_config._stop_listener()
+    finally:
+        for handler in list(root.handlers):
+            root.removeHandler(handler)
+        for handler in saved_handlers:
+            root.addHandler(handler)
+        root.setLevel(saved_level)
+
+    assert formatted_on and formatted_on[0] is not threading.main_thread()
+    assert "INFO strategies.test: Adding edge  value" in capsys.readouterr().out
+
+
+def test_sync_mode_writes_every_record(capsys):
+    root = logging.getLogger()
+    saved_handlers, saved_level = list(root.handlers), root.level
+    try:
+        setup_logging(level=logging.INFO, use_queue=False)
+        assert not any(handler.filters for handler in root.handlers)
+        for _ in range(10):
+            logging.getLogger('strategies.test').info("Same line")
+    finally:
+        for handler in list(root.handlers):
+            root.removeHandler(handler)
+        for handler in saved_handlers:
+            root.addHandler(handler)
+        root.setLevel(saved_level)
+
+    assert capsys.readouterr().out.count("Same line") == 10
+
+
+def test_queue_handler_snapshots_mutable_args():
+    log_queue = queue.Queue()
+    handler = logging_config._DeferredQueueHandler(log_queue)
+    details = {'profit': 0.1}
+
+    handler.handle(_record("Rejected details=%s", details))
+    details['profit'] = 0.9
+
+    assert log_queue.get_nowait().getMessage() == "Rejected details={'profit': 0.1}"
+
+
+def test_full_queue_drops_and_counts_instead_of_blocking():
+    log_queue = queue.Queue(maxsize=1)
+    handler = logging_config._DeferredQueueHandler(log_queue)
+
+    started = time.monotonic()
+    for i in range(3):
+        handler.handle(_record("Record %d", i))
+    assert time.monotonic() - started < 0.5
+    assert handler.dropped == 2
+
+    assert log_queue.get_nowait().getMessage() == "Record 0"
+    handler.handle(_record("Record %d", 3))
+    record = log_queue.get_nowait()
+    assert record.dropped == 2
+    formatted = logging_config.SanitizingFormatter("%(message)s").format(record)
+    assert formatted == "Record 3 [2 records dropped: log queue full]"
@@ -0,0 +1,118 @@
+import asyncio
+import json
+import time
+
+import pytest
+
+import utils.config as config
+from core.data_engine import DataEngine
+from core.market_cache import MarketMetadataCache
+
+BTC_MARKET = {
+    'id': 'BTCUSDT', 'symbol': 'BTC/USDT', 'base': 'BTC', 'quote': 'USDT',
+    'baseId': 'BTC', 'quoteId': 'USDT', 'type': 'spot', 'spot': True, 'active': True,
+    'precision': {'amount': 1e-05, 'price': 0.01},
+    'limits': {'amount': {'min': 1e-05, 'max': 9000.0}, 'cost': {'min': 5.0, 'max': None}},
+    'info': {'symbol': 'BTCUSDT', 'filters': ['...']},
+}
+
+
+def test_cache_round_trip_strips_raw_payloads(tmp_path):
+    cache = MarketMetadataCache(directory=str(tmp_path), ttl_seconds=60)
+    assert cache.load('binance') is None
+
+    assert cache.store('binance', {'BTC/USDT': BTC_MARKET}, {'BTC': {'id': 'BTC', 'info': {}}})
+    entry = cache.load('binance')
+
+    assert entry['markets']['BTC/USDT']['limits']['cost']['min'] == 5.0
+    assert 'info' not in entry['markets']['BTC/USDT']
+    assert 'info' not in entry['currencies']['BTC']
+    assert not cache.is_stale(entry['fetched_at'])
+    assert cache.is_stale(time.time() - 120)
+
+
+def test_cache_ignores_corrupt_files(tmp_path):
+    cache = MarketMetadataCache(directory=str(tmp_path))
+    (tmp_path / 'okx.json').write_text('{"markets": {', encoding='utf-8')
+    assert cache.load('okx') is None
+
+
+def test_engine_applies_cached_markets_at_startup():
+    MarketMetadataCache().store('binance', {'BTC/USDT': BTC_MARKET})
+
+    engine = DataEngine()
+
+    binance = engine.cex_exchanges['binance']
+    assert binance.symbols == ['BTC/USDT']
+    assert binance.markets['BTC/USDT']['precision']['price'] == 0.01
+    assert 'binance' in engine._markets_fetched_at
+
+
+class _MarketsExchange:
+    """Synchronous client stand-in with ccxt's markets/set_markets surface."""
+
+    def __init__(self, load_delay=0.0):
+        self.markets = {}
+        self.currencies = {}
+        self.symbols = []
+        self.load_delay = load_delay
+        self.loads = []
+
+    def set_markets(self, markets, currencies=None):
+        self.markets = dict(markets)
+        self.currencies = currencies or {}
+        self.symbols = sorted(markets)
+
+    def load_markets(self, reload=False):
+        time.sleep(self.load_delay)
+        self.loads.append(reload)
+        self.set_markets({'BTC/USDT': dict(BTC_MARKET), 'ETH/USDT': dict(BTC_MARKET, symbol='ETH/USDT')})
+        return self.markets
+
+    def fetch_ticker(self, pair):
+        return {'bid': 99.0, 'ask': 101.0, 'last': 100.0, 'baseVolume': 1}
+
+
+@pytest.mark.asyncio
+async def test_cold_load_is_persisted_for_the_next_process():
+    engine = DataEngine()
+    client = _MarketsExchange()
+    engine.cex_exchanges = {'venue': client}
+
+    await engine.fetch_cex_data(['BTC/USDT'])
+    assert client.loads == [False]
+
+    restarted = DataEngine()
+    warm = _MarketsExchange()
+    restarted.cex_exchanges = {'venue': warm}
+    restarted._apply_cached_markets('venue', warm)
+    await restarted.fetch_cex_data(['BTC/USDT'])
+
+    assert warm.loads == []
+    assert warm.symbols == ['BTC/USDT', 'ETH/USDT']
+
+
+@pytest.mark.asyncio
+async def test_stale_markets_refresh_in_the_background(monkeypatch):
+    monkeypatch.setitem(config.MARKET_CACHE_CONFIG, 'ttl_seconds', 60)
+    monkeypatch.setitem(config.EXCHANGES_CONFIG, 'venue', {'rate_limit': 6000})
+    cache = MarketMetadataCache()
+    cache.store('venue', {'BTC/USDT': BTC_MARKET}, fetched_at=time.time() - 3600)
+
+    engine = DataEngine()
+    client = _MarketsExchange(load_delay=0.3)
+    engine.cex_exchanges = {'venue': client}
+    engine._apply_cached_markets('venue', client)
+
+    started = time.monotonic()
+    cex_data = await engine.fetch_cex_data(['BTC/USDT'])
+    # The scan is served from the stale cache without waiting for the reload
+    assert time.monotonic() - started < 0.25
+    assert cex_data['venue']['BTC/USDT']['last'] == pytest.approx(100.0)
+
+    await asyncio.wait_for(engine._market_refresh_tasks['venue'], timeout=5)
+    assert client.loads == [True]
+    refreshed = cache.load('venue')
+    assert sorted(refreshed['markets']) == ['BTC/USDT', 'ETH/USDT']
+    assert not cache.is_stale(refreshed['fetched_at'])
+    await engine.close()
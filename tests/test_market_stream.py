@@ -0,0 +1,258 @@
+import asyncio
+import json
+
+import pytest
+from aiohttp import web
+
+import utils.config as config
+from core.data_engine import DataEngine
+from core.market_stream import STREAM_ADAPTERS, MarketStream
+
+PAIRS = ['BTC/USDT', 'ETH/USDT']
+
+# Frames as recorded from each venue's public ticker channel (values trimmed)
+RECORDED_FRAMES = {
+    'binance': [
+        {'result': None, 'id': 1},
+        {'u': 400900217, 's': 'BTCUSDT', 'b': '50010.10', 'B': '1.2', 'a': '50011.20', 'A': '0.7'},
+        {'u': 400900218, 's': 'ETHUSDT', 'b': '3001.50', 'B': '10', 'a': '3002.00', 'A': '4'},
+    ],
+    'okx': [
+        {'event': 'subscribe', 'arg': {'channel': 'tickers', 'instId': 'BTC-USDT'}},
+        {'arg': {'channel': 'tickers', 'instId': 'BTC-USDT'},
+         'data': [{'instId': 'BTC-USDT', 'last': '50020', 'bidPx': '50019.9', 'askPx': '50020.1',
+                   'vol24h': '1234', 'ts': '1700000000000'}]},
+    ],
+    'bybit': [
+        {'success': True, 'op': 'subscribe'},
+        {'topic': 'orderbook.1.BTCUSDT', 'ts': 1700000000000, 'type': 'snapshot',
+         'data': {'s': 'BTCUSDT', 'b': [['50005.0', '0.5']], 'a': [['50006.0', '0.3']], 'u': 1}},
+    ],
+    'gateio': [
+        {'channel': 'spot.book_ticker', 'event': 'subscribe', 'result': {'status': 'success'}},
+        {'channel': 'spot.book_ticker', 'event': 'update',
+         'result': {'t': 1700000000000, 's': 'BTC_USDT', 'b': '50001', 'B': '1', 'a': '50002', 'A': '2'}},
+    ],
+    'kraken': [
+        {'channel': 'status', 'type': 'update', 'data': [{'system': 'online'}]},
+        {'channel': 'ticker', 'type': 'snapshot',
+         'data': [{'symbol': 'BTC/USDT', 'bid': 49990.0, 'ask': 49991.0, 'last': 49990.5, 'volume': 55.0}]},
+    ],
+    'coinbase': [
+        {'type': 'subscriptions', 'channels': [{'name': 'ticker', 'product_ids': ['BTC-USDT']}]},
+        {'type': 'ticker', 'product_id': 'BTC-USDT', 'price': '50000.5', 'best_bid': '50000.0',
+         'best_ask': '50001.0', 'volume_24h': '900'},
+    ],
+    'bitfinex': [
+        {'event': 'info', 'version': 2},
+        {'event': 'subscribed', 'channel': 'ticker', 'chanId': 17, 'symbol': 'tBTCUST', 'pair': 'BTCUST'},
+        {'event': 'subscribed', 'channel': 'ticker', 'chanId': 18, 'symbol': 'tETHUST', 'pair': 'ETHUST'},
+        [17, 'hb'],
+        [17, [49980.0, 10.0, 49981.0, 12.0, 100.0, 0.002, 49980.5, 3000.0, 50500.0, 49000.0]],
+        [18, [2999.0, 50.0, 3000.0, 40.0, 10.0, 0.003, 2999.5, 8000.0, 3050.0, 2950.0]],
+    ],
+    'dydx': [
+        {'type': 'connected', 'connection_id': 'abc'},
+        {'type': 'subscribed', 'channel': 'v3_markets',
+         'contents': {'markets': {'BTC-USD': {'oraclePrice': '50003.0', 'volume24H': '1000'}}}},
+        {'type': 'channel_data', 'channel': 'v3_markets', 'contents': {'ETH-USD': {'oraclePrice': '3000.5'}}},
+    ],
+}
+
+
+@pytest.mark.parametrize('venue', sorted(RECORDED_FRAMES))
+def test_adapters_parse_recorded_frames(venue):
+    adapter_cls, _ = STREAM_ADAPTERS[venue]
+    adapter = adapter_cls(PAIRS)
+    assert adapter.subscribe_messages()
+
+    updates = []
+    for frame in RECORDED_FRAMES[venue]:
+        updates.extend(adapter.parse(frame))
+
+    quotes = dict(updates)
+    assert 'BTC/USDT' in quotes
+    btc = quotes['BTC/USDT']
+    assert 49000 < btc['bid'] <= btc['ask'] < 51000
+
+
+def test_bitfinex_adapter_uses_ust_symbols():
+    adapter = STREAM_ADAPTERS['bitfinex'][0](PAIRS)
+    assert [frame['symbol'] for frame in adapter.subscribe_messages()] == ['tBTCUST', 'tETHUST']
+
+    updates = dict(update for frame in RECORDED_FRAMES['bitfinex'] for update in adapter.parse(frame))
+    assert updates['ETH/USDT']['bid'] == pytest.approx(2999.0)
+
+
+async def _start_replay_server(frames_by_path, received):
+    """Local WebSocket stand-in: records subscription frames, then replays recorded frames."""
+
+    async def handler(request):
+        venue = request.match_info['venue']
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        received.setdefault(venue, []).append(await ws.receive_json())
+        for frame in frames_by_path[venue]:
+            await ws.send_str(json.dumps(frame))
+        # Keep the socket open until the client goes away
+        async for _ in ws:
+            pass
+        return ws
+
+    app = web.Application()
+    app.router.add_get('/{venue}', handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f"ws://127.0.0.1:{port}"
+
+
+async def _wait_for(predicate, timeout=5.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not predicate():
+        assert asyncio.get_running_loop().time() < deadline, "timed out waiting for stream"
+        await asyncio.sleep(0.01)
+
+
+@pytest.mark.asyncio
+async def test_stream_replays_frames_into_store():
+    received = {}
+    runner, base = await _start_replay_server(RECORDED_FRAMES, received)
+    venues = ['binance', 'bitfinex', 'dydx']
+    stream = MarketStream(PAIRS, venues=venues, urls={v: f"{base}/{v}" for v in venues})
+    try:
+        await stream.start()
+        await _wait_for(lambda: len(stream.quotes['cex'].get('binance', {})) == 2
+                        and 'bitfinex' in stream.quotes['cex'] and 'dydx' in stream.quotes['dex'])
+    finally:
+        await stream.stop()
+        await runner.cleanup()
+
+    assert received['binance'][0]['params'] == ['btcusdt@bookTicker', 'ethusdt@bookTicker']
+    snapshot = stream.snapshot()
+    assert snapshot['cex']['binance']['ETH/USDT']['ask'] == pytest.approx(3002.0)
+    assert snapshot['cex']['binance']['BTC/USDT']['source'] == 'cex:binance:ws'
+    assert snapshot['cex']['bitfinex']['BTC/USDT']['last'] == pytest.approx(49980.5)
+    assert snapshot['dex']['dydx']['ETH/USDT']['bid'] == pytest.approx(3000.5)
+    assert not stream.is_running
+
+
+@pytest.mark.asyncio
+async def test_stream_drops_book_on_disconnect_and_refills_after_reconnect(monkeypatch):
+    monkeypatch.setitem(config.STREAMING_CONFIG, 'reconnect_delay', 0.2)
+    connections = []
+    second_frame = dict(RECORDED_FRAMES['binance'][1], b='50100.00', a='50101.00')
+
+    async def handler(request):
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        await ws.receive_json()
+        connections.append(request)
+        if len(connections) == 1:
+            # First connection sends one update, then the server drops the socket
+            await ws.send_str(json.dumps(RECORDED_FRAMES['binance'][1]))
+            await ws.close()
+            return ws
+        await ws.send_str(json.dumps(second_frame))
+        async for _ in ws:
+            pass
+        return ws
+
+    app = web.Application()
+    app.router.add_get('/ws', handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+
+    stream = MarketStream(PAIRS, venues=['binance'], urls={'binance': f"ws://127.0.0.1:{port}/ws"})
+    book = lambda: stream.quotes['cex'].get('binance', {})
+    try:
+        await stream.start()
+        await _wait_for(lambda: len(connections) == 1 and not stream.connected['binance'])
+        # The frozen book is gone while the socket is down
+        assert 'binance' not in stream.quotes['cex']
+        await _wait_for(lambda: book().get('BTC/USDT', {}).get('bid') == pytest.approx(50100.0))
+        assert stream.connected['binance']
+    finally:
+        await stream.stop()
+        await runner.cleanup()
+
+    assert len(connections) == 2
+
+
+class _PolledExchange:
+    symbols = PAIRS
+
+    def __init__(self):
+        self.calls = []
+
+    def load_markets(self):
+        return {}
+
+    def fetch_ticker(self, pair):
+        self.calls.append(pair)
+        return {'bid': 99.0, 'ask': 101.0, 'last': 100.0, 'baseVolume': 1}
+
+
+@pytest.mark.asyncio
+async def test_fetch_all_market_data_reads_stream_snapshot(monkeypatch):
+    received = {}
+    runner, base = await _start_replay_server(RECORDED_FRAMES, received)
+
+    engine = DataEngine()
+    streamed_client = _PolledExchange()
+    polled_client = _PolledExchange()
+    engine.cex_exchanges = {'binance': streamed_client, 'kucoin': polled_client}
+    engine.dex_protocols = {'dydx': engine.dex_protocols['dydx']}
+    engine.web3_connected = False
+    try:
+        await engine.start_streaming(PAIRS, venues=['binance', 'dydx'],
+                                     urls={'binance': f"{base}/binance", 'dydx': f"{base}/dydx"})
+        await _wait_for(lambda: len(engine.market_stream.quotes['cex'].get('binance', {})) == 2
+                        and len(engine.market_stream.quotes['dex'].get('dydx', {})) == 2)
+        market_data = await engine.fetch_all_market_data(PAIRS)
+        assert engine.get_status()['streaming'] is True
+    finally:
+        await engine.stop_streaming()
+        await runner.cleanup()
+
+    # Streamed venue is a snapshot read; only the non-streamed venue hits REST
+    assert streamed_client.calls == []
+    assert sorted(polled_client.calls) == sorted(PAIRS)
+    assert market_data['cex']['binance']['BTC/USDT']['bid'] == pytest.approx(50010.10)
+    assert market_data['cex']['binance']['BTC']['mapped_from_pair'] == 'BTC/USDT'
+    assert market_data['cex']['kucoin']['ETH/USDT']['last'] == pytest.approx(100.0)
+    assert market_data['dex']['dydx']['BTC/USDT']['last'] == pytest.approx(50003.0)
+    assert engine.market_stream is None
+
+
+@pytest.mark.asyncio
+async def test_only_fresh_quotes_of_connected_venues_replace_polling(monkeypatch):
+    monkeypatch.setitem(config.STREAMING_CONFIG, 'max_quote_age', 5.0)
+    stream = MarketStream(PAIRS, venues=['binance', 'okx'],
+                          urls={'binance': 'ws://127.0.0.1:9/binance', 'okx': 'ws://127.0.0.1:9/okx'})
+    binance, okx = STREAM_ADAPTERS['binance'][0](PAIRS), STREAM_ADAPTERS['okx'][0](PAIRS)
+    for frame in RECORDED_FRAMES['binance']:
+        stream.apply_message('binance', binance, frame)
+    for frame in RECORDED_FRAMES['okx']:
+        stream.apply_message('okx', okx, frame)
+    stream.quotes['cex']['binance']['ETH/USDT']['received_at'] -= 60  # stalled channel
+    stream.connected.update(binance=True, okx=False)
+
+    engine = DataEngine()
+    engine.market_stream = stream
+    streamed = engine._streamed_market_data(PAIRS)
+    assert {venue: sorted(book) for venue, book in streamed['cex'].items()} == {'binance': ['BTC/USDT']}
+
+    # Pairs without a fresh streamed quote are polled, per pair
+    binance_client, okx_client = _PolledExchange(), _PolledExchange()
+    cex = await engine.fetch_cex_data(PAIRS, exchanges={'binance': binance_client, 'okx': okx_client},
+                                      streamed=streamed['cex'])
+    assert binance_client.calls == ['ETH/USDT']
+    assert sorted(okx_client.calls) == sorted(PAIRS)
+    assert cex['binance']['BTC/USDT']['bid'] == pytest.approx(50010.10)
+    assert cex['binance']['ETH/USDT']['bid'] == pytest.approx(99.0)
@@ -0,0 +1,90 @@
+import pytest
+
+from core.graph_builder import GraphBuilder
+from core.quote_store import QuoteStore, SectionQuotes
+from strategies.dex_cex_arbitrage import DEXCEXArbitrage
+from strategies.statistical_arbitrage import StatisticalArbitrage
+
+
+def _price_data():
+    return {
+        'tokens': ['BTC', 'ETH', 'USDT'],
+        'cex': {
+            'binance': {
+                'BTC/USDT': {'bid': 5000.0, 'ask': 5001.0, 'last': 5000.5, 'volume': 12.0,
+                             'timestamp': 1700000000000, 'pair': 'BTC/USDT', 'source': 'cex:binance'},
+                'BTC': {'bid': 5000.0, 'ask': 5001.0, 'mapped_from_pair': 'BTC/USDT'},
+                'ETH/USDT': {'bid': 3000.0, 'ask': 3001.0},
+            },
+            'kraken': {
+                'BTC/USDT': {'bid': 5100.0, 'ask': 5102.0},
+            },
+        },
+        'dex': {
+            'uniswap_v3': {
+                'ETH/USDT': {'bid': 2990.0, 'ask': 3005.0, 'fee': 0.003, 'liquidity': 25000.0,
+                             'network': 'ethereum'},
+            },
+        },
+    }
+
+
+def test_views_behave_like_the_nested_dicts():
+    store = QuoteStore.from_price_data(_price_data())
+    cex = store.section('cex')
+
+    assert list(cex) == ['binance', 'kraken']
+    binance = cex['binance']
+    # Iteration covers pairs only; the base-token alias is served by the index
+    assert list(binance) == ['BTC/USDT', 'ETH/USDT']
+    assert 'BTC' in binance and 'SOL' not in binance
+    assert binance['BTC/USDT'] == {
+        'bid': 5000.0, 'ask': 5001.0, 'last': 5000.5, 'volume': 12.0,
+        'timestamp': 1700000000000, 'pair': 'BTC/USDT', 'source': 'cex:binance',
+    }
+    assert binance['ETH']['mapped_from_pair'] == 'ETH/USDT'
+    assert binance.get('SOL/USDT') is None
+
+    eth_dex = store.section('dex')['uniswap_v3']['ETH/USDT']
+    assert eth_dex['fee'] == pytest.approx(0.003)
+    assert eth_dex['network'] == 'ethereum'
+    # Fields the source did not provide stay absent, so consumer defaults still apply
+    assert 'fee' not in binance['ETH/USDT']
+    assert len(store) == 4
+
+
+def test_put_replaces_a_quote_without_leaking_old_fields():
+    store = QuoteStore(capacity=1)
+    store.put('dex', 'curve', 'DAI/USDT', {'bid': 0.999, 'ask': 1.001, 'fee': 0.0004, 'note': 'x'})
+    store.put('dex', 'curve', 'USDC/USDT', {'bid': 0.9995, 'ask': 1.0005})
+    store.put('dex', 'curve', 'DAI/USDT', {'bid': 0.998, 'ask': 1.002})
+
+    assert len(store) == 2
+    assert store.section('dex')['curve']['DAI/USDT'] == {'bid': 0.998, 'ask': 1.002}
+    assert list(store.column('bid')) == pytest.approx([0.998, 0.9995])
+
+
+def test_graph_from_store_matches_graph_from_dicts():
+    data = _price_data()
+    store = QuoteStore.from_price_data(data)
+    columnar = dict(data, cex=store.section('cex'), dex=store.section('dex'))
+
+    from_dicts = GraphBuilder(ai_model=None).build_unified_graph(data)
+    from_store = GraphBuilder(ai_model=None).build_unified_graph(columnar)
+
+    assert dict(from_store.nodes(data=True)) == dict(from_dicts.nodes(data=True))
+    assert {(u, v): d for u, v, d in from_store.edges(data=True)} == \
+        {(u, v): d for u, v, d in from_dicts.edges(data=True)}
+
+
+def test_strategies_accept_store_views():
+    store = QuoteStore.from_price_data(_price_data())
+    assert isinstance(store.section('cex'), SectionQuotes)
+
+    info = DEXCEXArbitrage(ai_model=None).get_token_price_info(store.section('cex')['binance'], 'BTC')
+    assert info['pair'] == 'BTC/USDT'
+    assert info['bid'] == pytest.approx(5000.0)
+
+    statistical = StatisticalArbitrage(ai_model=None)
+    statistical.update_historical_data({'cex': store.section('cex'), 'dex': store.section('dex')})
+    assert 'ETH@uniswap_v3' in statistical.price_history
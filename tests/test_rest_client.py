@@ -0,0 +1,146 @@
+import pytest
+from aiohttp import web
+
+import utils.config as config
+from core.data_engine import DataEngine
+from core.rest_client import REST_ADAPTERS, RestTickerClient
+
+PAIRS = ['BTC/USDT', 'ETH/USDT']
+
+# Public ticker responses as recorded from each venue's REST API (values trimmed)
+RECORDED_RESPONSES = {
+    'binance': [
+        {'symbol': 'BTCUSDT', 'bidPrice': '50010.10', 'askPrice': '50011.20', 'lastPrice': '50010.50',
+         'volume': '1234.5', 'closeTime': 1700000000000},
+        {'symbol': 'ETHUSDT', 'bidPrice': '3001.50', 'askPrice': '3002.00', 'lastPrice': '3001.70',
+         'volume': '20000', 'closeTime': 1700000000000},
+    ],
+    'kraken': {'error': [], 'result': {
+        'XBTUSDT': {'a': ['50012.0', '1', '1.000'], 'b': ['50011.0', '2', '2.000'], 'c': ['50011.5', '0.1'],
+                    'v': ['10.0', '55.0']},
+        'ETHUSDT': {'a': ['3002.1', '1', '1.000'], 'b': ['3001.9', '3', '3.000'], 'c': ['3002.0', '0.5'],
+                    'v': ['100.0', '900.0']},
+    }},
+    'kucoin': {'code': '200000', 'data': {'time': 1700000000000, 'ticker': [
+        {'symbol': 'BTC-USDT', 'buy': '50001.0', 'sell': '50002.0', 'last': '50001.5', 'vol': '700'},
+        {'symbol': 'ETH-USDT', 'buy': '3000.0', 'sell': '3000.5', 'last': '3000.2', 'vol': '9000'},
+        {'symbol': 'SOL-USDT', 'buy': '100.0', 'sell': '100.1', 'last': '100.05', 'vol': '50000'},
+    ]}},
+    'bybit': {'retCode': 0, 'result': {'category': 'spot', 'list': [
+        {'symbol': 'BTCUSDT', 'bid1Price': '50005.0', 'ask1Price': '50006.0', 'lastPrice': '50005.5',
+         'volume24h': '800'},
+        {'symbol': 'ETHUSDT', 'bid1Price': '3000.9', 'ask1Price': '3001.1', 'lastPrice': '3001.0',
+         'volume24h': '7000'},
+    ]}},
+    'okx': {'code': '0', 'data': [
+        {'instId': 'BTC-USDT', 'last': '50020', 'bidPx': '50019.9', 'askPx': '50020.1', 'vol24h': '1234',
+         'ts': '1700000000000'},
+        {'instId': 'ETH-USDT', 'last': '3003', 'bidPx': '3002.9', 'askPx': '3003.1', 'vol24h': '5000',
+         'ts': '1700000000000'},
+    ]},
+    'coinbase': {'data': {'base': 'BTC', 'currency': 'USD', 'amount': '50000.50'}},
+    'bitfinex': [
+        ['tBTCUST', 49980.0, 10.0, 49981.0, 12.0, 100.0, 0.002, 49980.5, 3000.0, 50500.0, 49000.0],
+        ['tETHUST', 3000.0, 10.0, 3000.4, 12.0, 10.0, 0.003, 3000.2, 9000.0, 3100.0, 2900.0],
+    ],
+    'gateio': [
+        {'currency_pair': 'BTC_USDT', 'last': '50001.5', 'lowest_ask': '50002', 'highest_bid': '50001',
+         'base_volume': '300'},
+        {'currency_pair': 'ETH_USDT', 'last': '3000.5', 'lowest_ask': '3000.6', 'highest_bid': '3000.4',
+         'base_volume': '4000'},
+    ],
+    'coingecko': {'bitcoin': {'usd': 50003.0}, 'ethereum': {'usd': 3000.8}},
+    'coinmarketcap': {'data': {
+        'BTC': {'symbol': 'BTC', 'quote': {'USD': {'price': 50004.0, 'volume_24h': 1.0e9}}},
+        'ETH': {'symbol': 'ETH', 'quote': {'USD': {'price': 3000.9, 'volume_24h': 5.0e8}}},
+    }},
+}
+
+
+@pytest.mark.parametrize('venue', sorted(REST_ADAPTERS))
+def test_adapters_parse_recorded_responses(venue):
+    adapter = REST_ADAPTERS[venue](venue, config.EXCHANGE_ENDPOINTS[venue])
+    pairs = ['BTC/USDT'] if venue == 'coinbase' else PAIRS
+
+    quotes = adapter.parse(RECORDED_RESPONSES[venue], pairs)
+
+    assert set(quotes) == set(pairs)
+    btc = quotes['BTC/USDT']
+    assert 49000 < btc['bid'] <= btc['last'] <= btc['ask'] < 51000
+
+
+async def _start_ticker_server(requests_seen):
+    """Local HTTP stand-in: serves each venue's recorded response under /<venue>/..."""
+
+    async def handler(request):
+        venue = request.match_info['venue']
+        requests_seen.append((venue, request.path, dict(request.query)))
+        return web.json_response(RECORDED_RESPONSES[venue])
+
+    app = web.Application()
+    app.router.add_get('/{venue}/{tail:.*}', handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://127.0.0.1:{port}"
+
+
+async def _serve_venues(monkeypatch, requests_seen):
+    """Point every EXCHANGE_ENDPOINTS base_url at the local stand-in."""
+    runner, base = await _start_ticker_server(requests_seen)
+    for venue, entry in config.EXCHANGE_ENDPOINTS.items():
+        monkeypatch.setitem(entry, 'base_url', f"{base}/{venue}")
+    monkeypatch.setenv('COINMARKETCAP_API_KEY', 'test-key')
+    return runner
+
+
+@pytest.mark.asyncio
+async def test_bulk_endpoints_quote_every_pair_with_one_request(monkeypatch):
+    requests_seen = []
+    runner = await _serve_venues(monkeypatch, requests_seen)
+    client = RestTickerClient()
+    try:
+        quotes = await client.fetch_tickers('binance', PAIRS)
+        session = client._session
+        okx_quotes = await client.fetch_tickers('okx', PAIRS)
+        coinbase_quotes = await client.fetch_tickers('coinbase', ['BTC/USDT'])
+        # One pooled session serves every venue
+        assert client._session is session
+    finally:
+        await client.close()
+        await runner.cleanup()
+
+    assert quotes['ETH/USDT']['ask'] == pytest.approx(3002.0)
+    assert okx_quotes['BTC/USDT']['bid'] == pytest.approx(50019.9)
+    assert coinbase_quotes['BTC/USDT']['last'] == pytest.approx(50000.5)
+    assert requests_seen == [
+        ('binance', '/binance/api/v3/ticker/24hr', {'symbols': '["BTCUSDT","ETHUSDT"]'}),
+        ('okx', '/okx/api/v5/market/tickers', {'instType': 'SPOT'}),
+        ('coinbase', '/coinbase/v2/prices/BTC-USD/spot', {}),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_failed_ccxt_requests_fall_back_to_one_rest_request(monkeypatch):
+    class _Broken:
+        symbols = PAIRS
+
+        def fetch_ticker(self, pair):
+            raise RuntimeError("exchange down")
+
+    monkeypatch.setitem(config.FETCH_CONFIG, 'breaker_failure_threshold', 10)
+    requests_seen = []
+    runner = await _serve_venues(monkeypatch, requests_seen)
+    engine = DataEngine()
+    engine.cex_exchanges = {'kucoin': _Broken()}
+    try:
+        cex_data = await engine.fetch_cex_data(PAIRS)
+    finally:
+        await engine.close()
+        await runner.cleanup()
+
+    assert [venue for venue, _, _ in requests_seen] == ['kucoin']
+    assert cex_data['kucoin']['BTC/USDT']['bid'] == pytest.approx(50001.0)
+    assert cex_data['kucoin']['ETH/USDT']['source'] == 'cex:kucoin'
@@ -0,0 +1,94 @@
+import time
+
+import pytest
+
+import utils.config as config
+from core.data_engine import DataEngine
+from core.main_arbitrage_system import MainArbitrageSystem
+from core.scan_timing import ScanTimings
+
+PRICE_DATA = {
+    'tokens': ['BTC', 'ETH'],
+    'cex': {
+        'binance': {'BTC/USDT': {'bid': 100.0, 'ask': 99.0}, 'ETH/USDT': {'bid': 10.0, 'ask': 10.1}},
+        'kraken': {'BTC/USDT': {'bid': 101.0, 'ask': 100.0}, 'ETH/USDT': {'bid': 10.2, 'ask': 10.3}},
+    },
+    'dex': {
+        'uniswap_v3': {'BTC/USDT': {'bid': 103.0, 'ask': 102.0, 'fee': 0.003}},
+    },
+}
+
+
+def test_percentiles_cover_the_rolling_window():
+    timings = ScanTimings(window=100)
+    for ms in range(1, 201):
+        timings.record('detection', ms / 1000)
+
+    stats = timings.percentiles('detection')
+    # Only the last 100 samples (0.101s .. 0.200s) are kept
+    assert stats['count'] == 100
+    assert stats['last'] == pytest.approx(0.200)
+    assert stats['p50'] == pytest.approx(0.150)
+    assert stats['p95'] == pytest.approx(0.195)
+    assert stats['p99'] == pytest.approx(0.199)
+    assert timings.percentiles('unknown') is None
+
+
+def test_span_is_recorded_when_the_block_raises():
+    timings = ScanTimings()
+    timings.begin_scan()
+    with pytest.raises(RuntimeError):
+        with timings.span('graph_build'):
+            time.sleep(0.01)
+            raise RuntimeError("boom")
+    assert timings.last_scan['graph_build'] >= 0.01
+
+
+@pytest.mark.asyncio
+async def test_scan_records_every_stage_and_strategy():
+    main = MainArbitrageSystem(start_capital_usd=1000)
+
+    async def _fetch_all_market_data(_trading_pairs):
+        return PRICE_DATA
+    main.data_engine.fetch_all_market_data = _fetch_all_market_data
+
+    strategies = ['dex_cex', 'cross_exchange', 'triangular', 'statistical']
+    await main.run_full_arbitrage_scan(strategies, ['BTC/USDT', 'ETH/USDT'], min_profit_threshold=0.1)
+    await main.run_full_arbitrage_scan(strategies, ['BTC/USDT', 'ETH/USDT'], min_profit_threshold=0.1)
+
+    timings = main.get_system_status()['scan_timings']
+    assert set(timings['stages']) >= {'scan', 'fetch', 'statistical_update', 'graph_build',
+                                      'graph_compile', 'detection', 'ranking'}
+    assert set(timings['strategies']) == set(strategies)
+    assert timings['stages']['scan']['count'] == 2
+    # Stage spans of the latest scan add up to no more than its total
+    last = timings['last_scan']
+    assert sum(v for name, v in last.items() if name != 'scan' and '.' not in name) <= last['scan']
+
+
+class _SlowExchange:
+    symbols = ['BTC/USDT']
+
+    def __init__(self, delay):
+        self.delay = delay
+
+    def fetch_ticker(self, pair):
+        time.sleep(self.delay)
+        return {'bid': 99.9, 'ask': 100.1, 'last': 100.0, 'baseVolume': 1}
+
+
+@pytest.mark.asyncio
+async def test_fetch_records_per_venue_latency(monkeypatch):
+    monkeypatch.setitem(config.EXCHANGES_CONFIG, 'fast_venue', {'rate_limit': 6000})
+    monkeypatch.setitem(config.EXCHANGES_CONFIG, 'slow_venue', {'rate_limit': 6000})
+    engine = DataEngine()
+    engine.cex_exchanges = {'fast_venue': _SlowExchange(0.01), 'slow_venue': _SlowExchange(0.1)}
+    try:
+        await engine.fetch_cex_data(['BTC/USDT'])
+    finally:
+        await engine.close()
+
+    fast = engine.timings.percentiles('fetch.venue.fast_venue')
+    slow = engine.timings.percentiles('fetch.venue.slow_venue')
+    assert fast['count'] == slow['count'] == 1
+    assert slow['last'] >= 0.1 > fast['last']
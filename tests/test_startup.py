@@ -0,0 +1,76 @@
+import os
+import subprocess
+import sys
+import threading
+import time
+
+import core.ai_model as ai_model
+import core.data_engine as data_engine
+from core.main_arbitrage_system import MainArbitrageSystem
+
+
+class _HangingWeb3:
+    """Web3 stand-in whose RPC probe blocks like an offline public endpoint."""
+
+    released = threading.Event()
+
+    @staticmethod
+    def HTTPProvider(url, request_kwargs=None):
+        return url
+
+    def __init__(self, provider):
+        self.provider = provider
+
+    def is_connected(self):
+        self.released.wait(5)
+        return True
+
+
+def test_system_starts_without_waiting_for_web3_or_the_model(monkeypatch):
+    monkeypatch.setattr(data_engine, 'Web3', _HangingWeb3)
+    model_release = threading.Event()
+
+    def slow_load(self):
+        model_release.wait(5)
+        self.loaded = True
+        self.load_state = 'ready'
+
+    monkeypatch.setattr(ai_model, 'HAVE_TRANSFORMERS', True)
+    monkeypatch.setattr(ai_model.ArbitrageAI, '_load_model', slow_load)
+
+    started = time.monotonic()
+    system = MainArbitrageSystem()
+    assert time.monotonic() - started < 1.0
+
+    assert system.get_system_status()['readiness'] == {'ai_model': 'loading', 'web3': 'probing'}
+    assert not system.ai.is_loaded() and not system.data_engine.web3_connected
+
+    model_release.set()
+    _HangingWeb3.released.set()
+    deadline = time.monotonic() + 5
+    while system.get_system_status()['readiness'] != {'ai_model': 'ready', 'web3': 'connected'}:
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+    assert system.ai.is_loaded() and system.data_engine.web3_connected
+
+
+def test_ccxt_clients_are_built_on_first_use():
+    engine = data_engine.DataEngine()
+    clients = engine.cex_exchanges
+
+    assert 'binance' in clients and len(clients) > 0
+    assert clients.created() == {}
+    assert engine.get_status()['cex_exchanges'] == len(clients)
+
+    binance = clients['binance']
+    assert clients['binance'] is binance
+    assert list(clients.created()) == ['binance']
+
+
+def test_importing_the_scanner_defers_heavy_dependencies():
+    code = ("import sys, core.main_arbitrage_system; "
+            "print(sorted(m for m in ('ccxt', 'web3', 'aiohttp', 'transformers', 'torch', 'pandas') "
+            "if m in sys.modules))")
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    out = subprocess.run([sys.executable, '-c', code], cwd=root, capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == '[]'
@@ -0,0 +1,74 @@
+import json
+
+import pytest
+
+from core.main_arbitrage_system import MainArbitrageSystem
+from core.trace import TraceBuffer, get_trace_buffer
+
+PRICE_DATA = {
+    'tokens': ['BTC'],
+    'cex': {
+        'binance': {'BTC/USDT': {'bid': 100.0, 'ask': 99.0}},
+        'kraken': {'BTC/USDT': {'bid': 101.0, 'ask': 100.0}},
+    },
+    'dex': {
+        'uniswap_v3': {'BTC/USDT': {'bid': 103.0, 'ask': 102.0, 'fee': 0.003}},
+    },
+}
+
+
+def test_ring_buffer_keeps_the_newest_events_per_scan(tmp_path):
+    trace = TraceBuffer(capacity=5, enabled=True)
+    first = trace.begin_scan()
+    for i in range(3):
+        trace.emit('edge', index=i)
+    second = trace.begin_scan()
+    for i in range(4):
+        trace.emit('edge', index=i)
+
+    assert len(trace) == 5
+    # Two of the first scan's events were pushed out by the second scan
+    assert [e['index'] for e in trace.dump(first)] == [2]
+    assert [e['index'] for e in trace.dump()] == [0, 1, 2, 3]
+    assert all(e['scan'] == second and e['event'] == 'edge' for e in trace.dump())
+
+    path = tmp_path / 'trace.jsonl'
+    assert trace.write_jsonl(str(path), first) == 1
+    assert json.loads(path.read_text().splitlines()[0])['index'] == 2
+
+
+async def _scan():
+    main = MainArbitrageSystem(start_capital_usd=1000)
+
+    async def _fetch_all_market_data(_trading_pairs):
+        return PRICE_DATA
+    main.data_engine.fetch_all_market_data = _fetch_all_market_data
+    await main.run_full_arbitrage_scan(['dex_cex', 'cross_exchange'], ['BTC/USDT'], min_profit_threshold=0.0)
+    return main
+
+
+@pytest.mark.asyncio
+async def test_disabled_trace_points_record_nothing(monkeypatch):
+    trace = get_trace_buffer()
+    monkeypatch.setattr(trace, 'enabled', False)
+    before = len(trace)
+
+    main = await _scan()
+
+    assert len(trace) == before
+    assert main.get_scan_trace() == []
+
+
+@pytest.mark.asyncio
+async def test_enabled_trace_is_dumped_per_scan(monkeypatch):
+    trace = get_trace_buffer()
+    monkeypatch.setattr(trace, 'enabled', True)
+
+    main = await _scan()
+    events = main.get_scan_trace()
+
+    assert {e['scan'] for e in events} == {main.last_trace_scan}
+    kinds = {e['event'] for e in events}
+    assert {'quote', 'edge', 'raw_cycles'} <= kinds
+    quote = next(e for e in events if e['event'] == 'quote' and e['venue'] == 'binance')
+    assert quote['pair'] == 'BTC/USDT' and quote['bid'] == 100.0
@@ -0,0 +1,127 @@
+"""
+Benchmark the graph backends (networkx vs the built-in LeanDiGraph) for build plus detection.
+
+Builds a synthetic snapshot of CEX and DEX quotes, then times each stage of a scan
+with every backend selectable through GRAPH_CONFIG['backend']: unified graph build,
+cross-exchange transfer edges, compilation to a CompiledGraph and Bellman-Ford
+detection. Reports the median of --repeat runs and checks that both backends find
+the same cycles.
+
+Usage:
+    python tools/bench_graph_backend.py [--tokens 40] [--cex 8] [--dex 4] [--repeat 7] [--json]
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import time
+
+# Ensure project root is on sys.path so local packages are importable when running from tools/
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+import utils.config as config
+from core.bellman_ford_detector import BellmanFordDetector
+from core.graph_builder import GraphBuilder
+
+BACKENDS = ('networkx', 'lean')
+STAGES = ('build', 'cross_exchange', 'compile', 'detect')
+
+
+def build_price_data(num_tokens: int, num_cex: int, num_dex: int, noise: float, seed: int):
+    rng = random.Random(seed)
+    tokens = [f"T{i}" for i in range(num_tokens)]
+    fair = {token: rng.uniform(1.0, 200.0) for token in tokens}
+
+    price_data = {'tokens': tokens + ['USDT'], 'cex': {}, 'dex': {}}
+    for section, count in (('cex', num_cex), ('dex', num_dex)):
+        for i in range(count):
+            book = {}
+            for token in tokens:
+                mid = fair[token] * (1 + rng.uniform(-noise, noise))
+                book[f"{token}/USDT"] = {'bid': mid * 0.9995, 'ask': mid * 1.0005}
+                if section == 'dex':
+                    book[f"{token}/USDT"]['liquidity'] = rng.uniform(1e4, 1e7)
+            price_data[section][f"{section}{i}"] = book
+    return price_data
+
+
+def run_scan(price_data, backend: str):
+    config.GRAPH_CONFIG['backend'] = backend
+    timings = {}
+    builder = GraphBuilder(ai_model=None)
+    detector = BellmanFordDetector(ai_model=None)
+
+    started = time.perf_counter()
+    graph = builder.build_unified_graph(price_data)
+    timings['build'] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    builder.add_cross_exchange_edges(graph, price_data)
+    timings['cross_exchange'] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    compiled = builder.compile_graph(graph)
+    timings['compile'] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    cycles = detector.detect_all_cycles(compiled)
+    timings['detect'] = time.perf_counter() - started
+
+    timings['total'] = sum(timings[stage] for stage in STAGES)
+    found = {detector._cycle_key(cycle['path']) for cycle in cycles}
+    return graph, timings, found
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--tokens', type=int, default=40)
+    parser.add_argument('--cex', type=int, default=8, help='number of CEX venues')
+    parser.add_argument('--dex', type=int, default=4, help='number of DEX venues')
+    parser.add_argument('--noise', type=float, default=0.05, help='relative price noise per venue')
+    parser.add_argument('--repeat', type=int, default=7)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--json', action='store_true', help='print results as JSON')
+    args = parser.parse_args()
+
+    import logging
+    logging.disable(logging.WARNING)
+
+    price_data = build_price_data(args.tokens, args.cex, args.dex, args.noise, args.seed)
+    original_backend = config.GRAPH_CONFIG.get('backend')
+    runs = {backend: [] for backend in BACKENDS}
+    cycles, sizes = {}, {}
+    try:
+        # Interleave the backends so warm-up and machine noise affect both alike
+        for _ in range(max(1, args.repeat)):
+            for backend in BACKENDS:
+                graph, timings, cycles[backend] = run_scan(price_data, backend)
+                runs[backend].append(timings)
+                sizes[backend] = (graph.number_of_nodes(), graph.number_of_edges())
+    finally:
+        config.GRAPH_CONFIG['backend'] = original_backend
+    results = {backend: {name: statistics.median(run[name] for run in backend_runs) for name in backend_runs[0]}
+               for backend, backend_runs in runs.items()}
+
+    same_cycles = cycles['networkx'] == cycles['lean']
+    if args.json:
+        print(json.dumps({'sizes': sizes, 'median_seconds': results, 'same_cycles': same_cycles,
+                          'cycles': len(cycles['networkx'])}, indent=2))
+        return
+
+    nodes, edges = sizes['networkx']
+    print(f"Graph: {nodes} nodes, {edges} edges; median of {args.repeat} runs")
+    print(f"{'stage':>15} " + " ".join(f"{backend:>10}" for backend in BACKENDS) + "    speedup")
+    for stage in STAGES + ('total',):
+        reference, lean = results['networkx'][stage], results['lean'][stage]
+        speedup = reference / lean if lean else float('inf')
+        print(f"{stage:>15} {reference * 1000:>8.2f}ms {lean * 1000:>8.2f}ms    {speedup:5.2f}x")
+    print(f"Cycles found: {len(cycles['networkx'])} (networkx) / {len(cycles['lean'])} (lean); "
+          f"identical: {same_cycles}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,127 @@
+"""
+Benchmark cold start time per entry point.
+
+Each entry point is imported in fresh interpreters (so nothing is cached in-process):
+wall time and in-process import/construct time are the median over --repeat runs, and
+one extra run with ``python -X importtime`` breaks the import cost down by top-level
+package (self time summed over every module of the package).
+
+Entry points:
+    scanner      import core.main_arbitrage_system and construct MainArbitrageSystem
+                 (headless scan cold start, as in tools/run_live_scan.py)
+    graph        core.graph_builder + core.bellman_ford_detector (tools/inspect_cycles.py)
+    data_engine  import core.data_engine and construct DataEngine
+    app          import the Gradio dashboard module (skipped if gradio is missing)
+
+Usage:
+    python tools/bench_startup.py [--entry scanner --entry graph] [--repeat 5] [--top 12] [--json out.json]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+
+# Project root; child interpreters run from here with it on PYTHONPATH
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# name -> (import statement, construct statement or None)
+ENTRY_POINTS = {
+    'scanner': ("from core.main_arbitrage_system import MainArbitrageSystem", "MainArbitrageSystem()"),
+    'graph': ("import core.graph_builder, core.bellman_ford_detector", None),
+    'data_engine': ("from core.data_engine import DataEngine", "DataEngine()"),
+    'app': ("import app", None),
+}
+
+_PROBE = """
+import json, time
+started = time.perf_counter()
+{import_stmt}
+imported = time.perf_counter()
+{construct_stmt}
+print('BENCH ' + json.dumps({{'import': imported - started, 'construct': time.perf_counter() - imported}}))
+"""
+
+
+def _run(code: str, importtime: bool = False):
+    cmd = [sys.executable] + (['-X', 'importtime'] if importtime else []) + ['-c', code]
+    env = dict(os.environ, PYTHONPATH=ROOT + os.pathsep + os.environ.get('PYTHONPATH', ''),
+               PYTHONDONTWRITEBYTECODE='1', LOG_LEVEL='ERROR')
+    started = time.perf_counter()
+    proc = subprocess.run(cmd, cwd=ROOT, env=env, capture_output=True, text=True)
+    wall = time.perf_counter() - started
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else 'failed')
+    timings = {}
+    for line in proc.stdout.splitlines():
+        if line.startswith('BENCH '):
+            timings = json.loads(line[len('BENCH '):])
+    return wall, timings, proc.stderr
+
+
+def package_breakdown(importtime_log: str) -> dict:
+    """Sum ``-X importtime`` self times (seconds) per top-level package."""
+    totals = defaultdict(float)
+    for line in importtime_log.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, _cumulative, name = (part.strip() for part in line[len('import time:'):].split('|'))
+        totals[name.split('.')[0]] += int(self_us) / 1e6
+    return dict(totals)
+
+
+def bench_entry(name: str, repeat: int):
+    import_stmt, construct_stmt = ENTRY_POINTS[name]
+    code = _PROBE.format(import_stmt=import_stmt, construct_stmt=construct_stmt or 'pass')
+    walls, imports, constructs = [], [], []
+    for _ in range(repeat):
+        wall, timings, _ = _run(code)
+        walls.append(wall)
+        imports.append(timings.get('import', 0.0))
+        constructs.append(timings.get('construct', 0.0))
+    _, _, log = _run(code, importtime=True)
+    return {
+        'wall': statistics.median(walls),
+        'import': statistics.median(imports),
+        'construct': statistics.median(constructs),
+        'packages': package_breakdown(log),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--entry', action='append', choices=sorted(ENTRY_POINTS),
+                        help='entry point to measure (repeatable; default: all)')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--top', type=int, default=12, help='packages to list per entry point')
+    parser.add_argument('--json', help='also write the results to this file')
+    args = parser.parse_args()
+
+    baseline, _, _ = _run('pass')
+    print(f"Interpreter start-up: {baseline * 1000:.0f} ms ({sys.version.split()[0]})")
+
+    results = {'python': sys.version.split()[0], 'interpreter': baseline, 'entries': {}}
+    for name in args.entry or list(ENTRY_POINTS):
+        try:
+            result = bench_entry(name, args.repeat)
+        except RuntimeError as e:
+            print(f"\n{name}: skipped ({e})")
+            continue
+        results['entries'][name] = result
+        print(f"\n{name}: wall {result['wall'] * 1000:.0f} ms, import {result['import'] * 1000:.0f} ms, "
+              f"construct {result['construct'] * 1000:.0f} ms (median of {args.repeat})")
+        ranked = sorted(result['packages'].items(), key=lambda item: item[1], reverse=True)
+        for package, seconds in ranked[:args.top]:
+            print(f"  {package:<28} {seconds * 1000:8.1f} ms")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as handle:
+            json.dump(results, handle, indent=2)
+        print(f"\nWrote {args.json}")
+
+
+if __name__ == '__main__':
+    main()
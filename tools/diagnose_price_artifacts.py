@@ -2,6 +2,7 @@
 import asyncio
 import json
 import logging
+from collections.abc import Mapping
 from pathlib import Path
 import sys
 import os
@@ -42,7 +43,10 @@ async def run_diagnostics():
     strategy = DEXCEXArbitrage(ai_model=None)
 
     LOG.info("Fetching market data for diagnostic run...")
-    price_data = await de.fetch_all_market_data(TRADING_PAIRS)
+    try:
+        price_data = await de.fetch_all_market_data(TRADING_PAIRS)
+    finally:
+        await de.close()
 
     # Inspect cex exchange symbols availability
     for name, ex in de.cex_exchanges.items():
@@ -62,7 +66,7 @@ async def run_diagnostics():
 
     # Helper: attempt get token info like strategy.get_token_price_info
     def token_price_lookup(exchange_data, token):
-        if not isinstance(exchange_data, dict):
+        if not isinstance(exchange_data, Mapping):
             return None
         if token in exchange_data:
             return exchange_data[token]
@@ -26,7 +26,10 @@ async def main():
     enabled = ['dex_cex', 'cross_exchange', 'wrapped_tokens', 'triangular']
 
     logger.info(" Running live arbitrage scan (this will call exchanges/DEXes via DataEngine)")
-    opportunities = await system.run_full_arbitrage_scan(enabled, trading_pairs, min_profit_threshold=0.0)
+    try:
+        opportunities = await system.run_full_arbitrage_scan(enabled, trading_pairs, min_profit_threshold=0.0)
+    finally:
+        await system.close()
 
     logger.info(" Live scan complete. Found %d opportunities", len(opportunities))
     for i, opp in enumerate(opportunities):
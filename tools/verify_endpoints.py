@@ -18,6 +18,7 @@ sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1]))
 import logging
 logger = logging.getLogger(__name__)
 
+import asyncio
 import requests
 import time
 import json
@@ -25,6 +26,7 @@ import os
 from urllib.parse import urljoin
 from typing import Dict, Any
 from utils import config
+from core.rate_limiter import get_rate_limiter
 
 DEFAULT_SAMPLE_PAIR = "BTC/USDT"
 
@@ -45,10 +47,19 @@ def _format_path(path: str, pair: str) -> str:
         return path.format(noslash)
     return path
 
+async def _rest_quote(name: str, pair: str):
+    from core.rest_client import RestTickerClient
+    client = RestTickerClient()
+    try:
+        return (await client.fetch_tickers(name, [pair])).get(pair)
+    finally:
+        await client.close()
+
+
 def check_endpoint(name: str, entry: Dict[str, Any], sample_pair: str = DEFAULT_SAMPLE_PAIR) -> Dict[str, Any]:
     """
-    Use DataEngine.rest_fetch_ticker when possible to validate endpoint and parsing.
-    Falls back to simple HTTP GET check if DataEngine is unavailable.
+    Use the async REST ticker client when possible to validate endpoint and parsing.
+    Falls back to simple HTTP GET check if the client is unavailable.
     """
     base = entry.get('base_url')
     path = entry.get('public_ticker_path', '')
@@ -64,12 +75,10 @@ def check_endpoint(name: str, entry: Dict[str, Any], sample_pair: str = DEFAULT_
         'error': None
     }
 
-    # Prefer using DataEngine.rest_fetch_ticker for realistic parsing/params
+    # Prefer the REST ticker client DataEngine falls back to, for realistic parsing/params
     try:
-        from core.data_engine import DataEngine
-        engine = DataEngine()
         start = time.time()
-        parsed = engine.rest_fetch_ticker(name, sample_pair)
+        parsed = asyncio.run(_rest_quote(name, sample_pair))
         latency = (time.time() - start) * 1000.0
         result['latency_ms'] = round(latency, 2)
         if parsed and isinstance(parsed, dict) and parsed.get('last') is not None:
@@ -87,6 +96,7 @@ def check_endpoint(name: str, entry: Dict[str, Any], sample_pair: str = DEFAULT_
                 result['error'] = 'prefer_ccxt'
                 return result
             # fallback: attempt raw HTTP GET to the configured path
+            get_rate_limiter().wait(name)
             start = time.time()
             try:
                 resp = requests.get(checked_url, timeout=5)
@@ -97,8 +107,9 @@ def check_endpoint(name: str, entry: Dict[str, Any], sample_pair: str = DEFAULT_
             except Exception as http_e:
                 result['error'] = str(http_e)
     except Exception as e:
-        # If DataEngine import or rest_fetch_ticker fails, fallback to raw request
+        # If the REST client import or request fails, fallback to raw request
         try:
+            get_rate_limiter().wait(name)
             start = time.time()
             resp = requests.get(checked_url, timeout=5)
             latency = (time.time() - start) * 1000.0
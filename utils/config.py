@@ -1,4 +1,5 @@
 """Configuration settings for AI Crypto Arbitrage System"""
+import os as _os
 
 # Trading Configuration
 TRADING_CONFIG = {
@@ -86,30 +87,140 @@ EXCHANGES_CONFIG = {
     }
 }
 
+# Market data fetching (DataEngine)
+FETCH_CONFIG = {
+    # Upper bound on in-flight ticker requests per exchange; the effective limit is
+    # min(this, exchange rate_limit per second) and requests are paced to that allowance
+    'max_concurrency_per_exchange': 8,
+    # Use one fetch_tickers(symbols) call per venue when the exchange supports it
+    'use_bulk_tickers': True,
+    # Build ccxt.async_support clients (one keep-alive aiohttp session per exchange) when
+    # available; otherwise synchronous ccxt clients are called through worker threads.
+    # Opt-in: the sessions must be released with `await engine.close()` (or `async with DataEngine()`)
+    'async_ccxt': False,
+    # Default tolerance (seconds) for reusing cached quotes in fetch_all_market_data; callers
+    # can pass max_age per call. 0 re-fetches every quote on every scan
+    'max_quote_age': 0.0,
+    # Tail-latency bounds (seconds). Every exchange call is abandoned after request_timeout
+    # (load_markets after markets_timeout); fetch_cex_data stops waiting after scan_deadline
+    # and proceeds with the quotes that have arrived. None disables a bound
+    'request_timeout': 8.0,
+    'markets_timeout': 30.0,
+    'scan_deadline': 15.0,
+    # Hedged ticker requests: when a venue's p95 latency exceeds hedge_min_delay, a duplicate
+    # request is sent once a call has been outstanding for that p95 and the first answer wins
+    'hedge_requests': False,
+    'hedge_min_delay': 0.5,
+    'hedge_min_samples': 20,
+    # Per-venue circuit breaker (core/circuit_breaker.py): open after this many consecutive
+    # failures, skip the venue in scans and probe it in the background every reset_timeout
+    'breaker_failure_threshold': 5,
+    'breaker_reset_timeout': 30.0,
+}
+
+# Component start-up. Slow initialization (HuggingFace model download/load, Web3 RPC probe)
+# runs in background threads so the UI and scans start immediately; progress is reported
+# in MainArbitrageSystem.get_system_status()['readiness']
+STARTUP_CONFIG = {
+    'background_ai_model': True,     # load the AI model in a background thread
+    'background_web3_probe': True,   # probe the Web3 RPC in a background thread
+    'web3_timeout': 5.0,             # seconds before the RPC probe gives up
+    'lazy_ccxt_clients': True,       # build each ccxt client on first use
+}
+
+# Scan timing spans (core/scan_timing.py): every scan stage, each strategy's edge adding and
+# each venue's fetch are timed; the last `window` samples per span give p50/p95/p99 in the
+# dashboard's core diagnostics
+SCAN_TIMING_CONFIG = {
+    'window': 200,               # samples kept per span
+}
+
+# Diagnostic trace points (core/trace.py). Disabled trace points cost one attribute check;
+# enabled ones record structured events in a bounded ring buffer that can be dumped per scan
+DIAGNOSTICS_CONFIG = {
+    'trace_enabled': _os.getenv('AIARBI_TRACE', '').lower() in ('1', 'true', 'yes'),
+    'trace_capacity': 20000,     # events kept across scans
+}
+
+# Log output (utils/logging_config.py). With 'queue' the scan thread only enqueues records;
+# formatting, sanitizing and writing happen on a background listener thread. In that mode,
+# repeats of the same message from the same logger beyond 'repeat_burst' per
+# 'repeat_interval' seconds are collapsed into a count on the next record that gets through
+# (0 disables). Without 'queue' every record is written synchronously, unfiltered.
+LOGGING_CONFIG = {
+    'queue': _os.getenv('LOG_QUEUE', '').lower() in ('1', 'true', 'yes'),
+    'queue_size': 10000,         # records buffered; beyond that new records are dropped and counted
+    'repeat_burst': 5,
+    'repeat_interval': 10.0,
+}
+
+# Per-venue token buckets (core/rate_limiter.py) built from the rate limits declared in
+# EXCHANGES_CONFIG / EXCHANGE_ENDPOINTS / DEX_ENDPOINTS; shared by every network caller
+RATE_LIMIT_CONFIG = {
+    'burst_seconds': 1.0,        # bucket capacity, in seconds of allowance
+    'default_per_minute': 60,    # venues without a declared limit
+}
+
+# Async REST ticker client (core/rest_client.py): one pooled aiohttp session shared by
+# every venue's REST fallback requests
+REST_CLIENT_CONFIG = {
+    'pool_size': 64,             # open connections across all hosts
+    'pool_size_per_host': 8,
+    'keepalive_seconds': 30,
+    'dns_cache_seconds': 300,
+}
+
+# Persistent exchange market metadata (core/market_cache.py). Cached markets are applied to
+# the ccxt clients at startup; entries older than ttl_seconds are refreshed in the background.
+MARKET_CACHE_CONFIG = {
+    'enabled': True,
+    'directory': _os.getenv('AIARBI_MARKET_CACHE_DIR',
+                            _os.path.join(_os.path.expanduser('~'), '.cache', 'aiarbi', 'markets')),
+    'ttl_seconds': 6 * 3600,
+}
+
+# WebSocket streaming ingestion (core/market_stream.py). When enabled, DataEngine keeps a live
+# top-of-book per (venue, pair) and fetch_all_market_data reads a snapshot instead of polling REST.
+STREAMING_CONFIG = {
+    'enabled': False,
+    # Venues with a stream adapter; URLs come from EXCHANGE_ENDPOINTS / DEX_ENDPOINTS 'websocket_url'
+    'venues': ['binance', 'okx', 'bybit', 'gateio', 'kraken', 'coinbase', 'bitfinex', 'dydx'],
+    'reconnect_delay': 1.0,      # seconds, doubled after each failed attempt
+    'max_reconnect_delay': 30.0,
+    'heartbeat': 20.0,           # WebSocket ping interval in seconds
+    'max_quote_age': 10.0,       # seconds; older streamed quotes (stalled channel) are polled over REST
+}
+
 # Canonical REST endpoints for exchanges and market data (can be overridden via env vars)
 EXCHANGE_ENDPOINTS = {
     'binance': {
         'base_url': 'https://api.binance.com',
         'docs': 'https://binance-docs.github.io/apidocs/spot/en/',
         'public_ticker_path': '/api/v3/ticker/price',  # example: GET /api/v3/ticker/price?symbol=BTCUSDT
-        'rate_limit_per_min': 1200
+        'bulk_ticker_path': '/api/v3/ticker/24hr',  # ?symbols=["BTCUSDT","ETHUSDT"]
+        'rate_limit_per_min': 1200,
+        'websocket_url': 'wss://stream.binance.com:9443/ws'
     },
     'coinbase': {
         'base_url': 'https://api.coinbase.com',
         'docs': 'https://docs.cloud.coinbase.com/exchange/docs',
         'public_ticker_path': '/v2/prices/{base}-USD/spot',  # use base token with USD (e.g. BTC-USD)
-        'rate_limit_per_min': 166
+        'rate_limit_per_min': 166,
+        'websocket_url': 'wss://ws-feed.exchange.coinbase.com'
     },
     'kraken': {
         'base_url': 'https://api.kraken.com',
         'docs': 'https://docs.kraken.com/rest/',
         'public_ticker_path': '/0/public/Ticker',  # example: ?pair=XBTUSDT
-        'rate_limit_per_min': 60
+        'bulk_ticker_path': '/0/public/Ticker',  # ?pair=XBTUSDT,ETHUSDT
+        'rate_limit_per_min': 60,
+        'websocket_url': 'wss://ws.kraken.com/v2'
     },
     'kucoin': {
         'base_url': 'https://api.kucoin.com',
         'docs': 'https://docs.kucoin.com/',
         'public_ticker_path': '/api/v1/market/orderbook/level1',  # example: ?symbol=BTC-USDT
+        'bulk_ticker_path': '/api/v1/market/allTickers',
         'rate_limit_per_min': 180
     },
     'bybit': {
@@ -123,7 +234,9 @@ EXCHANGE_ENDPOINTS = {
             '/v5/market/tickers?category=spot',
             '/v2/public/tickers'
         ],
-        'rate_limit_per_min': 120
+        'bulk_ticker_path': '/v5/market/tickers?category=spot',
+        'rate_limit_per_min': 120,
+        'websocket_url': 'wss://stream.bybit.com/v5/public/spot'
     },
     'okx': {
         'base_url': 'https://www.okx.com',
@@ -131,7 +244,9 @@ EXCHANGE_ENDPOINTS = {
         # Include instId in the example path to make verification/raw GETs succeed:
         # GET /api/v5/market/ticker?instId=BTC-USDT
         'public_ticker_path': '/api/v5/market/ticker?instId={dash}',
-        'rate_limit_per_min': 600
+        'bulk_ticker_path': '/api/v5/market/tickers?instType=SPOT',
+        'rate_limit_per_min': 600,
+        'websocket_url': 'wss://ws.okx.com:8443/ws/v5/public'
     },
     'bitfinex': {
         'base_url': 'https://api-pub.bitfinex.com',
@@ -142,21 +257,26 @@ EXCHANGE_ENDPOINTS = {
             '/v2/ticker/t{noslash}',
             '/v1/pubticker/{base}'
         ],
+        'bulk_ticker_path': '/v2/tickers',  # ?symbols=tBTCUST,tETHUST
         'prefer_ccxt': True,
-        'rate_limit_per_min': 90
+        'rate_limit_per_min': 90,
+        'websocket_url': 'wss://api-pub.bitfinex.com/ws/2'
     },
     'gateio': {
         # Use host as base and include API version in the path so urljoin/_format_path resolves correctly.
         'base_url': 'https://api.gateio.ws',
         'docs': 'https://www.gate.com/docs/developers/apiv4/en',
         'public_ticker_path': '/api/v4/spot/tickers',
-        'rate_limit_per_min': 54000
+        'bulk_ticker_path': '/api/v4/spot/tickers',  # without currency_pair: every pair
+        'rate_limit_per_min': 54000,
+        'websocket_url': 'wss://api.gateio.ws/ws/v4/'
     },
     'coingecko': {
         'base_url': 'https://api.coingecko.com/api/v3',
         'docs': 'https://www.coingecko.com/en/api/documentation',
         # Avoid leading slash so urljoin preserves base path when base includes /api/v3
         'public_ticker_path': 'simple/price',  # e.g. ?ids=bitcoin&vs_currencies=usd
+        'bulk_ticker_path': 'simple/price',  # ?ids=bitcoin,ethereum
         'rate_limit_per_min': 30
     },
     'coinmarketcap': {
@@ -164,13 +284,13 @@ EXCHANGE_ENDPOINTS = {
         'docs': 'https://coinmarketcap.com/api/documentation/v1/',
         # Avoid leading slash so urljoin preserves base path when base includes /v1
         'public_ticker_path': 'cryptocurrency/quotes/latest',  # requires API key header X-CMC_PRO_API_KEY
+        'bulk_ticker_path': 'cryptocurrency/quotes/latest',  # ?symbol=BTC,ETH
         'requires_api_key': True,
         'rate_limit_per_min': 30
     }
 }
 
 # Allow environment variables to override any base_url at runtime
-import os as _os
 for _name, _entry in EXCHANGE_ENDPOINTS.items():
     _env_key = f"EXCHANGE_ENDPOINT_{_name.upper()}_BASE_URL"
     if _os.getenv(_env_key):
@@ -457,9 +577,38 @@ BELLMAN_FORD_CONFIG = {
     # This value is in log-space; negative values indicate a profitable cycle.
     'min_profit_threshold': -0.0001,  # Accept ~0.01% profit (log-space) during tests
     'max_cycles_to_process': 50,  # Limit cycles to avoid timeout
+    # 'multi_source': one pass from a virtual super-source (O(V*E));
+    # 'per_source': legacy run from every node (O(V^2*E))
+    'detection_mode': 'multi_source',
+    # Relaxation kernel: 'python' (reference) or 'numpy' (vectorized, faster on large graphs)
+    'relaxation_backend': 'python',
+    # Reuse the previous run's distances and re-relax only from changed edges
+    # (falls back to a full run whenever the previous graph had a negative cycle)
+    'incremental_detection': False,
+    # Candidate search: 'bellman_ford' (one cycle per relaxed node, top 20 after dedup) or
+    # 'bounded_dfs' (every profitable simple cycle up to max_cycle_length hops)
+    'cycle_search': 'bellman_ford',
+    'cycles_per_start': 5,         # bounded_dfs: most profitable cycles kept per start node
+    'max_enumerated_cycles': 200,  # bounded_dfs: cap on cycles returned per scan
+    # Cycles never cross strongly connected components: search each non-trivial SCC separately
+    'partition_components': True,
+    # Processes used to search components in parallel (0/1 = in-process)
+    'parallel_workers': 0,
     'enable_statistical_enhancement': True
 }
 
+# Graph construction
+GRAPH_CONFIG = {
+    # Keep the price graph between scans and re-weight only the edges whose tickers changed
+    # (GraphBuilder.apply_price_updates); strategy edges are re-added on a copy each scan
+    'incremental_updates': False,
+    # Drop price edges for quotes older than this many seconds (quote 'age'); None keeps all
+    'max_quote_age': None,
+    # Graph implementation: 'networkx' or 'lean' (built-in dict-of-dicts DiGraph, core/lean_graph.py;
+    # always used when networkx is not installed). Compare with tools/bench_graph_backend.py
+    'backend': _os.getenv('AIARBI_GRAPH_BACKEND', 'networkx'),
+}
+
 # Statistical Arbitrage Settings
 STATISTICAL_CONFIG = {
     'lookback_periods': 100,  # Number of price points to analyze
@@ -475,6 +624,12 @@ def get_exchange_fee(exchange: str, trade_type: str = 'taker') -> float:
         return EXCHANGES_CONFIG[exchange].get(f'{trade_type}_fee', 0.001)
     return 0.001  # Default 0.1% fee
 
+def get_dex_fee(protocol: str) -> float:
+    """Get swap fee for a DEX protocol"""
+    if protocol in DEX_CONFIG:
+        return DEX_CONFIG[protocol].get('fee', 0.003)
+    return 0.003  # Default 0.3% pool fee
+
 def get_supported_exchanges() -> list:
     """Get list of supported exchange names"""
     return list(EXCHANGES_CONFIG.keys())
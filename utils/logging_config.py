@@ -1,7 +1,12 @@
+import atexit
 import logging
+import logging.handlers
 import os
+import queue
 import sys
-from typing import Optional
+import threading
+import time
+from typing import Dict, Optional, Tuple
 
 """
 Centralized logging configuration for the project.
@@ -10,54 +15,213 @@ Usage:
     from utils.logging_config import setup_logging, get_logger
     setup_logging()  # optional: setup_logging(level=logging.DEBUG)
     logger = get_logger(__name__)
+
+With LOG_QUEUE=1 (LOGGING_CONFIG['queue']) records are only enqueued by the logging
+thread and are formatted, sanitized and written to stdout by a background listener;
+that mode also collapses repeated messages (RepeatFilter).
 """
 
-def setup_logging(level: Optional[int] = None):
+
+class _StripNonAscii(dict):
+    """str.translate table deleting every code point >= 128; entries are cached on first use."""
+
+    def __missing__(self, code: int):
+        value = code if code < 128 else None
+        self[code] = value
+        return value
+
+
+_ASCII_TABLE = _StripNonAscii()
+
+
+def _sanitize(s: str) -> str:
+    """Remove non-ASCII characters (emojis, fancy symbols) to avoid console encoding errors."""
+    try:
+        return s if s.isascii() else s.translate(_ASCII_TABLE)
+    except Exception:
+        return s
+
+
+class SanitizingFormatter(logging.Formatter):
+    """Formatter that sanitizes the final message to remove characters unsupported by some consoles."""
+
+    def format(self, record):
+        try:
+            # Produce the message, then sanitize it.
+            message = _sanitize(str(record.getMessage()))
+            suppressed = getattr(record, 'suppressed', 0)
+            if suppressed:
+                message += f" [{suppressed} similar messages suppressed]"
+            dropped = getattr(record, 'dropped', 0)
+            if dropped:
+                message += f" [{dropped} records dropped: log queue full]"
+            # Temporarily set record.message so formatting uses sanitized text
+            record.msg = message
+            record.args = ()
+        except Exception:
+            pass
+        return super().format(record)
+
+
+class RepeatFilter(logging.Filter):
+    """
+    Collapse repeated log messages per logger.
+
+    Records are keyed by (logger, level, message template, args), so checking costs a dict
+    lookup and never formats the message. Within each ``interval`` seconds the first
+    ``burst`` records of a key pass; later ones are dropped and counted, and the count is
+    attached to the next record of that key that passes (``record.suppressed``).
+    """
+
+    # Expired keys are pruned once this many are tracked
+    max_keys = 4096
+
+    def __init__(self, burst: int = 5, interval: float = 10.0):
+        super().__init__()
+        self.burst = int(burst)
+        self.interval = float(interval)
+        # key -> [window start, records passed in window, suppressed since last pass]
+        self._seen: Dict[Tuple, list] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(record: logging.LogRecord) -> Tuple:
+        try:
+            return record.name, record.levelno, record.msg, hash(record.args)
+        except TypeError:
+            # Unhashable args (dicts, lists): repeats are judged by the template alone
+            return record.name, record.levelno, str(record.msg), None
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if self.burst <= 0:
+            return True
+        key = self._key(record)
+        now = time.monotonic()
+        with self._lock:
+            state = self._seen.get(key)
+            if state is None or now - state[0] >= self.interval:
+                suppressed = state[2] if state is not None else 0
+                if state is None and len(self._seen) >= self.max_keys:
+                    self._prune(now)
+                self._seen[key] = [now, 1, 0]
+            elif state[1] < self.burst:
+                state[1] += 1
+                suppressed, state[2] = state[2], 0
+            else:
+                state[2] += 1
+                return False
+        if suppressed:
+            record.suppressed = suppressed
+        return True
+
+    def _prune(self, now: float):
+        expired = [key for key, state in self._seen.items() if now - state[0] >= self.interval]
+        for key in expired or list(self._seen)[:len(self._seen) // 2]:
+            del self._seen[key]
+
+
+def _snapshot(arg):
+    """Shallow copy of mutable builtin containers, so later mutation does not change a queued record."""
+    if isinstance(arg, (dict, list, set)):
+        return arg.copy()
+    return arg
+
+
+class _DeferredQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler that leaves formatting to the listener thread and never blocks the caller.
+
+    The stock handler merges msg and args on the caller's thread; here only mutable
+    container arguments are copied (e.g. a ``details`` dict the caller keeps filling)
+    and rendering happens when the listener formats the record. When the queue is full
+    the record is dropped and counted; the count rides on the next record enqueued
+    (``record.dropped``). ``emit`` runs under the handler lock, so the counters need none.
+    """
+
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+        self._unreported = 0
+
+    def prepare(self, record):
+        args = record.args
+        if isinstance(args, dict):
+            record.args = args.copy()
+        elif args:
+            record.args = tuple(_snapshot(arg) for arg in args)
+        return record
+
+    def enqueue(self, record):
+        if self._unreported:
+            record.dropped = self._unreported
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+            self._unreported += 1
+        else:
+            self._unreported = 0
+
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def _stop_listener():
+    """Flush queued records and stop the background listener (also run at exit)."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+atexit.register(_stop_listener)
+
+
+def setup_logging(level: Optional[int] = None, use_queue: Optional[bool] = None):
     """Configure root logging for the application.
 
     This sets an explicit StreamHandler to stdout so logs appear correctly
     in Hugging Face Spaces and other hosted environments. It respects the
-    LOG_LEVEL environment variable (e.g. LOG_LEVEL=DEBUG).
+    LOG_LEVEL environment variable (e.g. LOG_LEVEL=DEBUG). ``use_queue``
+    (default: LOGGING_CONFIG['queue']) moves formatting and output to a
+    background listener thread and collapses repeated messages; without it
+    every record is written as before.
     """
+    global _listener
+    from utils.config import LOGGING_CONFIG
+
     if level is None:
         level_name = os.getenv("LOG_LEVEL", "INFO").upper()
         level = getattr(logging, level_name, logging.INFO)
+    if use_queue is None:
+        use_queue = LOGGING_CONFIG.get('queue', False)
 
     # Configure root logger and explicit stdout StreamHandler for HF Spaces
     root = logging.getLogger()
     root.setLevel(level)
 
     # Remove existing handlers to avoid duplicate logs when re-initializing
+    _stop_listener()
     for h in list(root.handlers):
         root.removeHandler(h)
 
     handler = logging.StreamHandler(stream=sys.stdout)
     handler.setLevel(level)
-    
-    def _sanitize(s: str) -> str:
-        """Remove non-ASCII characters (emojis, fancy symbols) to avoid console encoding errors."""
-        try:
-            return ''.join(ch for ch in s if ord(ch) < 128)
-        except Exception:
-            return s
-    
-    class SanitizingFormatter(logging.Formatter):
-        """Formatter that sanitizes the final message to remove characters unsupported by some consoles."""
-        def format(self, record):
-            try:
-                # Produce the message, then sanitize it.
-                message = record.getMessage()
-                safe = _sanitize(str(message))
-                # Temporarily set record.message so formatting uses sanitized text
-                record.msg = safe
-                record.args = ()
-            except Exception:
-                pass
-            return super().format(record)
-    
     formatter = SanitizingFormatter("%(asctime)s %(levelname)s %(name)s: %(message)s")
     handler.setFormatter(formatter)
-    root.addHandler(handler)
+
+    if use_queue:
+        log_queue = queue.Queue(maxsize=int(LOGGING_CONFIG.get('queue_size', 10000)))
+        queue_handler = _DeferredQueueHandler(log_queue)
+        queue_handler.setLevel(level)
+        # Repeats are dropped before they are enqueued or formatted
+        queue_handler.addFilter(RepeatFilter(LOGGING_CONFIG.get('repeat_burst', 5),
+                                             LOGGING_CONFIG.get('repeat_interval', 10.0)))
+        root.addHandler(queue_handler)
+        _listener = logging.handlers.QueueListener(log_queue, handler, respect_handler_level=True)
+        _listener.start()
+    else:
+        root.addHandler(handler)
 
     # Reduce verbosity of very noisy third-party libraries
     for noisy in ["ccxt", "web3", "urllib3", "asyncio"]:
@@ -70,4 +234,4 @@ def setup_logging(level: Optional[int] = None):
 
 def get_logger(name: str):
     """Helper to get a module logger."""
-    return logging.getLogger(name)
\ No newline at end of file
+    return logging.getLogger(name)